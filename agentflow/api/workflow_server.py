@@ -12,18 +12,26 @@ import ray
 import time
 import asyncio
 import traceback
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, AsyncIterator, Optional, List, Set, Tuple
 
 import uvicorn
-from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request, BackgroundTasks, Header, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field, field_validator, ValidationError
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator, ValidationError
 
 from agentflow.core.distributed_workflow import ResearchDistributedWorkflow, DistributedConfig
 from agentflow.core.config import AgentConfig
 from agentflow.core.workflow import WorkflowEngine
 from agentflow.core.workflow_types import WorkflowConfig
+from agentflow.core.persistence import PersistenceFactory
+from agentflow.core.task_registry import TaskRegistry
+from agentflow.core.agent_pool import WorkflowAgentPool
+from agentflow.core.events import WorkflowEvent, WorkflowEventType
+from agentflow.core.workflow_batch import execute_batch
+from agentflow.core.admission import AdmissionController, PriorityClass
+from agentflow.core.exceptions import AdmissionRejectedError
 from agentflow.agents.agent import Agent
 from agentflow.core.model_config import ModelConfig
 from agentflow.agents.agent_types import AgentType
@@ -32,8 +40,25 @@ from agentflow.agents.agent_types import AgentType
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-# Dictionary to store workflow tasks and their status
-task_refs: Dict[str, Dict[str, Any]] = {}
+def _create_task_registry() -> TaskRegistry:
+    """Create the task registry from AGENTFLOW_TASK_* environment variables.
+    
+    AGENTFLOW_TASK_MAX_ENTRIES and AGENTFLOW_TASK_TTL bound the records held
+    in memory. If AGENTFLOW_TASK_SPILL_DIR is set, evicted records are
+    spilled there and /workflow/result keeps serving them.
+    """
+    spill_dir = os.environ.get("AGENTFLOW_TASK_SPILL_DIR")
+    persistence = None
+    if spill_dir:
+        persistence = PersistenceFactory.create_persistence("file", base_dir=spill_dir, format="jsonl")
+    return TaskRegistry(
+        max_entries=int(os.environ.get("AGENTFLOW_TASK_MAX_ENTRIES", 10000)),
+        ttl=float(os.environ.get("AGENTFLOW_TASK_TTL", 3600)),
+        persistence=persistence
+    )
+
+# Workflow tasks and their status, bounded and expiring
+task_refs = _create_task_registry()
 
 # Conditionally initialize Ray
 def initialize_ray():
@@ -71,8 +96,69 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
-# Create a global workflow engine instance
-workflow_engine = WorkflowEngine()
+# Create a global workflow engine instance; request workflows are unregistered
+# after execution and the limits guard against any that are left behind
+workflow_engine = WorkflowEngine(
+    max_workflows=int(os.environ.get("AGENTFLOW_MAX_WORKFLOWS", 1000)),
+    max_instances=int(os.environ.get("AGENTFLOW_MAX_WORKFLOW_INSTANCES", 1000))
+)
+
+async def create_workflow_agent(workflow_config: WorkflowConfig) -> Agent:
+    """Create and initialize an agent for a workflow."""
+    agent_config = AgentConfig(
+        id=str(uuid.uuid4()),
+        name=f"agent_{workflow_config.id}",
+        type=AgentType.RESEARCH,
+        model={
+            "provider": "openai",
+            "name": "gpt-4",
+            "temperature": 0.7,
+            "max_tokens": 4096
+        },
+        workflow=workflow_config
+    )
+    agent = Agent(config=agent_config)
+    await agent.initialize()
+    return agent
+
+# Initialized agents with registered workflows, reused across requests
+agent_pool = WorkflowAgentPool(
+    workflow_engine,
+    create_workflow_agent,
+    max_size=int(os.environ.get("AGENTFLOW_AGENT_POOL_SIZE", 4)),
+    max_keys=int(os.environ.get("AGENTFLOW_AGENT_POOL_KEYS", 128)),
+    idle_timeout=float(os.environ.get("AGENTFLOW_AGENT_POOL_IDLE_TIMEOUT", 600))
+)
+
+def _create_admission_controller() -> AdmissionController:
+    """Create the admission controller from AGENTFLOW_ADMISSION_* environment variables.
+    
+    AGENTFLOW_ADMISSION_MAX_CONCURRENT bounds the executions in progress and
+    AGENTFLOW_ADMISSION_MAX_QUEUE the requests waiting for one. The optional
+    AGENTFLOW_ADMISSION_TENANT_LIMIT bounds the executions of each tenant,
+    and AGENTFLOW_ADMISSION_BATCH_LIMIT those of batch requests, keeping the
+    remaining capacity for interactive and standard requests.
+    """
+    max_concurrent = int(os.environ.get("AGENTFLOW_ADMISSION_MAX_CONCURRENT", 16))
+    max_queue = int(os.environ.get("AGENTFLOW_ADMISSION_MAX_QUEUE", 1000))
+    tenant_limit = os.environ.get("AGENTFLOW_ADMISSION_TENANT_LIMIT")
+    batch_limit = int(os.environ.get("AGENTFLOW_ADMISSION_BATCH_LIMIT", max(1, max_concurrent // 2)))
+    return AdmissionController(
+        max_concurrent=max_concurrent,
+        max_queue=max_queue,
+        tenant_limit=int(tenant_limit) if tenant_limit else None,
+        class_limits={PriorityClass.BATCH: batch_limit},
+        queue_limits={PriorityClass.BATCH: max(1, max_queue // 2)}
+    )
+
+# Admission control in front of workflow execution
+admission = _create_admission_controller()
+
+# Seconds a synchronous or batch request waits in the admission queue
+ADMISSION_TIMEOUT = float(os.environ.get("AGENTFLOW_ADMISSION_TIMEOUT", 30))
+
+# Background executions, referenced so they are not garbage collected
+background_tasks: Set[asyncio.Task] = set()
 
 # Initialize workflow engine on startup
 @app.on_event("startup")
@@ -96,6 +182,59 @@ class WorkflowRequest(BaseModel):
         except Exception as e:
             raise ValueError(f"Invalid workflow configuration: {str(e)}")
 
+class WorkflowBatchRequest(BaseModel):
+    """Batch workflow request model."""
+    workflow: Dict[str, Any] = Field(description="Workflow configuration")
+    config: Dict[str, Any] = Field(default_factory=dict, description="Workflow configuration options")
+    inputs: List[Dict[str, Any]] = Field(description="Input data of each workflow execution")
+    max_concurrency: int = Field(default=4, ge=1, le=256, description="Maximum number of concurrent executions")
+    _workflow_config: Optional[WorkflowConfig] = PrivateAttr(default=None)
+    
+    @model_validator(mode="after")
+    def validate_workflow(self) -> "WorkflowBatchRequest":
+        """Validate workflow configuration and keep it for the whole batch."""
+        try:
+            self._workflow_config = WorkflowConfig(**self.workflow)
+        except Exception as e:
+            raise ValueError(f"Invalid workflow configuration: {str(e)}")
+        return self
+        
+    @property
+    def workflow_config(self) -> WorkflowConfig:
+        """Validated workflow configuration."""
+        return self._workflow_config
+
+def _format_result(result: Dict[str, Any], workflow_config: WorkflowConfig) -> Dict[str, Any]:
+    """Give an engine result the status and result fields clients expect."""
+    # Update status for consistency
+    if result.get("status") == "success":
+        result["status"] = "completed"
+        
+    # Ensure result is included
+    if "result" not in result or result["result"] is None:
+        # Get the last step's result
+        if workflow_config.steps and len(workflow_config.steps) > 0:
+            last_step = workflow_config.steps[-1]
+            if "steps" in result and last_step.id in result["steps"]:
+                last_step_result = result["steps"][last_step.id]["result"]
+                if isinstance(last_step_result, dict):
+                    result["result"] = last_step_result.get("result", last_step_result)
+                else:
+                    result["result"] = last_step_result
+        
+        # If still no result, create a default one
+        if "result" not in result or result["result"] is None:
+            result["result"] = {
+                "content": result.get("content", ""),
+                "steps": result.get("steps", {})
+            }
+    return result
+
+def _prepare_input(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Prepare request input for execution, the same for single and batch requests."""
+    input_data["test_mode"] = True
+    return input_data
+
 @app.exception_handler(ValidationError)
 async def validation_exception_handler(request: Request, exc: ValidationError):
     """Handle Pydantic validation errors"""
@@ -105,6 +244,25 @@ async def validation_exception_handler(request: Request, exc: ValidationError):
         content={"detail": str(exc)}
     )
 
+@app.exception_handler(AdmissionRejectedError)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejectedError):
+    """Answer requests the server is too busy to admit with 429"""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+def _admission_class(tenant: str, priority: Optional[str], default: PriorityClass) -> Tuple[str, PriorityClass]:
+    """Get the tenant and priority class of a request from its headers."""
+    try:
+        return tenant, PriorityClass(priority) if priority else default
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid priority {priority!r}, expected one of {[p.value for p in PriorityClass]}"
+        )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler for all unhandled exceptions"""
@@ -122,15 +280,25 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 @app.post("/workflow/execute")
-async def execute_workflow(request: WorkflowRequest) -> Dict[str, Any]:
+async def execute_workflow(
+    request: WorkflowRequest,
+    x_tenant_id: str = Header("default"),
+    x_priority: Optional[str] = Header(None)
+) -> Dict[str, Any]:
     """Execute workflow synchronously.
     
     Args:
         request: Workflow request
+        x_tenant_id: Tenant the request is accounted to
+        x_priority: Priority class, interactive by default
         
     Returns:
         Dict[str, Any]: Workflow execution results
+        
+    Raises:
+        HTTPException: 429 with Retry-After if the request is not admitted
     """
+    tenant, priority = _admission_class(x_tenant_id, x_priority, PriorityClass.INTERACTIVE)
     try:
         # Create workflow config
         workflow_config = WorkflowConfig(**request.workflow)
@@ -140,67 +308,96 @@ async def execute_workflow(request: WorkflowRequest) -> Dict[str, Any]:
             await workflow_engine.initialize()
             workflow_engine._pending_tasks = {}  # Initialize pending tasks dictionary
             
-        # Create and register an agent for this workflow
-        agent_config = AgentConfig(
-            id=str(uuid.uuid4()),
-            name=f"agent_{workflow_config.id}",
-            type=AgentType.RESEARCH,
-            model={
-                "provider": "openai",
-                "name": "gpt-4",
-                "temperature": 0.7,
-                "max_tokens": 4096
-            },
-            workflow=workflow_config
-        )
-        agent = Agent(config=agent_config)
-        await agent.initialize()
-        
-        # Set test mode in input data
-        request.input_data["test_mode"] = True
+        input_data = _prepare_input(request.input_data)
         
-        # Register workflow and execute
-        await workflow_engine.register_workflow(agent, workflow_config)
-        result = await workflow_engine.execute_workflow(agent.id, request.input_data)
+        # Execute with a pooled agent that has the workflow registered
+        async with admission.admit(tenant, priority, timeout=ADMISSION_TIMEOUT):
+            async with agent_pool.checkout(workflow_config) as workflow_id:
+                result = await workflow_engine.execute_workflow(workflow_id, input_data)
         
-        # Update status for consistency
-        if result.get("status") == "success":
-            result["status"] = "completed"
-            
-        # Ensure result is included
-        if "result" not in result or result["result"] is None:
-            # Get the last step's result
-            if workflow_config.steps and len(workflow_config.steps) > 0:
-                last_step = workflow_config.steps[-1]
-                if "steps" in result and last_step.id in result["steps"]:
-                    last_step_result = result["steps"][last_step.id]["result"]
-                    if isinstance(last_step_result, dict):
-                        result["result"] = last_step_result.get("result", last_step_result)
-                    else:
-                        result["result"] = last_step_result
-            
-            # If still no result, create a default one
-            if "result" not in result or result["result"] is None:
-                result["result"] = {
-                    "content": result.get("content", ""),
-                    "steps": result.get("steps", {})
-                }
-        
-        return result
+        return _format_result(result, workflow_config)
+    except AdmissionRejectedError:
+        raise
     except Exception as e:
         logger.error(f"Error executing workflow: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/workflow/execute_batch")
+async def execute_workflow_batch(
+    request: WorkflowBatchRequest,
+    x_tenant_id: str = Header("default"),
+    x_priority: Optional[str] = Header(None)
+) -> StreamingResponse:
+    """Execute a workflow for each of many inputs.
+    
+    The workflow configuration is validated once and pooled agents execute
+    the inputs with bounded concurrency. Results are streamed as
+    newline-delimited JSON in completion order, one object per input with
+    its ``index`` in ``inputs`` and either the ``result`` or the ``error``.
+    
+    The batch occupies one admission slot per concurrent execution.
+    
+    Args:
+        request: Batch workflow request
+        x_tenant_id: Tenant the request is accounted to
+        x_priority: Priority class, batch by default
+        
+    Returns:
+        StreamingResponse: application/x-ndjson stream of per-input results
+        
+    Raises:
+        HTTPException: 429 with Retry-After if the request is not admitted
+    """
+    tenant, priority = _admission_class(x_tenant_id, x_priority, PriorityClass.BATCH)
+    workflow_config = request.workflow_config
+    
+    # Initialize workflow engine if needed
+    if not workflow_engine._initialized:
+        await workflow_engine.initialize()
+        
+    ticket = admission.submit(tenant, priority, weight=min(request.max_concurrency, agent_pool.max_size))
+    await admission.wait(ticket, timeout=ADMISSION_TIMEOUT)
+    
+    async def result_lines():
+        try:
+            inputs = (_prepare_input(input_data) for input_data in request.inputs)
+            async for item in execute_batch(agent_pool, workflow_config, inputs, ticket.weight):
+                if item["status"] == "completed":
+                    item["result"] = _format_result(item["result"], workflow_config)
+                yield json.dumps(item, default=str) + "\n"
+        finally:
+            admission.release(ticket)
+            
+    # Also released after the response in case the stream never started
+    return StreamingResponse(
+        result_lines(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(admission.release, ticket)
+    )
+
 @app.post("/workflow/execute_async")
-async def execute_workflow_async(request: WorkflowRequest) -> Dict[str, Any]:
+async def execute_workflow_async(
+    request: WorkflowRequest,
+    x_tenant_id: str = Header("default"),
+    x_priority: Optional[str] = Header(None)
+) -> Dict[str, Any]:
     """Execute workflow asynchronously.
     
+    The request is queued for admission and executed in the background once
+    admitted; its task stays pending while queued.
+    
     Args:
         request: Workflow request
+        x_tenant_id: Tenant the request is accounted to
+        x_priority: Priority class, standard by default
         
     Returns:
         Dict[str, Any]: Initial response with task ID
+        
+    Raises:
+        HTTPException: 429 with Retry-After if the admission queue is full
     """
+    tenant, priority = _admission_class(x_tenant_id, x_priority, PriorityClass.STANDARD)
     try:
         # Create workflow config
         workflow_config = WorkflowConfig(**request.workflow)
@@ -209,22 +406,8 @@ async def execute_workflow_async(request: WorkflowRequest) -> Dict[str, Any]:
         if not workflow_engine._initialized:
             await workflow_engine.initialize()
             
-        # Create and register an agent for this workflow
-        agent_config = AgentConfig(
-            id=str(uuid.uuid4()),
-            name=f"agent_{workflow_config.id}",
-            type=AgentType.RESEARCH,
-            model={
-                "provider": "openai",
-                "name": "gpt-4",
-                "temperature": 0.7,
-                "max_tokens": 4096
-            },
-            workflow=workflow_config
-        )
-        agent = Agent(config=agent_config)
-        await agent.initialize()
-        await workflow_engine.register_workflow(agent, workflow_config)
+        # Queue for admission, rejected right away if the queue is full
+        ticket = admission.submit(tenant, priority)
         
         # Generate task ID
         task_id = str(uuid.uuid4())
@@ -239,31 +422,67 @@ async def execute_workflow_async(request: WorkflowRequest) -> Dict[str, Any]:
         
         # Start execution in background
         async def execute_and_store():
+            pooled = None
+            failed = False
             try:
-                result = await workflow_engine.execute_workflow(agent.id, request.input_data)
-                task_refs[task_id].update({
-                    "status": "completed",
-                    "result": result,
-                    "end_time": time.time()
-                })
+                await admission.wait(ticket)
+                # Check out a pooled agent that has the workflow registered
+                pooled = await agent_pool.acquire(workflow_config)
+                result = await workflow_engine.execute_workflow(
+                    pooled.agent.id, request.input_data, run_id=task_id
+                )
+                task_refs.update(
+                    task_id,
+                    status="completed",
+                    result=result,
+                    end_time=time.time()
+                )
             except Exception as e:
-                task_refs[task_id].update({
-                    "status": "error",
-                    "error": str(e),
-                    "end_time": time.time()
-                })
+                task_refs.update(
+                    task_id,
+                    status="error",
+                    error=str(e),
+                    end_time=time.time()
+                )
                 logger.error(f"Error in workflow execution: {e}")
+                failed = True
+                # End event streams of runs that failed before publishing their outcome
+                events = workflow_engine.event_bus.history(task_id)
+                if not events or not events[-1].terminal:
+                    workflow_engine.event_bus.publish(WorkflowEvent(
+                        type=WorkflowEventType.WORKFLOW_FAILED,
+                        run_id=task_id,
+                        workflow_id=workflow_config.id,
+                        data={"error": str(e)}
+                    ))
+            finally:
+                admission.release(ticket)
+                if pooled is not None:
+                    await agent_pool.release(pooled, discard=failed)
                 
-        asyncio.create_task(execute_and_store())
+        task = asyncio.create_task(execute_and_store())
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
         
         return {
             "result_ref": task_id,
             "status": "pending"
         }
+    except AdmissionRejectedError:
+        raise
     except Exception as e:
         logger.error(f"Error executing workflow asynchronously: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/admission/stats")
+async def get_admission_stats() -> Dict[str, Any]:
+    """Get admission queue depth, running executions and queue wait times.
+    
+    Returns:
+        Dict[str, Any]: Admission statistics
+    """
+    return admission.stats()
+
 @app.get("/workflow/result/{result_ref}")
 async def get_workflow_result(result_ref: str) -> Dict[str, Any]:
     """Get workflow result.
@@ -274,10 +493,9 @@ async def get_workflow_result(result_ref: str) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Workflow result
     """
-    if result_ref not in task_refs:
+    task_info = task_refs.get(result_ref)
+    if task_info is None:
         raise HTTPException(status_code=404, detail="Result not found")
-        
-    task_info = task_refs[result_ref]
     
     if task_info["status"] == "error":
         raise HTTPException(status_code=500, detail=task_info["error"])
@@ -293,6 +511,81 @@ async def get_workflow_result(result_ref: str) -> Dict[str, Any]:
         "retrieval_time": retrieval_time
     }
 
+async def _task_events(result_ref: str, after: int = 0) -> AsyncIterator[WorkflowEvent]:
+    """Progress events of an async task, starting after a sequence number.
+    
+    Kept events are replayed first, then live events follow until the run
+    finishes. If the run's events are no longer kept, only its outcome is
+    reported.
+    """
+    task_info = task_refs.get(result_ref)
+    if task_info is not None and task_info["status"] != "pending" and not workflow_engine.event_bus.history(result_ref):
+        finished = task_info["status"] == "completed"
+        yield WorkflowEvent(
+            type=WorkflowEventType.WORKFLOW_COMPLETED if finished else WorkflowEventType.WORKFLOW_FAILED,
+            run_id=result_ref,
+            data=task_info["result"] if finished else {"error": task_info.get("error")}
+        )
+        return
+    async for event in workflow_engine.event_bus.subscribe(result_ref, after=after):
+        yield event
+
+@app.get("/workflow/stream/{result_ref}")
+async def stream_workflow_events(result_ref: str, request: Request) -> StreamingResponse:
+    """Stream progress events of an async task as server-sent events.
+    
+    Reconnecting clients send the Last-Event-ID header to resume after the
+    last event they received.
+    
+    Args:
+        result_ref: Result reference ID
+        request: HTTP request
+        
+    Returns:
+        StreamingResponse: text/event-stream of workflow events
+    """
+    if task_refs.get(result_ref) is None:
+        raise HTTPException(status_code=404, detail="Result not found")
+    try:
+        after = int(request.headers.get("last-event-id") or 0)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Last-Event-ID header")
+        
+    async def event_source():
+        async for event in _task_events(result_ref, after):
+            if await request.is_disconnected():
+                break
+            yield f"id: {event.seq}\nevent: {event.type.value}\ndata: {json.dumps(event.to_dict())}\n\n"
+            
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.websocket("/workflow/ws/{result_ref}")
+async def workflow_events_socket(websocket: WebSocket, result_ref: str) -> None:
+    """Send progress events of an async task over a WebSocket.
+    
+    The optional ``after`` query parameter resumes after a sequence number.
+    The socket is closed once the run finishes.
+    
+    Args:
+        websocket: WebSocket connection
+        result_ref: Result reference ID
+    """
+    if task_refs.get(result_ref) is None:
+        await websocket.close(code=4404)
+        return
+    await websocket.accept()
+    try:
+        after = int(websocket.query_params.get("after") or 0)
+        async for event in _task_events(result_ref, after):
+            await websocket.send_json(event.to_dict())
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.debug(f"Event stream client for {result_ref} disconnected")
+
 @app.get("/workflow/status/{task_id}")
 async def get_workflow_status(task_id: str) -> Dict[str, Any]:
     """Get workflow execution status.
@@ -0,0 +1,333 @@
+"""Pool of long-lived Ray actors for distributed workflow steps."""
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import ray
+from ray.actor import ActorHandle
+
+from .exceptions import WorkflowExecutionError
+from .utils import content_hash
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str]
+
+
+@dataclass
+class PooledActor:
+    """Actor owned by the pool.
+
+    Attributes:
+        actor: Ray actor handle
+        key: Step type and configuration hash the actor was created for
+        name: Ray actor name
+        last_used: Time the actor was last released
+        leased: Whether the actor is currently leased
+        used: Whether the actor has been leased before
+    """
+    actor: ActorHandle
+    key: PoolKey
+    name: str
+    last_used: float = field(default_factory=time.time)
+    leased: bool = False
+    used: bool = False
+
+
+class StepActorPool:
+    """Reuses step actors across workflow instances.
+
+    Actors are grouped by step type and a hash of the step configuration,
+    so a leased actor already has the imports and state for the step it
+    runs. Each group keeps at least ``min_size`` actors, idle actors beyond
+    that are stopped after ``idle_timeout`` seconds, and no group grows
+    beyond ``max_size`` actors; leases wait for a release when it is full.
+    Idle actors that were used before are health-checked before they are
+    leased again and evicted if the check fails.
+
+    Actor names include a pool ID, random unless given, so pools of
+    different drivers never share an actor. Detached pools with a fixed
+    ``pool_id`` reattach to the actors of that ID on the next start; give
+    each concurrently running driver its own ID.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 0,
+        max_size: int = 16,
+        idle_timeout: float = 300.0,
+        health_check_timeout: float = 10.0,
+        lease_timeout: float = 60.0,
+        namespace: str = "agentflow",
+        detached: bool = False,
+        pool_id: Optional[str] = None
+    ):
+        """Initialize actor pool.
+
+        Args:
+            min_size: Actors kept per group even when idle
+            max_size: Maximum number of actors per group
+            idle_timeout: Seconds after which surplus idle actors are stopped
+            health_check_timeout: Seconds to wait for an actor's health check
+            lease_timeout: Seconds to wait for an actor when a group is full
+            namespace: Prefix of the Ray actor names
+            detached: Create detached actors that outlive the driver and are
+                reattached by name on the next start with the same pool_id
+            pool_id: ID in the actor names, a random one if None
+        """
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_timeout = health_check_timeout
+        self.lease_timeout = lease_timeout
+        self.namespace = namespace
+        self.detached = detached
+        self.pool_id = pool_id or uuid.uuid4().hex[:12]
+        # Only a fixed pool ID can name actors created by an earlier driver
+        self._reattach = detached and pool_id is not None
+        self._groups: Dict[PoolKey, List[PooledActor]] = {}
+        self._by_actor: Dict[ActorHandle, PooledActor] = {}
+        self._waiters: Dict[PoolKey, List[asyncio.Future]] = {}
+        self._serial = itertools.count()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(step_type: Any, config: Dict[str, Any]) -> PoolKey:
+        """Get the group key of a step type and configuration."""
+        step_type = getattr(step_type, "value", step_type)
+        return str(step_type), content_hash(config or {})
+
+    def _create(self, actor_cls: Any, key: PoolKey, actor_kwargs: Optional[Dict[str, Any]] = None) -> PooledActor:
+        """Create an actor for a group. Must be called with the lock held."""
+        name = f"{self.namespace}.{self.pool_id}.{key[0]}.{key[1][:12]}.{next(self._serial)}"
+        options: Dict[str, Any] = {"name": name}
+        if self.detached:
+            options["lifetime"] = "detached"
+        if self._reattach:
+            options["get_if_exists"] = True
+        actor = actor_cls.options(**options).remote(**(actor_kwargs or {}))
+        pooled = PooledActor(actor=actor, key=key, name=name)
+        self._groups.setdefault(key, []).append(pooled)
+        self._by_actor[pooled.actor] = pooled
+        return pooled
+
+    def _remove(self, pooled: PooledActor) -> None:
+        """Stop an actor and forget it. Must be called with the lock held."""
+        group = self._groups.get(pooled.key, [])
+        if pooled in group:
+            group.remove(pooled)
+        self._by_actor.pop(pooled.actor, None)
+        try:
+            ray.kill(pooled.actor)
+        except Exception as e:
+            logger.debug(f"Could not stop actor {pooled.name}: {e}")
+
+    async def _is_healthy(self, pooled: PooledActor) -> bool:
+        """Run the actor's health check."""
+        try:
+            return bool(await asyncio.wait_for(
+                pooled.actor.health_check.remote(), timeout=self.health_check_timeout
+            ))
+        except Exception as e:
+            logger.warning(f"Health check of actor {pooled.name} failed: {e}")
+            return False
+
+    async def lease(
+        self,
+        actor_cls: Any,
+        step_type: Any,
+        config: Dict[str, Any],
+        actor_kwargs: Optional[Dict[str, Any]] = None
+    ) -> ActorHandle:
+        """Lease an actor for a step.
+
+        Args:
+            actor_cls: Ray actor class used when a new actor is needed
+            step_type: Step type
+            config: Step configuration
+            actor_kwargs: Constructor arguments of a new actor, which should
+                be covered by config as they are not part of the group key
+
+        Returns:
+            Actor handle, to be given back with release()
+
+        Raises:
+            WorkflowExecutionError: If no actor becomes available within the lease timeout
+        """
+        key = self.make_key(step_type, config)
+        deadline = time.monotonic() + self.lease_timeout
+        self.evict_idle()
+        while True:
+            with self._lock:
+                group = self._groups.setdefault(key, [])
+                idle = [pooled for pooled in group if not pooled.leased]
+                # Most recently used first, so surplus actors age out
+                idle.sort(key=lambda pooled: pooled.last_used, reverse=True)
+                candidate = idle[0] if idle else None
+                if candidate is None and len(group) < self.max_size:
+                    candidate = self._create(actor_cls, key, actor_kwargs)
+                if candidate is not None:
+                    candidate.leased = True
+
+            if candidate is not None:
+                if candidate.used and not await self._is_healthy(candidate):
+                    with self._lock:
+                        self._remove(candidate)
+                    continue
+                candidate.used = True
+                return candidate.actor
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise WorkflowExecutionError(
+                    f"No actor available for step type {key[0]} within {self.lease_timeout}s"
+                )
+            waiter = asyncio.get_running_loop().create_future()
+            with self._lock:
+                self._waiters.setdefault(key, []).append(waiter)
+            try:
+                await asyncio.wait_for(waiter, timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._lock:
+                    waiters = self._waiters.get(key, [])
+                    if waiter in waiters:
+                        waiters.remove(waiter)
+
+    def release(self, actor: ActorHandle) -> None:
+        """Return a leased actor to the pool.
+
+        Args:
+            actor: Actor handle obtained from lease()
+        """
+        with self._lock:
+            pooled = self._by_actor.get(actor)
+            if pooled is None or not pooled.leased:
+                return
+            pooled.leased = False
+            pooled.last_used = time.time()
+            waiters = self._waiters.get(pooled.key, [])
+            while waiters:
+                waiter = waiters.pop(0)
+                if not waiter.done():
+                    waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+                    break
+        self.evict_idle()
+
+    def release_all(self, actors: Iterable[ActorHandle]) -> None:
+        """Return several leased actors to the pool."""
+        for actor in list(actors):
+            self.release(actor)
+
+    async def warm(self, actor_cls: Any, step_type: Any, config: Dict[str, Any], count: Optional[int] = None) -> None:
+        """Start actors ahead of the first lease.
+
+        Args:
+            actor_cls: Ray actor class
+            step_type: Step type
+            config: Step configuration
+            count: Number of actors the group should have, defaults to min_size
+        """
+        key = self.make_key(step_type, config)
+        count = min(self.max_size, self.min_size if count is None else count)
+        with self._lock:
+            group = self._groups.setdefault(key, [])
+            created = [self._create(actor_cls, key) for _ in range(count - len(group))]
+        # Wait for the actors to finish starting
+        await asyncio.gather(*(pooled.actor.__ray_ready__.remote() for pooled in created))
+
+    def evict_idle(self) -> int:
+        """Stop idle actors past the idle timeout, keeping min_size per group.
+
+        Returns:
+            Number of actors stopped
+        """
+        cutoff = time.time() - self.idle_timeout
+        evicted = 0
+        with self._lock:
+            for group in self._groups.values():
+                expired = sorted(
+                    (pooled for pooled in group if not pooled.leased and pooled.last_used < cutoff),
+                    key=lambda pooled: pooled.last_used
+                )
+                surplus = len(group) - self.min_size
+                for pooled in expired[:max(surplus, 0)]:
+                    self._remove(pooled)
+                    evicted += 1
+        return evicted
+
+    async def check_health(self) -> int:
+        """Health-check all idle actors and evict the unhealthy ones.
+
+        Returns:
+            Number of actors evicted
+        """
+        with self._lock:
+            idle = [pooled for group in self._groups.values() for pooled in group if not pooled.leased and pooled.used]
+            for pooled in idle:
+                pooled.leased = True
+        healthy = await asyncio.gather(*(self._is_healthy(pooled) for pooled in idle))
+        evicted = 0
+        with self._lock:
+            for pooled, ok in zip(idle, healthy):
+                pooled.leased = False
+                if not ok:
+                    self._remove(pooled)
+                    evicted += 1
+        return evicted
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get the number of leased and idle actors per group."""
+        with self._lock:
+            return {
+                f"{key[0]}:{key[1][:12]}": {
+                    "leased": sum(1 for pooled in group if pooled.leased),
+                    "idle": sum(1 for pooled in group if not pooled.leased),
+                }
+                for key, group in self._groups.items()
+            }
+
+    def shutdown(self) -> None:
+        """Stop all actors."""
+        with self._lock:
+            for group in list(self._groups.values()):
+                for pooled in list(group):
+                    self._remove(pooled)
+            self._groups = {}
+            self._waiters = {}
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    """Wake a lease waiting for a released actor."""
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+_default_actor_pool: Optional[StepActorPool] = None
+
+
+def get_default_actor_pool() -> StepActorPool:
+    """Get the process-wide actor pool that workflows lease step actors from."""
+    global _default_actor_pool
+    if _default_actor_pool is None:
+        _default_actor_pool = StepActorPool()
+    return _default_actor_pool
+
+
+def set_default_actor_pool(pool: Optional[StepActorPool]) -> None:
+    """Replace the process-wide actor pool.
+
+    Args:
+        pool: Actor pool to use, or None to create a new default pool on next use
+    """
+    global _default_actor_pool
+    _default_actor_pool = pool
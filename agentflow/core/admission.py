@@ -0,0 +1,314 @@
+"""Admission control with a bounded queue, tenant limits and priority classes."""
+
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from .exceptions import AdmissionRejectedError
+from .histogram import HistogramRegistry, get_default_histograms
+
+logger = logging.getLogger(__name__)
+
+
+class PriorityClass(str, Enum):
+    """Priority class enum, in dispatch order."""
+
+    INTERACTIVE = "interactive"
+    STANDARD = "standard"
+    BATCH = "batch"
+
+
+@dataclass(eq=False)
+class AdmissionTicket:
+    """Request waiting for or holding execution capacity.
+
+    Attributes:
+        tenant: Tenant the request is accounted to
+        priority: Priority class of the request
+        weight: Execution slots the request occupies
+        enqueued_at: Monotonic time the request was submitted
+        admitted_at: Monotonic time the request was admitted, None while queued
+        released: Whether the ticket was given back
+    """
+    tenant: str
+    priority: PriorityClass
+    weight: int = 1
+    enqueued_at: float = field(default_factory=time.monotonic)
+    admitted_at: Optional[float] = None
+    released: bool = False
+    future: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    @property
+    def wait_time(self) -> Optional[float]:
+        """Seconds spent queued, None while still queued."""
+        if self.admitted_at is None:
+            return None
+        return self.admitted_at - self.enqueued_at
+
+
+class AdmissionController:
+    """Admits requests to execution under global, tenant and class limits.
+
+    At most ``max_concurrent`` execution slots are in use at a time. Requests
+    beyond that wait in a queue of at most ``max_queue`` entries; further
+    requests are rejected with an AdmissionRejectedError carrying a
+    retry-after estimate. Queued requests are admitted by priority class,
+    and within a class round-robin across tenants, so a tenant at its
+    concurrency limit or with a long backlog does not hold up the others.
+    ``class_limits`` caps the slots of a class, for example to keep capacity
+    free for interactive requests during batch surges, and ``queue_limits``
+    caps its queued requests, so a batch surge cannot fill the whole queue.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 16,
+        max_queue: int = 1000,
+        tenant_limit: Optional[int] = None,
+        tenant_limits: Optional[Dict[str, int]] = None,
+        class_limits: Optional[Dict[PriorityClass, int]] = None,
+        queue_limits: Optional[Dict[PriorityClass, int]] = None,
+        histograms: Optional[HistogramRegistry] = None
+    ):
+        """Initialize admission controller.
+
+        Args:
+            max_concurrent: Maximum execution slots in use
+            max_queue: Maximum number of queued requests
+            tenant_limit: Maximum slots per tenant, None for no limit
+            tenant_limits: Maximum slots of individual tenants, overriding
+                tenant_limit
+            class_limits: Maximum slots per priority class
+            queue_limits: Maximum queued requests per priority class
+            histograms: Registry that queue wait times are recorded in,
+                the process-wide registry by default
+        """
+        if max_concurrent < 1 or max_queue < 0:
+            raise ValueError("max_concurrent must be at least 1 and max_queue not negative")
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.tenant_limit = tenant_limit
+        self.tenant_limits = dict(tenant_limits or {})
+        self.class_limits = {PriorityClass(key): value for key, value in (class_limits or {}).items()}
+        self.queue_limits = {PriorityClass(key): value for key, value in (queue_limits or {}).items()}
+        self.histograms = histograms if histograms is not None else get_default_histograms()
+        # Queued tickets per class and tenant, tenants in round-robin order
+        self._queues: Dict[PriorityClass, "OrderedDict[str, Deque[AdmissionTicket]]"] = {
+            priority: OrderedDict() for priority in PriorityClass
+        }
+        self._queued: Dict[PriorityClass, int] = {priority: 0 for priority in PriorityClass}
+        self._running = 0
+        self._running_by_class: Dict[PriorityClass, int] = {priority: 0 for priority in PriorityClass}
+        self._running_by_tenant: Dict[str, int] = {}
+        self._admitted: Dict[PriorityClass, int] = {priority: 0 for priority in PriorityClass}
+        self._rejected: Dict[PriorityClass, int] = {priority: 0 for priority in PriorityClass}
+        # Moving average of seconds a slot is held, for retry-after estimates
+        self._service_time = 1.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of queued requests."""
+        return sum(self._queued.values())
+
+    def _tenant_limit(self, tenant: str) -> Optional[int]:
+        return self.tenant_limits.get(tenant, self.tenant_limit)
+
+    def _can_run(self, ticket: AdmissionTicket) -> bool:
+        if self._running + ticket.weight > self.max_concurrent:
+            return False
+        class_limit = self.class_limits.get(ticket.priority)
+        if class_limit is not None and self._running_by_class[ticket.priority] + ticket.weight > class_limit:
+            return False
+        tenant_limit = self._tenant_limit(ticket.tenant)
+        running = self._running_by_tenant.get(ticket.tenant, 0)
+        return tenant_limit is None or running + ticket.weight <= tenant_limit
+
+    def retry_after(self) -> int:
+        """Estimate the seconds until a new request would be admitted."""
+        backlog = self.queue_depth + 1
+        return max(1, min(300, math.ceil(self._service_time * backlog / self.max_concurrent)))
+
+    def _reject(self, priority: PriorityClass, reason: str) -> AdmissionRejectedError:
+        self._rejected[priority] += 1
+        retry_after = self.retry_after()
+        logger.warning(f"Rejected {priority.value} request: {reason}, retry after {retry_after}s")
+        return AdmissionRejectedError(f"Server is saturated: {reason}", retry_after=retry_after)
+
+    def submit(
+        self,
+        tenant: str = "default",
+        priority: PriorityClass = PriorityClass.STANDARD,
+        weight: int = 1
+    ) -> AdmissionTicket:
+        """Queue a request for admission.
+
+        Must be called from a running event loop. The request is admitted
+        right away if the limits that apply to it allow.
+
+        Args:
+            tenant: Tenant the request is accounted to
+            priority: Priority class of the request
+            weight: Execution slots the request occupies, capped by the
+                limits that apply to it
+
+        Returns:
+            AdmissionTicket: Ticket to wait on and to release afterwards
+
+        Raises:
+            AdmissionRejectedError: If the queue or the class's share of it
+                is full
+        """
+        priority = PriorityClass(priority)
+        limits = [self.max_concurrent, self.class_limits.get(priority), self._tenant_limit(tenant)]
+        weight = max(1, min([weight] + [limit for limit in limits if limit is not None]))
+        ticket = AdmissionTicket(tenant=tenant, priority=priority, weight=weight)
+        # Queued tickets are all blocked, so one that can run is not queued behind them
+        if not self._can_run(ticket):
+            if self.queue_depth >= self.max_queue:
+                raise self._reject(priority, f"{self.queue_depth} requests queued")
+            queue_limit = self.queue_limits.get(priority)
+            if queue_limit is not None and self._queued[priority] >= queue_limit:
+                raise self._reject(priority, f"{self._queued[priority]} {priority.value} requests queued")
+
+        ticket.future = asyncio.get_running_loop().create_future()
+        self._queues[priority].setdefault(tenant, deque()).append(ticket)
+        self._queued[priority] += 1
+        self._dispatch()
+        return ticket
+
+    async def wait(self, ticket: AdmissionTicket, timeout: Optional[float] = None) -> None:
+        """Wait until a ticket is admitted.
+
+        Args:
+            ticket: Ticket from submit()
+            timeout: Maximum seconds to wait, None to wait indefinitely
+
+        Raises:
+            AdmissionRejectedError: If the ticket is not admitted in time;
+                it is removed from the queue
+        """
+        try:
+            await asyncio.wait_for(asyncio.shield(ticket.future), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.release(ticket)
+            raise self._reject(ticket.priority, f"not admitted within {timeout}s")
+        except asyncio.CancelledError:
+            self.release(ticket)
+            raise
+
+    def _start(self, ticket: AdmissionTicket) -> None:
+        ticket.admitted_at = time.monotonic()
+        self._queued[ticket.priority] -= 1
+        self._running += ticket.weight
+        self._running_by_class[ticket.priority] += ticket.weight
+        self._running_by_tenant[ticket.tenant] = self._running_by_tenant.get(ticket.tenant, 0) + ticket.weight
+        self._admitted[ticket.priority] += 1
+        self.histograms.observe("admission_wait_seconds", ticket.wait_time, {"priority": ticket.priority.value})
+        if not ticket.future.done():
+            ticket.future.set_result(None)
+
+    def _dispatch(self) -> None:
+        """Admit queued tickets while capacity allows."""
+        admitted = True
+        while admitted:
+            admitted = False
+            for priority in PriorityClass:
+                tenants = self._queues[priority]
+                for tenant, queue in tenants.items():
+                    if self._can_run(queue[0]):
+                        self._start(queue.popleft())
+                        if queue:
+                            tenants.move_to_end(tenant)
+                        else:
+                            del tenants[tenant]
+                        admitted = True
+                        break
+                if admitted:
+                    # Start over at the highest class with the freed state
+                    break
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        """Give back a ticket's slots, or withdraw it if still queued.
+
+        Releasing a ticket more than once has no effect.
+
+        Args:
+            ticket: Ticket from submit()
+        """
+        if ticket.released:
+            return
+        ticket.released = True
+        if ticket.admitted_at is None:
+            queue = self._queues[ticket.priority].get(ticket.tenant)
+            if queue is not None and ticket in queue:
+                queue.remove(ticket)
+                self._queued[ticket.priority] -= 1
+                if not queue:
+                    del self._queues[ticket.priority][ticket.tenant]
+            if not ticket.future.done():
+                ticket.future.cancel()
+            return
+
+        self._running -= ticket.weight
+        self._running_by_class[ticket.priority] -= ticket.weight
+        self._running_by_tenant[ticket.tenant] -= ticket.weight
+        if not self._running_by_tenant[ticket.tenant]:
+            del self._running_by_tenant[ticket.tenant]
+        held = time.monotonic() - ticket.admitted_at
+        self._service_time = 0.9 * self._service_time + 0.1 * held / ticket.weight
+        self._dispatch()
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        tenant: str = "default",
+        priority: PriorityClass = PriorityClass.STANDARD,
+        weight: int = 1,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[AdmissionTicket]:
+        """Hold execution capacity for the duration of a block.
+
+        Args:
+            tenant: Tenant the request is accounted to
+            priority: Priority class of the request
+            weight: Execution slots the request occupies
+            timeout: Maximum seconds to wait in the queue
+
+        Yields:
+            Admitted ticket
+
+        Raises:
+            AdmissionRejectedError: If the request is not admitted
+        """
+        ticket = self.submit(tenant, priority, weight)
+        try:
+            await self.wait(ticket, timeout)
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue depth, running slots, counters and wait times."""
+        wait_times = {}
+        for priority in PriorityClass:
+            histogram = self.histograms.get("admission_wait_seconds", {"priority": priority.value})
+            wait_times[priority.value] = histogram.summary() if histogram is not None else None
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "running": self._running,
+            "queue_depth": self.queue_depth,
+            "queued": {priority.value: count for priority, count in self._queued.items()},
+            "running_by_class": {priority.value: count for priority, count in self._running_by_class.items()},
+            "running_by_tenant": dict(self._running_by_tenant),
+            "admitted": {priority.value: count for priority, count in self._admitted.items()},
+            "rejected": {priority.value: count for priority, count in self._rejected.items()},
+            "wait_seconds": wait_times,
+            "retry_after": self.retry_after(),
+        }
@@ -0,0 +1,227 @@
+"""Pool of initialized agents with registered workflows, keyed by workflow config."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from .exceptions import WorkflowExecutionError
+from .utils import content_hash
+from .workflow_types import WorkflowConfig
+
+if TYPE_CHECKING:
+    from .workflow import WorkflowEngine
+
+logger = logging.getLogger(__name__)
+
+# Creates and initializes an agent for a workflow configuration
+AgentFactory = Callable[[WorkflowConfig], Awaitable[Any]]
+
+
+@dataclass
+class PooledAgent:
+    """Agent owned by the pool.
+
+    Attributes:
+        agent: Initialized agent whose ID is its registered workflow ID
+        key: Hash of the workflow configuration the agent was created for
+        workflow_config: Workflow configuration the agent was registered with
+        last_used: Monotonic time the agent was last released
+    """
+    agent: Any
+    key: str
+    workflow_config: WorkflowConfig
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class WorkflowAgentPool:
+    """Reuses initialized agents and registered workflows across requests.
+
+    Agents are grouped by a hash of the workflow configuration. A checkout
+    hands out an idle agent of the group, creates one while the group has
+    fewer than ``max_size`` agents, or waits for a release otherwise. Each
+    agent is used by one checkout at a time. Agents whose execution raised
+    are discarded instead of being reused. Idle agents are dropped after
+    ``idle_timeout`` seconds, and when more than ``max_keys`` groups exist
+    the idle agents of the least recently used groups are dropped.
+    """
+
+    def __init__(
+        self,
+        engine: "WorkflowEngine",
+        create_agent: AgentFactory,
+        max_size: int = 4,
+        max_keys: int = 128,
+        idle_timeout: float = 600.0,
+        checkout_timeout: float = 30.0
+    ):
+        """Initialize agent pool.
+
+        Args:
+            engine: Workflow engine the agents' workflows are registered with
+            create_agent: Coroutine function creating an initialized agent
+            max_size: Maximum number of agents per workflow configuration
+            max_keys: Maximum number of workflow configurations with idle agents
+            idle_timeout: Seconds after which idle agents are dropped
+            checkout_timeout: Seconds to wait for an agent when a group is full
+        """
+        if max_size < 1 or max_keys < 1:
+            raise ValueError("max_size and max_keys must be at least 1")
+        self.engine = engine
+        self.create_agent = create_agent
+        self.max_size = max_size
+        self.max_keys = max_keys
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self._idle: Dict[str, List[PooledAgent]] = {}
+        self._leased: Dict[str, int] = {}
+        # Group keys, least recently used first
+        self._keys: "OrderedDict[str, None]" = OrderedDict()
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        # Created on first use so it belongs to the serving event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    @staticmethod
+    def make_key(workflow_config: WorkflowConfig) -> str:
+        """Get the group key of a workflow configuration."""
+        return content_hash(workflow_config.model_dump(exclude={"agent"}))
+
+    def _size(self, key: str) -> int:
+        return self._leased.get(key, 0) + len(self._idle.get(key, ()))
+
+    async def acquire(self, workflow_config: WorkflowConfig) -> PooledAgent:
+        """Check out an agent with the workflow registered.
+
+        Args:
+            workflow_config: Workflow configuration
+
+        Returns:
+            PooledAgent: Agent to execute the workflow with, to be given
+            back with release()
+
+        Raises:
+            WorkflowExecutionError: If no agent becomes available within the
+                checkout timeout
+        """
+        key = self.make_key(workflow_config)
+        deadline = time.monotonic() + self.checkout_timeout
+        pooled: Optional[PooledAgent] = None
+        async with self.condition:
+            while True:
+                idle = self._idle.get(key)
+                if idle:
+                    pooled = idle.pop()
+                    break
+                if self._size(key) < self.max_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise WorkflowExecutionError(
+                        f"No agent available for workflow {workflow_config.id} within {self.checkout_timeout}s"
+                    )
+                try:
+                    await asyncio.wait_for(self.condition.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+            self._leased[key] = self._leased.get(key, 0) + 1
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+
+        try:
+            if pooled is None:
+                agent = await self.create_agent(workflow_config)
+                pooled = PooledAgent(agent=agent, key=key, workflow_config=workflow_config)
+                await self.engine.register_workflow(agent, workflow_config)
+            elif pooled.agent.id not in self.engine.workflows:
+                # The engine dropped the idle registration, register it again
+                await self.engine.register_workflow(pooled.agent, pooled.workflow_config)
+        except BaseException:
+            async with self.condition:
+                self._leased[key] -= 1
+                self.condition.notify_all()
+            raise
+        return pooled
+
+    async def release(self, pooled: PooledAgent, discard: bool = False) -> None:
+        """Return a checked out agent to the pool.
+
+        Args:
+            pooled: Agent obtained from acquire()
+            discard: Drop the agent instead of reusing it, for example
+                after its execution failed
+        """
+        async with self.condition:
+            self._leased[pooled.key] -= 1
+            if not discard:
+                pooled.last_used = time.monotonic()
+                self._idle.setdefault(pooled.key, []).append(pooled)
+            self.condition.notify_all()
+        if discard:
+            await self.engine.unregister_workflow(pooled.agent.id)
+        await self.evict_idle()
+
+    @asynccontextmanager
+    async def checkout(self, workflow_config: WorkflowConfig) -> AsyncIterator[str]:
+        """Check out an agent for the duration of a block.
+
+        Args:
+            workflow_config: Workflow configuration
+
+        Yields:
+            ID under which the workflow is registered with the engine
+        """
+        pooled = await self.acquire(workflow_config)
+        try:
+            yield pooled.agent.id
+        except BaseException:
+            await self.release(pooled, discard=True)
+            raise
+        await self.release(pooled)
+
+    async def evict_idle(self) -> int:
+        """Drop idle agents past the idle timeout or of surplus groups.
+
+        Returns:
+            Number of agents dropped
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        evicted: List[PooledAgent] = []
+        async with self.condition:
+            for key, idle in self._idle.items():
+                expired = [pooled for pooled in idle if pooled.last_used < cutoff]
+                if expired:
+                    self._idle[key] = [pooled for pooled in idle if pooled.last_used >= cutoff]
+                    evicted.extend(expired)
+            active = [key for key in self._keys if self._size(key)]
+            for key in active[:max(len(active) - self.max_keys, 0)]:
+                evicted.extend(self._idle.pop(key, []))
+            for key in [key for key in self._keys if not self._size(key)]:
+                del self._keys[key]
+                self._idle.pop(key, None)
+                self._leased.pop(key, None)
+        for pooled in evicted:
+            await self.engine.unregister_workflow(pooled.agent.id)
+        return len(evicted)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get the number of leased and idle agents per workflow configuration."""
+        return {
+            key[:12]: {"leased": self._leased.get(key, 0), "idle": len(self._idle.get(key, ()))}
+            for key in self._keys
+        }
+
+    async def close(self) -> None:
+        """Drop all idle agents."""
+        async with self.condition:
+            evicted = [pooled for idle in self._idle.values() for pooled in idle]
+            self._idle = {}
+        for pooled in evicted:
+            await self.engine.unregister_workflow(pooled.agent.id)
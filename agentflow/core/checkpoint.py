@@ -0,0 +1,355 @@
+"""Checkpoint store for resuming workflow runs."""
+
+import base64
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+import numpy as np
+
+from .utils import content_hash
+
+logger = logging.getLogger(__name__)
+
+# Key marking encoded values that JSON cannot represent directly
+TYPE_KEY = "__checkpoint_type__"
+
+# Directory of checkpoints inside a FilePersistence directory
+CHECKPOINT_DIR = "_checkpoints"
+
+# Saved checkpoint: step ID, input hash and JSON payload
+CheckpointRow = Tuple[str, str, str]
+
+
+def encode_value(value: Any) -> Any:
+    """Encode a step result as JSON-compatible data.
+
+    Besides JSON types, tuples, bytes, dictionaries with non-string keys and
+    numpy arrays and scalars of non-object dtypes are supported.
+
+    Raises:
+        TypeError: If the value holds an unsupported type
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (np.ndarray, np.generic)):
+        array = np.asarray(value)
+        if array.dtype.hasobject:
+            raise TypeError("numpy arrays of objects cannot be checkpointed")
+        return {
+            TYPE_KEY: "ndarray" if isinstance(value, np.ndarray) else "numpy_scalar",
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "data": base64.b64encode(np.ascontiguousarray(array).tobytes()).decode("ascii"),
+        }
+    if isinstance(value, list):
+        return [encode_value(item) for item in value]
+    if isinstance(value, tuple):
+        return {TYPE_KEY: "tuple", "items": [encode_value(item) for item in value]}
+    if isinstance(value, bytes):
+        return {TYPE_KEY: "bytes", "data": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value) and TYPE_KEY not in value:
+            return {key: encode_value(item) for key, item in value.items()}
+        return {TYPE_KEY: "dict", "items": [[encode_value(key), encode_value(item)] for key, item in value.items()]}
+    raise TypeError(f"{type(value).__name__} values cannot be checkpointed")
+
+
+def decode_value(value: Any) -> Any:
+    """Decode data created by encode_value.
+
+    Raises:
+        ValueError: If the data is malformed
+    """
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    kind = value.get(TYPE_KEY)
+    if kind is None:
+        return {key: decode_value(item) for key, item in value.items()}
+    if kind in ("ndarray", "numpy_scalar"):
+        dtype = np.dtype(value["dtype"])
+        if dtype.hasobject:
+            raise ValueError("numpy arrays of objects cannot be restored")
+        array = np.frombuffer(base64.b64decode(value["data"]), dtype=dtype).reshape(value["shape"]).copy()
+        return array if kind == "ndarray" else array[()]
+    if kind == "tuple":
+        return tuple(decode_value(item) for item in value["items"])
+    if kind == "bytes":
+        return base64.b64decode(value["data"])
+    if kind == "dict":
+        return {_hashable(decode_value(key)): decode_value(item) for key, item in value["items"]}
+    raise ValueError(f"Unknown checkpoint value type: {kind}")
+
+
+def _hashable(key: Any) -> Any:
+    """Restore a dictionary key, whose lists were tuples when encoded."""
+    if isinstance(key, list):
+        return tuple(_hashable(item) for item in key)
+    return key
+
+
+class CheckpointBackend(ABC):
+    """Storage of encoded step checkpoints."""
+
+    @abstractmethod
+    def save(self, workflow_id: str, run_id: str, step_id: str, input_hash: str, payload: str) -> None:
+        """Save a checkpoint, replacing an earlier one of the same step."""
+        pass
+
+    @abstractmethod
+    def load(self, workflow_id: str, run_id: str) -> List[CheckpointRow]:
+        """Load the checkpoints of a run."""
+        pass
+
+    @abstractmethod
+    def clear(self, workflow_id: str, run_id: str) -> None:
+        """Delete the checkpoints of a run."""
+        pass
+
+    def close(self) -> None:
+        """Release resources held by the backend."""
+        pass
+
+
+class SQLiteCheckpointBackend(CheckpointBackend):
+    """Checkpoints in a ``workflow_checkpoints`` SQLite table.
+
+    The database may be the one of a SQLitePersistence; results queries
+    only read their own table, so they never return checkpoints.
+    """
+
+    def __init__(self, db_path: str):
+        """Initialize SQLite checkpoint backend.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS workflow_checkpoints (
+                    workflow_id TEXT NOT NULL,
+                    run_id TEXT NOT NULL,
+                    step_id TEXT NOT NULL,
+                    input_hash TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (workflow_id, run_id, step_id)
+                )
+            """)
+
+    def save(self, workflow_id: str, run_id: str, step_id: str, input_hash: str, payload: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO workflow_checkpoints
+                (workflow_id, run_id, step_id, input_hash, payload)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (workflow_id, run_id, step_id, input_hash, payload)
+            )
+
+    def load(self, workflow_id: str, run_id: str) -> List[CheckpointRow]:
+        with self._lock:
+            return self._conn.execute(
+                """
+                SELECT step_id, input_hash, payload FROM workflow_checkpoints
+                WHERE workflow_id = ? AND run_id = ?
+                """,
+                (workflow_id, run_id)
+            ).fetchall()
+
+    def clear(self, workflow_id: str, run_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM workflow_checkpoints WHERE workflow_id = ? AND run_id = ?",
+                (workflow_id, run_id)
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class FileCheckpointBackend(CheckpointBackend):
+    """Checkpoints as JSON files, one directory per run.
+
+    Inside a FilePersistence directory the checkpoints go to its
+    ``_checkpoints`` subdirectory, which result queries do not read.
+    Files are replaced atomically, so a crash never leaves a partial
+    checkpoint behind.
+    """
+
+    def __init__(self, base_dir: Union[str, Path]):
+        """Initialize file checkpoint backend.
+
+        Args:
+            base_dir: Directory holding the checkpoints
+        """
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    def _run_dir(self, workflow_id: str, run_id: str) -> Path:
+        return self.base_dir / quote(workflow_id, safe="") / quote(run_id, safe="")
+
+    def save(self, workflow_id: str, run_id: str, step_id: str, input_hash: str, payload: str) -> None:
+        run_dir = self._run_dir(workflow_id, run_id)
+        run_dir.mkdir(parents=True, exist_ok=True)
+        record = json.dumps({"step_id": step_id, "input_hash": input_hash, "payload": payload})
+        fd, temp_path = tempfile.mkstemp(dir=run_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(record)
+            os.replace(temp_path, run_dir / f"{quote(step_id, safe='')}.json")
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def load(self, workflow_id: str, run_id: str) -> List[CheckpointRow]:
+        rows: List[CheckpointRow] = []
+        for path in self._run_dir(workflow_id, run_id).glob("*.json"):
+            try:
+                record = json.loads(path.read_text(encoding="utf-8"))
+                rows.append((record["step_id"], record["input_hash"], record["payload"]))
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable checkpoint file {path}: {e}")
+        return rows
+
+    def clear(self, workflow_id: str, run_id: str) -> None:
+        run_dir = self._run_dir(workflow_id, run_id)
+        for path in run_dir.glob("*"):
+            path.unlink(missing_ok=True)
+        try:
+            run_dir.rmdir()
+        except OSError:
+            pass
+
+
+class CheckpointStore:
+    """Persists completed step results so a failed run can be resumed.
+
+    Each completed step becomes one checkpoint keyed by workflow, run and
+    step, holding the hash of the run's input and the step result encoded
+    as JSON with encode_value(). Restoring a checkpoint therefore never
+    runs code from storage; results that cannot be encoded are not
+    checkpointed.
+
+    The store runs on a SQLitePersistence, in its database, or on a
+    FilePersistence, in its directory, without showing up in their result
+    queries. It also takes a SQLite database path or a CheckpointBackend.
+    """
+
+    def __init__(self, storage: Any):
+        """Initialize checkpoint store.
+
+        Args:
+            storage: SQLitePersistence or FilePersistence to keep
+                checkpoints next to, path to a SQLite database file, or a
+                CheckpointBackend
+
+        Raises:
+            TypeError: If checkpoints cannot be stored on the given storage
+        """
+        self.backend = self._backend_for(storage)
+
+    @staticmethod
+    def _backend_for(storage: Any) -> CheckpointBackend:
+        """Get the checkpoint backend of a storage argument."""
+        if isinstance(storage, CheckpointBackend):
+            return storage
+        if isinstance(storage, (str, os.PathLike)):
+            return SQLiteCheckpointBackend(os.fspath(storage))
+        # Imported here as the persistence module needs pymongo
+        from .persistence import FilePersistence, SQLitePersistence
+        if isinstance(storage, SQLitePersistence):
+            return SQLiteCheckpointBackend(storage.db_path)
+        if isinstance(storage, FilePersistence):
+            return FileCheckpointBackend(storage.base_dir / CHECKPOINT_DIR)
+        raise TypeError(f"Checkpoints cannot be stored on {type(storage).__name__}")
+
+    @staticmethod
+    def hash_input(data: Any) -> str:
+        """Hash workflow input so checkpoints are only reused for the same input."""
+        return content_hash(data)
+
+    def save_step(
+        self,
+        workflow_id: str,
+        run_id: str,
+        input_hash: str,
+        step_id: str,
+        result: Any
+    ) -> bool:
+        """Save the result of a completed step.
+
+        Args:
+            workflow_id: ID of the workflow
+            run_id: ID of the workflow run
+            input_hash: Hash of the run's input data
+            step_id: ID of the completed step
+            result: Step result
+
+        Returns:
+            True if saved successfully, False otherwise
+        """
+        try:
+            payload = json.dumps(encode_value(result))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Step {step_id} result cannot be checkpointed: {e}")
+            return False
+
+        try:
+            self.backend.save(workflow_id, run_id, step_id, input_hash, payload)
+            return True
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Error saving checkpoint of step {step_id}: {e}")
+            return False
+
+    def load_run(
+        self,
+        workflow_id: str,
+        run_id: str,
+        input_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Load the completed steps of a run.
+
+        Args:
+            workflow_id: ID of the workflow
+            run_id: ID of the workflow run
+            input_hash: If given, ignore checkpoints made for a different input
+
+        Returns:
+            Mapping from step ID to step result
+        """
+        completed: Dict[str, Any] = {}
+        for step_id, saved_hash, payload in self.backend.load(workflow_id, run_id):
+            if input_hash is not None and saved_hash != input_hash:
+                continue
+            try:
+                completed[step_id] = decode_value(json.loads(payload))
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable checkpoint for step {step_id}: {e}")
+        return completed
+
+    def clear_run(self, workflow_id: str, run_id: str) -> None:
+        """Delete all checkpoints of a run.
+
+        Args:
+            workflow_id: ID of the workflow
+            run_id: ID of the workflow run
+        """
+        self.backend.clear(workflow_id, run_id)
+
+    def close(self) -> None:
+        """Close the checkpoint backend."""
+        self.backend.close()
@@ -1,7 +1,10 @@
 """Distributed workflow implementation using Ray."""
 
-from typing import Dict, Any, List, Optional, Union, Type, cast, NoReturn, TypeVar
+from typing import Dict, Any, Callable, List, Optional, Union, Type, cast, NoReturn, TypeVar
+from collections import defaultdict
 from datetime import datetime
+from enum import Enum
+from functools import partial
 import asyncio
 import logging
 import ray
@@ -10,6 +13,7 @@ import numpy as np
 from sklearn.preprocessing import StandardScaler
 from dataclasses import dataclass, field
 import time
+import weakref
 from pydantic import BaseModel
 from ray.actor import ActorHandle
 from ray.util.actor_pool import ActorPool
@@ -23,6 +27,7 @@ from agentflow.core.workflow_types import (
     WorkflowDefinition
 )
 from agentflow.core.workflow_state import WorkflowState
+from agentflow.core.actor_pool import StepActorPool, get_default_actor_pool
 from agentflow.core.exceptions import WorkflowExecutionError
 from agentflow.core.enums import WorkflowStatus
 from agentflow.core.config import DistributedConfig
@@ -32,6 +37,28 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# Builds the actor input of a step from the run input, the step ID and the
+# object references of the step's dependencies
+StepInputBuilder = Callable[[Dict[str, Any], str, Dict[str, ObjectRef]], Dict[str, Any]]
+
+# Default size from which payloads are placed in the object store
+LARGE_PAYLOAD_BYTES = 1 << 20
+
+# Ray actor classes of workflow classes, created once per class
+_remote_classes: Dict[type, Any] = {}
+
+def _remote_class(cls: type) -> Any:
+    """Get the Ray actor class of a workflow class."""
+    if cls not in _remote_classes:
+        _remote_classes[cls] = ray.remote(cls)
+    return _remote_classes[cls]
+
+
+class PayloadMode(str, Enum):
+    """How workflow input is passed to step actors."""
+    INLINE = "inline"
+    OBJECT_STORE = "object_store"
+
 def initialize_ray() -> None:
     """Initialize Ray if not already initialized."""
     if not ray.is_initialized():
@@ -47,6 +74,104 @@ def initialize_ray() -> None:
             logger.error(f"Failed to initialize Ray: {e}")
             raise
 
+def _payload_size(value: Any) -> int:
+    """Get the size in bytes of an array-like payload, 0 for other values."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    memory_usage = getattr(value, 'memory_usage', None)
+    if callable(memory_usage):
+        # pandas Series and DataFrame
+        try:
+            return int(np.sum(memory_usage(index=True)))
+        except Exception:
+            return 0
+    return 0
+
+def put_large_payloads(data: Dict[str, Any], threshold: int = LARGE_PAYLOAD_BYTES) -> Dict[str, Any]:
+    """Place large arrays of a step input in the Ray object store.
+
+    Arrays, DataFrames and byte strings of at least ``threshold`` bytes are
+    replaced by object references, also inside nested dictionaries. Actors
+    fetching a NumPy array from the object store get a read-only view of
+    shared memory instead of a private copy.
+
+    Args:
+        data: Step input
+        threshold: Minimum payload size in bytes
+
+    Returns:
+        Copy of the input with large payloads replaced by object references
+    """
+    shared: Dict[str, Any] = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            shared[key] = put_large_payloads(value, threshold)
+        elif _payload_size(value) >= threshold:
+            shared[key] = ray.put(value)
+        else:
+            shared[key] = value
+    return shared
+
+async def _resolve_payloads(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Fetch payloads that were placed in the object store by put_large_payloads."""
+    refs = {key: value for key, value in data.items() if isinstance(value, ObjectRef)}
+    nested = {key: value for key, value in data.items() if isinstance(value, dict)}
+    if not refs and not nested:
+        return data
+
+    resolved = dict(data)
+    for key, value in zip(refs, await asyncio.gather(*refs.values())):
+        resolved[key] = value
+    for key, value in nested.items():
+        resolved[key] = await _resolve_payloads(value)
+    return resolved
+
+async def _resolve_input(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve the object references in a step actor's input.
+
+    Args:
+        input_data: Step input as sent by the driver
+
+    Returns:
+        Step input with dependency results and shared payloads fetched
+    """
+    input_data = await _resolve_dependencies(input_data)
+    payload = {key: value for key, value in input_data.items() if key != 'dependencies'}
+    resolved = await _resolve_payloads(payload)
+    if 'dependencies' in input_data:
+        resolved['dependencies'] = input_data['dependencies']
+    return resolved
+
+async def _resolve_dependencies(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Fetch upstream step results passed to a step actor as object references.
+
+    The driver hands dependency results to downstream actors as ``ObjectRef``s,
+    so they are pulled from the object store by the actor that needs them
+    instead of travelling through the driver.
+
+    Args:
+        input_data: Step input, optionally with a ``dependencies`` mapping
+
+    Returns:
+        Step input with each dependency replaced by the ``data`` field of its
+        result, or the result itself if it has none
+    """
+    dependencies = input_data.get('dependencies')
+    if not isinstance(dependencies, dict):
+        return input_data
+
+    refs = {dep_id: value for dep_id, value in dependencies.items() if isinstance(value, ObjectRef)}
+    if not refs:
+        return input_data
+
+    values = await asyncio.gather(*refs.values())
+    resolved = dict(dependencies)
+    for dep_id, value in zip(refs, values):
+        resolved[dep_id] = value.get('data') if isinstance(value, dict) else value
+    return {**input_data, 'dependencies': resolved}
+
 @ray.remote
 class TransformStep:
     """Transform step in workflow."""
@@ -102,6 +227,8 @@ class TransformStep:
             if not self.initialized:
                 raise WorkflowExecutionError("Step not initialized")
             
+            input_data = await _resolve_input(input_data)
+            
             # Get data from input
             data = input_data.get('data')
             if data is None:
@@ -182,6 +309,8 @@ class ResearchExecutionStep:
             if not self.initialized:
                 raise WorkflowExecutionError("Step not initialized")
             
+            input_data = await _resolve_input(input_data)
+            
             # Get strategy from config
             strategy = self.step_config.get('strategy')
             if not strategy:
@@ -209,11 +338,16 @@ class ResearchExecutionStep:
 class DistributedWorkflow:
     """Distributed workflow class."""
 
-    def __init__(self, config: Optional[Union[Dict[str, Any], WorkflowConfig]] = None):
+    def __init__(
+        self,
+        config: Optional[Union[Dict[str, Any], WorkflowConfig]] = None,
+        actor_pool: Optional[StepActorPool] = None
+    ):
         """Initialize distributed workflow.
         
         Args:
             config: Workflow configuration
+            actor_pool: Pool to lease step actors from, the process-wide pool by default
         """
         self.config = config
         self.steps: Dict[str, Dict[str, Any]] = {}
@@ -225,6 +359,15 @@ class DistributedWorkflow:
         self.workflow_config: Optional[Dict[str, Any]] = None
         self.logger = logging.getLogger(__name__)
 
+        config_dict = self.get_config_dict()
+        self.payload_mode = PayloadMode(config_dict.get('payload_mode', PayloadMode.INLINE))
+        self.payload_threshold: int = config_dict.get('payload_threshold', LARGE_PAYLOAD_BYTES)
+
+        # Leased actors go back to the pool on close() or when the workflow is collected
+        self.actor_pool = actor_pool if actor_pool is not None else get_default_actor_pool()
+        self._leased_actors: List[ActorHandle] = []
+        self._release_finalizer = weakref.finalize(self, self.actor_pool.release_all, self._leased_actors)
+
     def get_config_dict(self) -> Dict[str, Any]:
         """Get workflow configuration as dictionary."""
         if self.config is None:
@@ -303,12 +446,12 @@ class DistributedWorkflow:
             step_type = step.get('type', WorkflowStepType.RESEARCH_EXECUTION)
             
             try:
-                # Create appropriate actor based on step type
-                actor: Optional[ActorHandle] = None
-                if step_type == WorkflowStepType.TRANSFORM:
-                    actor = cast(ActorHandle, TransformStep.remote())
-                else:
-                    actor = cast(ActorHandle, ResearchExecutionStep.remote())
+                # Lease an actor for the step type and configuration
+                actor_cls = TransformStep if step_type == WorkflowStepType.TRANSFORM else ResearchExecutionStep
+                actor: Optional[ActorHandle] = await self.actor_pool.lease(
+                    actor_cls, step_type, step.get('config', {})
+                )
+                self._leased_actors.append(actor)
                 
                 # Initialize actor with configuration
                 if actor is not None:
@@ -388,6 +531,10 @@ class DistributedWorkflow:
             
             steps = self._convert_workflow_to_steps(workflow)
             
+            # A pooled workflow actor is initialized again for each definition
+            self.close()
+            self.steps = {}
+            
             # Initialize step configurations
             self._initialize_step_configs(steps)
             
@@ -426,6 +573,7 @@ class DistributedWorkflow:
                     "id": step_def.get("id", str(uuid.uuid4())),
                     "name": step_def.get("name", ""),
                     "type": step_def.get("type", WorkflowStepType.RESEARCH_EXECUTION),
+                    "dependencies": step_def.get("dependencies", []),
                     "config": {
                         "strategy": step_def.get("config", {}).get("strategy", "feature_engineering"),
                         "params": {
@@ -446,6 +594,7 @@ class DistributedWorkflow:
                     "id": step_def.get("id", step_id),
                     "name": step_def.get("name", ""),
                     "type": step_def.get("type", WorkflowStepType.RESEARCH_EXECUTION),
+                    "dependencies": step_def.get("dependencies", []),
                     "config": {
                         "strategy": step_def.get("config", {}).get("strategy", "feature_engineering"),
                         "params": {
@@ -460,6 +609,111 @@ class DistributedWorkflow:
                 }
                 steps.append(step)
         return steps
+
+    @staticmethod
+    def _step_dependencies(step: Dict[str, Any]) -> List[str]:
+        """Get the IDs of the steps a step depends on."""
+        config = step.get('config') or {}
+        dependencies = list(step.get('dependencies') or [])
+        for dep_id in config.get('dependencies') or []:
+            if dep_id not in dependencies:
+                dependencies.append(dep_id)
+        return dependencies
+
+    async def _dispatch_steps(self, input_data: Dict[str, Any], build_input: StepInputBuilder) -> Dict[str, Any]:
+        """Execute step actors concurrently in dependency order.
+
+        All steps whose dependencies are satisfied are submitted at once.
+        ``ray.wait`` reports each finished step as soon as its result lands,
+        which releases the steps waiting on it. Downstream steps receive the
+        ``ObjectRef``s of their dependencies rather than materialized results.
+
+        In ``PayloadMode.OBJECT_STORE`` large arrays in the input are put in
+        the object store once and every step receives the same references.
+        The references are dropped when the run ends, which lets Ray free
+        the shared objects.
+
+        Args:
+            input_data: Workflow run input
+            build_input: Builds the input of a step from the run input, its ID
+                and the object references of its dependencies
+
+        Returns:
+            Mapping from step ID to step result
+
+        Raises:
+            WorkflowExecutionError: If a step fails or the dependencies cannot be satisfied
+        """
+        runnable = {step_id: step for step_id, step in self.steps.items() if step.get('actor')}
+        dependencies = {step_id: self._step_dependencies(step) for step_id, step in runnable.items()}
+
+        waiting_on: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        for step_id, dep_ids in dependencies.items():
+            for dep_id in dep_ids:
+                if dep_id not in runnable:
+                    raise WorkflowExecutionError(f"Dependent step {dep_id} of step {step_id} cannot be executed")
+                dependents[dep_id].append(step_id)
+            waiting_on[step_id] = len(dep_ids)
+
+        if self.payload_mode == PayloadMode.OBJECT_STORE:
+            input_data = put_large_payloads(input_data, self.payload_threshold)
+
+        refs: Dict[str, ObjectRef] = {}
+        pending: Dict[ObjectRef, str] = {}
+
+        def submit(step_id: str) -> None:
+            step = runnable[step_id]
+            step['status'] = 'running'
+            dep_refs = {dep_id: refs[dep_id] for dep_id in dependencies[step_id]}
+            ref = step['actor'].execute.remote(build_input(input_data, step_id, dep_refs))
+            refs[step_id] = ref
+            pending[ref] = step_id
+
+        for step_id, count in waiting_on.items():
+            if count == 0:
+                submit(step_id)
+
+        results: Dict[str, Any] = {}
+        loop = asyncio.get_running_loop()
+        try:
+            while pending:
+                # ray.wait blocks, so run it off the event loop
+                ready, _ = await loop.run_in_executor(
+                    None, partial(ray.wait, list(pending), num_returns=1)
+                )
+                for ref in ready:
+                    step_id = pending.pop(ref)
+                    step = runnable[step_id]
+                    try:
+                        result = await ref
+                    except Exception as e:
+                        error_msg = f"Failed to execute step {step_id}: {str(e)}"
+                        self.logger.error(error_msg)
+                        step['status'] = 'failed'
+                        step['error'] = error_msg
+                        raise WorkflowExecutionError(error_msg)
+
+                    step['status'] = 'completed'
+                    step['result'] = result
+                    results[step_id] = result
+                    for dependent in dependents[step_id]:
+                        waiting_on[dependent] -= 1
+                        if waiting_on[dependent] == 0:
+                            submit(dependent)
+        finally:
+            for ref in pending:
+                try:
+                    ray.cancel(ref)
+                except Exception as e:
+                    self.logger.debug(f"Could not cancel step task: {e}")
+            # Drop the driver's references to shared payloads and intermediate results
+            input_data = {}
+            refs.clear()
+
+        if len(results) != len(runnable):
+            raise WorkflowExecutionError("Circular dependency detected in workflow steps")
+        return results
         
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute workflow with input data.
@@ -499,37 +753,18 @@ class DistributedWorkflow:
             if not hasattr(state, 'start_time') or state.start_time is None:
                 state.start_time = time.time()  # type: ignore
             
-            # Execute steps in sequence
-            results = {}
-            steps_executed = 0
-            for step_id, step in self.steps.items():
-                actor = step.get('actor')
-                if not actor:
-                    continue
-                    
-                try:
-                    # Execute step
-                    step['status'] = 'running'
-                    result = await actor.execute.remote(input_data)
-                    
-                    # Store result
-                    step['status'] = 'completed'
-                    step['result'] = result
-                    results[step_id] = result
-                    steps_executed += 1
-                    
-                except Exception as e:
-                    error_msg = f"Failed to execute step {step_id}: {str(e)}"
-                    self.logger.error(error_msg)
-                    step['status'] = 'failed'
-                    step['error'] = error_msg
-                    raise WorkflowExecutionError(error_msg)
+            # Execute steps concurrently, respecting dependencies
+            results = await self._dispatch_steps(
+                input_data,
+                lambda run_input, step_id, dep_refs: {**run_input, "dependencies": dep_refs} if dep_refs else run_input
+            )
+            steps_executed = len(results)
             
             # Update workflow status
             if not hasattr(self, 'state') or self.state is None:
                 from types import SimpleNamespace
                 self.state = SimpleNamespace()  # type: ignore
-            self.state.status = WorkflowStatus.COMPLETED
+            self.state.status = WorkflowStatus.SUCCESS
             if not hasattr(self.state, 'end_time') or self.state.end_time is None:
                 self.state.end_time = time.time()  # type: ignore
             
@@ -576,6 +811,10 @@ class DistributedWorkflow:
     async def create_remote_workflow(cls, workflow_def: Dict[str, Any], workflow_config: Union[dict, 'WorkflowConfig'], workflow_id: str) -> 'ray.actor.ActorHandle':
         """Create a remote workflow actor.
         
+        Workflow actors are leased from the process-wide actor pool, so an
+        actor given back with release_remote_workflow() is initialized with
+        the next definition instead of starting a new one.
+        
         Args:
             workflow_def: Workflow definition
             workflow_config: Workflow configuration
@@ -585,11 +824,21 @@ class DistributedWorkflow:
             Ray actor handle for the workflow
         """
         try:
-            # Create workflow instance
-            workflow = ray.remote(cls).remote(config=workflow_config)  # type: ignore
+            # Lease an idle workflow actor of the same class and configuration
+            pool = get_default_actor_pool()
+            workflow = await pool.lease(
+                _remote_class(cls),
+                "workflow",
+                {"class": f"{cls.__module__}.{cls.__qualname__}", "config": workflow_config},
+                actor_kwargs={"config": workflow_config}
+            )
             
             # Initialize workflow
-            await workflow.initialize.remote(workflow_def, workflow_id)  # type: ignore
+            try:
+                await workflow.initialize.remote(workflow_def, workflow_id)  # type: ignore
+            except Exception:
+                pool.release(workflow)
+                raise
             
             return workflow
             
@@ -598,6 +847,22 @@ class DistributedWorkflow:
             logger.error(error_msg)
             raise WorkflowExecutionError(error_msg)
 
+    @staticmethod
+    async def release_remote_workflow(workflow: 'ray.actor.ActorHandle') -> None:
+        """Return a workflow actor from create_remote_workflow to the actor pool.
+        
+        Args:
+            workflow: Workflow actor handle
+        """
+        try:
+            await workflow.close.remote()  # type: ignore
+        finally:
+            get_default_actor_pool().release(workflow)
+
+    async def health_check(self) -> bool:
+        """Check the workflow responds, before a pooled workflow actor is reused."""
+        return True
+
     async def execute_async(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute workflow asynchronously.
         
@@ -612,18 +877,32 @@ class DistributedWorkflow:
         """
         return await self.execute(input_data)
 
+    def close(self) -> None:
+        """Return the workflow's step actors to the actor pool."""
+        self.actor_pool.release_all(self._leased_actors)
+        self._leased_actors.clear()
+        for step in self.steps.values():
+            step['actor'] = None
+
 class ResearchDistributedWorkflow(DistributedWorkflow):
     """Research distributed workflow class."""
 
-    def __init__(self, name: Optional[str] = None, config: Optional[Union[Dict[str, Any], WorkflowConfig]] = None, steps: Optional[List[Dict[str, Any]]] = None):
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        config: Optional[Union[Dict[str, Any], WorkflowConfig]] = None,
+        steps: Optional[List[Dict[str, Any]]] = None,
+        actor_pool: Optional[StepActorPool] = None
+    ):
         """Initialize research distributed workflow.
         
         Args:
             name: Workflow name
             config: Workflow configuration
             steps: List of workflow steps
+            actor_pool: Pool to lease step actors from, the process-wide pool by default
         """
-        super().__init__(config)
+        super().__init__(config, actor_pool)
         self.name = name or "default_research_workflow"
         self.research_context: Dict[str, Any] = {}
         self.logger = logging.getLogger(__name__)
@@ -635,7 +914,8 @@ class ResearchDistributedWorkflow(DistributedWorkflow):
             status=WorkflowStatus.PENDING
         )
         
-        # Initialize steps if provided
+        # Step actors are leased from the pool when the workflow first executes
+        self._pending_steps: List[Dict[str, Any]] = []
         if steps:
             self.steps = {}
             for step in steps:
@@ -649,24 +929,7 @@ class ResearchDistributedWorkflow(DistributedWorkflow):
                         'result': None,
                         'error': None
                     }
-                    
-                    # Create actor for step
-                    try:
-                        # Create a new actor instance
-                        actor = ResearchExecutionStep.options(name=step_id).remote()
-                        # Initialize the actor
-                        init_result = ray.get(actor.initialize.remote(
-                            step_id=step_id,
-                            config=step.get('config', {}),
-                            dependencies=step.get('dependencies', [])
-                        ))
-                        if init_result:
-                            self.steps[step_id]['actor'] = actor
-                        else:
-                            raise WorkflowExecutionError(f"Failed to initialize step {step_id}")
-                    except Exception as e:
-                        self.logger.error(f"Failed to initialize step {step_id}: {e}")
-                        raise WorkflowExecutionError(f"Failed to initialize step {step_id}: {e}")
+                    self._pending_steps.append(step)
 
     async def initialize(self, workflow_def: Dict[str, Any], workflow_id: str) -> None:
         """Initialize workflow with definition.
@@ -692,6 +955,11 @@ class ResearchDistributedWorkflow(DistributedWorkflow):
             # Convert workflow to steps
             steps = self._convert_workflow_to_steps(workflow)
             
+            # A pooled workflow actor is initialized again for each definition
+            self.close()
+            self.steps = {}
+            self._pending_steps = []
+            
             # Initialize step configurations
             self._initialize_step_configs(steps)
             
@@ -728,66 +996,36 @@ class ResearchDistributedWorkflow(DistributedWorkflow):
             if not hasattr(self.state, 'start_time') or self.state.start_time is None:
                 self.state.start_time = time.time()
             
-            # Execute steps in sequence, respecting dependencies
-            results = {}
-            steps_executed = 0
+            # Execute steps concurrently, respecting dependencies
+            def build_input(run_input: Dict[str, Any], step_id: str, dep_refs: Dict[str, ObjectRef]) -> Dict[str, Any]:
+                step_input = {"data": run_input.get("data")}
+                if dep_refs:
+                    step_input["dependencies"] = dep_refs
+                return step_input
+
+            if self._pending_steps:
+                await self._initialize_step_actors(self._pending_steps)
+                self._pending_steps = []
             
-            # Get ordered steps based on dependencies
+            results = await self._dispatch_steps(input_data, build_input)
+            steps_executed = len(results)
             step_ids = list(self.steps.keys())
-            for step_id in step_ids:
-                step = self.steps[step_id]
-                actor = step.get('actor')
-                if not actor:
-                    continue
-                
-                try:
-                    # Prepare input data with dependencies
-                    step_input = {"data": input_data.get("data")}
-                    step_config = step.get('config', {})
-                    dependencies = step_config.get('dependencies', [])
-                    
-                    if dependencies:
-                        dep_results = {}
-                        for dep_id in dependencies:
-                            if dep_id not in results:
-                                raise WorkflowExecutionError(f"Dependent step {dep_id} not executed yet")
-                            dep_results[dep_id] = results[dep_id].get("data")
-                        step_input["dependencies"] = dep_results
-                    
-                    # Execute step
-                    step['status'] = WorkflowStatus.RUNNING.value
-                    result = await actor.execute.remote(step_input)
-                    
-                    # Store result
-                    step['status'] = WorkflowStatus.COMPLETED.value
-                    step['result'] = result
-                    results[step_id] = result
-                    steps_executed += 1
-                    
-                except Exception as e:
-                    error_msg = f"Failed to execute step {step_id}: {str(e)}"
-                    self.logger.error(error_msg)
-                    step['status'] = WorkflowStatus.FAILED.value
-                    step['error'] = error_msg
-                    self.state.status = WorkflowStatus.FAILED
-                    self.state.end_time = time.time()
-                    raise WorkflowExecutionError(error_msg)
             
             # Update workflow status
-            self.state.status = WorkflowStatus.COMPLETED
+            self.state.status = WorkflowStatus.SUCCESS
             self.state.end_time = time.time()
             
             # Get final result from last step
             final_step_id = step_ids[-1]
-            final_result = results[final_step_id] if results else None
+            final_result = results.get(final_step_id) if results else None
             
             return {
-                "status": WorkflowStatus.COMPLETED.value,
+                "status": WorkflowStatus.SUCCESS.value,
                 "metrics": {
                     "steps_executed": steps_executed
                 },
                 "results": results,
-                "data": final_result.get("data") if final_result else None
+                "data": final_result.get("data") if isinstance(final_result, dict) else None
             }
             
         except Exception as e:
@@ -814,32 +1052,6 @@ class ResearchDistributedWorkflow(DistributedWorkflow):
             }
         }
         
-    @classmethod
-    async def create_remote_workflow(cls, workflow_def: Dict[str, Any], workflow_config: Union[dict, 'WorkflowConfig'], workflow_id: str) -> 'ray.actor.ActorHandle':
-        """Create a remote workflow actor.
-        
-        Args:
-            workflow_def: Workflow definition
-            workflow_config: Workflow configuration
-            workflow_id: Unique identifier for the workflow
-            
-        Returns:
-            Ray actor handle for the workflow
-        """
-        try:
-            # Create workflow instance
-            workflow = ray.remote(cls).remote(config=workflow_config)  # type: ignore
-            
-            # Initialize workflow
-            await workflow.initialize.remote(workflow_def, workflow_id)  # type: ignore
-            
-            return workflow
-            
-        except Exception as e:
-            error_msg = f"Failed to create remote workflow: {str(e)}"
-            logger.error(error_msg)
-            raise WorkflowExecutionError(error_msg)
-
     async def execute_async(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute workflow asynchronously.
         
@@ -0,0 +1,191 @@
+"""In-process event bus for workflow progress events."""
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowEventType(str, Enum):
+    """Workflow event type enum."""
+
+    WORKFLOW_STARTED = "workflow_started"
+    STEP_STARTED = "step_started"
+    STEP_COMPLETED = "step_completed"
+    STEP_FAILED = "step_failed"
+    WORKFLOW_COMPLETED = "workflow_completed"
+    WORKFLOW_FAILED = "workflow_failed"
+
+
+# Events after which a run publishes nothing more
+TERMINAL_EVENTS = frozenset({WorkflowEventType.WORKFLOW_COMPLETED, WorkflowEventType.WORKFLOW_FAILED})
+
+
+@dataclass
+class WorkflowEvent:
+    """Progress event of a workflow run.
+
+    Attributes:
+        type: Event type
+        run_id: ID of the workflow run
+        workflow_id: ID of the workflow
+        step_id: ID of the step for step events
+        data: Event payload such as a step result or error
+        seq: Sequence number within the run, assigned on publish
+        timestamp: Time the event was created
+    """
+    type: WorkflowEventType
+    run_id: str
+    workflow_id: Optional[str] = None
+    step_id: Optional[str] = None
+    data: Any = None
+    seq: int = 0
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def terminal(self) -> bool:
+        return self.type in TERMINAL_EVENTS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-compatible dictionary."""
+        return {
+            "type": self.type.value,
+            "run_id": self.run_id,
+            "workflow_id": self.workflow_id,
+            "step_id": self.step_id,
+            "data": json.loads(json.dumps(self.data, default=str)),
+            "seq": self.seq,
+            "timestamp": self.timestamp,
+        }
+
+
+class EventBus:
+    """Fans out workflow events to asynchronous subscribers.
+
+    Publishing never blocks: every subscriber has a bounded queue and a slow
+    subscriber loses its oldest undelivered events instead of holding up the
+    workflow. The last ``history_size`` events of up to ``max_runs`` runs
+    are kept, so a client that subscribes after a run started, or
+    reconnects, first receives the events it missed. Beyond ``max_runs``
+    the histories of finished runs are dropped first, oldest first; an
+    unfinished run only loses its history when all kept runs are
+    unfinished, and keeps its sequence numbering until it finishes.
+    """
+
+    def __init__(self, history_size: int = 256, max_runs: int = 1000, queue_size: int = 1000):
+        """Initialize event bus.
+
+        Args:
+            history_size: Events kept per run for late subscribers
+            max_runs: Runs whose history is kept
+            queue_size: Maximum undelivered events per subscriber
+        """
+        self.history_size = history_size
+        self.max_runs = max_runs
+        self.queue_size = queue_size
+        self._history: "OrderedDict[str, Deque[WorkflowEvent]]" = OrderedDict()
+        self._seq: Dict[str, "itertools.count[int]"] = {}
+        # Runs that published a terminal event, in the order they finished
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        # Subscriber queues per run ID, None for subscribers to all runs
+        self._subscribers: Dict[Optional[str], Set[asyncio.Queue]] = {}
+
+    def publish(self, event: WorkflowEvent) -> WorkflowEvent:
+        """Publish an event.
+
+        Args:
+            event: Event to publish, its sequence number is assigned here
+
+        Returns:
+            The published event
+        """
+        if event.run_id not in self._seq:
+            self._seq[event.run_id] = itertools.count(1)
+        event.seq = next(self._seq[event.run_id])
+        history = self._history.get(event.run_id)
+        if history is None:
+            history = self._history[event.run_id] = deque(maxlen=self.history_size)
+        history.append(event)
+        if event.terminal:
+            self._finished[event.run_id] = None
+        self._evict()
+
+        for queue in (*self._subscribers.get(event.run_id, ()), *self._subscribers.get(None, ())):
+            if queue.full():
+                queue.get_nowait()
+                logger.warning(f"Dropped an event of run {event.run_id} for a slow subscriber")
+            queue.put_nowait(event)
+        return event
+
+    def _evict(self) -> None:
+        """Drop histories beyond max_runs, those of finished runs first."""
+        while len(self._history) > self.max_runs:
+            if self._finished:
+                run_id, _ = self._finished.popitem(last=False)
+                self._seq.pop(run_id, None)
+            else:
+                # The sequence counter stays, so later events of the run keep their order
+                run_id = next(iter(self._history))
+            self._history.pop(run_id, None)
+
+    def history(self, run_id: str) -> List[WorkflowEvent]:
+        """Get the kept events of a run."""
+        return list(self._history.get(run_id, ()))
+
+    async def subscribe(self, run_id: Optional[str] = None, after: int = 0) -> AsyncIterator[WorkflowEvent]:
+        """Receive events of a run until it finishes.
+
+        Args:
+            run_id: ID of the run, None to receive events of all runs
+                without an end
+            after: Sequence number of the last event already received; kept
+                events after it are replayed first
+
+        Yields:
+            Workflow events in publishing order
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(run_id, set()).add(queue)
+        try:
+            last_seq = after
+            if run_id is not None:
+                for event in self.history(run_id):
+                    if event.seq > last_seq:
+                        last_seq = event.seq
+                        yield event
+                        if event.terminal:
+                            return
+            while True:
+                event = await queue.get()
+                if run_id is not None:
+                    # Already replayed from the history
+                    if event.seq <= last_seq:
+                        continue
+                    last_seq = event.seq
+                yield event
+                if run_id is not None and event.terminal:
+                    return
+        finally:
+            subscribers = self._subscribers.get(run_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[run_id]
+
+
+_default_event_bus: Optional[EventBus] = None
+
+
+def get_default_event_bus() -> EventBus:
+    """Get the process-wide event bus that workflow progress is published to."""
+    global _default_event_bus
+    if _default_event_bus is None:
+        _default_event_bus = EventBus()
+    return _default_event_bus
@@ -77,3 +77,9 @@ class AgentConfigError(Exception):
 class AgentExecutionError(Exception):
     """Agent execution error."""
     pass
+
+class AdmissionRejectedError(AgentFlowError):
+    """Exception raised when a request is not admitted because the server is saturated."""
+    def __init__(self, message: str, retry_after: int = 1):
+        self.retry_after = retry_after
+        super().__init__(message)
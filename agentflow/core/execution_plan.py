@@ -0,0 +1,152 @@
+"""Compiled execution plans for workflow step graphs."""
+
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from .exceptions import WorkflowExecutionError
+from .workflow_types import WorkflowStep
+
+# Maximum number of compiled plans kept in the process-wide cache
+PLAN_CACHE_SIZE = 256
+
+GraphKey = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """Validated dependency graph of a workflow.
+
+    Steps are referred to by their position in the workflow's step list.
+
+    Attributes:
+        step_ids: Step IDs in list order
+        step_index: Mapping from step ID to list position
+        dependencies: Indexes of the steps each step depends on
+        dependents: Indexes of the steps that depend on each step
+        order: Topological order of step indexes
+        layers: Groups of step indexes whose dependencies are all in earlier layers
+    """
+    step_ids: Tuple[str, ...]
+    step_index: Dict[str, int]
+    dependencies: Tuple[Tuple[int, ...], ...]
+    dependents: Tuple[Tuple[int, ...], ...]
+    order: Tuple[int, ...]
+    layers: Tuple[Tuple[int, ...], ...]
+
+    def __len__(self) -> int:
+        return len(self.step_ids)
+
+
+def graph_key(steps: Sequence[WorkflowStep]) -> GraphKey:
+    """Build a hashable key describing the dependency graph of the steps.
+
+    Args:
+        steps: Workflow steps
+
+    Returns:
+        Key that is equal for step lists with the same IDs and dependencies
+    """
+    return tuple((step.id, tuple(step.dependencies or ())) for step in steps)
+
+
+def compile_plan(steps: Sequence[WorkflowStep]) -> ExecutionPlan:
+    """Validate the step graph and compile it into an execution plan.
+
+    Runs in O(V + E) using Kahn's algorithm.
+
+    Args:
+        steps: Workflow steps
+
+    Returns:
+        ExecutionPlan: Compiled plan
+
+    Raises:
+        WorkflowExecutionError: If the steps contain circular or missing dependencies
+    """
+    step_ids = tuple(step.id for step in steps)
+    step_index = {step_id: index for index, step_id in enumerate(step_ids)}
+
+    dependencies: List[List[int]] = [[] for _ in step_ids]
+    dependents: List[List[int]] = [[] for _ in step_ids]
+    has_missing = False
+    for index, step in enumerate(steps):
+        for dep_id in step.dependencies or ():
+            dep_index = step_index.get(dep_id)
+            if dep_index is None:
+                has_missing = True
+                continue
+            dependencies[index].append(dep_index)
+            dependents[dep_index].append(index)
+
+    # Kahn's algorithm, one layer at a time
+    in_degree = [len(deps) for deps in dependencies]
+    current = [index for index, degree in enumerate(in_degree) if degree == 0]
+    order: List[int] = []
+    layers: List[Tuple[int, ...]] = []
+    while current:
+        layers.append(tuple(current))
+        order.extend(current)
+        following = []
+        for index in current:
+            for dependent in dependents[index]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    following.append(dependent)
+        current = following
+
+    if len(order) != len(step_ids):
+        raise WorkflowExecutionError("Circular dependency detected in workflow steps")
+    if has_missing:
+        raise WorkflowExecutionError("Missing dependencies detected in workflow steps")
+
+    return ExecutionPlan(
+        step_ids=step_ids,
+        step_index=step_index,
+        dependencies=tuple(tuple(deps) for deps in dependencies),
+        dependents=tuple(tuple(deps) for deps in dependents),
+        order=tuple(order),
+        layers=tuple(layers),
+    )
+
+
+_plan_cache: "OrderedDict[GraphKey, ExecutionPlan]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+def get_execution_plan(steps: Sequence[WorkflowStep]) -> ExecutionPlan:
+    """Get the compiled plan for the steps, compiling it on first use.
+
+    Plans are cached process-wide by graph key, so repeated executions
+    of the same workflow skip validation.
+
+    Args:
+        steps: Workflow steps
+
+    Returns:
+        ExecutionPlan: Compiled plan
+
+    Raises:
+        WorkflowExecutionError: If the steps contain circular or missing dependencies
+    """
+    key = graph_key(steps)
+    with _plan_cache_lock:
+        plan = _plan_cache.get(key)
+        if plan is not None:
+            _plan_cache.move_to_end(key)
+            return plan
+
+    plan = compile_plan(steps)
+    with _plan_cache_lock:
+        _plan_cache[key] = plan
+        _plan_cache.move_to_end(key)
+        while len(_plan_cache) > PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
+def clear_plan_cache() -> None:
+    """Remove all cached execution plans."""
+    with _plan_cache_lock:
+        _plan_cache.clear()
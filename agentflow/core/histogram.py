@@ -0,0 +1,220 @@
+"""Streaming latency histograms with bounded memory."""
+
+import math
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+LabelKey = FrozenSet[Tuple[str, str]]
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LogHistogram:
+    """Histogram with logarithmically sized buckets.
+
+    Bucket boundaries grow by a constant factor, so every quantile estimate
+    is within ``relative_accuracy`` of the true value for values inside
+    ``[min_trackable, max_trackable]``. Memory is a fixed array of bucket
+    counts, independent of the number of observations. Histograms with the
+    same parameters can be merged by adding their counts.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        min_trackable: float = 1e-6,
+        max_trackable: float = 1e6
+    ):
+        """Initialize histogram.
+
+        Args:
+            relative_accuracy: Maximum relative error of quantile estimates
+            min_trackable: Smallest value resolved; smaller values share the
+                lowest bucket
+            max_trackable: Largest value resolved; larger values share the
+                highest bucket
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if not 0 < min_trackable < max_trackable:
+            raise ValueError("min_trackable must be positive and below max_trackable")
+        self.relative_accuracy = relative_accuracy
+        self.min_trackable = min_trackable
+        self.max_trackable = max_trackable
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._offset = math.floor(math.log(min_trackable) / self._log_gamma)
+        size = math.ceil(math.log(max_trackable) / self._log_gamma) - self._offset + 1
+        self.counts = np.zeros(size, dtype=np.int64)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _bucket(self, value: float) -> int:
+        """Get the bucket index of a value."""
+        if value <= self.min_trackable:
+            return 0
+        index = math.ceil(math.log(value) / self._log_gamma) - self._offset
+        return min(index, len(self.counts) - 1)
+
+    def _bucket_value(self, index: int) -> float:
+        """Get the representative value of a bucket."""
+        upper = self._gamma ** (index + self._offset)
+        return 2 * upper / (1 + self._gamma)
+
+    def record(self, value: float) -> None:
+        """Record an observation.
+
+        Args:
+            value: Observed value, for example a duration in seconds
+        """
+        self.counts[self._bucket(value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LogHistogram") -> None:
+        """Add the observations of another histogram.
+
+        Args:
+            other: Histogram with the same parameters
+
+        Raises:
+            ValueError: If the histograms have different parameters
+        """
+        if (other.relative_accuracy, other.min_trackable, other.max_trackable) != (
+            self.relative_accuracy, self.min_trackable, self.max_trackable
+        ):
+            raise ValueError("Cannot merge histograms with different parameters")
+        self.counts += other.counts
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def copy(self) -> "LogHistogram":
+        """Create an independent copy of the histogram."""
+        clone = LogHistogram(self.relative_accuracy, self.min_trackable, self.max_trackable)
+        clone.merge(self)
+        return clone
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or None if the histogram is empty
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        index = int(np.searchsorted(np.cumsum(self.counts), rank, side="right"))
+        return min(max(self._bucket_value(index), self.min), self.max)
+
+    def quantiles(self, qs: Iterable[float] = DEFAULT_QUANTILES) -> Dict[float, Optional[float]]:
+        """Estimate several quantiles."""
+        return {q: self.quantile(q) for q in qs}
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Get the mean of recorded values."""
+        return self.sum / self.count if self.count else None
+
+    def summary(self, qs: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, Optional[float]]:
+        """Summarize the histogram.
+
+        Returns:
+            Count, sum, mean, min, max and the requested quantiles keyed as
+            ``p50``, ``p95`` and so on
+        """
+        result: Dict[str, Optional[float]] = {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.mean,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+        for q in qs:
+            result[f"p{q * 100:g}"] = self.quantile(q)
+        return result
+
+
+class HistogramRegistry:
+    """Histograms per metric name and label set."""
+
+    def __init__(self, **histogram_kwargs):
+        """Initialize registry.
+
+        Args:
+            **histogram_kwargs: Parameters for new LogHistogram instances
+        """
+        self._histogram_kwargs = histogram_kwargs
+        self._series: Dict[Tuple[str, LabelKey], LogHistogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """Record an observation in the series of a metric and label set.
+
+        Args:
+            name: Metric name
+            value: Observed value
+            labels: Series labels
+        """
+        key = (name, frozenset((labels or {}).items()))
+        with self._lock:
+            histogram = self._series.get(key)
+            if histogram is None:
+                histogram = self._series[key] = LogHistogram(**self._histogram_kwargs)
+            histogram.record(value)
+
+    def get(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[LogHistogram]:
+        """Get the merged histogram of all series of a metric matching the labels.
+
+        Args:
+            name: Metric name
+            labels: Labels a series must have to be included
+
+        Returns:
+            Merged histogram, or None if no series matches
+        """
+        wanted = set((labels or {}).items())
+        merged: Optional[LogHistogram] = None
+        with self._lock:
+            for (series_name, series_labels), histogram in self._series.items():
+                if series_name != name or not wanted <= series_labels:
+                    continue
+                if merged is None:
+                    merged = histogram.copy()
+                else:
+                    merged.merge(histogram)
+        return merged
+
+    def series(self, name: Optional[str] = None) -> List[Tuple[str, Dict[str, str], LogHistogram]]:
+        """List series as (name, labels, histogram) tuples."""
+        with self._lock:
+            return [
+                (series_name, dict(series_labels), histogram)
+                for (series_name, series_labels), histogram in self._series.items()
+                if name is None or series_name == name
+            ]
+
+    def clear(self) -> None:
+        """Remove all series."""
+        with self._lock:
+            self._series = {}
+
+
+_default_histograms = HistogramRegistry()
+
+
+def get_default_histograms() -> HistogramRegistry:
+    """Get the process-wide histogram registry that workflow timings feed."""
+    return _default_histograms
@@ -3,7 +3,14 @@ from typing import Dict, Any, List, Optional, Set, Tuple
 from dataclasses import dataclass
 import numpy as np
 from enum import Enum
+import logging
+from ..utils import content_hash
 from .formal import FormalInstruction, InstructionType
+from . import list_scheduler
+from .list_scheduler import ListScheduler, SchedulePlan
+from .plan_cache import CompiledPlanCache, code_fingerprint, get_default_plan_cache, structural_hash
+
+logger = logging.getLogger(__name__)
 
 class OptimizationLevel(Enum):
     """Optimization levels for instruction compilation."""
@@ -41,19 +48,67 @@ class CompilationContext:
         self.resource_constraints = config.get("resource_constraints", {})
         self.safety_checks = config.get("safety_checks", True)
 
+# Code hashes of compiler classes, part of every plan cache key
+_fingerprints: Dict[type, str] = {}
+
 class InstructionCompiler:
-    """Compiles instructions into optimized sequences."""
+    """Compiles instructions into optimized sequences.
     
-    def __init__(self, config: Dict[str, Any]):
+    Compiled plans are cached by a structural hash of the instructions,
+    the compilation context and the compiler code, in the process-wide
+    plan cache unless another is given or the ``plan_cache`` config is
+    false.
+    """
+    
+    def __init__(self,
+                 config: Dict[str, Any],
+                 plan_cache: Optional[CompiledPlanCache] = None):
         self.config = config
         self.optimization_passes = self._initialize_passes()
         self.ir_builder = IRBuilder()
         self.code_generator = CodeGenerator()
+        if plan_cache is None and config.get("plan_cache", True):
+            plan_cache = get_default_plan_cache()
+        self.plan_cache = plan_cache
+        
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the code that compilation runs."""
+        compiler_type = type(self)
+        if compiler_type not in _fingerprints:
+            _fingerprints[compiler_type] = code_fingerprint(
+                *[cls for cls in compiler_type.__mro__ if cls is not object],
+                IRBuilder,
+                CodeGenerator,
+                list_scheduler
+            )
+        return _fingerprints[compiler_type]
         
     def compile(self,
                 instructions: List[FormalInstruction],
                 context: CompilationContext) -> List[FormalInstruction]:
         """Compile instruction sequence with optimizations."""
+        if self.plan_cache is None:
+            return self._compile(instructions, context)
+        try:
+            key = structural_hash(
+                instructions,
+                context,
+                content_hash([self.fingerprint, self.config])
+            )
+        except TypeError as e:
+            logger.debug(f"Compiled plan is not cached: {e}")
+            return self._compile(instructions, context)
+        compiled = self.plan_cache.lookup(key, instructions)
+        if compiled is None:
+            compiled = self._compile(instructions, context)
+            self.plan_cache.store(key, instructions, compiled)
+        return compiled
+    
+    def _compile(self,
+                 instructions: List[FormalInstruction],
+                 context: CompilationContext) -> List[FormalInstruction]:
+        """Compile without the plan cache."""
         # Build IR
         ir = self.ir_builder.build(instructions)
         
@@ -119,9 +174,10 @@ class InstructionCompiler:
                            context: CompilationContext) -> IRNode:
         """Eliminate unnecessary instructions."""
         if ir.type == IRNodeType.SEQUENCE:
+            used = self._used_names(ir.instructions, context)
             live_instructions = []
             for instr in ir.instructions:
-                if self._is_instruction_live(instr, context):
+                if self._is_instruction_live(instr, used):
                     live_instructions.append(instr)
             ir.instructions = live_instructions
         return ir
@@ -129,17 +185,18 @@ class InstructionCompiler:
     def _parallelize_execution(self,
                              ir: IRNode,
                              context: CompilationContext) -> IRNode:
-        """Identify and mark parallel execution opportunities."""
+        """Identify and mark parallel execution opportunities.
+        
+        The instructions are list scheduled along their critical path; the
+        timed schedule is kept in the ``schedule`` metadata.
+        """
         if ir.type == IRNodeType.SEQUENCE:
-            parallel_groups = self._identify_parallel_groups(
-                ir.instructions,
-                context
-            )
-            if parallel_groups:
+            plan = self._schedule(ir.instructions, context)
+            if len(plan.groups) < len(ir.instructions):
                 return IRNode(
                     type=IRNodeType.PARALLEL,
-                    instructions=parallel_groups,
-                    metadata=ir.metadata,
+                    instructions=plan.groups,
+                    metadata={**ir.metadata, "schedule": plan.to_metadata()},
                     dependencies=ir.dependencies,
                     optimizations=ir.optimizations + ["parallelized"]
                 )
@@ -169,9 +226,16 @@ class InstructionCompiler:
         if not self._are_fusible(instr1, instr2):
             return None
             
+        internal = {instr1.id, instr1.name}
         return FormalInstruction(
             name=f"fused_{instr1.name}_{instr2.name}",
             type=instr1.type,
+            content="\n".join(part for part in (instr1.content, instr2.content) if part),
+            parameters={**instr1.parameters, **instr2.parameters},
+            dependencies=list(dict.fromkeys(
+                instr1.dependencies +
+                [dep for dep in instr2.dependencies if dep not in internal]
+            )),
             metadata=self._merge_metadata(instr1, instr2)
         )
     
@@ -183,39 +247,107 @@ class InstructionCompiler:
             instr1.type == instr2.type and
             not self._has_side_effects(instr1) and
             not self._has_side_effects(instr2) and
-            not set(instr2.metadata.dependencies).intersection(
+            not set(instr2.dependencies).intersection(
                 instr1.metadata.get("outputs", [])
             )
         )
     
+    def _has_side_effects(self, instr: FormalInstruction) -> bool:
+        """Check if instruction may have effects beyond its outputs.
+        
+        Instructions are assumed to have side effects unless marked pure.
+        """
+        return not instr.metadata.get("pure", False) or instr.requires_ordering()
+    
+    def _merge_metadata(self,
+                        instr1: FormalInstruction,
+                        instr2: FormalInstruction) -> Dict[str, Any]:
+        """Merge metadata of fused instructions."""
+        metadata = {**instr1.metadata, **instr2.metadata}
+        for key in ("cost", "memory", "complexity"):
+            if key in instr1.metadata or key in instr2.metadata:
+                metadata[key] = instr1.metadata.get(key, 0) + instr2.metadata.get(key, 0)
+        metadata["outputs"] = list(dict.fromkeys(
+            list(instr1.metadata.get("outputs", [])) + list(instr2.metadata.get("outputs", []))
+        ))
+        # Dependencies on the originals are kept on the fused instruction
+        metadata["aliases"] = [
+            key
+            for instr in (instr1, instr2)
+            for key in [instr.id, instr.name] + list(instr.metadata.get("aliases", []))
+            if key
+        ]
+        return metadata
+    
+    def _used_names(self,
+                    instructions: List[FormalInstruction],
+                    context: CompilationContext) -> Set[str]:
+        """Collect the names and instructions that are read."""
+        used = set(context.config.get("live_outputs", []))
+        for instr in instructions:
+            used.update(dep[len("input:"):] if dep.startswith("input:") else dep
+                        for dep in instr.dependencies)
+        return used
+    
+    def _has_used_outputs(self,
+                          instr: FormalInstruction,
+                          used: Set[str]) -> bool:
+        """Check if an output or the instruction itself is read."""
+        outputs = {dep[len("output:"):] for dep in instr.get_outputs()}
+        outputs.update(instr.metadata.get("outputs", []))
+        outputs.update({instr.id, instr.name})
+        outputs.update(instr.metadata.get("aliases", []))
+        return bool(outputs & used)
+    
     def _is_instruction_live(self,
                            instr: FormalInstruction,
-                           context: CompilationContext) -> bool:
+                           used: Set[str]) -> bool:
         """Check if instruction has observable effects."""
         return (
             self._has_side_effects(instr) or
-            self._has_used_outputs(instr, context)
+            self._has_used_outputs(instr, used)
         )
     
+    def _schedule(self,
+                  instructions: List[FormalInstruction],
+                  context: CompilationContext) -> SchedulePlan:
+        """List schedule instructions under the resource constraints.
+        
+        Costs come from the ``cost_estimates`` config, execution times by
+        instruction name as measured by the scheduler's metrics collector,
+        and otherwise from the instructions' hints.
+        """
+        constraints = dict(context.resource_constraints)
+        workers = constraints.pop("workers", context.config.get("max_workers", 4))
+        scheduler = ListScheduler(
+            capacities=constraints,
+            workers=workers,
+            cost_estimates=context.config.get("cost_estimates")
+        )
+        return scheduler.schedule(instructions)
+    
     def _identify_parallel_groups(self,
                                 instructions: List[FormalInstruction],
                                 context: CompilationContext) -> List[List[FormalInstruction]]:
-        """Identify groups of instructions that can run in parallel."""
-        groups = []
-        current_group = []
+        """Identify groups of instructions that can run in parallel.
         
-        for instr in instructions:
-            if self._can_parallelize(instr, current_group):
-                current_group.append(instr)
-            else:
-                if current_group:
-                    groups.append(current_group)
-                current_group = [instr]
-                
-        if current_group:
-            groups.append(current_group)
-            
-        return groups
+        Groups run one after another, the instructions of a group in
+        parallel within the resource constraints.
+        """
+        return self._schedule(instructions, context).groups
+    
+    def _flatten(self, ir: IRNode) -> List[FormalInstruction]:
+        """Get the instructions of a node, in order."""
+        instructions = []
+        for item in ir.instructions:
+            instructions.extend(item if isinstance(item, list) else [item])
+        return instructions
+    
+    def _groups(self, ir: IRNode) -> List[List[FormalInstruction]]:
+        """Get the instructions that run together, one group at a time."""
+        if ir.type == IRNodeType.PARALLEL:
+            return [item if isinstance(item, list) else [item] for item in ir.instructions]
+        return [[instr] for instr in self._flatten(ir)]
     
     def _create_resource_plan(self,
                             ir: IRNode,
@@ -227,6 +359,28 @@ class InstructionCompiler:
             "constraints": context.resource_constraints
         }
     
+    def _calculate_resource_allocation(self,
+                                       ir: IRNode,
+                                       context: CompilationContext) -> Dict[str, float]:
+        """Calculate the peak resources in use by any group."""
+        allocation: Dict[str, float] = {}
+        for group in self._groups(ir):
+            usage: Dict[str, float] = {}
+            for instr in group:
+                for resource, amount in instr.metadata.get("resources", {}).items():
+                    usage[resource] = usage.get(resource, 0.0) + amount
+            for resource, amount in usage.items():
+                allocation[resource] = max(allocation.get(resource, 0.0), amount)
+        return allocation
+    
+    def _create_resource_schedule(self,
+                                  ir: IRNode,
+                                  context: CompilationContext) -> Dict[str, Any]:
+        """Get the timed schedule of the instructions."""
+        if "schedule" in ir.metadata:
+            return ir.metadata["schedule"]
+        return self._schedule(self._flatten(ir), context).to_metadata()
+    
     def _create_memory_plan(self,
                           ir: IRNode,
                           context: CompilationContext) -> Dict[str, Any]:
@@ -236,6 +390,36 @@ class InstructionCompiler:
             "lifecycle": self._create_memory_lifecycle(ir),
             "optimization": self._identify_memory_optimizations(ir)
         }
+    
+    def _calculate_memory_allocation(self, ir: IRNode) -> Dict[str, float]:
+        """Calculate total and peak group memory."""
+        group_memory = [
+            sum(instr.metadata.get("memory", 0) for instr in group)
+            for group in self._groups(ir)
+        ]
+        return {
+            "total": float(sum(group_memory)),
+            "peak": float(max(group_memory, default=0))
+        }
+    
+    def _create_memory_lifecycle(self, ir: IRNode) -> Dict[str, Dict[str, int]]:
+        """Find the groups that first write and last read each output."""
+        lifecycle: Dict[str, Dict[str, int]] = {}
+        for index, group in enumerate(self._groups(ir)):
+            for instr in group:
+                for dep in instr.get_outputs():
+                    lifecycle.setdefault(dep[len("output:"):], {"created": index, "released": index})
+                for dep in instr.get_inputs():
+                    if dep[len("input:"):] in lifecycle:
+                        lifecycle[dep[len("input:"):]]["released"] = index
+        return lifecycle
+    
+    def _identify_memory_optimizations(self, ir: IRNode) -> List[str]:
+        """Suggest releasing outputs right after their last read."""
+        return [
+            f"release:{name}@{span['released']}"
+            for name, span in self._create_memory_lifecycle(ir).items()
+        ]
 
 class IRBuilder:
     """Builds intermediate representation from instructions."""
@@ -299,7 +483,9 @@ class CodeGenerator:
         """Generate code for parallel execution."""
         instructions = []
         for group in ir.instructions:
-            if isinstance(group, list):
+            if isinstance(group, list) and len(group) == 1:
+                instructions.extend(group)
+            elif isinstance(group, list):
                 instructions.extend(self._wrap_parallel(group))
             else:
                 instructions.append(group)
@@ -53,6 +53,7 @@ class OptimizationHint:
     priority: int = 0
     deadline: Optional[float] = None
     locality: Optional[str] = None
+    cost: Optional[float] = None  # Estimated execution time in seconds
 
 class FormalInstruction(BaseModel):
     """Formal instruction."""
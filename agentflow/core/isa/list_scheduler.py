@@ -0,0 +1,283 @@
+"""Critical-path list scheduling of instruction graphs."""
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any
+from dataclasses import dataclass, field
+import math
+import numpy as np
+from .formal import FormalInstruction
+
+# Tolerance when comparing schedule times
+_EPSILON = 1e-9
+
+def instruction_dependencies(instructions: List[FormalInstruction]) -> List[Set[int]]:
+    """Get the predecessors of each instruction, by position.
+
+    An instruction depends on earlier instructions it names by id or name,
+    on the last earlier writer of each ``input:`` or ``output:`` name it
+    reads or writes, and, when it writes a name, on the earlier readers of
+    that name since its last write. Instructions that require ordering keep
+    their relative order.
+    """
+    predecessors: List[Set[int]] = [set() for _ in instructions]
+    by_key: Dict[str, int] = {}
+    writers: Dict[str, int] = {}
+    readers: Dict[str, List[int]] = {}
+    last_ordered: Optional[int] = None
+    for position, instruction in enumerate(instructions):
+        deps = predecessors[position]
+        outputs = {dep[len("output:"):] for dep in instruction.get_outputs()}
+        outputs.update(instruction.metadata.get("outputs", []))
+        inputs = {dep[len("input:"):] for dep in instruction.get_inputs()}
+        for dependency in instruction.dependencies:
+            if dependency in by_key:
+                deps.add(by_key[dependency])
+        for name in inputs:
+            if name in writers:
+                deps.add(writers[name])
+        for name in outputs:
+            if name in writers:
+                deps.add(writers[name])
+            deps.update(readers.pop(name, []))
+        if instruction.requires_ordering():
+            if last_ordered is not None:
+                deps.add(last_ordered)
+            last_ordered = position
+        deps.discard(position)
+        for name in inputs:
+            readers.setdefault(name, []).append(position)
+        for name in outputs:
+            writers[name] = position
+        for key in [instruction.id, instruction.name] + list(instruction.metadata.get("aliases", [])):
+            if key:
+                by_key[key] = position
+    return predecessors
+
+def estimate_cost(instruction: FormalInstruction,
+                  measured: Optional[Dict[str, float]] = None,
+                  default: float = 1.0) -> float:
+    """Estimate the execution time of an instruction.
+
+    Measured times by instruction name win, then the optimization hint's
+    cost, the ``cost`` metadata and the required time.
+    """
+    if measured and measured.get(instruction.name) is not None:
+        return float(measured[instruction.name])
+    if instruction.optimization.cost is not None:
+        return float(instruction.optimization.cost)
+    if instruction.metadata.get("cost") is not None:
+        return float(instruction.metadata["cost"])
+    if instruction.resources.time > 0:
+        return float(instruction.resources.time)
+    return default
+
+@dataclass
+class ScheduledInstruction:
+    """Instruction placed on a worker."""
+    instruction: FormalInstruction
+    start: float
+    finish: float
+    worker: int
+
+@dataclass
+class SchedulePlan:
+    """Timed schedule and the parallel groups derived from it."""
+    entries: List[ScheduledInstruction]
+    makespan: float
+    critical_path: List[FormalInstruction]
+    critical_path_length: float
+    groups: List[List[FormalInstruction]] = field(default_factory=list)
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """Get the schedule as IR metadata."""
+        return {
+            "makespan": self.makespan,
+            "critical_path": [instruction.id for instruction in self.critical_path],
+            "critical_path_length": self.critical_path_length,
+            "slots": {
+                entry.instruction.id: {
+                    "start": entry.start,
+                    "finish": entry.finish,
+                    "worker": entry.worker
+                }
+                for entry in self.entries
+            }
+        }
+
+class ListScheduler:
+    """Resource-aware list scheduler in the style of HEFT.
+
+    Instructions are prioritized by upward rank, their cost plus the longest
+    path of costs to an exit instruction, so critical-path instructions are
+    placed first. Each is inserted at the earliest time after its
+    predecessors finish at which a worker is idle for its whole duration and
+    the ``resources`` metadata of it and the instructions overlapping it fit
+    the capacities. Workers are identical and share memory, so there are no
+    transfer costs. Resources without a capacity are not limited, and a
+    demand above a capacity is capped so the instruction runs alone.
+    """
+
+    def __init__(self,
+                 capacities: Optional[Dict[str, float]] = None,
+                 workers: int = 4,
+                 cost_estimates: Optional[Dict[str, float]] = None,
+                 default_cost: float = 1.0):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.capacities = {
+            resource: float(amount)
+            for resource, amount in (capacities or {}).items()
+            if isinstance(amount, (int, float))
+        }
+        self.workers = workers
+        self.cost_estimates = cost_estimates or {}
+        self.default_cost = default_cost
+
+    @classmethod
+    def from_resource_manager(cls, resource_manager: Any, workers: int,
+                              cost_estimates: Optional[Dict[str, float]] = None) -> "ListScheduler":
+        """Create a scheduler for the capacities of a resource manager."""
+        return cls(dict(resource_manager.resources), workers, cost_estimates)
+
+    def schedule(self,
+                 instructions: List[FormalInstruction],
+                 edges: Optional[Iterable[Tuple[str, str]]] = None) -> SchedulePlan:
+        """Schedule instructions, keeping their dependencies.
+
+        Args:
+            instructions: Instructions in program order
+            edges: Further dependencies as pairs of instruction ids, the
+                first running before the second
+
+        Raises:
+            ValueError: If the dependencies have a cycle
+        """
+        count = len(instructions)
+        if not count:
+            return SchedulePlan([], 0.0, [], 0.0, [])
+        predecessors = instruction_dependencies(instructions)
+        positions = {instruction.id: position for position, instruction in enumerate(instructions)}
+        for before, after in edges or ():
+            if before in positions and after in positions and before != after:
+                predecessors[positions[after]].add(positions[before])
+        successors: List[List[int]] = [[] for _ in instructions]
+        for position, deps in enumerate(predecessors):
+            for dep in deps:
+                successors[dep].append(position)
+        costs = np.array([
+            max(estimate_cost(instruction, self.cost_estimates, self.default_cost), 0.0)
+            for instruction in instructions
+        ])
+        resources = list(self.capacities)
+        capacity = np.array([self.capacities[resource] for resource in resources])
+        demands = np.array([
+            [float(instruction.metadata.get("resources", {}).get(resource, 0.0)) for resource in resources]
+            for instruction in instructions
+        ]).reshape(count, len(resources))
+        demands = np.minimum(demands, capacity)
+
+        topological = self._topological_order(predecessors, successors)
+        index = {position: order for order, position in enumerate(topological)}
+        ranks = costs.copy()
+        for position in reversed(topological):
+            if successors[position]:
+                ranks[position] += max(ranks[successor] for successor in successors[position])
+
+        starts = np.full(count, math.inf)
+        finishes = np.full(count, math.inf)
+        workers = np.full(count, -1)
+        placed = np.zeros(count, dtype=bool)
+        # Ranks decrease along edges, the topological order breaks ties of zero costs
+        for position in sorted(range(count), key=lambda p: (-ranks[p], index[p])):
+            ready = max((finishes[dep] for dep in predecessors[position]), default=0.0)
+            start, worker = self._earliest_slot(
+                ready, costs[position], demands[position], capacity, starts, finishes, workers, demands, placed
+            )
+            starts[position], finishes[position] = start, start + costs[position]
+            workers[position] = worker
+            placed[position] = True
+
+        order = sorted(range(count), key=lambda p: (starts[p], p))
+        entries = [
+            ScheduledInstruction(instructions[p], float(starts[p]), float(finishes[p]), int(workers[p]))
+            for p in order
+        ]
+        critical = [int(np.argmax(ranks))]
+        while successors[critical[-1]]:
+            critical.append(max(successors[critical[-1]], key=lambda s: ranks[s]))
+        return SchedulePlan(
+            entries=entries,
+            makespan=float(finishes.max()),
+            critical_path=[instructions[p] for p in critical],
+            critical_path_length=float(ranks.max()),
+            groups=self._groups(instructions, order, predecessors, demands, capacity)
+        )
+
+    @staticmethod
+    def _topological_order(predecessors: List[Set[int]], successors: List[List[int]]) -> List[int]:
+        """Order positions so that dependencies come first."""
+        remaining = [len(deps) for deps in predecessors]
+        ready = [position for position, count in enumerate(remaining) if not count]
+        order: List[int] = []
+        while ready:
+            position = ready.pop()
+            order.append(position)
+            for successor in successors[position]:
+                remaining[successor] -= 1
+                if not remaining[successor]:
+                    ready.append(successor)
+        if len(order) < len(predecessors):
+            raise ValueError("Instruction dependencies have a cycle")
+        return order
+
+    def _earliest_slot(self, ready, cost, demand, capacity, starts, finishes, workers, demands, placed):
+        """Find the earliest start and a worker for an instruction."""
+        candidates = np.unique(np.concatenate(([ready], finishes[placed & (finishes > ready)])))
+        for start in candidates:
+            end = start + cost
+            if cost > 0:
+                overlapping = placed & (starts < end) & (finishes > start)
+            else:
+                overlapping = placed & (starts <= start) & (finishes > start)
+            busy = set(workers[overlapping].tolist())
+            if len(busy) >= self.workers:
+                continue
+            if len(capacity) and not self._fits(start, demand, capacity, starts[overlapping],
+                                                finishes[overlapping], demands[overlapping]):
+                continue
+            worker = next(w for w in range(self.workers) if w not in busy)
+            return float(start), worker
+        # Every placed instruction has finished by the last candidate
+        raise AssertionError("No slot found after all instructions finished")
+
+    @staticmethod
+    def _fits(start, demand, capacity, starts, finishes, demands) -> bool:
+        """Check the usage stays within capacity whenever it can change."""
+        for point in np.concatenate(([start], starts[starts > start])):
+            active = (starts <= point) & (finishes > point)
+            if np.any(demands[active].sum(axis=0) + demand > capacity + _EPSILON):
+                return False
+        return True
+
+    def _groups(self, instructions, order, predecessors, demands, capacity) -> List[List[FormalInstruction]]:
+        """Split the schedule into groups that run in parallel one after another.
+
+        Instructions are taken in order of start time; a group is closed
+        when the next instruction depends on one of its members or would
+        exceed the workers or a capacity.
+        """
+        groups: List[List[FormalInstruction]] = []
+        members: Set[int] = set()
+        usage = np.zeros_like(capacity)
+        for position in order:
+            if members and (
+                predecessors[position] & members
+                or len(members) >= self.workers
+                or np.any(usage + demands[position] > capacity + _EPSILON)
+            ):
+                members = set()
+                usage = np.zeros_like(capacity)
+            if not members:
+                groups.append([])
+            groups[-1].append(instructions[position])
+            members.add(position)
+            usage = usage + demands[position]
+        return groups
@@ -4,11 +4,18 @@ import numpy as np
 from dataclasses import dataclass
 from collections import defaultdict
 from .patterns import Pattern, PatternType, PatternMetrics
-from .formal import FormalInstruction
+from .formal import FormalInstruction, InstructionType
 from .analyzer import AnalysisResult
-from sklearn.cluster import KMeans
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.neighbors import NearestNeighbors
 from sklearn.preprocessing import StandardScaler
 
+# Column of each instruction type in behavioral feature matrices
+_INSTRUCTION_TYPES = list(InstructionType)
+_TYPE_INDEX = {instruction_type: i for i, instruction_type in enumerate(_INSTRUCTION_TYPES)}
+
 @dataclass
 class FrequentSequence:
     """Represents a frequent instruction sequence."""
@@ -24,121 +31,186 @@ class DependencyGraph:
     edges: List[Tuple[str, str]]
     weights: Dict[Tuple[str, str], float]
 
+class InstructionCorpus:
+    """Instruction traces encoded as integer ids in one growable array.
+    
+    Traces are stored back to back, each followed by a -1 separator, so
+    no sequence spans two traces. Instructions are identified by the value
+    of their ``key`` attribute; the first instruction seen with a value
+    represents it in mined sequences.
+    """
+    
+    SEPARATOR = -1
+    
+    def __init__(self, key: str = "id", capacity: int = 1024):
+        self.key = key
+        self.vocabulary: Dict[Any, int] = {}
+        self.representatives: List[FormalInstruction] = []
+        self.num_traces = 0
+        self.num_instructions = 0
+        self._codes = np.full(max(capacity, 1), self.SEPARATOR, dtype=np.int32)
+        self._size = 0
+        
+    @property
+    def codes(self) -> np.ndarray:
+        """Encoded traces including separators."""
+        return self._codes[:self._size]
+        
+    def encode(self, trace: List[FormalInstruction]) -> np.ndarray:
+        """Encode a trace, adding unseen instructions to the vocabulary."""
+        codes = np.empty(len(trace), dtype=np.int32)
+        for i, instruction in enumerate(trace):
+            value = getattr(instruction, self.key)
+            code = self.vocabulary.get(value)
+            if code is None:
+                code = self.vocabulary[value] = len(self.representatives)
+                self.representatives.append(instruction)
+            codes[i] = code
+        return codes
+        
+    def add(self, trace: List[FormalInstruction]) -> None:
+        """Append a trace."""
+        codes = self.encode(trace)
+        required = self._size + len(codes) + 1
+        if required > len(self._codes):
+            grown = np.full(max(required, 2 * len(self._codes)), self.SEPARATOR, dtype=np.int32)
+            grown[:self._size] = self.codes
+            self._codes = grown
+        self._codes[self._size:self._size + len(codes)] = codes
+        # The slot after the trace already holds a separator
+        self._size = required
+        self.num_traces += 1
+        self.num_instructions += len(codes)
+        
 class SequenceMiner:
-    """Advanced sequence pattern mining."""
+    """Frequent contiguous sequence mining over instruction traces.
+    
+    Sequences are grown PrefixSpan-style over integer-encoded instructions:
+    the occurrences of a frequent sequence are kept as end positions in the
+    encoded corpus, and extending it by one instruction only looks at the
+    instruction after each occurrence. Only frequent sequences are extended,
+    as no extension can occur more often than its prefix, and each level is
+    counted for all sequences at once with NumPy. Support is the number of
+    occurrences per instruction in the corpus and confidence the
+    occurrences of a sequence per occurrence of its prefix without the last
+    instruction.
+    
+    ``find_sequences`` mines the given instructions or traces. Traces can
+    also be added over time with ``update``; ``frequent_sequences`` then
+    mines everything added so far, reusing its result until the next update.
+    """
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.min_support = config.get("min_support", 0.1)
         self.min_confidence = config.get("min_confidence", 0.8)
+        # Absolute occurrence threshold, overriding min_support
+        self.min_count = config.get("min_count")
+        self.max_length = config.get("max_length", 9)
+        # Instruction attribute that identifies equal instructions
+        self.key = config.get("key", "id")
+        if self.max_length < 2:
+            raise ValueError("max_length must be at least 2")
+        self.corpus = InstructionCorpus(self.key)
+        self._sequences: Optional[List[FrequentSequence]] = None
         
     def find_sequences(self,
-                      instructions: List[FormalInstruction]) -> List[FrequentSequence]:
-        """Find frequent instruction sequences."""
-        sequences = []
-        n = len(instructions)
-        
-        # Generate candidate sequences
-        for length in range(2, min(10, n + 1)):
-            candidates = self._generate_candidates(instructions, length)
-            
-            # Calculate support for each candidate
-            for candidate in candidates:
-                support = self._calculate_support(candidate, instructions)
-                if support >= self.min_support:
-                    confidence = self._calculate_confidence(
-                        candidate,
-                        instructions
-                    )
-                    if confidence >= self.min_confidence:
-                        sequences.append(
-                            FrequentSequence(
-                                instructions=candidate,
-                                support=support,
-                                confidence=confidence,
-                                frequency=self._count_frequency(
-                                    candidate,
-                                    instructions
-                                )
-                            )
-                        )
-                        
-        return sequences
+                      instructions: Union[List[FormalInstruction], List[List[FormalInstruction]]]
+                      ) -> List[FrequentSequence]:
+        """Find frequent instruction sequences in one trace or several traces."""
+        corpus = InstructionCorpus(self.key, capacity=self._total_length(instructions))
+        for trace in self._as_traces(instructions):
+            corpus.add(trace)
+        return self._mine(corpus)
     
-    def _generate_candidates(self,
-                           instructions: List[FormalInstruction],
-                           length: int) -> List[List[FormalInstruction]]:
-        """Generate candidate sequences."""
-        candidates = []
-        n = len(instructions)
-        
-        for i in range(n - length + 1):
-            candidate = instructions[i:i+length]
-            if self._is_valid_candidate(candidate):
-                candidates.append(candidate)
-                
-        return candidates
+    def update(self,
+              instructions: Union[List[FormalInstruction], List[List[FormalInstruction]]]) -> None:
+        """Add one trace or several traces to the mined corpus."""
+        for trace in self._as_traces(instructions):
+            self.corpus.add(trace)
+        self._sequences = None
+        
+    def frequent_sequences(self) -> List[FrequentSequence]:
+        """Find frequent instruction sequences in all traces added with update."""
+        if self._sequences is None:
+            self._sequences = self._mine(self.corpus)
+        return self._sequences
     
-    def _is_valid_candidate(self,
-                          candidate: List[FormalInstruction]) -> bool:
-        """Check if candidate sequence is valid."""
-        if not candidate or len(candidate) < 2:
-            raise ValueError("Sequence must have at least 2 instructions")
-            
-        # Check for dependencies
-        for i in range(len(candidate) - 1):
-            if self._has_dependency(candidate[i], candidate[i+1]):
-                return True
-        return False
+    def reset(self) -> None:
+        """Remove all traces added with update."""
+        self.corpus = InstructionCorpus(self.key)
+        self._sequences = None
+        
+    @staticmethod
+    def _as_traces(instructions) -> List[List[FormalInstruction]]:
+        """Normalize a trace or a list of traces to a list of traces."""
+        if instructions and isinstance(instructions[0], (list, tuple)):
+            return [list(trace) for trace in instructions]
+        return [list(instructions)] if instructions else []
     
-    def _has_dependency(self,
-                       instr1: FormalInstruction,
-                       instr2: FormalInstruction) -> bool:
-        """Check if instructions have dependency."""
-        # Implement dependency check
-        return True  # Placeholder
-
-    def _calculate_support(self,
-                         candidate: List[FormalInstruction],
-                         instructions: List[FormalInstruction]) -> float:
-        """Calculate support for candidate sequence."""
-        occurrences = self._count_frequency(candidate, instructions)
-        return occurrences / len(instructions)
-
-    def _calculate_confidence(self,
-                            candidate: List[FormalInstruction],
-                            instructions: List[FormalInstruction]) -> float:
-        """Calculate confidence for candidate sequence."""
-        if len(candidate) < 2:
-            return 0.0
-            
-        antecedent = candidate[:-1]
-        antecedent_freq = self._count_frequency(antecedent, instructions)
-        
-        if antecedent_freq == 0:
-            return 0.0
-            
-        sequence_freq = self._count_frequency(candidate, instructions)
-        return sequence_freq / antecedent_freq
-
-    def _count_frequency(self,
-                        candidate: List[FormalInstruction],
-                        instructions: List[FormalInstruction]) -> int:
-        """Count frequency of candidate sequence in instructions."""
-        count = 0
-        n = len(instructions)
-        m = len(candidate)
-        
-        for i in range(n - m + 1):
-            match = True
-            for j in range(m):
-                if instructions[i + j].id != candidate[j].id:
-                    match = False
-                    break
-            if match:
-                count += 1
-                
-        return count
+    @classmethod
+    def _total_length(cls, instructions) -> int:
+        traces = cls._as_traces(instructions)
+        return sum(len(trace) for trace in traces) + len(traces)
+    
+    def _threshold(self, corpus: InstructionCorpus) -> int:
+        """Minimum number of occurrences of a frequent sequence."""
+        if self.min_count is not None:
+            return max(1, int(self.min_count))
+        return max(1, int(np.ceil(self.min_support * corpus.num_instructions - 1e-9)))
+    
+    def _mine(self, corpus: InstructionCorpus) -> List[FrequentSequence]:
+        """Mine frequent sequences of length 2 to max_length."""
+        codes = corpus.codes
+        if corpus.num_instructions == 0:
+            return []
+        vocabulary_size = len(corpus.representatives)
+        min_count = self._threshold(corpus)
+        counts = np.bincount(codes[codes >= 0], minlength=vocabulary_size)
+        
+        # Level 1: frequent single instructions, identified by their code
+        frequent = np.flatnonzero(counts >= min_count)
+        pattern_ids = np.full(vocabulary_size, -1, dtype=np.int64)
+        pattern_ids[frequent] = np.arange(len(frequent))
+        positions = np.flatnonzero((codes >= 0) & (pattern_ids[np.maximum(codes, 0)] >= 0))
+        patterns = pattern_ids[codes[positions]]
+        sequences = frequent.reshape(-1, 1)
+        pattern_counts = counts[frequent]
+        
+        results = []
+        for length in range(2, self.max_length + 1):
+            if not len(positions):
+                break
+            # Extend every occurrence by the instruction that follows it
+            positions = positions + 1
+            following = codes[positions]
+            inside = following >= 0
+            positions, patterns, following = positions[inside], patterns[inside], following[inside]
+            keys = patterns * vocabulary_size + following
+            extensions, inverse, extension_counts = np.unique(keys, return_inverse=True, return_counts=True)
+            inverse = inverse.reshape(-1)
+            is_frequent = extension_counts >= min_count
+            new_ids = np.full(len(extensions), -1, dtype=np.int64)
+            new_ids[is_frequent] = np.arange(int(is_frequent.sum()))
+            kept = new_ids[inverse] >= 0
+            positions, patterns = positions[kept], new_ids[inverse][kept]
+            
+            prefixes = extensions[is_frequent] // vocabulary_size
+            prefix_counts = pattern_counts[prefixes]
+            pattern_counts = extension_counts[is_frequent]
+            sequences = np.column_stack([sequences[prefixes], extensions[is_frequent] % vocabulary_size])
+            confidences = pattern_counts / prefix_counts
+            
+            for index in np.argsort(-pattern_counts, kind="stable"):
+                if confidences[index] < self.min_confidence:
+                    continue
+                results.append(FrequentSequence(
+                    instructions=[corpus.representatives[code] for code in sequences[index]],
+                    support=float(pattern_counts[index] / corpus.num_instructions),
+                    confidence=float(confidences[index]),
+                    frequency=int(pattern_counts[index])
+                ))
+        return results
     
 class ParallelMiner:
     """Advanced parallel pattern mining."""
@@ -279,7 +351,19 @@ class ParallelMiner:
         return False
 
 class BehavioralMiner:
-    """Behavioral pattern mining."""
+    """Behavioral pattern mining.
+    
+    Instructions are described by a batched feature matrix with a fixed
+    number of columns, so batches from different traces are comparable.
+    Small sets are clustered with KMeans, sets of ``minibatch_threshold``
+    instructions or more with MiniBatchKMeans, and with the ``"graph"``
+    clustering method by the connected components of a sparse
+    nearest-neighbour similarity graph. Streaming traces can be clustered
+    incrementally with ``partial_fit`` and ``predict``.
+    """
+    
+    # Instruction names of the sequence patterns are matched against
+    TARGET_PATTERN = ["load_data", "validate", "process", "save"]
     
     def __init__(self, config: Dict[str, Any]):
         """Initialize behavioral miner."""
@@ -290,6 +374,13 @@ class BehavioralMiner:
         self.min_pattern_length = config.get("min_pattern_length", 2)
         self.min_support = config.get("min_support", 0.4)
         self.similarity_threshold = config.get("similarity_threshold", 0.8)
+        self.target_pattern = list(config.get("target_pattern", self.TARGET_PATTERN))
+        self.clustering = config.get("clustering", "kmeans")
+        self.max_clusters = config.get("max_clusters", 5)
+        self.minibatch_threshold = config.get("minibatch_threshold", 10000)
+        self.batch_size = config.get("batch_size", 1024)
+        self.n_neighbors = config.get("n_neighbors", 10)
+        self.random_state = config.get("random_state", 42)
         
         # Validate configuration
         if self.min_pattern_length < 2:
@@ -298,13 +389,15 @@ class BehavioralMiner:
             raise ValueError("min_support must be between 0 and 1")
         if not 0 <= self.similarity_threshold <= 1:
             raise ValueError("similarity_threshold must be between 0 and 1")
+        if self.clustering not in ("kmeans", "graph"):
+            raise ValueError("clustering must be 'kmeans' or 'graph'")
+            
+        # Models updated by partial_fit
+        self._stream_scaler: Optional[StandardScaler] = None
+        self._stream_model: Optional[MiniBatchKMeans] = None
         
-    def find_patterns(self, instructions: List[FormalInstruction], depth: int = 0) -> List[Pattern]:
+    def find_patterns(self, instructions: List[FormalInstruction]) -> List[Pattern]:
         """Find behavioral patterns in instructions."""
-        # Prevent infinite recursion
-        if depth > 3:
-            return []
-
         if not instructions:
             return []
 
@@ -312,92 +405,77 @@ class BehavioralMiner:
         if len(instructions) < self.min_pattern_length:
             return []
 
-        # Precompute features for all instructions
-        features = self._extract_features(instructions)
-
         # Cluster instructions based on features
+        features = self._extract_features(instructions)
         clusters = self._cluster_instructions(features)
 
-        patterns = []
+        found = []
         for cluster in clusters:
-            # Extract instructions in this cluster
-            cluster_instructions = [instructions[i] for i in cluster]
-
-            # Check if cluster meets minimum length requirement
-            if len(cluster_instructions) >= self.min_pattern_length:
-                # Find pattern within the cluster
-                pattern_instructions = self._find_pattern_in_cluster(cluster_instructions)
-
-                # Create pattern with metrics
-                if pattern_instructions:
-                    pattern_metrics = PatternMetrics(
-                        frequency=self.calculate_pattern_frequency(pattern_instructions, instructions),
-                        confidence=self._calculate_pattern_confidence(pattern_instructions),
-                        support=self._calculate_support(pattern_instructions, instructions),
-                        significance=self.calculate_pattern_significance(pattern_instructions, instructions, depth)
-                    )
-
-                    pattern = Pattern(
-                        type=PatternType.BEHAVIORAL,
-                        instructions=pattern_instructions,
-                        metrics=pattern_metrics
-                    )
-                    patterns.append(pattern)
+            # Find pattern within the cluster
+            pattern_instructions = self._find_pattern_in_cluster([instructions[i] for i in cluster])
+            if pattern_instructions:
+                found.append(pattern_instructions)
+                
+        # Significance is relative to all patterns found, so frequencies come first
+        frequencies = [self.calculate_pattern_frequency(p, instructions) for p in found]
+        total_frequency = sum(frequencies)
+        patterns = []
+        for pattern_instructions, frequency in zip(found, frequencies):
+            pattern_metrics = PatternMetrics(
+                frequency=frequency,
+                confidence=self._calculate_pattern_confidence(pattern_instructions),
+                support=frequency / len(instructions),
+                significance=frequency / total_frequency if total_frequency else 0.0
+            )
+            patterns.append(Pattern(
+                type=PatternType.BEHAVIORAL,
+                instructions=pattern_instructions,
+                metrics=pattern_metrics
+            ))
 
         return patterns
 
     def _find_pattern_in_cluster(self, instructions: List[FormalInstruction]) -> List[FormalInstruction]:
         """Find a meaningful pattern within a cluster of instructions."""
-        # Prioritize patterns with specific ETL-like sequence
-        etl_pattern_names = ["load_data", "validate", "process", "save"]
-        
-        # Check for exact ETL pattern
-        for i in range(len(instructions) - len(etl_pattern_names) + 1):
-            potential_pattern = instructions[i:i+len(etl_pattern_names)]
-            if all(instr.name == name for instr, name in zip(potential_pattern, etl_pattern_names)):
-                return potential_pattern
-
-        # If no exact ETL pattern, find longest sequence with high similarity
-        max_pattern = []
-        for length in range(len(etl_pattern_names), len(instructions) + 1):
-            for i in range(len(instructions) - length + 1):
-                candidate = instructions[i:i+length]
-                
-                # Calculate similarity to ETL pattern
-                similarity_score = self._calculate_pattern_similarity(candidate, etl_pattern_names)
-                
-                if similarity_score >= self.similarity_threshold and len(candidate) > len(max_pattern):
-                    max_pattern = candidate
-
-        return max_pattern
+        scores = self._window_scores(instructions, self.target_pattern)
+        if not len(scores):
+            return []
+            
+        # Prioritize an exact match of the target pattern
+        exact = np.flatnonzero(scores == 1.0)
+        if len(exact):
+            start = int(exact[0])
+            return instructions[start:start + len(self.target_pattern)]
+            
+        # Otherwise the longest sequence similar to it, which is the whole cluster
+        if scores.max() >= self.similarity_threshold:
+            return instructions
+        return []
+
+    @staticmethod
+    def _window_scores(pattern: List[FormalInstruction], target_names: List[str]) -> np.ndarray:
+        """Fraction of target names matched by each window of the pattern."""
+        m = len(target_names)
+        if not m or len(pattern) < m:
+            return np.zeros(0)
+        names = np.array([instr.name for instr in pattern], dtype=object)
+        windows = np.lib.stride_tricks.sliding_window_view(names, m)
+        return (windows == np.array(target_names, dtype=object)).mean(axis=1)
 
     def _calculate_pattern_similarity(self, 
                                       pattern: List[FormalInstruction], 
                                       target_names: List[str]) -> float:
         """Calculate similarity between a pattern and a target pattern."""
-        if len(pattern) < len(target_names):
-            return 0.0
-
-        max_similarity = 0.0
-        for i in range(len(pattern) - len(target_names) + 1):
-            current_slice = pattern[i:i+len(target_names)]
-            
-            # Calculate name similarity
-            name_similarity = sum(
-                1.0 if instr.name == target_name else 0.0 
-                for instr, target_name in zip(current_slice, target_names)
-            ) / len(target_names)
-            
-            max_similarity = max(max_similarity, name_similarity)
-
-        return max_similarity
+        scores = self._window_scores(pattern, target_names)
+        return float(scores.max()) if len(scores) else 0.0
 
     def find_behavioral_patterns(self, instructions: List[FormalInstruction], analysis: AnalysisResult) -> List[Dict[str, Any]]:
         """Find behavioral patterns with analysis."""
-        # Extract behavioral features
-        features = self._extract_behavioral_features(instructions, analysis)
-        
+        if not instructions:
+            return []
+            
         # Cluster based on behavioral features
+        features = self._behavioral_feature_matrix(instructions, analysis)
         clusters = self._cluster_behaviors(features)
         
         # Find patterns within clusters
@@ -438,46 +516,41 @@ class BehavioralMiner:
             
         return total_similarity / max_length
         
-    def calculate_pattern_significance(self, 
-                                       pattern_instructions: List[FormalInstruction], 
-                                       instructions: List[FormalInstruction], 
-                                       depth: int = 0) -> float:
-        """Calculate significance of a pattern."""
-        # Prevent infinite recursion
-        if depth > 3:
-            return 0.0
-
-        # Frequency of this pattern
-        pattern_frequency = self.calculate_pattern_frequency(pattern_instructions, instructions)
+    def _extract_features(self, instructions: List[FormalInstruction]) -> np.ndarray:
+        """Extract a feature matrix with one row per instruction.
         
-        # Total number of possible patterns
-        other_patterns = self.find_patterns(instructions, depth + 1)
-        total_pattern_frequency = sum(
-            self.calculate_pattern_frequency(p.instructions, instructions) 
-            for p in other_patterns
+        Columns are a one-hot encoding of the instruction type followed by
+        the number of parameters and whether the instruction has content.
+        """
+        n = len(instructions)
+        features = np.zeros((n, len(_INSTRUCTION_TYPES) + 2))
+        type_codes = np.fromiter((_TYPE_INDEX[instr.type] for instr in instructions), dtype=np.int64, count=n)
+        features[np.arange(n), type_codes] = 1.0
+        features[:, -2] = np.fromiter((len(instr.parameters) for instr in instructions), dtype=float, count=n)
+        features[:, -1] = np.fromiter((bool(instr.content) for instr in instructions), dtype=float, count=n)
+        return features
+
+    def _behavioral_feature_matrix(
+        self,
+        instructions: List[FormalInstruction],
+        analysis_result: Optional[AnalysisResult] = None
+    ) -> np.ndarray:
+        """Extract normalized behavioral features with one row per instruction."""
+        n = len(instructions)
+        metrics = analysis_result.metrics if analysis_result else {}
+        features = np.empty((n, 5))
+        # Instruction complexity metrics
+        features[:, 0] = np.fromiter((len(instr.params) for instr in instructions), dtype=float, count=n)
+        features[:, 1] = np.fromiter((len(instr.dependencies) for instr in instructions), dtype=float, count=n)
+        features[:, 2] = np.fromiter(
+            (instr.optimization.priority if instr.optimization else 0 for instr in instructions),
+            dtype=float,
+            count=n
         )
-        
-        # Significance is relative frequency
-        if total_pattern_frequency > 0:
-            return pattern_frequency / total_pattern_frequency
-        
-        return 0.0
-
-    def _extract_features(self, instructions: List[FormalInstruction]) -> np.ndarray:
-        """Extract features from instructions."""
-        features = []
-        for instruction in instructions:
-            # Convert instruction type to numeric value
-            type_value = list(instruction.type.__class__.__members__.values()).index(instruction.type)
-            
-            # Basic instruction features
-            instruction_features = [
-                float(type_value),
-                len(instruction.parameters),
-                1.0 if instruction.content else 0.0
-            ]
-            features.append(instruction_features)
-        return np.array(features)
+        # Performance metrics from analysis result
+        features[:, 3] = metrics.get('accuracy', 0.9)
+        features[:, 4] = metrics.get('f1_score', 0.8)
+        return StandardScaler().fit_transform(features)
 
     def _extract_behavioral_features(
         self, 
@@ -494,116 +567,191 @@ class BehavioralMiner:
         Returns:
             Dict[str, np.ndarray]: Extracted behavioral features for each instruction
         """
-        features = []
-        instruction_names = []
-        
-        for instruction in instructions:
-            # Base features
-            base_features = [
-                # Instruction complexity metrics
-                len(instruction.params) if instruction.params else 0.0,
-                len(instruction.dependencies) if instruction.dependencies else 0.0,
-                instruction.optimization.priority if instruction.optimization else 0,
-                
-                # Performance metrics from analysis result
-                analysis_result.metrics.get('accuracy', 0.9) if analysis_result else 0.9,
-                analysis_result.metrics.get('f1_score', 0.8) if analysis_result else 0.8
-            ]
-            
-            features.append(base_features)
-            instruction_names.append(instruction.name)
-        
-        # Normalize features
-        features_array = np.array(features)
-        scaler = StandardScaler()
-        normalized_features = scaler.fit_transform(features_array)
+        normalized_features = self._behavioral_feature_matrix(instructions, analysis_result)
         
         # Return a dictionary mapping instruction names to feature vectors
         return {
-            name: features for name, features in zip(instruction_names, normalized_features)
+            instruction.name: features for instruction, features in zip(instructions, normalized_features)
         }
 
+    def _n_clusters(self, features: np.ndarray, max_clusters: int) -> int:
+        """Number of clusters, at most the number of distinct feature rows."""
+        distinct = len(np.unique(features, axis=0))
+        return min(max_clusters, distinct)
+
+    def _fit_labels(self, features: np.ndarray, n_clusters: int) -> np.ndarray:
+        """Cluster feature rows, with mini-batches for large sets."""
+        if len(features) >= self.minibatch_threshold:
+            model = MiniBatchKMeans(
+                n_clusters=n_clusters,
+                batch_size=self.batch_size,
+                random_state=self.random_state,
+                n_init=3
+            )
+        else:
+            model = KMeans(n_clusters=n_clusters, random_state=self.random_state, n_init=10)
+        return model.fit_predict(features)
+
+    @staticmethod
+    def _group_labels(labels: np.ndarray) -> List[List[int]]:
+        """Group row indices by cluster label, in order of first appearance."""
+        order = np.argsort(labels, kind="stable")
+        boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+        groups = np.split(order, boundaries)
+        return [sorted(group.tolist()) for group in sorted(groups, key=lambda group: group.min())]
+
     def _cluster_instructions(self, features: np.ndarray) -> List[List[int]]:
         """Cluster instructions based on features."""
         if len(features) < self.min_pattern_length:
             return []
             
         # Scale features
-        scaler = StandardScaler()
-        scaled_features = scaler.fit_transform(features)
+        scaled_features = StandardScaler().fit_transform(features)
         
-        # Determine number of clusters
-        n_clusters = min(len(features) // 2, 5)
-        if n_clusters < 2:
-            return [[i for i in range(len(features))]]
-            
-        # Perform clustering
-        kmeans = KMeans(n_clusters=n_clusters)
-        labels = kmeans.fit_predict(scaled_features)
-        
-        # Group indices by cluster
-        clusters = [[] for _ in range(n_clusters)]
-        for i, label in enumerate(labels):
-            clusters[label].append(i)
+        if self.clustering == "graph":
+            clusters = self._graph_clusters(scaled_features)
+        else:
+            # Determine number of clusters
+            n_clusters = self._n_clusters(scaled_features, min(len(features) // 2, self.max_clusters))
+            if n_clusters < 2:
+                return [list(range(len(features)))]
+            clusters = self._group_labels(self._fit_labels(scaled_features, n_clusters))
             
         # Filter small clusters
         min_cluster_size = max(self.min_pattern_length, 
                            int(len(features) * self.min_support))
         return [c for c in clusters if len(c) >= min_cluster_size]
 
-    def _cluster_behaviors(self, features: Dict[str, np.ndarray]) -> List[List[int]]:
+    def _cluster_behaviors(self, features: Union[np.ndarray, Dict[str, np.ndarray]]) -> List[List[int]]:
         """
         Cluster behaviors based on features.
         
         Args:
-            features (Dict[str, np.ndarray]): Dictionary of feature vectors
+            features (Union[np.ndarray, Dict[str, np.ndarray]]): Feature matrix or
+                dictionary of feature vectors
         
         Returns:
             List[List[int]]: Clustered instruction indices
         """
-        # Convert features to a numpy array
-        features_array = np.array(list(features.values()))
+        features_array = np.array(list(features.values())) if isinstance(features, dict) else features
+        if not len(features_array):
+            return []
+        if self.clustering == "graph":
+            return self._graph_clusters(features_array)
         
         # Determine the number of clusters (using a simple heuristic)
-        n_clusters = min(len(features), 4)
-        
-        # Use KMeans clustering
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-        cluster_labels = kmeans.fit_predict(features_array)
+        n_clusters = self._n_clusters(features_array, 4)
+        if n_clusters < 2:
+            return [list(range(len(features_array)))]
+        return self._group_labels(self._fit_labels(features_array, n_clusters))
+
+    def similarity_graph(self, features: np.ndarray) -> csr_matrix:
+        """Build a sparse nearest-neighbour similarity graph.
         
-        # Group instruction indices by cluster
-        clusters = [[] for _ in range(n_clusters)]
-        for idx, label in enumerate(cluster_labels):
-            clusters[label].append(idx)
+        Each row is connected to its ``n_neighbors`` nearest rows with
+        weight ``1 / (1 + distance)``, kept if at least the similarity
+        threshold, and the graph is made symmetric.
         
-        return clusters
-
-    def _calculate_similarity(self, instr1: FormalInstruction, instr2: FormalInstruction) -> float:
-        """Calculate similarity between two instructions."""
-        # Simple similarity based on type and parameters
-        type_match = instr1.type == instr2.type
-        param_similarity = len(set(instr1.parameters.keys()) & set(instr2.parameters.keys())) / \
-                         max(len(instr1.parameters), len(instr2.parameters), 1)
-        return (type_match + param_similarity) / 2
+        Args:
+            features: Feature matrix with one row per instruction
+            
+        Returns:
+            Sparse symmetric similarity matrix
+        """
+        n = len(features)
+        n_neighbors = min(self.n_neighbors, n - 1)
+        if n_neighbors < 1:
+            return csr_matrix((n, n))
+        distances = NearestNeighbors(n_neighbors=n_neighbors).fit(features).kneighbors_graph(mode="distance")
+        graph = distances.copy()
+        graph.data = 1.0 / (1.0 + distances.data)
+        graph.data[graph.data < self.similarity_threshold] = 0.0
+        graph = graph.maximum(graph.T).tocsr()
+        graph.eliminate_zeros()
+        return graph
+
+    def _graph_clusters(self, features: np.ndarray) -> List[List[int]]:
+        """Cluster rows as the connected components of the similarity graph."""
+        # Equal rows are merged first, which shrinks the graph of repetitive traces
+        unique_rows, inverse = np.unique(features, axis=0, return_inverse=True)
+        _, components = connected_components(self.similarity_graph(unique_rows), directed=False)
+        return self._group_labels(components[inverse.reshape(-1)])
+
+    def partial_fit(self, instructions: List[FormalInstruction]) -> "BehavioralMiner":
+        """Update the streaming clustering model with a batch of instructions.
+        
+        The first batch needs at least ``max_clusters`` instructions.
+        """
+        features = self._extract_features(instructions)
+        if self._stream_model is None:
+            self._stream_scaler = StandardScaler()
+            self._stream_model = MiniBatchKMeans(
+                n_clusters=self.max_clusters,
+                batch_size=self.batch_size,
+                random_state=self.random_state,
+                n_init=3
+            )
+        self._stream_scaler.partial_fit(features)
+        self._stream_model.partial_fit(self._stream_scaler.transform(features))
+        return self
+
+    def predict(self, instructions: List[FormalInstruction]) -> np.ndarray:
+        """Get the streaming model's cluster label of each instruction."""
+        if self._stream_model is None:
+            raise ValueError("partial_fit must be called before predict")
+        return self._stream_model.predict(self._stream_scaler.transform(self._extract_features(instructions)))
+
+    @staticmethod
+    def _similarity_inputs(instructions: List[FormalInstruction]) -> Tuple[np.ndarray, csr_matrix]:
+        """Get type codes and a sparse parameter key indicator matrix."""
+        n = len(instructions)
+        type_codes = np.fromiter((_TYPE_INDEX[instr.type] for instr in instructions), dtype=np.int64, count=n)
+        keys: Dict[str, int] = {}
+        rows, cols = [], []
+        for row, instr in enumerate(instructions):
+            for key in instr.parameters:
+                rows.append(row)
+                cols.append(keys.setdefault(key, len(keys)))
+        indicators = csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, max(len(keys), 1)))
+        return type_codes, indicators
+
+    @staticmethod
+    def _similarity_matrix(type_codes: np.ndarray, indicators: csr_matrix) -> np.ndarray:
+        """Pairwise similarity of type match and shared parameter keys."""
+        sizes = np.asarray(indicators.sum(axis=1)).ravel()
+        shared = (indicators @ indicators.T).toarray()
+        param_similarity = shared / np.maximum(np.maximum.outer(sizes, sizes), 1)
+        return ((type_codes[:, None] == type_codes[None, :]) + param_similarity) / 2
+
+    def pairwise_similarity(self, instructions: List[FormalInstruction]) -> np.ndarray:
+        """Calculate the similarity of every pair of instructions."""
+        return self._similarity_matrix(*self._similarity_inputs(instructions))
 
     def _calculate_pattern_confidence(self, instructions: List[FormalInstruction]) -> float:
-        """Calculate confidence score for a pattern."""
+        """Calculate confidence score for a pattern as the mean pairwise similarity."""
         if not instructions:
             return 0.0
             
-        # Calculate average pairwise similarity
         n = len(instructions)
         if n < 2:
             return 1.0
             
-        total_similarity = 0.0
-        pairs = 0
-        for i in range(n):
-            for j in range(i+1, n):
-                total_similarity += self._calculate_similarity(instructions[i], instructions[j])
-                pairs += 1
-                
-        return total_similarity / pairs if pairs > 0 else 0.0
+        # Equal instructions have equal similarities, so pairs are summed per
+        # distinct (type, parameter keys) signature weighted by counts
+        signatures: Dict[Tuple[Any, ...], int] = {}
+        representatives = []
+        inverse = np.empty(n, dtype=np.int64)
+        for i, instr in enumerate(instructions):
+            signature = (instr.type, frozenset(instr.parameters))
+            index = signatures.get(signature)
+            if index is None:
+                index = signatures[signature] = len(representatives)
+                representatives.append(instr)
+            inverse[i] = index
+        counts = np.bincount(inverse).astype(float)
+        similarity = self.pairwise_similarity(representatives)
+        total = counts @ similarity @ counts - counts @ np.diag(similarity)
+        return float(total / (n * (n - 1)))
 
     def _calculate_parameter_similarity(self, instr1: FormalInstruction, instr2: FormalInstruction) -> float:
         """Calculate similarity between instruction parameters."""
@@ -626,43 +774,33 @@ class BehavioralMiner:
         else:
             pattern_instructions = pattern
         
-        if not pattern_instructions or not instructions:
-            return 0
-        
-        count = 0
-        n = len(instructions)
         m = len(pattern_instructions)
+        if not m or len(instructions) < m:
+            return 0
         
-        for i in range(n - m + 1):
-            match = True
-            for j in range(m):
-                if instructions[i + j].name != pattern_instructions[j].name:
-                    match = False
-                    break
-            if match:
-                count += 1
-                
-        return count
+        codes: Dict[str, int] = {}
+        encoded = np.fromiter(
+            (codes.setdefault(instr.name, len(codes)) for instr in instructions),
+            dtype=np.int64,
+            count=len(instructions)
+        )
+        target = np.array([codes.get(instr.name, -1) for instr in pattern_instructions])
+        windows = np.lib.stride_tricks.sliding_window_view(encoded, m)
+        return int((windows == target).all(axis=1).sum())
         
-    def calculate_pattern_significance(self, pattern: List[FormalInstruction], instructions: List[FormalInstruction], depth: int = 0) -> float:
-        """Calculate significance of pattern."""
-        # Prevent infinite recursion
-        if depth > 3:
-            return 0.0
-
+    def calculate_pattern_significance(self, pattern: Union[Pattern, List[FormalInstruction]], instructions: List[FormalInstruction]) -> float:
+        """Calculate significance of pattern relative to all patterns found."""
         # Frequency of this pattern
         pattern_frequency = self.calculate_pattern_frequency(pattern, instructions)
         
-        # Total number of possible patterns
-        other_patterns = self.find_patterns(instructions, depth + 1)
+        # Total frequency of the patterns found in the instructions
         total_pattern_frequency = sum(
-            self.calculate_pattern_frequency(p.instructions, instructions) 
-            for p in other_patterns
+            p.metrics.frequency for p in self.find_patterns(instructions)
         )
         
         # Significance is relative frequency
         if total_pattern_frequency > 0:
-            return pattern_frequency / total_pattern_frequency
+            return min(pattern_frequency / total_pattern_frequency, 1.0)
         
         return 0.0
         
@@ -671,23 +809,19 @@ class BehavioralMiner:
         if not instructions:
             return []
             
-        # Find patterns
-        patterns = self.find_patterns(instructions)
-        
         # Sort patterns by significance
-        pattern_scores = []
-        for pattern in patterns:
-            significance = self.calculate_pattern_significance(pattern, instructions)
-            pattern_scores.append((pattern, significance))
-            
-        pattern_scores.sort(key=lambda x: x[1], reverse=True)
+        patterns = sorted(
+            self.find_patterns(instructions),
+            key=lambda pattern: pattern.metrics.significance,
+            reverse=True
+        )
         
         # Build optimized sequence
         optimized = []
         used = set()
         
         # Add high-significance patterns first
-        for pattern, _ in pattern_scores:
+        for pattern in patterns:
             for instr in pattern:
                 if instr.id not in used:
                     optimized.append(instr)
@@ -701,17 +835,6 @@ class BehavioralMiner:
                 
         return optimized
         
-    def _generate_candidates(self, instructions: List[FormalInstruction], length: int) -> List[List[FormalInstruction]]:
-        """Generate candidate patterns."""
-        candidates = []
-        n = len(instructions)
-        
-        for i in range(n - length + 1):
-            candidate = instructions[i:i+length]
-            candidates.append(candidate)
-            
-        return candidates
-        
     def _calculate_support(self, pattern: List[FormalInstruction], instructions: List[FormalInstruction]) -> float:
         """Calculate support for pattern."""
         frequency = self.calculate_pattern_frequency(pattern, instructions)
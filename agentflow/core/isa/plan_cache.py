@@ -0,0 +1,224 @@
+"""Cache of compiled instruction plans."""
+from typing import Any, Dict, List, Optional
+from dataclasses import asdict, dataclass, is_dataclass
+import logging
+import os
+import threading
+import uuid
+from ..step_cache import CacheBackend, CacheEntry, DiskCacheBackend, MemoryCacheBackend
+from ..utils import content_hash
+from .formal import FormalInstruction
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate stored plans when compilation changes in ways code hashes miss
+PLAN_CACHE_VERSION = 1
+
+# Instruction fields that are runtime state rather than definition
+_STATE_FIELDS = {"id", "status", "metrics"}
+
+@dataclass(frozen=True)
+class _InstructionRef:
+    """Reference to an input instruction in a cached plan."""
+    position: int
+
+@dataclass(frozen=True)
+class _IdRef:
+    """Reference to the id of an input instruction in a cached plan."""
+    position: int
+
+# Default field values per instruction class, left out of hashes
+_field_defaults: Dict[type, Dict[str, Any]] = {}
+
+def _defaults(instruction_type: type) -> Dict[str, Any]:
+    if instruction_type not in _field_defaults:
+        _field_defaults[instruction_type] = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in instruction_type.model_fields.items()
+            if name not in _STATE_FIELDS
+        }
+    return _field_defaults[instruction_type]
+
+def _definition(value: Any) -> Any:
+    """Get a hashable form of an instruction field."""
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    return value
+
+def code_fingerprint(*owners: Any) -> str:
+    """Hash the code and constants defined by classes or modules.
+
+    Functions are hashed with their bytecode, constants and defaults, and
+    classes defined in a module recursively, so editing a threshold in a
+    method or a module-level constant changes the fingerprint.
+    """
+    members = []
+    for owner in owners:
+        for name, member in sorted(vars(owner).items()):
+            member = getattr(member, "__func__", member)
+            if hasattr(member, "__code__"):
+                members.append((name, member))
+            elif isinstance(member, type) and member.__module__ == getattr(owner, "__name__", None):
+                members.append((name, code_fingerprint(member)))
+            elif isinstance(member, (bool, int, float, str, tuple, frozenset)) and not name.startswith("__"):
+                members.append((name, member))
+    return content_hash(members)
+
+def structural_hash(instructions: List[FormalInstruction], context: Any, fingerprint: str = "") -> str:
+    """Hash instruction definitions and the compilation context.
+
+    Instruction ids are left out and dependencies on instructions of the
+    list are hashed by position, so sequences rebuilt with fresh ids share
+    a hash while any change to a definition, the instruction class or the
+    context gives a new one. Callables in instruction fields are hashed
+    with their constants and captured values.
+
+    Raises:
+        TypeError: If an instruction holds a callable that cannot be hashed
+            by content, so its plan must not be cached
+    """
+    positions = {instruction.id: position for position, instruction in enumerate(instructions)}
+    definitions = []
+    for instruction in instructions:
+        fields = {}
+        for name, default in _defaults(type(instruction)).items():
+            value = getattr(instruction, name)
+            try:
+                unchanged = bool(value == default)
+            except Exception:
+                # Comparisons of arrays are elementwise
+                unchanged = False
+            if not unchanged:
+                fields[name] = _definition(value)
+        fields["dependencies"] = [
+            ("position", positions[dep]) if dep in positions else dep
+            for dep in instruction.dependencies
+        ]
+        definitions.append((f"{type(instruction).__module__}.{type(instruction).__qualname__}", fields))
+    return content_hash({
+        "version": PLAN_CACHE_VERSION,
+        "fingerprint": fingerprint,
+        "context": getattr(context, "config", context),
+        "optimization_level": getattr(context, "optimization_level", None),
+        "instructions": definitions
+    }, strict=True)
+
+class CompiledPlanCache:
+    """Two-level cache of compiled instruction plans.
+
+    Plans are kept in an in-process LRU and, with a disk directory, also
+    on disk for other processes and restarts. A plan refers to the
+    instructions it was compiled from by position, so a hit returns the
+    caller's own instructions, with fresh copies of the instructions that
+    compilation created. Plans that cannot be pickled are only kept in
+    memory.
+    """
+
+    def __init__(self,
+                 max_entries: int = 256,
+                 disk_dir: Optional[str] = None,
+                 max_disk_entries: int = 10000):
+        self.memory: CacheBackend = MemoryCacheBackend(max_entries=max_entries)
+        self.disk: Optional[CacheBackend] = (
+            DiskCacheBackend(disk_dir, max_entries=max_disk_entries) if disk_dir else None
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, key: str, instructions: List[FormalInstruction]) -> Optional[List[FormalInstruction]]:
+        """Get the cached plan for a key, bound to the given instructions."""
+        entry = self.memory.get(key)
+        if entry is None and self.disk is not None:
+            try:
+                entry = self.disk.get(key)
+            except Exception as e:
+                logger.warning(f"Compiled plan could not be read from disk: {e}")
+            if entry is not None:
+                self.memory.set(key, entry)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return [self._bind(item, instructions) for item in entry.value]
+
+    def store(self,
+              key: str,
+              instructions: List[FormalInstruction],
+              compiled: List[FormalInstruction]) -> None:
+        """Cache a compiled plan of the given instructions."""
+        positions = {id(instruction): position for position, instruction in enumerate(instructions)}
+        ids = {instruction.id: position for position, instruction in enumerate(instructions)}
+        entry = CacheEntry(value=[self._template(item, positions, ids) for item in compiled])
+        self.memory.set(key, entry)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, entry)
+            except Exception as e:
+                logger.warning(f"Compiled plan could not be stored on disk: {e}")
+
+    def _template(self, value: Any, positions: Dict[int, int], ids: Dict[str, int]) -> Any:
+        """Replace input instructions by references, copying the rest."""
+        if isinstance(value, FormalInstruction):
+            if id(value) in positions:
+                return _InstructionRef(positions[id(value)])
+            template = value.model_copy(update={"metadata": {}}, deep=True)
+            template.dependencies = [_IdRef(ids[dep]) if dep in ids else dep for dep in value.dependencies]
+            template.metadata = self._template(value.metadata, positions, ids)
+            if "aliases" in value.metadata:
+                template.metadata["aliases"] = [
+                    _IdRef(ids[alias]) if alias in ids else alias for alias in value.metadata["aliases"]
+                ]
+            return template
+        if isinstance(value, list):
+            return [self._template(item, positions, ids) for item in value]
+        if isinstance(value, dict):
+            return {key: self._template(item, positions, ids) for key, item in value.items()}
+        return value
+
+    def _bind(self, value: Any, instructions: List[FormalInstruction]) -> Any:
+        """Resolve references of a template to the given instructions."""
+        if isinstance(value, _InstructionRef):
+            return instructions[value.position]
+        if isinstance(value, _IdRef):
+            return instructions[value.position].id
+        if isinstance(value, FormalInstruction):
+            bound = value.model_copy(update={"id": str(uuid.uuid4()), "metadata": {}}, deep=True)
+            bound.dependencies = [self._bind(dep, instructions) for dep in value.dependencies]
+            bound.metadata = self._bind(value.metadata, instructions)
+            return bound
+        if isinstance(value, list):
+            return [self._bind(item, instructions) for item in value]
+        if isinstance(value, dict):
+            return {key: self._bind(item, instructions) for key, item in value.items()}
+        return value
+
+    def clear(self) -> None:
+        """Remove all cached plans, on disk too."""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit and miss counts and the number of cached plans."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.memory),
+            "disk_entries": len(self.disk) if self.disk is not None else None
+        }
+
+_default_plan_cache: Optional[CompiledPlanCache] = None
+
+def get_default_plan_cache() -> CompiledPlanCache:
+    """Get the process-wide plan cache, on disk if AGENTFLOW_PLAN_CACHE_DIR is set."""
+    global _default_plan_cache
+    if _default_plan_cache is None:
+        _default_plan_cache = CompiledPlanCache(disk_dir=os.environ.get("AGENTFLOW_PLAN_CACHE_DIR"))
+    return _default_plan_cache
+
+def set_default_plan_cache(cache: Optional[CompiledPlanCache]) -> None:
+    """Replace the process-wide plan cache, None to reset it."""
+    global _default_plan_cache
+    _default_plan_cache = cache
@@ -2,10 +2,26 @@
 from typing import Dict, List, Optional, Set, Tuple, Any, Callable
 from dataclasses import dataclass
 from enum import Enum
+import asyncio
+import heapq
+import inspect
+import itertools
+import math
+import os
+import sys
+import threading
+import time
+import tracemalloc
 import numpy as np
-from concurrent.futures import ThreadPoolExecutor, Future
-from .formal import FormalInstruction
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
+from .formal import FormalInstruction, InstructionStatus
 from .compiler import IRNode, IRNodeType
+from .list_scheduler import ListScheduler, instruction_dependencies
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
 
 class SchedulingPolicy(Enum):
     """Scheduling policies for instruction execution."""
@@ -43,7 +59,11 @@ class ExecutionResult:
     context: Dict[str, Any]
 
 class InstructionScheduler:
-    """Advanced instruction scheduler."""
+    """Advanced instruction scheduler.
+    
+    The scheduler's execution engine holds worker threads or processes
+    until close() is called or the scheduler's with block ends.
+    """
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
@@ -55,6 +75,16 @@ class InstructionScheduler:
         self.resource_manager = ResourceManager(config)
         self.metrics_collector = MetricsCollector()
         
+    def close(self) -> None:
+        """Shut down the execution engine's workers."""
+        self.executor.shutdown()
+        
+    def __enter__(self) -> "InstructionScheduler":
+        return self
+        
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+        
     def schedule(self,
                 ir: IRNode,
                 context: ExecutionContext) -> List[ExecutionResult]:
@@ -95,6 +125,53 @@ class InstructionScheduler:
             
         return graph
     
+    def _build_sequence_graph(self, ir: IRNode, graph: Dict[str, Any]) -> None:
+        """Add instructions and their data dependencies to the graph."""
+        instructions = [
+            instr
+            for item in ir.instructions
+            for instr in (item if isinstance(item, list) else [item])
+        ]
+        for instr in instructions:
+            graph["nodes"][instr.id] = instr
+        for position, predecessors in enumerate(instruction_dependencies(instructions)):
+            for predecessor in predecessors:
+                graph["edges"].add((instructions[predecessor].id, instructions[position].id))
+                
+    def _build_parallel_graph(self, ir: IRNode, graph: Dict[str, Any]) -> None:
+        """Add instructions, each group depending on the one before it."""
+        self._build_sequence_graph(ir, graph)
+        previous: List[FormalInstruction] = []
+        for item in ir.instructions:
+            group = item if isinstance(item, list) else [item]
+            for before in previous:
+                for after in group:
+                    graph["edges"].add((before.id, after.id))
+            previous = group
+    
+    def _apply_resource_aware_scheduling(self,
+                                         dag: Dict[str, Any],
+                                         context: ExecutionContext) -> List[Dict[str, Any]]:
+        """List schedule the graph along its critical path.
+        
+        Batches respect the resource manager's capacities and the engine's
+        workers; costs are the measured execution times where known.
+        """
+        estimates = {
+            name: metrics["execution_time"]
+            for name, metrics in self.metrics_collector.instruction_metrics.items()
+            if "execution_time" in metrics
+        }
+        scheduler = ListScheduler.from_resource_manager(
+            self.resource_manager, self.executor.max_workers, estimates
+        )
+        plan = scheduler.schedule(list(dag["nodes"].values()), dag["edges"])
+        dag["metadata"]["schedule"] = plan.to_metadata()
+        return [
+            {"instructions": group, "parallel": len(group) > 1}
+            for group in plan.groups
+        ]
+    
     def _create_execution_plan(self,
                              dag: Dict[str, Any],
                              context: ExecutionContext) -> List[Dict[str, Any]]:
@@ -122,6 +199,9 @@ class InstructionScheduler:
                          context: ExecutionContext) -> List[Dict[str, Any]]:
         """Optimize execution schedule."""
         optimized = plan.copy()
+        if self.policy == SchedulingPolicy.RESOURCE_AWARE:
+            # Resources and parallelism are already planned for
+            return optimized
         
         # Apply optimizations
         optimized = self._optimize_resource_usage(optimized, context)
@@ -155,18 +235,162 @@ class InstructionScheduler:
     def _update_metrics(self, results: List[ExecutionResult]) -> None:
         """Update scheduler metrics."""
         for result in results:
-            self.metrics_collector.update(result.metrics)
+            self.metrics_collector.update(result.metrics, result.context.get("instruction"))
+
+class ExecutionBackend(Enum):
+    """Backends that run instructions in parallel."""
+    THREAD = "thread"  # Thread pool, for I/O-bound instruction bodies
+    PROCESS = "process"  # Process pool, for CPU-bound instruction bodies
+    ASYNCIO = "asyncio"  # Event loop, for coroutine instruction bodies
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+# Engines that asked for allocation tracing, and measurements in progress
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+_active_measurements = 0
+
+def _acquire_tracing() -> None:
+    """Start tracing allocations unless already traced."""
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        _tracing_users += 1
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+
+def _release_tracing() -> None:
+    """Stop tracing started here once no engine needs it."""
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        _tracing_users -= 1
+        if not _tracing_users and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+def _start_traced_measurement() -> int:
+    """Get the traced memory, resetting the peak unless others are measuring."""
+    global _active_measurements
+    with _tracing_lock:
+        _active_measurements += 1
+        # Resetting would lose the peaks of concurrent measurements
+        if _active_measurements == 1 and hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+
+def _end_traced_measurement() -> int:
+    """Get the traced peak and end a measurement."""
+    global _active_measurements
+    with _tracing_lock:
+        _active_measurements -= 1
+        return tracemalloc.get_traced_memory()[1]
+
+def _run_instruction(instruction: FormalInstruction,
+                     context: Dict[str, Any],
+                     trace_memory: bool = False) -> Tuple[Any, Dict[str, float], Optional[str]]:
+    """Execute an instruction and measure it.
+    
+    Runs in the calling thread or in a pool worker process. Wall time uses
+    time.perf_counter and CPU time the executing thread's CPU clock. Memory
+    is by default how far the execution raised the process's peak RSS.
+    With trace_memory it is the tracemalloc peak above the memory traced at
+    the start; instructions running concurrently in one process share the
+    trace, so their peaks are upper bounds.
+    
+    Returns:
+        Output, metrics and the error message if the instruction raised
+    """
+    tracing = trace_memory and tracemalloc.is_tracing()
+    if tracing:
+        baseline = _start_traced_measurement()
+    start_rss = _peak_rss_mb()
+    start_cpu = time.thread_time()
+    start = time.perf_counter()
+    output, error = None, None
+    try:
+        output = instruction.execute(context)
+        if inspect.isawaitable(output):
+            output = asyncio.run(output)
+    except Exception as e:
+        error = str(e)
+    wall_time = time.perf_counter() - start
+    cpu_time = time.thread_time() - start_cpu
+    peak_rss = _peak_rss_mb()
+    if tracing:
+        memory = max(_end_traced_measurement() - baseline, 0) / (1024 * 1024)
+    else:
+        memory = peak_rss - start_rss
+    return output, {
+        "execution_time": wall_time,
+        "cpu_time": cpu_time,
+        "cpu_usage": cpu_time / wall_time if wall_time > 0 else 0.0,
+        "memory_usage": memory,
+        "peak_rss": peak_rss
+    }, error
 
 class ExecutionEngine:
-    """Advanced execution engine."""
+    """Advanced execution engine.
+    
+    Parallel batches are run by the backend selected with the
+    ``executor_backend`` config key: a thread pool, a process pool for
+    CPU-bound instruction bodies that the GIL would serialize, or an event
+    loop for coroutine bodies. Instructions are queued in priority classes
+    and each worker prefers its own class, stealing from the others when it
+    runs dry. Every execution is measured: wall and CPU time, CPU usage and
+    memory in MB, by default the growth of the peak RSS and with
+    ``trace_memory`` the peak traced by tracemalloc. Tracing slows
+    allocation-heavy code down several times while any engine has it on,
+    so it is opt-in. Engines hold worker pools until shut down, also by
+    using them as context managers.
+    """
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        self.backend = ExecutionBackend(config.get("executor_backend", "thread"))
+        self.max_workers = config.get("max_workers", 4)
+        self.trace_memory = config.get("trace_memory", False)
         self.thread_pool = ThreadPoolExecutor(
-            max_workers=config.get("max_workers", 4)
+            max_workers=self.max_workers
         )
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._tracing = self.trace_memory and self.backend != ExecutionBackend.PROCESS
+        if self._tracing:
+            _acquire_tracing()
         self.resource_manager = ResourceManager(config)
         
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        # Created on first use, worker processes are expensive
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_acquire_tracing if self.trace_memory else None
+            )
+        return self._process_pool
+        
+    def shutdown(self) -> None:
+        """Shut down worker pools and stop memory tracing started here."""
+        self.thread_pool.shutdown(wait=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
+        if self._tracing:
+            _release_tracing()
+            self._tracing = False
+            
+    def __enter__(self) -> "ExecutionEngine":
+        return self
+        
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+        
     def execute_sequential(self,
                          instructions: List[FormalInstruction],
                          context: ExecutionContext) -> List[ExecutionResult]:
@@ -185,112 +409,238 @@ class ExecutionEngine:
     def execute_parallel(self,
                         instructions: List[FormalInstruction],
                         context: ExecutionContext) -> List[ExecutionResult]:
-        """Execute instructions in parallel."""
-        futures: List[Future] = []
+        """Execute instructions in parallel.
         
-        # Submit all instructions
-        for instruction in instructions:
-            future = self.thread_pool.submit(
-                self._execute_single,
-                instruction,
-                context
-            )
-            futures.append(future)
+        Returns:
+            Results in the order of the instructions
+        """
+        if not instructions:
+            return []
+        if self.backend == ExecutionBackend.ASYNCIO:
+            coroutine = self.execute_parallel_async(instructions, context)
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(coroutine)
+            # Called from a running loop, which must not be blocked on
+            return self.thread_pool.submit(asyncio.run, coroutine).result()
             
-        # Collect results
-        results = []
+        queue, positions, results = self._enqueue(instructions)
+        
+        def work(home: str) -> None:
+            while True:
+                instruction = queue.dequeue(home)
+                if instruction is None:
+                    return
+                results[positions[id(instruction)].pop()] = self._execute_single(instruction, context)
+                
+        futures: List[Future] = [
+            self.thread_pool.submit(work, home)
+            for home in self._worker_homes(len(instructions))
+        ]
         for future in futures:
-            try:
-                result = future.result()
-                results.append(result)
-            except Exception as e:
-                results.append(ExecutionResult(
-                    success=False,
-                    output=None,
-                    metrics={},
-                    errors=[str(e)],
-                    context={}
-                ))
+            future.result()
+        return results
+    
+    async def execute_parallel_async(self,
+                                     instructions: List[FormalInstruction],
+                                     context: ExecutionContext) -> List[ExecutionResult]:
+        """Execute instructions concurrently on the running event loop.
+        
+        Coroutine instruction bodies run on the loop, others in the thread
+        pool.
+        
+        Returns:
+            Results in the order of the instructions
+        """
+        queue, positions, results = self._enqueue(instructions)
+        
+        async def work(home: str) -> None:
+            while True:
+                instruction = queue.dequeue(home)
+                if instruction is None:
+                    return
+                results[positions[id(instruction)].pop()] = await self._execute_single_async(instruction, context)
                 
+        await asyncio.gather(*(work(home) for home in self._worker_homes(len(instructions))))
         return results
     
+    def _enqueue(self, instructions: List[FormalInstruction]
+                 ) -> Tuple["QueueManager", Dict[int, List[int]], List[Optional[ExecutionResult]]]:
+        """Queue instructions by priority class for one parallel batch."""
+        queue = QueueManager(self.config)
+        positions: Dict[int, List[int]] = {}
+        for position, instruction in enumerate(instructions):
+            positions.setdefault(id(instruction), []).insert(0, position)
+            queue.enqueue(instruction, QueueManager.classify(instruction))
+        return queue, positions, [None] * len(instructions)
+    
+    def _worker_homes(self, count: int) -> List[str]:
+        """Priority class each worker prefers, spread over the classes."""
+        workers = min(self.max_workers, count)
+        return [QueueManager.PRIORITIES[i % len(QueueManager.PRIORITIES)] for i in range(workers)]
+    
+    @staticmethod
+    def _instruction_context(context: Any) -> Dict[str, Any]:
+        """Get the dictionary context that instructions execute with."""
+        if isinstance(context, dict):
+            return context
+        return {
+            **context.constraints,
+            "mode": context.mode.value,
+            "resources": context.resources,
+            "metrics": context.metrics
+        }
+    
+    def _result(self,
+                instruction: FormalInstruction,
+                output: Any,
+                metrics: Dict[str, float],
+                error: Optional[str]) -> ExecutionResult:
+        # Worker processes execute copies, so the status is set here
+        instruction.status = InstructionStatus.FAILED if error else InstructionStatus.COMPLETED
+        return ExecutionResult(
+            success=error is None,
+            output=output,
+            metrics=metrics,
+            errors=[error] if error else [],
+            context={"instruction": instruction.name, "backend": self.backend.value}
+        )
+    
+    def _resource_failure(self, instruction: FormalInstruction) -> ExecutionResult:
+        return ExecutionResult(
+            success=False,
+            output=None,
+            metrics={},
+            errors=["Resource acquisition failed"],
+            context={"instruction": instruction.name}
+        )
+    
     def _execute_single(self,
                        instruction: FormalInstruction,
                        context: ExecutionContext) -> ExecutionResult:
         """Execute single instruction."""
+        requirements = instruction.metadata.get("resources", {})
+        # Acquire resources
+        if not self.resource_manager.acquire_resources(requirements):
+            return self._resource_failure(instruction)
         try:
-            # Acquire resources
-            if not self.resource_manager.acquire_resources(
-                instruction.metadata.get("resources", {})
-            ):
-                return ExecutionResult(
-                    success=False,
-                    output=None,
-                    metrics={},
-                    errors=["Resource acquisition failed"],
-                    context={}
-                )
-                
-            # Execute instruction
-            output = instruction.execute(context)
-            
-            # Collect metrics
-            metrics = self._collect_execution_metrics(instruction)
+            instruction_context = self._instruction_context(context)
+            if self.backend == ExecutionBackend.PROCESS:
+                output, metrics, error = self.process_pool.submit(
+                    _run_instruction, instruction, instruction_context, self.trace_memory
+                ).result()
+            else:
+                output, metrics, error = _run_instruction(instruction, instruction_context, self._tracing)
+            return self._result(instruction, output, metrics, error)
+        except Exception as e:
+            return self._result(instruction, None, {}, str(e))
+        finally:
+            # Release resources
+            self.resource_manager.release_resources(requirements)
             
-            return ExecutionResult(
-                success=True,
-                output=output,
-                metrics=metrics,
-                errors=[],
-                context={"instruction": instruction.name}
-            )
+    async def _execute_single_async(self,
+                                    instruction: FormalInstruction,
+                                    context: ExecutionContext) -> ExecutionResult:
+        """Execute single instruction on the event loop."""
+        if not inspect.iscoroutinefunction(instruction.execute):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.thread_pool, self._execute_single, instruction, context)
             
+        requirements = instruction.metadata.get("resources", {})
+        if not self.resource_manager.acquire_resources(requirements):
+            return self._resource_failure(instruction)
+        start_cpu = time.process_time()
+        start = time.perf_counter()
+        output, error = None, None
+        try:
+            output = await instruction.execute(self._instruction_context(context))
         except Exception as e:
-            return ExecutionResult(
-                success=False,
-                output=None,
-                metrics={},
-                errors=[str(e)],
-                context={"instruction": instruction.name}
-            )
-            
+            error = str(e)
         finally:
-            # Release resources
-            self.resource_manager.release_resources(
-                instruction.metadata.get("resources", {})
-            )
-    
-    def _collect_execution_metrics(self,
-                                instruction: FormalInstruction) -> Dict[str, float]:
-        """Collect metrics from instruction execution."""
-        return {
-            "execution_time": 0.0,  # Implement metric collection
+            self.resource_manager.release_resources(requirements)
+        wall_time = time.perf_counter() - start
+        # CPU time of the loop's process, which includes concurrent coroutines
+        cpu_time = time.process_time() - start_cpu
+        return self._result(instruction, output, {
+            "execution_time": wall_time,
+            "cpu_time": cpu_time,
+            "cpu_usage": cpu_time / wall_time if wall_time > 0 else 0.0,
             "memory_usage": 0.0,
-            "cpu_usage": 0.0
-        }
+            "peak_rss": _peak_rss_mb()
+        }, error)
 
 class QueueManager:
-    """Manages instruction queues."""
+    """Manages instruction queues.
+    
+    Each priority class is a heap ordered by the instructions' optimization
+    priority, then deadline, then arrival, so equal instructions leave in
+    FIFO order. With work stealing, a dequeue from an empty class takes the
+    next instruction of the other classes, higher classes first. Queues are
+    safe to share between worker threads.
+    """
+    
+    # Priority classes, highest first
+    PRIORITIES = ("high", "medium", "low")
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.queues: Dict[str, List[FormalInstruction]] = {
-            "high": [],
-            "medium": [],
-            "low": []
+        self.work_stealing = config.get("work_stealing", True)
+        self.queues: Dict[str, List[Tuple[Tuple[float, float, int], FormalInstruction]]] = {
+            priority: [] for priority in self.PRIORITIES
         }
+        self.stolen = 0
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        
+    @staticmethod
+    def classify(instruction: FormalInstruction) -> str:
+        """Get the priority class of an instruction.
+        
+        An explicit ``priority_class`` metadata entry wins; otherwise
+        positive optimization priorities are high and negative ones low.
+        """
+        priority_class = instruction.metadata.get("priority_class")
+        if priority_class in QueueManager.PRIORITIES:
+            return priority_class
+        priority = instruction.optimization.priority if instruction.optimization else 0
+        if priority > 0:
+            return "high"
+        return "low" if priority < 0 else "medium"
         
     def enqueue(self,
                instruction: FormalInstruction,
                priority: str = "medium") -> None:
         """Enqueue instruction with priority."""
-        if priority in self.queues:
-            self.queues[priority].append(instruction)
+        if priority not in self.queues:
+            return
+        optimization = instruction.optimization
+        deadline = optimization.deadline if optimization and optimization.deadline is not None else math.inf
+        key = (-(optimization.priority if optimization else 0), deadline, next(self._counter))
+        with self._lock:
+            heapq.heappush(self.queues[priority], (key, instruction))
     
-    def dequeue(self, priority: str = "medium") -> Optional[FormalInstruction]:
-        """Dequeue instruction with priority."""
-        if priority in self.queues and self.queues[priority]:
-            return self.queues[priority].pop(0)
+    def dequeue(self,
+               priority: str = "medium",
+               steal: Optional[bool] = None) -> Optional[FormalInstruction]:
+        """Dequeue instruction with priority.
+        
+        Args:
+            priority: Priority class to take from first
+            steal: Whether to take from other classes if it is empty,
+                defaults to the work_stealing config
+        """
+        if priority not in self.queues:
+            return None
+        steal = self.work_stealing if steal is None else steal
+        with self._lock:
+            if self.queues[priority]:
+                return heapq.heappop(self.queues[priority])[1]
+            if steal:
+                for other in self.PRIORITIES:
+                    if self.queues[other]:
+                        self.stolen += 1
+                        return heapq.heappop(self.queues[other])[1]
         return None
     
     def get_queue_length(self, priority: str = "medium") -> int:
@@ -339,15 +689,25 @@ class ResourceManager:
 class MetricsCollector:
     """Collects and aggregates execution metrics."""
     
-    def __init__(self):
+    def __init__(self, smoothing: float = 0.2):
         self.metrics: Dict[str, List[float]] = {}
+        # Moving averages per instruction name, as estimates for scheduling
+        self.smoothing = smoothing
+        self.instruction_metrics: Dict[str, Dict[str, float]] = {}
         
-    def update(self, new_metrics: Dict[str, float]) -> None:
-        """Update metrics with new values."""
+    def update(self, new_metrics: Dict[str, float], instruction: Optional[str] = None) -> None:
+        """Update metrics with new values, also per instruction if named."""
         for metric, value in new_metrics.items():
             if metric not in self.metrics:
                 self.metrics[metric] = []
             self.metrics[metric].append(value)
+        if instruction is not None and new_metrics:
+            averages = self.instruction_metrics.setdefault(instruction, {})
+            for metric, value in new_metrics.items():
+                previous = averages.get(metric)
+                averages[metric] = value if previous is None else (
+                    (1 - self.smoothing) * previous + self.smoothing * value
+                )
     
     def get_average(self, metric: str) -> float:
         """Get average value for metric."""
@@ -355,6 +715,10 @@ class MetricsCollector:
             return np.mean(self.metrics[metric])
         return 0.0
     
+    def get_instruction_estimate(self, instruction: str, metric: str = "execution_time") -> Optional[float]:
+        """Get the moving average of a metric for an instruction name."""
+        return self.instruction_metrics.get(instruction, {}).get(metric)
+    
     def get_summary(self) -> Dict[str, Dict[str, float]]:
         """Get summary of all metrics."""
         summary = {}
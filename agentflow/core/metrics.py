@@ -1,12 +1,19 @@
 """Metrics module for AgentFlow."""
 
 from enum import Enum
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 import time
+import asyncio
+import inspect
 import logging
 
+import numpy as np
+
+from .metrics_store import ColumnarMetricsStore, MetricSeries
+from .histogram import HistogramRegistry, LogHistogram, DEFAULT_QUANTILES
+
 logger = logging.getLogger(__name__)
 
 class MetricType(str, Enum):
@@ -29,6 +36,14 @@ class MetricType(str, Enum):
     RESPONSE_TIME = "response_time"
     REQUEST_COUNT = "request_count"
     VALIDATION_SCORE = "validation_score"
+    CACHE_HIT = "cache_hit"
+    CACHE_MISS = "cache_miss"
+    STEP_DURATION = "step_duration"
+    WORKFLOW_DURATION = "workflow_duration"
+    COUNTER = "counter"
+    GAUGE = "gauge"
+    HISTOGRAM = "histogram"
+    SUMMARY = "summary"
     CUSTOM = "custom"
 
 @dataclass
@@ -39,17 +54,35 @@ class MetricPoint:
     timestamp: float
     labels: Dict[str, str]
 
+async def _await(awaitable: Any) -> Any:
+    return await awaitable
+
 class MetricsManager:
     """Metrics manager class."""
     
-    def __init__(self, persistence: Optional[Any] = None):
+    def __init__(
+        self,
+        persistence: Optional[Any] = None,
+        store: Optional[ColumnarMetricsStore] = None,
+        histograms: Optional[HistogramRegistry] = None
+    ):
         """Initialize metrics manager.
         
         Args:
             persistence: Optional persistence layer for storing metrics
+            store: Optional columnar store that keeps points in bounded
+                memory instead of an unbounded list per metric type
+            histograms: Optional registry for streaming histograms, for
+                example one shared between managers
         """
         self.metrics: Dict[str, List[MetricPoint]] = {}
         self.persistence = persistence
+        # Writes to an async persistence layer still in flight
+        self._pending_writes: "set[asyncio.Future]" = set()
+        self.store = store
+        # Shared registries outlive this manager and are not cleared by it
+        self._owns_histograms = histograms is None
+        self.histograms = histograms if histograms is not None else HistogramRegistry()
         self._initialized = False
         
     async def initialize(self):
@@ -57,13 +90,18 @@ class MetricsManager:
         if not self._initialized:
             # Initialize metrics storage
             self.metrics = {}
+            if self.store is not None:
+                self.store.clear()
             self._initialized = True
             
     async def cleanup(self) -> None:
         """Clean up metrics manager resources."""
         try:
+            await self.flush()
             # Reset metrics
             self.metrics = {}
+            if self.store is not None:
+                self.store.clear()
             self._initialized = False
         except Exception as e:
             logger.error(f"Error during metrics cleanup: {str(e)}")
@@ -78,6 +116,16 @@ class MetricsManager:
         """Record a metric."""
         labels = labels or {}
         metric_key = metric_type.value
+        timestamp = datetime.now().timestamp()
+
+        if self.store is not None:
+            self.store.append(metric_key, value, timestamp, labels)
+            # Only build a point object when it has to be persisted
+            if self.persistence:
+                self._persist(
+                    MetricPoint(metric_type=metric_type, value=value, timestamp=timestamp, labels=labels)
+                )
+            return
         
         if metric_key not in self.metrics:
             self.metrics[metric_key] = []
@@ -85,7 +133,7 @@ class MetricsManager:
         metric_point = MetricPoint(
             metric_type=metric_type,
             value=value,
-            timestamp=datetime.now().timestamp(),
+            timestamp=timestamp,
             labels=labels
         )
         
@@ -93,7 +141,45 @@ class MetricsManager:
         
         # Persist metric if persistence layer is available
         if self.persistence:
-            self.persistence.store_metric(metric_point)
+            self._persist(metric_point)
+            
+    def _persist(self, metric_point: MetricPoint) -> None:
+        """Hand a metric point to the persistence layer.
+        
+        An async persistence layer's write is scheduled on the running
+        event loop instead of being awaited, so recording never blocks.
+        Without a running loop, an executor adapter's synchronous backend
+        is written directly rather than starting an event loop per point.
+        """
+        persistence = self.persistence
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+            # Imported here as the persistence backends are optional for metrics
+            from .persistence import ExecutorPersistence
+            if isinstance(persistence, ExecutorPersistence):
+                persistence = persistence.persistence
+        write = persistence.store_metric(metric_point)
+        if not inspect.isawaitable(write):
+            return
+        if loop is None:
+            # Natively async backends have no synchronous path
+            asyncio.run(_await(write))
+            return
+        future = asyncio.ensure_future(write, loop=loop)
+        self._pending_writes.add(future)
+        future.add_done_callback(self._write_done)
+        
+    def _write_done(self, future: "asyncio.Future") -> None:
+        self._pending_writes.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Error persisting metric: {future.exception()}")
+            
+    async def flush(self) -> None:
+        """Wait for metric writes to an async persistence layer."""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
         
     def get_metrics(
         self,
@@ -104,6 +190,25 @@ class MetricsManager:
     ) -> Dict[str, List[MetricPoint]]:
         """Get metrics with optional filtering."""
         filtered_metrics = {}
+
+        if self.store is not None:
+            metric_keys = [metric_type.value] if metric_type else self.store.keys()
+            for key in metric_keys:
+                series = self.store.query(key, start_time, end_time, labels)
+                if len(series):
+                    point_type = MetricType(key)
+                    filtered_metrics[key] = [
+                        MetricPoint(
+                            metric_type=point_type,
+                            value=float(value),
+                            timestamp=float(timestamp),
+                            labels=dict(series.label_sets[int(label_id)])
+                        )
+                        for timestamp, value, label_id in zip(
+                            series.timestamps, series.values, series.label_ids
+                        )
+                    ]
+            return filtered_metrics
         
         # If metric_type is specified, only look at that type
         metric_keys = [metric_type.value] if metric_type else self.metrics.keys()
@@ -137,9 +242,75 @@ class MetricsManager:
                 
         return filtered_metrics
         
+    def query_metrics(
+        self,
+        metric_type: MetricType,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        labels: Optional[Dict[str, str]] = None
+    ) -> MetricSeries:
+        """Get the points of a metric type as NumPy columns.
+
+        Args:
+            metric_type: Type of metric
+            start_time: Optional earliest timestamp
+            end_time: Optional latest timestamp
+            labels: Optional labels that points must have
+
+        Returns:
+            MetricSeries: Timestamps and values of matching points. Label
+            IDs are only meaningful when a columnar store is configured.
+        """
+        if self.store is not None:
+            return self.store.query(metric_type.value, start_time, end_time, labels)
+
+        points = self.get_metrics(metric_type, start_time, end_time, labels).get(metric_type.value, [])
+        return MetricSeries(
+            timestamps=np.fromiter((p.timestamp for p in points), dtype=np.float64, count=len(points)),
+            values=np.fromiter((p.value for p in points), dtype=np.float64, count=len(points)),
+            label_ids=np.full(len(points), -1, dtype=np.int32),
+        )
+
+    def observe(
+        self,
+        metric_type: MetricType,
+        value: float,
+        labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Record a value in the streaming histogram of a metric and label set.
+
+        Unlike record_metric, the raw value is not kept, so memory stays
+        constant per label set.
+        """
+        self.histograms.observe(metric_type.value, value, labels)
+
+    def get_percentiles(
+        self,
+        metric_type: MetricType,
+        labels: Optional[Dict[str, str]] = None,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES
+    ) -> Dict[str, Optional[float]]:
+        """Get a summary with percentiles of an observed metric.
+
+        Args:
+            metric_type: Type of metric
+            labels: Optional labels; all series that have them are merged
+            quantiles: Quantiles to estimate
+
+        Returns:
+            Count, sum, mean, min, max and percentiles such as ``p99``, or
+            an empty dict if nothing was observed
+        """
+        histogram = self.histograms.get(metric_type.value, labels)
+        return histogram.summary(quantiles) if histogram else {}
+
     def clear_metrics(self) -> None:
         """Clear all metrics."""
         self.metrics = {}
+        if self.store is not None:
+            self.store.clear()
+        if self._owns_histograms:
+            self.histograms.clear()
 
     def get_metric(self, name: str, metric_type: MetricType) -> Optional[Any]:
         """Get a metric value.
@@ -157,14 +328,20 @@ class MetricsManager:
         if not self._initialized:
             raise RuntimeError("Metrics manager not initialized")
             
-        if metric_type == MetricType.COUNTER:
-            return self.metrics["counters"].get(name)
-        elif metric_type == MetricType.GAUGE:
-            return self.metrics["gauges"].get(name)
+        if metric_type in (MetricType.COUNTER, MetricType.GAUGE):
+            if self.store is not None:
+                values = self.store.query(name).values
+            else:
+                values = [point.value for point in self.metrics.get(name, [])]
+            if not len(values):
+                return None
+            # Counters accumulate recorded values, gauges report the latest one
+            return float(np.sum(values)) if metric_type == MetricType.COUNTER else float(values[-1])
         elif metric_type == MetricType.HISTOGRAM:
-            return self.metrics["histograms"].get(name)
+            return self.histograms.get(name)
         elif metric_type == MetricType.SUMMARY:
-            return self.metrics["summaries"].get(name)
+            histogram = self.histograms.get(name)
+            return histogram.summary() if histogram else None
         else:
             raise ValueError(f"Invalid metric type: {metric_type}")
             
@@ -179,7 +356,9 @@ class MetricsManager:
         """
         if not self._initialized:
             raise RuntimeError("Metrics manager not initialized")
-            
+
+        if self.store is not None:
+            return self.get_metrics()
         return self.metrics
 
 # Alias for backward compatibility with existing tests
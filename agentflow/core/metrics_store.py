@@ -0,0 +1,325 @@
+"""Bounded-memory columnar storage for metric points."""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+LabelKey = FrozenSet[Tuple[str, str]]
+
+
+class LabelInterner:
+    """Assigns integer IDs to distinct label sets and indexes them by label.
+
+    Label sets are reference counted by the points using them. Once the
+    last point of a label set is released the set is evicted and its ID
+    reused, so memory is bounded by the label sets of the stored points.
+    """
+
+    def __init__(self):
+        """Initialize label interner."""
+        self._ids: Dict[LabelKey, int] = {}
+        self._label_sets: List[Optional[Dict[str, str]]] = []
+        self._refs: List[int] = []
+        self._free: List[int] = []
+        self._index: Dict[Tuple[str, str], Set[int]] = {}
+
+    def intern(self, labels: Optional[Dict[str, str]]) -> int:
+        """Get the ID of a label set and count a reference to it.
+
+        An ID is assigned on first use.
+
+        Args:
+            labels: Label set
+
+        Returns:
+            Label set ID
+        """
+        key = frozenset((labels or {}).items())
+        label_id = self._ids.get(key)
+        if label_id is None:
+            if self._free:
+                label_id = self._free.pop()
+            else:
+                label_id = len(self._label_sets)
+                self._label_sets.append(None)
+                self._refs.append(0)
+            self._ids[key] = label_id
+            self._label_sets[label_id] = dict(key)
+            for item in key:
+                self._index.setdefault(item, set()).add(label_id)
+        self._refs[label_id] += 1
+        return label_id
+
+    def release(self, label_ids: Iterable[int]) -> None:
+        """Drop one reference per given ID, evicting unreferenced label sets.
+
+        Args:
+            label_ids: IDs of the label sets of discarded points
+        """
+        ids, counts = np.unique(np.fromiter(label_ids, dtype=np.int64), return_counts=True)
+        for label_id, count in zip(ids.tolist(), counts.tolist()):
+            self._refs[label_id] -= count
+            if self._refs[label_id] > 0:
+                continue
+            key = frozenset(self._label_sets[label_id].items())
+            del self._ids[key]
+            for item in key:
+                members = self._index[item]
+                members.discard(label_id)
+                if not members:
+                    del self._index[item]
+            self._label_sets[label_id] = None
+            self._free.append(label_id)
+
+    def labels(self, label_id: int) -> Dict[str, str]:
+        """Get a copy of the label set with the given ID.
+
+        Raises:
+            KeyError: If no label set has the ID
+        """
+        labels = self._label_sets[label_id] if 0 <= label_id < len(self._label_sets) else None
+        if labels is None:
+            raise KeyError(label_id)
+        return dict(labels)
+
+    def matching_ids(self, labels: Dict[str, str]) -> np.ndarray:
+        """Get the IDs of all label sets containing the given labels.
+
+        Args:
+            labels: Labels that must all be present
+
+        Returns:
+            Sorted array of matching label set IDs
+        """
+        matches: Optional[Set[int]] = None
+        for item in labels.items():
+            ids = self._index.get(item)
+            if not ids:
+                return np.empty(0, dtype=np.int32)
+            matches = set(ids) if matches is None else matches & ids
+            if not matches:
+                return np.empty(0, dtype=np.int32)
+        if matches is None:
+            return np.fromiter(sorted(self._ids.values()), dtype=np.int32, count=len(self._ids))
+        return np.fromiter(sorted(matches), dtype=np.int32, count=len(matches))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+@dataclass
+class MetricSeries:
+    """Columnar query result, ordered by insertion time.
+
+    ``label_sets`` maps the label IDs of the points to their label sets as
+    of the query, since IDs of evicted label sets are reused.
+    """
+    timestamps: np.ndarray
+    values: np.ndarray
+    label_ids: np.ndarray
+    label_sets: Dict[int, Dict[str, str]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class _RingBuffer:
+    """Fixed-capacity ring buffer of (timestamp, value, label ID) columns.
+
+    Arrays start small and double in size until they reach capacity, after
+    which the oldest points are overwritten.
+    """
+
+    def __init__(self, capacity: int, initial_size: int = 1024):
+        self.capacity = capacity
+        size = min(capacity, initial_size)
+        self.timestamps = np.empty(size, dtype=np.float64)
+        self.values = np.empty(size, dtype=np.float64)
+        self.label_ids = np.empty(size, dtype=np.int32)
+        self.start = 0
+        self.size = 0
+
+    def _grow(self) -> None:
+        """Double array size, keeping points in chronological order."""
+        new_size = min(self.capacity, len(self.values) * 2)
+        order = self._order()
+        for name in ("timestamps", "values", "label_ids"):
+            old = getattr(self, name)
+            new = np.empty(new_size, dtype=old.dtype)
+            new[:self.size] = old[order]
+            setattr(self, name, new)
+        self.start = 0
+
+    def _order(self) -> np.ndarray:
+        """Get array positions of stored points from oldest to newest."""
+        return (self.start + np.arange(self.size)) % len(self.values)
+
+    def append(self, timestamp: float, value: float, label_id: int) -> Optional[int]:
+        """Append a point, returning the label ID of an overwritten point."""
+        if self.size == len(self.values) and self.size < self.capacity:
+            self._grow()
+        position = (self.start + self.size) % len(self.values)
+        overwritten = self.label_ids[position]
+        self.timestamps[position] = timestamp
+        self.values[position] = value
+        self.label_ids[position] = label_id
+        if self.size < len(self.values):
+            self.size += 1
+            return None
+        # Full, the oldest point was overwritten
+        self.start = (self.start + 1) % len(self.values)
+        return int(overwritten)
+
+    def drop_before(self, cutoff: float) -> np.ndarray:
+        """Discard leading points older than the cutoff.
+
+        Points are appended in time order, so the expired points are found
+        with a binary search over the ring.
+
+        Returns:
+            Label IDs of the discarded points
+        """
+        if not self.size or self.timestamps[self.start] >= cutoff:
+            return np.empty(0, dtype=np.int32)
+        length = len(self.values)
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamps[(self.start + middle) % length] < cutoff:
+                low = middle + 1
+            else:
+                high = middle
+        dropped = self.label_ids[(self.start + np.arange(low)) % length]
+        self.start = (self.start + low) % length
+        self.size -= low
+        return dropped
+
+    def view(self) -> MetricSeries:
+        order = self._order()
+        return MetricSeries(
+            timestamps=self.timestamps[order],
+            values=self.values[order],
+            label_ids=self.label_ids[order],
+        )
+
+
+class ColumnarMetricsStore:
+    """Metric storage with bounded memory and vectorized queries.
+
+    Each metric key is stored in its own ring buffer of NumPy columns.
+    Label sets are interned to integer IDs, so a point costs 20 bytes
+    regardless of how many labels it has, and are evicted when their last
+    point is overwritten or expires.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100_000,
+        retention_seconds: Optional[float] = None
+    ):
+        """Initialize metrics store.
+
+        Args:
+            capacity: Maximum number of points kept per metric key
+            retention_seconds: Discard points older than this, None to keep
+                points until they are overwritten
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.retention_seconds = retention_seconds
+        self.labels = LabelInterner()
+        self._series: Dict[str, _RingBuffer] = {}
+        self._lock = threading.Lock()
+
+    def append(
+        self,
+        metric_key: str,
+        value: float,
+        timestamp: float,
+        labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Store a metric point.
+
+        Args:
+            metric_key: Metric key
+            value: Metric value
+            timestamp: Point timestamp in seconds since the epoch
+            labels: Point labels
+        """
+        with self._lock:
+            series = self._series.get(metric_key)
+            if series is None:
+                series = self._series[metric_key] = _RingBuffer(self.capacity)
+            overwritten = series.append(timestamp, value, self.labels.intern(labels))
+            if overwritten is not None:
+                self.labels.release((overwritten,))
+            self._expire(series)
+
+    def query(
+        self,
+        metric_key: str,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        labels: Optional[Dict[str, str]] = None
+    ) -> MetricSeries:
+        """Get the points of a metric key matching the filters.
+
+        Args:
+            metric_key: Metric key
+            start_time: Optional earliest timestamp
+            end_time: Optional latest timestamp
+            labels: Optional labels that points must have
+
+        Returns:
+            MetricSeries: Matching points
+        """
+        with self._lock:
+            series = self._series.get(metric_key)
+            if series is None:
+                empty = np.empty(0)
+                return MetricSeries(empty, empty, np.empty(0, dtype=np.int32))
+            self._expire(series)
+            data = series.view()
+            label_ids = self.labels.matching_ids(labels) if labels else None
+
+            mask = np.ones(len(data), dtype=bool)
+            if start_time:
+                mask &= data.timestamps >= start_time
+            if end_time:
+                mask &= data.timestamps <= end_time
+            if label_ids is not None:
+                mask &= np.isin(data.label_ids, label_ids)
+            matched = data.label_ids[mask]
+            # Resolved under the lock, before the IDs can be evicted and reused
+            label_sets = {label_id: self.labels.labels(label_id) for label_id in np.unique(matched).tolist()}
+        return MetricSeries(
+            timestamps=data.timestamps[mask],
+            values=data.values[mask],
+            label_ids=matched,
+            label_sets=label_sets,
+        )
+
+    def _expire(self, series: _RingBuffer) -> None:
+        """Discard points past the retention window and release their labels."""
+        if self.retention_seconds is not None:
+            dropped = series.drop_before(time.time() - self.retention_seconds)
+            if len(dropped):
+                self.labels.release(dropped)
+
+    def keys(self) -> List[str]:
+        """Get the metric keys that have points."""
+        with self._lock:
+            return [key for key, series in self._series.items() if series.size]
+
+    def clear(self) -> None:
+        """Remove all points and label sets."""
+        with self._lock:
+            self._series = {}
+            self.labels = LabelInterner()
+
+    def __len__(self) -> int:
+        return sum(series.size for series in self._series.values())
@@ -0,0 +1,197 @@
+"""Dynamic micro-batching of work items across a set of workers."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+W = TypeVar('W')
+
+# Processes a batch of items on a worker and returns one result per item
+BatchProcessor = Callable[[Any, List[Any]], Awaitable[Sequence[Any]]]
+
+# Queued by close() after the last item to dispatch
+_STOP = object()
+
+
+class MicroBatcher(Generic[W]):
+    """Coalesces submitted items into batches and dispatches them to workers.
+
+    A batch is dispatched once it holds ``batch_size`` items or ``max_wait``
+    seconds after its first item arrived, whichever comes first. Each batch
+    goes to the worker with the fewest items in flight. A worker accepts at
+    most ``max_inflight_per_worker`` batches at a time; when every worker is
+    saturated dispatching pauses, the pending queue fills up and submit()
+    blocks until capacity frees up.
+    """
+
+    def __init__(
+        self,
+        workers: Sequence[W],
+        process: BatchProcessor,
+        batch_size: int = 1,
+        max_wait: float = 0.01,
+        max_inflight_per_worker: int = 1,
+        max_pending: int = 1000
+    ):
+        """Initialize batcher.
+
+        Args:
+            workers: Workers to dispatch batches to
+            process: Coroutine function running a batch on a worker
+            batch_size: Maximum number of items per batch
+            max_wait: Seconds a partial batch waits for more items
+            max_inflight_per_worker: Maximum concurrent batches per worker
+            max_pending: Maximum number of submitted items waiting for dispatch
+        """
+        if not workers:
+            raise ValueError("MicroBatcher needs at least one worker")
+        if batch_size < 1 or max_inflight_per_worker < 1:
+            raise ValueError("batch_size and max_inflight_per_worker must be at least 1")
+        self.workers = list(workers)
+        self.process = process
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.max_inflight_per_worker = max_inflight_per_worker
+        self.max_pending = max_pending
+        # Items and batches in flight per worker
+        self.load = [0] * len(self.workers)
+        self.inflight = [0] * len(self.workers)
+        self._queue: Optional[asyncio.Queue] = None
+        self._capacity: Optional[asyncio.Condition] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._batches: "set[asyncio.Task]" = set()
+
+    async def start(self) -> None:
+        """Start dispatching batches."""
+        if self._runner is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._capacity = asyncio.Condition()
+            self._runner = asyncio.create_task(self._run())
+
+    async def submit(self, item: Any) -> Any:
+        """Submit an item and wait for its result.
+
+        Args:
+            item: Work item
+
+        Returns:
+            Result of the item
+        """
+        await self.start()
+        runner = self._runner
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        if runner.done() and not future.done():
+            # Queued after close() stopped the dispatch loop
+            future.set_exception(RuntimeError("MicroBatcher was closed before the item was dispatched"))
+        return await future
+
+    async def map(self, items: Iterable[Any]) -> List[Any]:
+        """Process items and return their results in input order.
+
+        Args:
+            items: Work items
+
+        Returns:
+            Results in the order of the items
+        """
+        return list(await asyncio.gather(*(self.submit(item) for item in items)))
+
+    async def close(self) -> None:
+        """Dispatch the items submitted so far, finish all batches and stop.
+
+        Items still queued when dispatching has stopped, submitted while
+        closing, fail with a RuntimeError.
+        """
+        if self._runner is None:
+            return
+        await self._queue.put(_STOP)
+        await self._runner
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("MicroBatcher was closed before the item was dispatched"))
+        self._runner = None
+
+    async def __aenter__(self) -> "MicroBatcher[W]":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _collect(self) -> Tuple[List[Tuple[Any, asyncio.Future]], bool]:
+        """Wait for the next batch of items.
+
+        Returns:
+            The batch, and whether close() was called after its items
+        """
+        loop = asyncio.get_running_loop()
+        first = await self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _acquire_worker(self) -> int:
+        """Wait for a worker with spare capacity and pick the least loaded one."""
+        async with self._capacity:
+            while True:
+                available = [
+                    index for index in range(len(self.workers))
+                    if self.inflight[index] < self.max_inflight_per_worker
+                ]
+                if available:
+                    return min(available, key=lambda index: (self.load[index], self.inflight[index]))
+                await self._capacity.wait()
+
+    async def _run(self) -> None:
+        """Dispatch loop, running until close() is called."""
+        while True:
+            batch, stopping = await self._collect()
+            if batch:
+                index = await self._acquire_worker()
+                self.load[index] += len(batch)
+                self.inflight[index] += 1
+                task = asyncio.create_task(self._dispatch(index, batch))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+            if stopping:
+                return
+
+    async def _dispatch(self, index: int, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Run a batch on a worker and deliver the results."""
+        items = [item for item, _ in batch]
+        try:
+            results = await self.process(self.workers[index], items)
+            if len(results) != len(items):
+                raise ValueError(f"Worker returned {len(results)} results for {len(items)} items")
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            logger.error(f"Batch of {len(items)} items failed on worker {index}: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            async with self._capacity:
+                self.load[index] -= len(batch)
+                self.inflight[index] -= 1
+                self._capacity.notify_all()
@@ -1,10 +1,10 @@
 """Objective handler for managing agent goals and success criteria in the CO-STAR framework."""
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from .validators import ValidatorRegistry, ValidationResult
-from .persistence import PersistenceFactory, BasePersistence
+from .persistence import PersistenceFactory, BasePersistence, ExecutorPersistence
 
 class ObjectiveType(Enum):
     """Objective types supported by the system"""
@@ -66,6 +66,31 @@ class ObjectiveHandler:
             persistence_type,
             **persistence_config.get("config", {})
         )
+        # Runs the same backend off the event loop for async callers, created on first use
+        self._async_persistence: Optional[ExecutorPersistence] = None
+        
+    @property
+    def async_persistence(self) -> ExecutorPersistence:
+        """Async adapter of the persistence backend, whose threads run until close()."""
+        if self._async_persistence is None:
+            self._async_persistence = ExecutorPersistence(self.persistence)
+        return self._async_persistence
+        
+    async def close(self) -> None:
+        """Apply pending writes, stop the adapter's threads and close the backend."""
+        if self._async_persistence is not None:
+            await self._async_persistence.close()
+            self._async_persistence = None
+        else:
+            close = getattr(self.persistence, "close", None)
+            if close is not None:
+                close()
+                
+    async def __aenter__(self) -> "ObjectiveHandler":
+        return self
+        
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
         
     def create_objective(
         self,
@@ -236,35 +261,14 @@ class ObjectiveHandler:
         Raises:
             ValueError: If objective not found
         """
-        objective = self.objectives.get(objective_id)
-        if not objective:
-            raise ValueError(f"Objective {objective_id} not found")
-            
-        results = {
-            "objective_id": objective_id,
-            "status": objective.status.value,
-            "criteria_results": []
-        }
+        objective = self._get_objective_for_validation(objective_id)
+        results = self._new_validation_results(objective)
         
         for criteria in objective.success_criteria:
-            validator_type = criteria.get("validation_method")
-            validator = ValidatorRegistry.get_validator(validator_type)
-            
-            if not validator:
-                results["criteria_results"].append({
-                    "type": criteria["type"],
-                    "description": criteria["description"],
-                    "validated": False,
-                    "error": f"No validator found for method: {validator_type}"
-                })
+            validator_type, validation_result = self._validate_criteria(objective, criteria, results)
+            if validation_result is None:
                 continue
                 
-            # Get validation data from objective metadata
-            validation_data = objective.metadata.get("validation_data", {})
-            
-            # Validate
-            validation_result = validator.validate(validation_data, criteria)
-            
             # Store validation result
             self.persistence.save_result(
                 objective_id=objective_id,
@@ -272,17 +276,93 @@ class ObjectiveHandler:
                 result=validation_result
             )
             
+        return results
+        
+    async def validate_objective_async(self, objective_id: str) -> Dict[str, Any]:
+        """Validate objective without blocking the event loop on persistence.
+        
+        Validation results are written through the async persistence adapter
+        instead of the synchronous backend.
+        
+        Args:
+            objective_id: Objective identifier
+            
+        Returns:
+            Validation results
+            
+        Raises:
+            ValueError: If objective not found
+        """
+        objective = self._get_objective_for_validation(objective_id)
+        results = self._new_validation_results(objective)
+        
+        for criteria in objective.success_criteria:
+            validator_type, validation_result = self._validate_criteria(objective, criteria, results)
+            if validation_result is None:
+                continue
+                
+            await self.async_persistence.save_result(
+                objective_id=objective_id,
+                validation_type=validator_type,
+                result=validation_result
+            )
+            
+        return results
+        
+    def _get_objective_for_validation(self, objective_id: str) -> Objective:
+        objective = self.objectives.get(objective_id)
+        if not objective:
+            raise ValueError(f"Objective {objective_id} not found")
+        return objective
+        
+    @staticmethod
+    def _new_validation_results(objective: Objective) -> Dict[str, Any]:
+        return {
+            "objective_id": objective.objective_id,
+            "status": objective.status.value,
+            "criteria_results": []
+        }
+        
+    @staticmethod
+    def _validate_criteria(
+        objective: Objective,
+        criteria: Dict[str, Any],
+        results: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[ValidationResult]]:
+        """Validate one criterion and append its entry to the results.
+        
+        Returns:
+            Validator type and validation result, result is None if no
+            validator is registered for the criterion
+        """
+        validator_type = criteria.get("validation_method")
+        validator = ValidatorRegistry.get_validator(validator_type)
+        
+        if not validator:
             results["criteria_results"].append({
                 "type": criteria["type"],
                 "description": criteria["description"],
-                "validated": validation_result.is_valid,
-                "score": validation_result.score,
-                "details": validation_result.details,
-                "message": validation_result.message,
-                "timestamp": validation_result.timestamp
+                "validated": False,
+                "error": f"No validator found for method: {validator_type}"
             })
+            return validator_type, None
             
-        return results
+        # Get validation data from objective metadata
+        validation_data = objective.metadata.get("validation_data", {})
+        
+        # Validate
+        validation_result = validator.validate(validation_data, criteria)
+        
+        results["criteria_results"].append({
+            "type": criteria["type"],
+            "description": criteria["description"],
+            "validated": validation_result.is_valid,
+            "score": validation_result.score,
+            "details": validation_result.details,
+            "message": validation_result.message,
+            "timestamp": validation_result.timestamp
+        })
+        return validator_type, validation_result
         
     def get_validation_history(
         self,
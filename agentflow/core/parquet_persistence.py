@@ -0,0 +1,481 @@
+"""Columnar validation history in partitioned Parquet files."""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .persistence import (
+    DEFAULT_PAGE_SIZE,
+    BasePersistence,
+    ResultPage,
+    decode_cursor,
+    encode_cursor,
+    project_result,
+)
+from .validators import ValidationResult
+
+logger = logging.getLogger(__name__)
+
+# Columns stored in the data files; date and validation_type are partition keys
+SCHEMA = pa.schema([
+    ("objective_id", pa.string()),
+    ("timestamp", pa.string()),
+    ("ts", pa.timestamp("us")),
+    ("is_valid", pa.bool_()),
+    ("score", pa.float64()),
+    ("details", pa.string()),
+    ("message", pa.string()),
+])
+
+PARTITION_SCHEMA = pa.schema([("date", pa.string()), ("validation_type", pa.string())])
+
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+
+# Schema of the dataset including the partition keys
+DATASET_SCHEMA = pa.unify_schemas([SCHEMA, PARTITION_SCHEMA])
+
+# Time buckets accepted by ParquetPersistence.aggregate
+BUCKET_UNITS = ("minute", "hour", "day", "week", "month", "year")
+
+# Columns read for each projectable field
+FIELD_COLUMNS = {
+    "objective_id": ("objective_id",),
+    "validation_type": ("validation_type",),
+    "timestamp": ("timestamp",),
+    "result": ("is_valid", "score", "details", "message"),
+    "result.is_valid": ("is_valid",),
+    "result.score": ("score",),
+    "result.details": ("details",),
+    "result.message": ("message",),
+}
+
+
+def _parse_timestamp(timestamp: str) -> datetime:
+    """Parse an ISO timestamp as naive UTC for the ts column."""
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _utc_date(timestamp: str) -> str:
+    """Get the UTC date of an ISO timestamp, the date partition key."""
+    return _parse_timestamp(timestamp).date().isoformat()
+
+
+class ParquetPersistence(BasePersistence):
+    """Parquet-based persistence partitioned by date and validation type.
+
+    Results are buffered in memory and written as Parquet files under
+    ``date=<YYYY-MM-DD>/validation_type=<type>/``, with the date in UTC,
+    once ``flush_rows`` results are pending or the oldest pending result
+    is ``flush_interval`` seconds old, and on flush() and close(). Reads
+    scan the files with a dataset filter, so date and validation type
+    predicates skip whole partitions and the remaining predicates are
+    evaluated on Parquet row-group statistics before any rows are decoded;
+    buffered results are filtered in memory, so reads never write files.
+
+    save_result() returns once a result is buffered: results not yet
+    flushed are lost if the process dies, so call flush() where a result
+    must be durable and close() on shutdown.
+
+    Parquet files are immutable: deletes rewrite the affected files, so
+    this backend suits append-mostly history rather than frequent deletes.
+    Once a partition holds more than ``compact_files`` files, a flush
+    merges them into one.
+    """
+
+    def __init__(
+        self,
+        base_dir: str,
+        flush_rows: int = 10000,
+        flush_interval: Optional[float] = 60.0,
+        compact_files: int = 16
+    ):
+        """Initialize Parquet persistence.
+
+        Args:
+            base_dir: Root directory of the partitioned dataset
+            flush_rows: Number of buffered results that triggers a write
+            flush_interval: Age in seconds of the oldest buffered result
+                that triggers a write on the next save, None for no limit
+            compact_files: Number of files in a partition above which a
+                flush merges them
+        """
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.compact_files = compact_files
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffered_since = 0.0
+        self._lock = threading.RLock()
+
+    def _dataset(self) -> ds.Dataset:
+        return ds.dataset(
+            self.base_dir,
+            schema=DATASET_SCHEMA,
+            format="parquet",
+            partitioning=PARTITIONING
+        )
+
+    @staticmethod
+    def _filter(
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None
+    ) -> Optional[ds.Expression]:
+        """Build a dataset filter, including partition predicates for pruning."""
+        conditions = []
+        if objective_id:
+            conditions.append(ds.field("objective_id") == objective_id)
+        if validation_type:
+            conditions.append(ds.field("validation_type") == validation_type)
+        # Compare instants, so timestamps with different offsets filter correctly
+        if start_time:
+            conditions.append(ds.field("date") >= _utc_date(start_time))
+            conditions.append(ds.field("ts") >= pa.scalar(_parse_timestamp(start_time), pa.timestamp("us")))
+        if end_time:
+            conditions.append(ds.field("date") <= _utc_date(end_time))
+            conditions.append(ds.field("ts") <= pa.scalar(_parse_timestamp(end_time), pa.timestamp("us")))
+        if not conditions:
+            return None
+        expression = conditions[0]
+        for condition in conditions[1:]:
+            expression = expression & condition
+        return expression
+
+    def _scan(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        filter: Optional[ds.Expression] = None
+    ) -> pa.Table:
+        """Read matching rows of the given columns, buffered results included."""
+        columns = list(columns) if columns else None
+        # Under the lock a flush or compaction cannot move rows while they are read
+        with self._lock:
+            table = self._dataset().to_table(columns=columns, filter=filter)
+            if not self._buffer:
+                return table
+            buffered = pa.Table.from_pylist(self._buffer, schema=DATASET_SCHEMA)
+        buffered = ds.dataset(buffered).to_table(columns=columns, filter=filter)
+        return pa.concat_tables([table, buffered])
+
+    @staticmethod
+    def _to_records(table: pa.Table) -> List[Dict[str, Any]]:
+        """Convert rows to result dictionaries."""
+        records = []
+        for row in table.to_pylist():
+            record = {key: row[key] for key in ("objective_id", "validation_type", "timestamp") if key in row}
+            result = {}
+            if "is_valid" in row:
+                result["is_valid"] = row["is_valid"]
+            if "score" in row:
+                result["score"] = row["score"]
+            if "details" in row:
+                result["details"] = json.loads(row["details"]) if row["details"] else None
+            if "message" in row:
+                result["message"] = row["message"]
+            if result:
+                record["result"] = result
+            records.append(record)
+        return records
+
+    def flush(self) -> None:
+        """Write buffered results to Parquet files."""
+        with self._lock:
+            if not self._buffer:
+                return
+            table = pa.Table.from_pylist(self._buffer, schema=DATASET_SCHEMA)
+            written = []
+            ds.write_dataset(
+                table,
+                self.base_dir,
+                format="parquet",
+                partitioning=PARTITIONING,
+                basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+                file_visitor=lambda written_file: written.append(written_file.path)
+            )
+            # Cleared only once written, so a failed write keeps the results
+            self._buffer = []
+            directories = {os.path.dirname(path) for path in written}
+            self._compact(lambda directory, files: directory in directories and len(files) > self.compact_files)
+
+    def compact(self) -> None:
+        """Merge the files of each partition into one file."""
+        self.flush()
+        with self._lock:
+            self._compact(lambda directory, files: len(files) > 1)
+
+    def _compact(self, select) -> None:
+        """Merge the files of the partitions chosen by select(directory, files)."""
+        dataset = self._dataset()
+        partitions: Dict[str, list] = defaultdict(list)
+        for fragment in dataset.get_fragments():
+            partitions[os.path.dirname(fragment.path)].append(fragment)
+        for directory, fragments in partitions.items():
+            if not select(directory, fragments):
+                continue
+            table = pa.concat_tables([fragment.to_table(schema=dataset.schema) for fragment in fragments])
+            name = f"part-{uuid.uuid4().hex}-0.parquet"
+            # Dot-prefixed files are skipped by dataset discovery
+            tmp_path = os.path.join(directory, f".{name}.tmp")
+            pq.write_table(table.select(SCHEMA.names), tmp_path)
+            os.replace(tmp_path, os.path.join(directory, name))
+            # A crash before the old files are removed leaves duplicates, never losses
+            for fragment in fragments:
+                os.remove(fragment.path)
+
+    def close(self) -> None:
+        """Write buffered results."""
+        self.flush()
+
+    def save_result(
+        self,
+        objective_id: str,
+        validation_type: str,
+        result: ValidationResult
+    ) -> bool:
+        try:
+            result_dict = asdict(result)
+            with self._lock:
+                if not self._buffer:
+                    self._buffered_since = time.monotonic()
+                self._buffer.append({
+                    "objective_id": objective_id,
+                    "timestamp": result.timestamp,
+                    "ts": _parse_timestamp(result.timestamp),
+                    "is_valid": bool(result_dict["is_valid"]),
+                    "score": result_dict["score"],
+                    "details": json.dumps(result_dict["details"]) if result_dict["details"] is not None else None,
+                    "message": result_dict["message"],
+                    "date": _utc_date(result.timestamp),
+                    "validation_type": validation_type,
+                })
+                if len(self._buffer) >= self.flush_rows or (
+                    self.flush_interval is not None
+                    and time.monotonic() - self._buffered_since >= self.flush_interval
+                ):
+                    self.flush()
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving result to Parquet: {e}")
+            return False
+
+    def get_result(
+        self,
+        objective_id: str,
+        validation_type: str,
+        timestamp: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            expression = self._filter(objective_id, validation_type)
+            if timestamp:
+                expression = expression & (ds.field("timestamp") == timestamp)
+            table = self._scan(filter=expression)
+            if table.num_rows == 0:
+                return None
+            latest = pc.index(table["ts"], pc.max(table["ts"]))
+            return self._to_records(table.slice(latest.as_py(), 1))[0]
+
+        except Exception as e:
+            logger.error(f"Error getting result from Parquet: {e}")
+            return None
+
+    def get_results(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        try:
+            table = self._scan(filter=self._filter(objective_id, validation_type, start_time, end_time))
+            return self._to_records(table.sort_by([("ts", "descending")]))
+
+        except Exception as e:
+            logger.error(f"Error getting results from Parquet: {e}")
+            return []
+
+    def get_results_page(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> ResultPage:
+        """Get one page of results, reading only the columns of the requested fields.
+
+        The cursor is an offset into the filtered results ordered by timestamp.
+        """
+        columns = None
+        if fields is not None:
+            columns = ["ts"]
+            for path in fields:
+                for column in FIELD_COLUMNS.get(path, ()):
+                    if column not in columns:
+                        columns.append(column)
+        table = self._scan(columns, self._filter(objective_id, validation_type, start_time, end_time))
+        start = int(decode_cursor(cursor)[0]) if cursor else 0
+        page = table.sort_by([("ts", "descending")]).slice(start, limit)
+        end = start + page.num_rows
+        return ResultPage(
+            items=[project_result(record, fields) for record in self._to_records(page)],
+            next_cursor=encode_cursor([end]) if end < table.num_rows else None
+        )
+
+    def delete_result(
+        self,
+        objective_id: str,
+        validation_type: str,
+        timestamp: Optional[str] = None
+    ) -> bool:
+        try:
+            match = ds.field("objective_id") == objective_id
+            if timestamp:
+                match = match & (ds.field("timestamp") == timestamp)
+            deleted = 0
+            with self._lock:
+                kept = [
+                    row for row in self._buffer
+                    if not (
+                        row["objective_id"] == objective_id
+                        and row["validation_type"] == validation_type
+                        and (not timestamp or row["timestamp"] == timestamp)
+                    )
+                ]
+                deleted += len(self._buffer) - len(kept)
+                self._buffer = kept
+                dataset = self._dataset()
+                for fragment in dataset.get_fragments(filter=ds.field("validation_type") == validation_type):
+                    table = fragment.to_table(schema=dataset.schema)
+                    keep = table.filter(~match)
+                    removed = table.num_rows - keep.num_rows
+                    if not removed:
+                        continue
+                    deleted += removed
+                    if keep.num_rows:
+                        # Dot-prefixed files are skipped by dataset discovery
+                        directory, name = os.path.split(fragment.path)
+                        tmp_path = os.path.join(directory, f".{name}.tmp")
+                        pq.write_table(keep.select(SCHEMA.names), tmp_path)
+                        os.replace(tmp_path, fragment.path)
+                    else:
+                        os.remove(fragment.path)
+            return deleted > 0
+
+        except Exception as e:
+            logger.error(f"Error deleting result from Parquet: {e}")
+            return False
+
+    def aggregate(
+        self,
+        bucket: str = "day",
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        by_validation_type: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Aggregate results per time bucket.
+
+        Only the timestamp, score and is_valid columns of matching partitions
+        are read, and bucketing and aggregation run as vectorized Arrow
+        kernels.
+
+        Args:
+            bucket: Bucket size, one of minute, hour, day, week, month or year
+            objective_id: Optional objective ID filter
+            validation_type: Optional validation type filter
+            start_time: Optional start time filter
+            end_time: Optional end time filter
+            by_validation_type: Group buckets per validation type as well
+
+        Returns:
+            One dictionary per bucket, ordered by bucket, with the bucket
+            start time, count, mean score and pass rate
+
+        Raises:
+            ValueError: If bucket is not supported
+        """
+        if bucket not in BUCKET_UNITS:
+            raise ValueError(f"Unsupported bucket: {bucket}, expected one of {BUCKET_UNITS}")
+        columns = ["ts", "score", "is_valid"] + (["validation_type"] if by_validation_type else [])
+        table = self._scan(columns, self._filter(objective_id, validation_type, start_time, end_time))
+        keys = ["bucket"] + (["validation_type"] if by_validation_type else [])
+
+        table = table.append_column("bucket", pc.floor_temporal(table["ts"], unit=bucket))
+        table = table.append_column("passed", pc.cast(table["is_valid"], pa.float64()))
+        grouped = table.group_by(keys).aggregate([
+            ("ts", "count"),
+            ("score", "mean"),
+            ("passed", "mean"),
+        ]).sort_by([(key, "ascending") for key in keys])
+
+        return [
+            {
+                **{key: row[key] for key in keys},
+                "bucket": row["bucket"].isoformat(),
+                "count": row["ts_count"],
+                "mean_score": row["score_mean"],
+                "pass_rate": row["passed_mean"],
+            }
+            for row in grouped.to_pylist()
+        ]
+
+
+def export_to_parquet(
+    source: BasePersistence,
+    target: ParquetPersistence,
+    objective_id: Optional[str] = None,
+    validation_type: Optional[str] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> int:
+    """Copy validation history from another backend into a Parquet dataset.
+
+    Args:
+        source: Backend to read results from
+        target: Parquet backend to write to
+        objective_id: Optional objective ID filter
+        validation_type: Optional validation type filter
+        start_time: Optional start time filter
+        end_time: Optional end time filter
+        page_size: Number of results read per page
+
+    Returns:
+        Number of results exported
+    """
+    exported = 0
+    for record in source.iter_results(
+        objective_id, validation_type, start_time, end_time, page_size=page_size
+    ):
+        result = {
+            key: value for key, value in record["result"].items()
+            if key in ValidationResult.__dataclass_fields__
+        }
+        result["timestamp"] = record["timestamp"]
+        if target.save_result(record["objective_id"], record["validation_type"], ValidationResult(**result)):
+            exported += 1
+    target.flush()
+    return exported
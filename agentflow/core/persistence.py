@@ -1,20 +1,91 @@
 """Persistence module for storing validation results."""
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, AsyncIterator, Callable, Iterator, List, Optional, Sequence, Tuple, Union
 from abc import ABC, abstractmethod
+import asyncio
+import base64
 import json
 import os
+import queue
 import sqlite3
+import threading
+import time
 from datetime import datetime
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
 from pathlib import Path
 import pymongo
-from dataclasses import asdict
+from bson import ObjectId
+from dataclasses import asdict, dataclass, field
 import yaml
 
 from .validators import ValidationResult
+from .segment_log import SegmentLog
 
 logger = logging.getLogger(__name__)
 
+# Number of results fetched per page by iter_results
+DEFAULT_PAGE_SIZE = 500
+
+# Result fields stored in the file index, readable without loading records
+INDEXED_FIELDS = ("objective_id", "validation_type", "timestamp")
+
+@dataclass
+class ResultPage:
+    """One page of validation results, newest first.
+
+    Attributes:
+        items: Results on this page
+        next_cursor: Opaque cursor for the next page, None on the last page
+    """
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+def encode_cursor(position: Sequence[Any]) -> str:
+    """Encode a result position as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(position)).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor created by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(position, list):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return position
+
+def project_result(record: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """Keep only the given fields of a result.
+
+    Args:
+        record: Result dictionary
+        fields: Field names, nested fields as dotted paths like ``result.score``;
+            None keeps every field
+
+    Returns:
+        Projected result with the same nesting as the original
+    """
+    if fields is None:
+        return record
+    projected: Dict[str, Any] = {}
+    for path in fields:
+        source: Any = record
+        parts = path.split(".")
+        for part in parts:
+            if not isinstance(source, dict) or part not in source:
+                break
+            source = source[part]
+        else:
+            target = projected
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = source
+    return projected
+
 class BasePersistence(ABC):
     """Base class for persistence implementations."""
     
@@ -95,25 +166,173 @@ class BasePersistence(ABC):
             True if deleted successfully, False otherwise
         """
         pass
+        
+    def get_results_page(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> ResultPage:
+        """Get one page of validation results, newest first.
+        
+        Backends override this to push filters, limits and projection down
+        to their storage. This default loads all matching results with
+        get_results and slices them.
+        
+        Args:
+            objective_id: Optional objective ID filter
+            validation_type: Optional validation type filter
+            start_time: Optional start time filter
+            end_time: Optional end time filter
+            limit: Maximum number of results on the page
+            cursor: Cursor of the page to fetch, None for the first page
+            fields: Optional fields to return, see project_result
+        
+        Returns:
+            ResultPage: Results and the cursor of the next page
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        results = sorted(
+            self.get_results(objective_id, validation_type, start_time, end_time),
+            key=lambda r: r["timestamp"],
+            reverse=True
+        )
+        start = int(decode_cursor(cursor)[0]) if cursor else 0
+        items = results[start:start + limit]
+        end = start + len(items)
+        return ResultPage(
+            items=[project_result(r, fields) for r in items],
+            next_cursor=encode_cursor([end]) if end < len(results) else None
+        )
+        
+    def iter_results(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over validation results, newest first, one page at a time.
+        
+        Args:
+            objective_id: Optional objective ID filter
+            validation_type: Optional validation type filter
+            start_time: Optional start time filter
+            end_time: Optional end time filter
+            limit: Optional maximum number of results
+            cursor: Optional cursor to resume from
+            fields: Optional fields to return, see project_result
+            page_size: Number of results fetched per page
+        
+        Yields:
+            Validation results
+        """
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            page = self.get_results_page(
+                objective_id, validation_type, start_time, end_time,
+                limit=size, cursor=cursor, fields=fields
+            )
+            yield from page.items
+            if remaining is not None:
+                remaining -= len(page.items)
+            if not page.next_cursor or not page.items:
+                return
+            cursor = page.next_cursor
+        
+    async def aiter_results(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Asynchronously iterate over validation results, newest first.
+        
+        Pages are fetched in the default executor so the event loop is not
+        blocked by storage I/O. Arguments are the same as for iter_results.
+        
+        Yields:
+            Validation results
+        """
+        loop = asyncio.get_running_loop()
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            page = await loop.run_in_executor(None, lambda: self.get_results_page(
+                objective_id, validation_type, start_time, end_time,
+                limit=size, cursor=cursor, fields=fields
+            ))
+            for item in page.items:
+                yield item
+            if remaining is not None:
+                remaining -= len(page.items)
+            if not page.next_cursor or not page.items:
+                return
+            cursor = page.next_cursor
 
 class FilePersistence(BasePersistence):
-    """File-based persistence implementation."""
+    """File-based persistence implementation.
     
-    def __init__(self, base_dir: str, format: str = "json"):
+    The json and yaml formats keep one file per objective and validation
+    type, rewritten on every save. The jsonl format appends results to
+    segment files with a sidecar index (see SegmentLog), so saves never
+    rewrite data and lookups seek straight to the matching records.
+    """
+    
+    def __init__(
+        self,
+        base_dir: str,
+        format: str = "json",
+        segment_size: int = 64 * 1024 * 1024,
+        compact_ratio: float = 0.5
+    ):
         """Initialize file persistence.
         
         Args:
             base_dir: Base directory for storing files
-            format: File format (json or yaml)
+            format: File format (json, yaml or jsonl)
+            segment_size: Segment size in bytes for the jsonl format
+            compact_ratio: Fraction of deleted bytes that triggers compaction
+                for the jsonl format
         """
         self.base_dir = Path(base_dir)
         self.format = format.lower()
-        if self.format not in ["json", "yaml"]:
-            raise ValueError("Format must be either 'json' or 'yaml'")
+        if self.format not in ["json", "yaml", "jsonl"]:
+            raise ValueError("Format must be 'json', 'yaml' or 'jsonl'")
             
         # Create base directory if it doesn't exist
         self.base_dir.mkdir(parents=True, exist_ok=True)
         
+        self._log: Optional[SegmentLog] = None
+        if self.format == "jsonl":
+            self._log = SegmentLog(self.base_dir, segment_size=segment_size, compact_ratio=compact_ratio)
+            
+    def compact(self) -> None:
+        """Rewrite the jsonl segments without deleted results."""
+        if self._log is not None:
+            self._log.compact()
+            
+    def close(self) -> None:
+        """Close open segment files."""
+        if self._log is not None:
+            self._log.close()
+        
     def _get_file_path(self, objective_id: str, validation_type: str) -> Path:
         """Get the file path for a validation result."""
         return self.base_dir / f"{objective_id}_{validation_type}.{self.format}"
@@ -135,6 +354,10 @@ class FilePersistence(BasePersistence):
                 "result": asdict(result)
             }
             
+            if self._log is not None:
+                self._log.append(result_dict)
+                return True
+            
             # Load existing results
             existing_results = []
             if file_path.exists():
@@ -167,6 +390,11 @@ class FilePersistence(BasePersistence):
         timestamp: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         try:
+            if self._log is not None:
+                with self._log.pinned():
+                    entry = self._log.latest(objective_id, validation_type, timestamp)
+                    return next(self._log.read([entry])) if entry else None
+                
             file_path = self._get_file_path(objective_id, validation_type)
             if not file_path.exists():
                 return None
@@ -199,6 +427,12 @@ class FilePersistence(BasePersistence):
         end_time: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         try:
+            if self._log is not None:
+                with self._log.pinned():
+                    return list(self._log.read(self._log.entries(
+                        objective_id, validation_type, start_time, end_time
+                    )))
+                
             all_results = []
             
             # Get all relevant files
@@ -248,6 +482,52 @@ class FilePersistence(BasePersistence):
             logger.error(f"Error getting results: {e}")
             return []
             
+    def get_results_page(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> ResultPage:
+        if self._log is None:
+            return super().get_results_page(
+                objective_id, validation_type, start_time, end_time, limit, cursor, fields
+            )
+            
+        after = None
+        if cursor:
+            after = tuple(decode_cursor(cursor))
+            if len(after) != 4:
+                raise ValueError(f"Invalid cursor: {cursor}")
+                
+        # Filter and order on the index, then read only the records on the page
+        with self._log.pinned():
+            # Positions do not depend on file locations, so cursors survive compaction;
+            # records of one key and timestamp are told apart by their append order
+            ordinals: Dict[Tuple[str, str, str], int] = {}
+            positioned = []
+            for entry in self._log.entries(objective_id, validation_type, start_time, end_time):
+                same = (entry.timestamp, entry.objective_id, entry.validation_type)
+                ordinals[same] = ordinals.get(same, -1) + 1
+                positioned.append(((*same, ordinals[same]), entry))
+            positioned.sort(key=lambda item: item[0], reverse=True)
+            if after is not None:
+                positioned = [item for item in positioned if item[0] < after]
+            page = [entry for _, entry in positioned[:limit]]
+            next_cursor = encode_cursor(positioned[limit - 1][0]) if len(positioned) > limit else None
+            
+            if fields is not None and all(path in INDEXED_FIELDS for path in fields):
+                items = [
+                    {path: getattr(entry, path) for path in fields}
+                    for entry in page
+                ]
+            else:
+                items = [project_result(record, fields) for record in self._log.read(page)]
+        return ResultPage(items=items, next_cursor=next_cursor)
+            
     def delete_result(
         self,
         objective_id: str,
@@ -255,6 +535,9 @@ class FilePersistence(BasePersistence):
         timestamp: Optional[str] = None
     ) -> bool:
         try:
+            if self._log is not None:
+                return self._log.delete(objective_id, validation_type, timestamp) > 0
+                
             file_path = self._get_file_path(objective_id, validation_type)
             if not file_path.exists():
                 return False
@@ -288,23 +571,97 @@ class FilePersistence(BasePersistence):
             logger.error(f"Error deleting result: {e}")
             return False
 
+# Columns of the validation_results table in SELECT * order
+SQLITE_COLUMNS = (
+    "id", "objective_id", "validation_type", "timestamp",
+    "is_valid", "score", "details", "message"
+)
+
+# Columns needed to return each projectable field
+SQLITE_FIELD_COLUMNS = {
+    "objective_id": ("objective_id",),
+    "validation_type": ("validation_type",),
+    "timestamp": ("timestamp",),
+    "result": ("is_valid", "score", "details", "message"),
+    "result.is_valid": ("is_valid",),
+    "result.score": ("score",),
+    "result.details": ("details",),
+    "result.message": ("message",),
+}
+
 class SQLitePersistence(BasePersistence):
-    """SQLite-based persistence implementation."""
+    """SQLite-based persistence implementation.
+    
+    Each thread keeps one open connection. The database runs in WAL mode,
+    so readers do not block the writer. With ``batch_writes`` enabled,
+    save_result() queues rows for a writer thread that inserts them in
+    batches, one transaction per batch, at least every ``flush_interval``
+    seconds. Each queued row gets a sequence number and a read waits only
+    for the rows queued before it, so it sees earlier writes without
+    waiting for writes that keep arriving. save_result() then reports
+    whether the row was queued; use submit_result() for a future of the
+    commit, or flush(), which raises the first write error since the last
+    flush.
+    """
     
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        batch_writes: bool = False,
+        batch_size: int = 500,
+        flush_interval: float = 0.05
+    ):
         """Initialize SQLite persistence.
         
         Args:
             db_path: Path to SQLite database file
+            batch_writes: Queue writes for a background writer thread
+            batch_size: Maximum number of rows per write transaction
+            flush_interval: Maximum seconds a queued row waits before it is written
         """
         self.db_path = db_path
+        self.batch_writes = batch_writes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self._init_db()
         
+        self._write_queue: Optional["queue.Queue[Optional[tuple]]"] = None
+        self._writer: Optional[threading.Thread] = None
+        # Sequence numbers of the last queued and the last written row
+        self._write_state = threading.Condition()
+        self._queued_seq = 0
+        self._written_seq = 0
+        self._write_error: Optional[Exception] = None
+        self._stopping = False
+        if batch_writes:
+            self._write_queue = queue.Queue()
+            self._writer = threading.Thread(
+                target=self._write_loop,
+                name=f"sqlite-writer-{Path(db_path).name}",
+                daemon=True
+            )
+            self._writer.start()
+        
+    def _connect(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+        
     def _init_db(self):
         """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+        conn = self._connect()
+        with conn:
+            conn.execute("""
                 CREATE TABLE IF NOT EXISTS validation_results (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     objective_id TEXT NOT NULL,
@@ -316,40 +673,186 @@ class SQLitePersistence(BasePersistence):
                     message TEXT
                 )
             """)
-            conn.commit()
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_validation_results_lookup
+                ON validation_results (objective_id, validation_type, timestamp)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_validation_results_timestamp
+                ON validation_results (timestamp)
+            """)
             
-    def save_result(
+    @staticmethod
+    def _to_row(objective_id: str, validation_type: str, result: ValidationResult) -> tuple:
+        """Convert a validation result to a table row."""
+        return (
+            objective_id,
+            validation_type,
+            result.timestamp,
+            result.is_valid,
+            result.score,
+            json.dumps(result.details) if result.details else None,
+            result.message
+        )
+        
+    @staticmethod
+    def _from_row(row: tuple) -> Dict[str, Any]:
+        """Convert a table row to a result dictionary."""
+        return {
+            "objective_id": row[1],
+            "validation_type": row[2],
+            "timestamp": row[3],
+            "result": {
+                "is_valid": bool(row[4]),
+                "score": row[5],
+                "details": json.loads(row[6]) if row[6] else None,
+                "message": row[7]
+            }
+        }
+        
+    def _insert(self, conn: sqlite3.Connection, rows: List[tuple]) -> None:
+        """Insert rows in a single transaction."""
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO validation_results
+                (objective_id, validation_type, timestamp, is_valid, score,
+                 details, message)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+            
+    def _write_loop(self) -> None:
+        """Writer thread: drain the queue in batches."""
+        conn = self._connect()
+        stopping = False
+        while not stopping:
+            item = self._write_queue.get()
+            batch = []
+            if item is None:
+                stopping = True
+            else:
+                batch.append(item)
+            deadline = time.monotonic() + self.flush_interval
+            while not stopping and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._write_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                else:
+                    batch.append(item)
+            if not batch:
+                continue
+            # Rows whose futures were cancelled before being dequeued are not written
+            pending = [(row, future) for _, row, future in batch if future.set_running_or_notify_cancel()]
+            error: Optional[Exception] = None
+            try:
+                if pending:
+                    self._insert(conn, [row for row, _ in pending])
+            except Exception as e:
+                logger.error(f"Error writing {len(pending)} results to SQLite: {e}")
+                error = e
+            finally:
+                try:
+                    for _, future in pending:
+                        if error is None:
+                            future.set_result(True)
+                        else:
+                            future.set_exception(error)
+                finally:
+                    with self._write_state:
+                        if error is not None and self._write_error is None:
+                            self._write_error = error
+                        self._written_seq = batch[-1][0]
+                        self._write_state.notify_all()
+                
+    def _wait_for_writes(self) -> None:
+        """Wait until the rows queued before this call are written."""
+        with self._write_state:
+            target = self._queued_seq
+            self._write_state.wait_for(lambda: self._written_seq >= target)
+            
+    def submit_result(
         self,
         objective_id: str,
         validation_type: str,
         result: ValidationResult
-    ) -> bool:
+    ) -> "Future[bool]":
+        """Save a validation result, returning a future of its commit.
+        
+        Args:
+            objective_id: ID of the objective
+            validation_type: Type of validation
+            result: Validation result to save
+            
+        Returns:
+            Future resolving to True once the row is committed, or raising
+            the error that made its batch fail. Cancelling it before the
+            writer picks the row up keeps the row from being saved.
+        """
+        future: "Future[bool]" = Future()
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO validation_results
-                    (objective_id, validation_type, timestamp, is_valid, score,
-                     details, message)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        objective_id,
-                        validation_type,
-                        result.timestamp,
-                        result.is_valid,
-                        result.score,
-                        json.dumps(result.details) if result.details else None,
-                        result.message
-                    )
-                )
-                conn.commit()
-                return True
-                
+            row = self._to_row(objective_id, validation_type, result)
+            with self._write_state:
+                if self._write_queue is not None and not self._stopping:
+                    # Queue under the lock so queue order matches sequence order
+                    self._queued_seq += 1
+                    self._write_queue.put((self._queued_seq, row, future))
+                    return future
+            self._insert(self._connect(), [row])
+            future.set_result(True)
         except Exception as e:
-            logger.error(f"Error saving result to SQLite: {e}")
+            future.set_exception(e)
+        return future
+        
+    def flush(self) -> None:
+        """Wait until the rows queued so far are committed.
+        
+        Raises:
+            Exception: The first error of a batched write since the last
+                flush, whose rows were not saved
+        """
+        self._wait_for_writes()
+        with self._write_state:
+            error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+            
+    def close(self) -> None:
+        """Write queued rows, stop the writer and close all connections."""
+        with self._write_state:
+            stop = self._writer is not None and not self._stopping
+            self._stopping = True
+            if stop:
+                self._write_queue.put(None)
+        if stop:
+            self._writer.join()
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception as e:
+                    logger.debug(f"Error closing SQLite connection: {e}")
+            self._connections = []
+        self._local = threading.local()
+        
+    def save_result(
+        self,
+        objective_id: str,
+        validation_type: str,
+        result: ValidationResult
+    ) -> bool:
+        future = self.submit_result(objective_id, validation_type, result)
+        if future.done() and future.exception() is not None:
+            logger.error(f"Error saving result to SQLite: {future.exception()}")
             return False
+        return True
             
     def get_result(
         self,
@@ -358,42 +861,30 @@ class SQLitePersistence(BasePersistence):
         timestamp: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            self._wait_for_writes()
+            cursor = self._connect().cursor()
+            
+            if timestamp:
+                cursor.execute(
+                    """
+                    SELECT * FROM validation_results
+                    WHERE objective_id = ? AND validation_type = ?
+                    AND timestamp = ?
+                    """,
+                    (objective_id, validation_type, timestamp)
+                )
+            else:
+                cursor.execute(
+                    """
+                    SELECT * FROM validation_results
+                    WHERE objective_id = ? AND validation_type = ?
+                    ORDER BY timestamp DESC LIMIT 1
+                    """,
+                    (objective_id, validation_type)
+                )
                 
-                if timestamp:
-                    cursor.execute(
-                        """
-                        SELECT * FROM validation_results
-                        WHERE objective_id = ? AND validation_type = ?
-                        AND timestamp = ?
-                        """,
-                        (objective_id, validation_type, timestamp)
-                    )
-                else:
-                    cursor.execute(
-                        """
-                        SELECT * FROM validation_results
-                        WHERE objective_id = ? AND validation_type = ?
-                        ORDER BY timestamp DESC LIMIT 1
-                        """,
-                        (objective_id, validation_type)
-                    )
-                    
-                row = cursor.fetchone()
-                if row:
-                    return {
-                        "objective_id": row[1],
-                        "validation_type": row[2],
-                        "timestamp": row[3],
-                        "result": {
-                            "is_valid": bool(row[4]),
-                            "score": row[5],
-                            "details": json.loads(row[6]) if row[6] else None,
-                            "message": row[7]
-                        }
-                    }
-                return None
+            row = cursor.fetchone()
+            return self._from_row(row) if row else None
                 
         except Exception as e:
             logger.error(f"Error getting result from SQLite: {e}")
@@ -407,52 +898,114 @@ class SQLitePersistence(BasePersistence):
         end_time: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            self._wait_for_writes()
+            cursor = self._connect().cursor()
+            
+            query = "SELECT * FROM validation_results WHERE 1=1"
+            params = []
+            
+            if objective_id:
+                query += " AND objective_id = ?"
+                params.append(objective_id)
                 
-                query = "SELECT * FROM validation_results WHERE 1=1"
-                params = []
+            if validation_type:
+                query += " AND validation_type = ?"
+                params.append(validation_type)
                 
-                if objective_id:
-                    query += " AND objective_id = ?"
-                    params.append(objective_id)
-                    
-                if validation_type:
-                    query += " AND validation_type = ?"
-                    params.append(validation_type)
-                    
-                if start_time:
-                    query += " AND timestamp >= ?"
-                    params.append(start_time)
-                    
-                if end_time:
-                    query += " AND timestamp <= ?"
-                    params.append(end_time)
-                    
-                query += " ORDER BY timestamp DESC"
+            if start_time:
+                query += " AND timestamp >= ?"
+                params.append(start_time)
                 
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
+            if end_time:
+                query += " AND timestamp <= ?"
+                params.append(end_time)
                 
-                return [
-                    {
-                        "objective_id": row[1],
-                        "validation_type": row[2],
-                        "timestamp": row[3],
-                        "result": {
-                            "is_valid": bool(row[4]),
-                            "score": row[5],
-                            "details": json.loads(row[6]) if row[6] else None,
-                            "message": row[7]
-                        }
-                    }
-                    for row in rows
-                ]
+            query += " ORDER BY timestamp DESC"
+            
+            cursor.execute(query, params)
+            return [self._from_row(row) for row in cursor.fetchall()]
                 
         except Exception as e:
             logger.error(f"Error getting results from SQLite: {e}")
             return []
             
+    def get_results_page(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> ResultPage:
+        """Get one page of results with keyset pagination on (timestamp, id).
+        
+        Filters, ordering and the limit run in SQL and only the columns
+        needed for the requested fields are selected.
+        """
+        self._wait_for_writes()
+        conditions, params = [], []
+        for column, value in (("objective_id", objective_id), ("validation_type", validation_type)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if start_time:
+            conditions.append("timestamp >= ?")
+            params.append(start_time)
+        if end_time:
+            conditions.append("timestamp <= ?")
+            params.append(end_time)
+        if cursor:
+            timestamp, row_id = decode_cursor(cursor)
+            conditions.append("(timestamp < ? OR (timestamp = ? AND id < ?))")
+            params.extend([timestamp, timestamp, row_id])
+            
+        if fields is None:
+            columns = list(SQLITE_COLUMNS)
+        else:
+            columns = ["id", "timestamp"]
+            for path in fields:
+                for column in SQLITE_FIELD_COLUMNS.get(path, ()):
+                    if column not in columns:
+                        columns.append(column)
+                        
+        query = f"SELECT {', '.join(columns)} FROM validation_results"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+        
+        rows = self._connect().execute(query, params).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = dict(zip(columns, rows[-1]))
+            next_cursor = encode_cursor([last["timestamp"], last["id"]])
+            
+        if fields is None:
+            items = [self._from_row(row) for row in rows]
+        else:
+            items = [project_result(self._from_columns(dict(zip(columns, row))), fields) for row in rows]
+        return ResultPage(items=items, next_cursor=next_cursor)
+        
+    @staticmethod
+    def _from_columns(values: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert selected columns to a (partial) result dictionary."""
+        record = {key: values[key] for key in INDEXED_FIELDS if key in values}
+        result: Dict[str, Any] = {}
+        if "is_valid" in values:
+            result["is_valid"] = bool(values["is_valid"])
+        if "score" in values:
+            result["score"] = values["score"]
+        if "details" in values:
+            result["details"] = json.loads(values["details"]) if values["details"] else None
+        if "message" in values:
+            result["message"] = values["message"]
+        if result:
+            record["result"] = result
+        return record
+            
     def delete_result(
         self,
         objective_id: str,
@@ -460,11 +1013,11 @@ class SQLitePersistence(BasePersistence):
         timestamp: Optional[str] = None
     ) -> bool:
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
+            self._wait_for_writes()
+            conn = self._connect()
+            with conn:
                 if timestamp:
-                    cursor.execute(
+                    conn.execute(
                         """
                         DELETE FROM validation_results
                         WHERE objective_id = ? AND validation_type = ?
@@ -473,21 +1026,90 @@ class SQLitePersistence(BasePersistence):
                         (objective_id, validation_type, timestamp)
                     )
                 else:
-                    cursor.execute(
+                    conn.execute(
                         """
                         DELETE FROM validation_results
                         WHERE objective_id = ? AND validation_type = ?
                         """,
                         (objective_id, validation_type)
                     )
-                    
-                conn.commit()
-                return True
+            return True
                 
         except Exception as e:
             logger.error(f"Error deleting result from SQLite: {e}")
             return False
 
+# Compound index used by result lookups
+MONGO_INDEX_KEYS = [
+    ("objective_id", pymongo.ASCENDING),
+    ("validation_type", pymongo.ASCENDING),
+    ("timestamp", pymongo.DESCENDING)
+]
+
+def _mongo_filter(
+    objective_id: Optional[str] = None,
+    validation_type: Optional[str] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build a MongoDB filter document for result queries."""
+    query: Dict[str, Any] = {}
+    if objective_id:
+        query["objective_id"] = objective_id
+    if validation_type:
+        query["validation_type"] = validation_type
+    if start_time or end_time:
+        query["timestamp"] = {}
+        if start_time:
+            query["timestamp"]["$gte"] = start_time
+        if end_time:
+            query["timestamp"]["$lte"] = end_time
+    return query
+
+def _mongo_page_query(
+    objective_id: Optional[str],
+    validation_type: Optional[str],
+    start_time: Optional[str],
+    end_time: Optional[str],
+    limit: int,
+    cursor: Optional[str],
+    fields: Optional[Sequence[str]]
+) -> Tuple[Dict[str, Any], Optional[Dict[str, int]], Dict[str, Any]]:
+    """Build the filter, projection and find options of a result page.
+    
+    One extra document is requested to detect whether a next page exists.
+    
+    Returns:
+        Tuple of filter, projection and keyword options for find
+    """
+    query = _mongo_filter(objective_id, validation_type, start_time, end_time)
+    if cursor:
+        timestamp, document_id = decode_cursor(cursor)
+        query = {"$and": [query, {"$or": [
+            {"timestamp": {"$lt": timestamp}},
+            {"timestamp": timestamp, "_id": {"$lt": ObjectId(document_id)}}
+        ]}]}
+    projection = None
+    if fields is not None:
+        projection = {path: 1 for path in fields}
+        projection["timestamp"] = 1
+    options = {
+        "sort": [("timestamp", pymongo.DESCENDING), ("_id", pymongo.DESCENDING)],
+        "limit": limit + 1
+    }
+    return query, projection, options
+
+def _mongo_page(documents: List[Dict[str, Any]], limit: int, fields: Optional[Sequence[str]]) -> ResultPage:
+    """Build a result page from documents fetched with _mongo_page_query."""
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = encode_cursor([documents[-1]["timestamp"], str(documents[-1]["_id"])])
+    return ResultPage(
+        items=[project_result(document, fields) for document in documents],
+        next_cursor=next_cursor
+    )
+
 class MongoPersistence(BasePersistence):
     """MongoDB-based persistence implementation."""
     
@@ -509,11 +1131,7 @@ class MongoPersistence(BasePersistence):
         self.collection = self.db[collection]
         
         # Create indexes
-        self.collection.create_index([
-            ("objective_id", pymongo.ASCENDING),
-            ("validation_type", pymongo.ASCENDING),
-            ("timestamp", pymongo.DESCENDING)
-        ])
+        self.collection.create_index(MONGO_INDEX_KEYS)
         
     def save_result(
         self,
@@ -571,21 +1189,7 @@ class MongoPersistence(BasePersistence):
         end_time: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         try:
-            query = {}
-            
-            if objective_id:
-                query["objective_id"] = objective_id
-                
-            if validation_type:
-                query["validation_type"] = validation_type
-                
-            if start_time or end_time:
-                query["timestamp"] = {}
-                if start_time:
-                    query["timestamp"]["$gte"] = start_time
-                if end_time:
-                    query["timestamp"]["$lte"] = end_time
-                    
+            query = _mongo_filter(objective_id, validation_type, start_time, end_time)
             return list(
                 self.collection.find(
                     query,
@@ -597,6 +1201,26 @@ class MongoPersistence(BasePersistence):
             logger.error(f"Error getting results from MongoDB: {e}")
             return []
             
+    def get_results_page(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> ResultPage:
+        """Get one page of results with keyset pagination on (timestamp, _id).
+        
+        Filters, sort, limit and projection are sent to MongoDB.
+        """
+        query, projection, options = _mongo_page_query(
+            objective_id, validation_type, start_time, end_time, limit, cursor, fields
+        )
+        documents = list(self.collection.find(query, projection, **options))
+        return _mongo_page(documents, limit, fields)
+            
     def delete_result(
         self,
         objective_id: str,
@@ -619,6 +1243,356 @@ class MongoPersistence(BasePersistence):
             logger.error(f"Error deleting result from MongoDB: {e}")
             return False
 
+class AsyncBasePersistence(ABC):
+    """Base class for asynchronous persistence implementations.
+    
+    Mirrors BasePersistence with coroutine methods so results can be stored
+    and read from the event loop without blocking it.
+    """
+    
+    @abstractmethod
+    async def save_result(
+        self,
+        objective_id: str,
+        validation_type: str,
+        result: ValidationResult
+    ) -> bool:
+        """Save a validation result, see BasePersistence.save_result."""
+        pass
+        
+    @abstractmethod
+    async def get_result(
+        self,
+        objective_id: str,
+        validation_type: str,
+        timestamp: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a validation result, see BasePersistence.get_result."""
+        pass
+        
+    @abstractmethod
+    async def get_results(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get multiple validation results, see BasePersistence.get_results."""
+        pass
+        
+    @abstractmethod
+    async def get_results_page(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> ResultPage:
+        """Get one page of validation results, see BasePersistence.get_results_page."""
+        pass
+        
+    @abstractmethod
+    async def delete_result(
+        self,
+        objective_id: str,
+        validation_type: str,
+        timestamp: Optional[str] = None
+    ) -> bool:
+        """Delete a validation result, see BasePersistence.delete_result."""
+        pass
+        
+    async def aiter_results(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over validation results, newest first, one page at a time.
+        
+        Arguments are the same as for BasePersistence.iter_results.
+        
+        Yields:
+            Validation results
+        """
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            page = await self.get_results_page(
+                objective_id, validation_type, start_time, end_time,
+                limit=size, cursor=cursor, fields=fields
+            )
+            for item in page.items:
+                yield item
+            if remaining is not None:
+                remaining -= len(page.items)
+            if not page.next_cursor or not page.items:
+                return
+            cursor = page.next_cursor
+            
+    async def close(self) -> None:
+        """Release connections and worker threads."""
+        pass
+        
+    async def __aenter__(self) -> "AsyncBasePersistence":
+        return self
+        
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+class ExecutorPersistence(AsyncBasePersistence):
+    """Asynchronous adapter running a synchronous backend in worker threads.
+    
+    Writes go through a single dedicated writer thread, so they are applied
+    in submission order and a slow write never holds up the event loop.
+    Reads run on a small reader pool and wait for the writes submitted
+    before them, so a read observes every earlier write of this adapter.
+    """
+    
+    def __init__(self, persistence: BasePersistence, read_workers: int = 4):
+        """Initialize executor persistence.
+        
+        Args:
+            persistence: Synchronous backend to run
+            read_workers: Number of reader threads
+        """
+        if read_workers < 1:
+            raise ValueError("read_workers must be at least 1")
+        self.persistence = persistence
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="persistence-writer")
+        self._readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="persistence-reader")
+        self._last_write: Optional[Future] = None
+        
+    async def _write(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a write on the writer thread."""
+        future = self._writer.submit(fn, *args)
+        self._last_write = future
+        return await asyncio.wrap_future(future)
+        
+    async def _read(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a read on the reader pool once earlier writes are applied."""
+        pending = self._last_write
+        
+        def run() -> Any:
+            # The writer is FIFO, so the last write finishing implies all earlier ones did
+            if pending is not None:
+                wait_futures([pending])
+            return fn(*args, **kwargs)
+            
+        return await asyncio.wrap_future(self._readers.submit(run))
+        
+    async def save_result(
+        self,
+        objective_id: str,
+        validation_type: str,
+        result: ValidationResult
+    ) -> bool:
+        return await self._write(self.persistence.save_result, objective_id, validation_type, result)
+        
+    async def get_result(
+        self,
+        objective_id: str,
+        validation_type: str,
+        timestamp: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        return await self._read(self.persistence.get_result, objective_id, validation_type, timestamp)
+        
+    async def get_results(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return await self._read(self.persistence.get_results, objective_id, validation_type, start_time, end_time)
+        
+    async def get_results_page(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> ResultPage:
+        return await self._read(
+            self.persistence.get_results_page, objective_id, validation_type, start_time, end_time,
+            limit=limit, cursor=cursor, fields=fields
+        )
+        
+    async def delete_result(
+        self,
+        objective_id: str,
+        validation_type: str,
+        timestamp: Optional[str] = None
+    ) -> bool:
+        return await self._write(self.persistence.delete_result, objective_id, validation_type, timestamp)
+        
+    async def store_metric(self, metric: Any) -> Any:
+        """Store a metric point on the writer thread.
+        
+        Args:
+            metric: Metric point passed to the backend's store_metric
+            
+        Raises:
+            AttributeError: If the backend cannot store metrics
+        """
+        return await self._write(self.persistence.store_metric, metric)
+        
+    async def flush(self) -> None:
+        """Wait until all submitted writes are applied."""
+        pending = self._last_write
+        if pending is not None:
+            await asyncio.wait([asyncio.wrap_future(pending)])
+            
+    async def close(self) -> None:
+        """Apply pending writes, stop the worker threads and close the backend."""
+        await self.flush()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._shutdown)
+        
+    def _shutdown(self) -> None:
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+        close = getattr(self.persistence, "close", None)
+        if close is not None:
+            close()
+
+class AsyncMongoPersistence(AsyncBasePersistence):
+    """MongoDB persistence on PyMongo's native asyncio client."""
+    
+    def __init__(
+        self,
+        connection_string: str,
+        database: str,
+        collection: str = "validation_results"
+    ):
+        """Initialize async MongoDB persistence.
+        
+        Args:
+            connection_string: MongoDB connection string
+            database: Database name
+            collection: Collection name
+            
+        Raises:
+            ImportError: If the installed PyMongo has no asyncio client
+        """
+        if not hasattr(pymongo, "AsyncMongoClient"):
+            raise ImportError("AsyncMongoPersistence requires pymongo>=4.9")
+        self.client = pymongo.AsyncMongoClient(connection_string)
+        self.db = self.client[database]
+        self.collection = self.db[collection]
+        self._indexed = False
+        
+    async def _ensure_indexes(self) -> None:
+        """Create indexes on first use, the constructor cannot await."""
+        if not self._indexed:
+            await self.collection.create_index(MONGO_INDEX_KEYS)
+            self._indexed = True
+            
+    async def save_result(
+        self,
+        objective_id: str,
+        validation_type: str,
+        result: ValidationResult
+    ) -> bool:
+        try:
+            await self._ensure_indexes()
+            await self.collection.insert_one({
+                "objective_id": objective_id,
+                "validation_type": validation_type,
+                "timestamp": result.timestamp,
+                "result": asdict(result)
+            })
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error saving result to MongoDB: {e}")
+            return False
+            
+    async def get_result(
+        self,
+        objective_id: str,
+        validation_type: str,
+        timestamp: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            query: Dict[str, Any] = {
+                "objective_id": objective_id,
+                "validation_type": validation_type
+            }
+            if timestamp:
+                query["timestamp"] = timestamp
+            return await self.collection.find_one(query, sort=[("timestamp", pymongo.DESCENDING)])
+            
+        except Exception as e:
+            logger.error(f"Error getting result from MongoDB: {e}")
+            return None
+            
+    async def get_results(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        try:
+            query = _mongo_filter(objective_id, validation_type, start_time, end_time)
+            return await self.collection.find(query, sort=[("timestamp", pymongo.DESCENDING)]).to_list(None)
+            
+        except Exception as e:
+            logger.error(f"Error getting results from MongoDB: {e}")
+            return []
+            
+    async def get_results_page(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> ResultPage:
+        query, projection, options = _mongo_page_query(
+            objective_id, validation_type, start_time, end_time, limit, cursor, fields
+        )
+        documents = await self.collection.find(query, projection, **options).to_list(None)
+        return _mongo_page(documents, limit, fields)
+        
+    async def delete_result(
+        self,
+        objective_id: str,
+        validation_type: str,
+        timestamp: Optional[str] = None
+    ) -> bool:
+        try:
+            query = {
+                "objective_id": objective_id,
+                "validation_type": validation_type
+            }
+            if timestamp:
+                query["timestamp"] = timestamp
+            result = await self.collection.delete_many(query)
+            return result.deleted_count > 0
+            
+        except Exception as e:
+            logger.error(f"Error deleting result from MongoDB: {e}")
+            return False
+            
+    async def close(self) -> None:
+        """Close the MongoDB client."""
+        await self.client.close()
+
 class PersistenceFactory:
     """Factory for creating persistence instances."""
     
@@ -630,7 +1604,7 @@ class PersistenceFactory:
         """Create a persistence instance.
         
         Args:
-            persistence_type: Type of persistence (file, sqlite, mongo)
+            persistence_type: Type of persistence (file, sqlite, parquet, mongo)
             **kwargs: Additional arguments for specific persistence type
             
         Returns:
@@ -642,11 +1616,25 @@ class PersistenceFactory:
         if persistence_type == "file":
             return FilePersistence(
                 base_dir=kwargs.get("base_dir", "validation_results"),
-                format=kwargs.get("format", "json")
+                format=kwargs.get("format", "json"),
+                segment_size=kwargs.get("segment_size", 64 * 1024 * 1024),
+                compact_ratio=kwargs.get("compact_ratio", 0.5)
             )
         elif persistence_type == "sqlite":
             return SQLitePersistence(
-                db_path=kwargs.get("db_path", "validation_results.db")
+                db_path=kwargs.get("db_path", "validation_results.db"),
+                batch_writes=kwargs.get("batch_writes", False),
+                batch_size=kwargs.get("batch_size", 500),
+                flush_interval=kwargs.get("flush_interval", 0.05)
+            )
+        elif persistence_type == "parquet":
+            # Imported here as pyarrow is only needed for this backend
+            from .parquet_persistence import ParquetPersistence
+            return ParquetPersistence(
+                base_dir=kwargs.get("base_dir", "validation_results"),
+                flush_rows=kwargs.get("flush_rows", 10000),
+                flush_interval=kwargs.get("flush_interval", 60.0),
+                compact_files=kwargs.get("compact_files", 16)
             )
         elif persistence_type == "mongo":
             return MongoPersistence(
@@ -656,3 +1644,35 @@ class PersistenceFactory:
             )
         else:
             raise ValueError(f"Unsupported persistence type: {persistence_type}")
+            
+    @staticmethod
+    def create_async_persistence(
+        persistence_type: str,
+        **kwargs
+    ) -> AsyncBasePersistence:
+        """Create an asynchronous persistence instance.
+        
+        MongoDB uses the native asyncio client. File and SQLite backends run
+        in worker threads with a dedicated writer thread.
+        
+        Args:
+            persistence_type: Type of persistence (file, sqlite, mongo)
+            **kwargs: Arguments for the persistence type, as for
+                create_persistence, plus read_workers for threaded backends
+            
+        Returns:
+            Asynchronous persistence instance
+            
+        Raises:
+            ValueError: If persistence type is not supported
+        """
+        if persistence_type == "mongo":
+            return AsyncMongoPersistence(
+                connection_string=kwargs["connection_string"],
+                database=kwargs["database"],
+                collection=kwargs.get("collection", "validation_results")
+            )
+        return ExecutorPersistence(
+            PersistenceFactory.create_persistence(persistence_type, **kwargs),
+            read_workers=kwargs.get("read_workers", 4)
+        )
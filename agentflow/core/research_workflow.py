@@ -12,6 +12,7 @@ from ..agents.agent import Agent
 from .exceptions import WorkflowExecutionError
 from .workflow_types import WorkflowStepType
 from .config import WorkflowConfig
+from .micro_batcher import MicroBatcher
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +32,12 @@ class DistributedConfig:
     batch_size: int = 1
     max_retries: int = 3
     timeout: float = 3600.0
+    # Seconds a partial batch waits for more items before dispatch
+    max_batch_wait: float = 0.01
+    # Concurrent batches per worker before it counts as saturated
+    max_inflight_per_worker: int = 2
+    # Items waiting for dispatch before submitters are blocked
+    max_pending: int = 1000
 
 class ResearchDistributedWorkflow:
     """Research distributed workflow class."""
@@ -144,14 +151,37 @@ class ResearchDistributedWorkflow:
         if not self.workers:
             await self.initialize_workers()
             
-        tasks = []
-        for i, item in enumerate(batch):
-            worker = self.workers[i % len(self.workers)]
-            task = asyncio.create_task(worker.execute({"data": item}))
-            tasks.append(task)
-            
-        results = await asyncio.gather(*tasks)
+        async with self.create_batcher() as batcher:
+            results = await batcher.map(batch)
         return [{"result": result} for result in results]
+
+    def create_batcher(self) -> MicroBatcher:
+        """Create a micro-batcher over the workflow's workers.
+
+        Items are grouped into batches of ``dist_config.batch_size`` and each
+        batch goes to the least loaded worker. Workers with an
+        ``execute_batch`` method receive the whole batch in one call, other
+        workers execute the batch items concurrently.
+
+        Returns:
+            MicroBatcher: Batcher configured from the distributed config
+        """
+        return MicroBatcher(
+            self.workers,
+            self._execute_on_worker,
+            batch_size=self.dist_config.batch_size,
+            max_wait=self.dist_config.max_batch_wait,
+            max_inflight_per_worker=self.dist_config.max_inflight_per_worker,
+            max_pending=self.dist_config.max_pending
+        )
+
+    @staticmethod
+    async def _execute_on_worker(worker: Any, items: List[Any]) -> List[Any]:
+        """Execute a batch of items on a worker."""
+        inputs = [{"data": item} for item in items]
+        if hasattr(worker, "execute_batch"):
+            return await worker.execute_batch(inputs)
+        return await asyncio.gather(*(worker.execute(item_input) for item_input in inputs))
         
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute workflow.
@@ -0,0 +1,450 @@
+"""Append-only JSON-lines segment log with a sidecar index."""
+
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Name of the file holding the current generation of segments and index
+CURRENT_FILE = "CURRENT"
+
+ResultKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """Location of a record in the segment log.
+
+    Attributes:
+        objective_id: ID of the objective
+        validation_type: Type of validation
+        timestamp: Record timestamp
+        segment: Segment number
+        offset: Byte offset of the record in the segment
+        length: Record length in bytes, including the newline
+        generation: Generation of the segment files holding the record
+    """
+    objective_id: str
+    validation_type: str
+    timestamp: str
+    segment: int
+    offset: int
+    length: int
+    generation: int = 0
+
+
+class SegmentLog:
+    """Result records stored as JSON lines in append-only segment files.
+
+    Every record is appended to the active segment and its key, timestamp
+    and byte range are appended to a sidecar index file. The index is held
+    in memory, so lookups read only the matching records with a seek.
+    Deletes append tombstones to the index; once deleted records make up
+    more than ``compact_ratio`` of the log, the live records are copied to a
+    new generation of segments and the old files are removed.
+
+    Files of one generation are ``segment-<gen>-<n>.jsonl`` and
+    ``index-<gen>.jsonl``. The ``CURRENT`` file names the live generation
+    and is replaced atomically when a compaction finishes. Index entries
+    carry their generation, and the files of a replaced generation are
+    kept until the reads pinning it finish, so entries found before a
+    compaction stay readable.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        segment_size: int = 64 * 1024 * 1024,
+        compact_ratio: float = 0.5
+    ):
+        """Initialize segment log.
+
+        Args:
+            base_dir: Directory for segment and index files
+            segment_size: Size in bytes after which a new segment is started
+            compact_ratio: Fraction of deleted bytes that triggers compaction
+        """
+        self.base_dir = Path(base_dir)
+        self.segment_size = segment_size
+        self.compact_ratio = compact_ratio
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._entries: Dict[ResultKey, List[IndexEntry]] = {}
+        self._by_objective: Dict[str, set] = defaultdict(set)
+        self._live_bytes = 0
+        self._dead_bytes = 0
+        # End offset of the indexed records per segment, deleted ones included
+        self._indexed_end: Dict[int, int] = {}
+        self._segment_file = None
+        self._index_file = None
+        # Active readers per generation, and files of replaced generations kept for them
+        self._pins: Dict[int, int] = defaultdict(int)
+        self._retired: Dict[int, List[Path]] = {}
+        self._load()
+
+    # File layout
+
+    def _segment_path(self, generation: int, segment: int) -> Path:
+        return self.base_dir / f"segment-{generation}-{segment:06d}.jsonl"
+
+    def _index_path(self, generation: int) -> Path:
+        return self.base_dir / f"index-{generation}.jsonl"
+
+    def _read_generation(self) -> int:
+        current = self.base_dir / CURRENT_FILE
+        if current.exists():
+            return int(current.read_text().strip() or 0)
+        return 0
+
+    def _write_generation(self, generation: int) -> None:
+        tmp_path = self.base_dir / f"{CURRENT_FILE}.tmp"
+        tmp_path.write_text(str(generation))
+        os.replace(tmp_path, self.base_dir / CURRENT_FILE)
+
+    def _segments(self, generation: int) -> List[int]:
+        prefix = f"segment-{generation}-"
+        return sorted(
+            int(path.stem[len(prefix):])
+            for path in self.base_dir.glob(f"{prefix}*.jsonl")
+        )
+
+    def _generation_files(self, generation: int) -> List[Path]:
+        return [
+            *[self._segment_path(generation, segment) for segment in self._segments(generation)],
+            self._index_path(generation)
+        ]
+
+    def _remove_stale_generations(self) -> None:
+        """Remove files of generations replaced while a reader still used them."""
+        for path in self.base_dir.glob("index-*.jsonl"):
+            try:
+                generation = int(path.stem[len("index-"):])
+            except ValueError:
+                continue
+            if generation < self.generation:
+                for stale in self._generation_files(generation):
+                    stale.unlink(missing_ok=True)
+
+    # Loading
+
+    def _load(self) -> None:
+        """Load the index of the current generation, rebuilding it if needed."""
+        self.generation = self._read_generation()
+        self._remove_stale_generations()
+        index_path = self._index_path(self.generation)
+        segments = self._segments(self.generation)
+        self.segment = segments[-1] if segments else 0
+
+        if index_path.exists():
+            with open(index_path, "r") as f:
+                for line in f:
+                    try:
+                        self._apply(json.loads(line))
+                    except ValueError:
+                        # Torn write at the end of the index
+                        logger.warning(f"Skipping corrupt index line in {index_path}")
+
+        # Index records appended after the last index write
+        for segment in segments:
+            size = self._segment_path(self.generation, segment).stat().st_size
+            indexed = self._indexed_end.get(segment, 0)
+            if indexed < size:
+                self._reindex_segment(segment, indexed)
+
+        self._open_for_append()
+
+    def _reindex_segment(self, segment: int, start: int) -> None:
+        """Add the records of a segment from a byte offset to the index."""
+        path = self._segment_path(self.generation, segment)
+        with open(path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self._add(IndexEntry(
+                    record["objective_id"], record["validation_type"], record["timestamp"],
+                    segment, offset, len(line), self.generation
+                ))
+                offset += len(line)
+        with open(self._index_path(self.generation), "a") as index:
+            for entries in self._entries.values():
+                for entry in entries:
+                    if entry.segment == segment and entry.offset >= start:
+                        index.write(self._encode_add(entry))
+
+    def _apply(self, op: Dict[str, Any]) -> None:
+        """Apply an index operation to the in-memory index."""
+        if op.get("op") == "del":
+            self._remove(op["o"], op["v"], op.get("t"))
+        else:
+            self._add(IndexEntry(op["o"], op["v"], op["t"], op["s"], op["p"], op["n"], self.generation))
+
+    def _add(self, entry: IndexEntry) -> None:
+        self._entries.setdefault((entry.objective_id, entry.validation_type), []).append(entry)
+        self._by_objective[entry.objective_id].add(entry.validation_type)
+        self._live_bytes += entry.length
+        end = entry.offset + entry.length
+        if end > self._indexed_end.get(entry.segment, 0):
+            self._indexed_end[entry.segment] = end
+
+    def _remove(self, objective_id: str, validation_type: str, timestamp: Optional[str]) -> int:
+        key = (objective_id, validation_type)
+        entries = self._entries.get(key, [])
+        removed = [entry for entry in entries if timestamp is None or entry.timestamp == timestamp]
+        if not removed:
+            return 0
+        kept = [entry for entry in entries if timestamp is not None and entry.timestamp != timestamp]
+        if kept:
+            self._entries[key] = kept
+        else:
+            self._entries.pop(key, None)
+            self._by_objective[objective_id].discard(validation_type)
+            if not self._by_objective[objective_id]:
+                del self._by_objective[objective_id]
+        freed = sum(entry.length for entry in removed)
+        self._live_bytes -= freed
+        self._dead_bytes += freed
+        return len(removed)
+
+    @staticmethod
+    def _encode_add(entry: IndexEntry) -> str:
+        return json.dumps({
+            "op": "add", "o": entry.objective_id, "v": entry.validation_type,
+            "t": entry.timestamp, "s": entry.segment, "p": entry.offset, "n": entry.length
+        }) + "\n"
+
+    def _open_for_append(self) -> None:
+        self._segment_file = open(self._segment_path(self.generation, self.segment), "ab")
+        self._index_file = open(self._index_path(self.generation), "a")
+
+    # Public API
+
+    def append(self, record: Dict[str, Any]) -> IndexEntry:
+        """Append a record.
+
+        Args:
+            record: Record with objective_id, validation_type and timestamp fields
+
+        Returns:
+            IndexEntry: Location of the record
+        """
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with self._lock:
+            if self._segment_file.tell() and self._segment_file.tell() + len(line) > self.segment_size:
+                self._segment_file.close()
+                self.segment += 1
+                self._segment_file = open(self._segment_path(self.generation, self.segment), "ab")
+            offset = self._segment_file.tell()
+            self._segment_file.write(line)
+            self._segment_file.flush()
+            entry = IndexEntry(
+                record["objective_id"], record["validation_type"], record["timestamp"],
+                self.segment, offset, len(line), self.generation
+            )
+            self._index_file.write(self._encode_add(entry))
+            self._index_file.flush()
+            self._add(entry)
+            return entry
+
+    def entries(
+        self,
+        objective_id: Optional[str] = None,
+        validation_type: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None
+    ) -> List[IndexEntry]:
+        """Find records in the index.
+
+        Args:
+            objective_id: Optional objective ID filter
+            validation_type: Optional validation type filter
+            start_time: Optional start time filter
+            end_time: Optional end time filter
+
+        Returns:
+            Matching index entries in append order
+        """
+        with self._lock:
+            if objective_id and validation_type:
+                keys: Iterable[ResultKey] = [(objective_id, validation_type)]
+            elif objective_id:
+                keys = [(objective_id, vtype) for vtype in self._by_objective.get(objective_id, ())]
+            else:
+                keys = [key for key in self._entries if not validation_type or key[1] == validation_type]
+            matches = [
+                entry
+                for key in keys
+                for entry in self._entries.get(key, ())
+                if (not start_time or entry.timestamp >= start_time)
+                and (not end_time or entry.timestamp <= end_time)
+            ]
+        matches.sort(key=lambda entry: (entry.segment, entry.offset))
+        return matches
+
+    def latest(self, objective_id: str, validation_type: str, timestamp: Optional[str] = None) -> Optional[IndexEntry]:
+        """Find the most recently appended record of a key.
+
+        Args:
+            objective_id: ID of the objective
+            validation_type: Type of validation
+            timestamp: Optional specific timestamp
+
+        Returns:
+            Index entry if found, None otherwise
+        """
+        with self._lock:
+            for entry in reversed(self._entries.get((objective_id, validation_type), [])):
+                if timestamp is None or entry.timestamp == timestamp:
+                    return entry
+        return None
+
+    @contextmanager
+    def pinned(self) -> Iterator[None]:
+        """Keep the files of the current generation while the block runs.
+
+        Entries found inside the block stay readable inside it even if a
+        compaction replaces the generation in the meantime.
+        """
+        with self._lock:
+            generation = self.generation
+            self._pins[generation] += 1
+        try:
+            yield
+        finally:
+            self._unpin(generation)
+
+    def _unpin(self, generation: int) -> None:
+        with self._lock:
+            self._pins[generation] -= 1
+            if self._pins[generation] <= 0:
+                del self._pins[generation]
+                for path in self._retired.pop(generation, ()):
+                    path.unlink(missing_ok=True)
+
+    def read(self, entries: Iterable[IndexEntry]) -> Iterator[Dict[str, Any]]:
+        """Read records with one seek per record.
+
+        Args:
+            entries: Index entries of the records
+
+        Yields:
+            Records in the order of the entries
+
+        Raises:
+            LookupError: If entries belong to a generation that was compacted
+                and removed before the read started
+        """
+        entries = list(entries)
+        with self._lock:
+            generations = {entry.generation for entry in entries}
+            stale = [
+                generation for generation in generations
+                if generation != self.generation and generation not in self._pins
+            ]
+            if stale:
+                raise LookupError(f"Segment log generation {stale[0]} was compacted; look the entries up again")
+            for generation in generations:
+                self._pins[generation] += 1
+        handles: Dict[Tuple[int, int], Any] = {}
+        try:
+            for entry in entries:
+                location = (entry.generation, entry.segment)
+                handle = handles.get(location)
+                if handle is None:
+                    handle = handles[location] = open(self._segment_path(*location), "rb")
+                handle.seek(entry.offset)
+                yield json.loads(handle.read(entry.length))
+        finally:
+            for handle in handles.values():
+                handle.close()
+            for generation in generations:
+                self._unpin(generation)
+
+    def delete(self, objective_id: str, validation_type: str, timestamp: Optional[str] = None) -> int:
+        """Delete records of a key.
+
+        Args:
+            objective_id: ID of the objective
+            validation_type: Type of validation
+            timestamp: Optional specific timestamp, all records of the key if None
+
+        Returns:
+            Number of records deleted
+        """
+        with self._lock:
+            removed = self._remove(objective_id, validation_type, timestamp)
+            if removed:
+                self._index_file.write(json.dumps(
+                    {"op": "del", "o": objective_id, "v": validation_type, "t": timestamp}
+                ) + "\n")
+                self._index_file.flush()
+                if self._dead_bytes > self.compact_ratio * (self._live_bytes + self._dead_bytes):
+                    self.compact()
+            return removed
+
+    def compact(self) -> None:
+        """Copy live records to a new generation of files and remove the old ones."""
+        with self._lock:
+            old_generation = self.generation
+            old_files = self._generation_files(old_generation)
+            live = sorted(
+                (entry for entries in self._entries.values() for entry in entries),
+                key=lambda entry: (entry.segment, entry.offset)
+            )
+            records = list(self.read(live))
+            self._segment_file.close()
+            self._index_file.close()
+
+            self.generation = old_generation + 1
+            self.segment = 0
+            self._entries = {}
+            self._by_objective = defaultdict(set)
+            self._live_bytes = 0
+            self._dead_bytes = 0
+            self._indexed_end = {}
+            for path in (self._index_path(self.generation), *[
+                self._segment_path(self.generation, segment) for segment in self._segments(self.generation)
+            ]):
+                # Leftovers of an interrupted compaction
+                path.unlink(missing_ok=True)
+            self._open_for_append()
+            for record in records:
+                self.append(record)
+            os.fsync(self._segment_file.fileno())
+            os.fsync(self._index_file.fileno())
+            self._write_generation(self.generation)
+
+            if self._pins.get(old_generation):
+                self._retired[old_generation] = old_files
+            else:
+                for path in old_files:
+                    path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of records and live and deleted bytes."""
+        with self._lock:
+            return {
+                "records": sum(len(entries) for entries in self._entries.values()),
+                "live_bytes": self._live_bytes,
+                "dead_bytes": self._dead_bytes,
+                "segments": self.segment + 1,
+            }
+
+    def close(self) -> None:
+        """Close the open segment and index files."""
+        with self._lock:
+            for handle in (self._segment_file, self._index_file):
+                if handle is not None and not handle.closed:
+                    handle.close()
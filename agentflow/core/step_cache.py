@@ -0,0 +1,443 @@
+"""Content-addressed cache for workflow step results."""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .metrics import MetricsManager, MetricType
+from .utils import content_hash
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """Cached step result."""
+    value: Any
+    expires_at: Optional[float] = None
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Check whether the entry has outlived its TTL."""
+        return self.expires_at is not None and (now or time.time()) >= self.expires_at
+
+
+class CacheBackend(ABC):
+    """Base class for step cache storage backends."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cache entry if found, None otherwise
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry, evicting least recently used entries if full.
+
+        Args:
+            key: Cache key
+            entry: Entry to store
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove an entry.
+
+        Args:
+            key: Cache key
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all entries."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache backend."""
+
+    def __init__(self, max_entries: int = 1024):
+        """Initialize memory backend.
+
+        Args:
+            max_entries: Maximum number of cached entries
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """SQLite cache backend shared between processes."""
+
+    def __init__(self, db_path: str, max_entries: int = 10000):
+        """Initialize SQLite backend.
+
+        Args:
+            db_path: Path to SQLite database file
+            max_entries: Maximum number of cached entries
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize database schema."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS step_cache (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    expires_at REAL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_step_cache_last_access ON step_cache (last_access)"
+            )
+            conn.commit()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM step_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE step_cache SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            conn.commit()
+        return CacheEntry(value=pickle.loads(row[0]), expires_at=row[1])
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO step_cache (key, value, expires_at, last_access)
+                VALUES (?, ?, ?, ?)
+                """,
+                (key, pickle.dumps(entry.value), entry.expires_at, time.time())
+            )
+            count = conn.execute("SELECT COUNT(*) FROM step_cache").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    """
+                    DELETE FROM step_cache WHERE key IN (
+                        SELECT key FROM step_cache ORDER BY last_access ASC LIMIT ?
+                    )
+                    """,
+                    (count - self.max_entries,)
+                )
+            conn.commit()
+
+    def delete(self, key: str) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM step_cache WHERE key = ?", (key,))
+            conn.commit()
+
+    def clear(self) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM step_cache")
+            conn.commit()
+
+    def __len__(self) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM step_cache").fetchone()[0]
+
+
+class DiskCacheBackend(CacheBackend):
+    """File-per-entry cache backend, using file modification time for LRU order.
+
+    The number of entries is tracked in memory, so writes only scan the
+    directory when the count passes ``max_entries``. Eviction then removes
+    a tenth of the limit, least recently used first, and recounts, which
+    also picks up entries written by other processes.
+    """
+
+    # Fraction of max_entries removed by an eviction
+    EVICT_FRACTION = 0.1
+
+    def __init__(self, base_dir: str, max_entries: int = 10000):
+        """Initialize disk backend.
+
+        Args:
+            base_dir: Directory for cache files
+            max_entries: Maximum number of cached entries
+        """
+        self.base_dir = Path(base_dir)
+        self.max_entries = max_entries
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._count = len(self)
+
+    def _get_file_path(self, key: str) -> Path:
+        """Get the file path for a cache key."""
+        return self.base_dir / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        file_path = self._get_file_path(key)
+        try:
+            with open(file_path, "rb") as f:
+                entry = pickle.load(f)
+            os.utime(file_path)
+            return entry
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        file_path = self._get_file_path(key)
+        tmp_path = file_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entry, f)
+        is_new = not file_path.exists()
+        os.replace(tmp_path, file_path)
+
+        with self._lock:
+            if is_new:
+                self._count += 1
+            if self._count > self.max_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries to make room for new ones."""
+        files = []
+        for path in self.base_dir.glob("*.pkl"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                pass
+        keep = self.max_entries - int(self.max_entries * self.EVICT_FRACTION)
+        files.sort()
+        for _, path in files[:max(len(files) - keep, 0)]:
+            path.unlink(missing_ok=True)
+        self._count = min(len(files), keep)
+
+    def delete(self, key: str) -> None:
+        try:
+            self._get_file_path(key).unlink()
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._count = max(self._count - 1, 0)
+
+    def clear(self) -> None:
+        for path in self.base_dir.glob("*.pkl"):
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._count = 0
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.base_dir.glob("*.pkl"))
+
+
+class StepCache:
+    """Memoizes step results by a content hash of the step and its input.
+
+    Two steps share cache entries when they have the same type, strategy
+    and parameters and receive the same input context. Hits and misses are
+    recorded on the metrics manager, labelled with the step type.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        default_ttl: Optional[float] = None,
+        metrics: Optional[MetricsManager] = None
+    ):
+        """Initialize step cache.
+
+        Args:
+            backend: Storage backend, in-memory LRU by default
+            default_ttl: Seconds an entry stays valid, None for no expiry
+            metrics: Metrics manager receiving hit and miss counts
+        """
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.default_ttl = default_ttl
+        self.metrics = metrics if metrics is not None else MetricsManager()
+
+    @staticmethod
+    def make_key(step: Any, context: Any, workflow_id: Optional[str] = None) -> str:
+        """Compute the cache key of a step execution.
+
+        Functions in the step parameters are hashed with their constants,
+        defaults and captured values, so steps only share entries when
+        they compute the same thing.
+
+        Args:
+            step: Workflow step
+            context: Step input context
+            workflow_id: Workflow the step belongs to, entries are not
+                shared between workflows
+
+        Returns:
+            Content hash of the step configuration and input
+
+        Raises:
+            TypeError: If the step or input holds a callable that cannot be
+                hashed by content, so the step must not be cached
+        """
+        return content_hash({
+            "workflow_id": workflow_id,
+            "type": step.type,
+            "strategy": step.config.strategy,
+            "params": step.config.params,
+            "input": context,
+        }, strict=True)
+
+    def lookup(
+        self,
+        key: str,
+        labels: Optional[Dict[str, str]] = None,
+        metrics: Optional[MetricsManager] = None
+    ) -> Tuple[bool, Any]:
+        """Look up a cached result.
+
+        Args:
+            key: Cache key
+            labels: Metric labels for the hit or miss
+            metrics: Metrics manager recording the hit or miss, defaults
+                to the cache's own
+
+        Returns:
+            Tuple of whether the key was found and the cached value
+        """
+        try:
+            entry = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Step cache lookup failed: {e}")
+            entry = None
+
+        if entry is not None and entry.is_expired():
+            self.backend.delete(key)
+            entry = None
+
+        metrics = metrics if metrics is not None else self.metrics
+        if entry is None:
+            metrics.record_metric(MetricType.CACHE_MISS, 1, labels)
+            return False, None
+        metrics.record_metric(MetricType.CACHE_HIT, 1, labels)
+        return True, entry.value
+
+    def store(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a result.
+
+        Args:
+            key: Cache key
+            value: Step result
+            ttl: Seconds the entry stays valid, defaults to the cache TTL
+        """
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        try:
+            self.backend.set(key, CacheEntry(value=value, expires_at=expires_at))
+        except Exception as e:
+            logger.warning(f"Step result could not be cached: {e}")
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        self.backend.clear()
+
+
+class StepCacheFactory:
+    """Factory for creating step caches."""
+
+    @staticmethod
+    def create_cache(cache_type: str = "memory", **kwargs) -> StepCache:
+        """Create a step cache.
+
+        Args:
+            cache_type: Type of backend (memory, sqlite, disk)
+            **kwargs: Backend arguments plus optional default_ttl and metrics
+
+        Returns:
+            Step cache instance
+
+        Raises:
+            ValueError: If cache type is not supported
+        """
+        if cache_type == "memory":
+            backend = MemoryCacheBackend(max_entries=kwargs.get("max_entries", 1024))
+        elif cache_type == "sqlite":
+            backend = SQLiteCacheBackend(
+                db_path=kwargs.get("db_path", "step_cache.db"),
+                max_entries=kwargs.get("max_entries", 10000)
+            )
+        elif cache_type == "disk":
+            backend = DiskCacheBackend(
+                base_dir=kwargs.get("base_dir", "step_cache"),
+                max_entries=kwargs.get("max_entries", 10000)
+            )
+        else:
+            raise ValueError(f"Unsupported step cache type: {cache_type}")
+        return StepCache(
+            backend=backend,
+            default_ttl=kwargs.get("default_ttl"),
+            metrics=kwargs.get("metrics")
+        )
+
+
+_default_step_cache: Optional[StepCache] = None
+
+
+def get_default_step_cache() -> StepCache:
+    """Get the process-wide step cache used when an executor has none."""
+    global _default_step_cache
+    if _default_step_cache is None:
+        _default_step_cache = StepCache()
+    return _default_step_cache
+
+
+def set_default_step_cache(cache: Optional[StepCache]) -> None:
+    """Replace the process-wide step cache.
+
+    Args:
+        cache: Step cache to use, or None to reset to a fresh in-memory cache
+    """
+    global _default_step_cache
+    _default_step_cache = cache
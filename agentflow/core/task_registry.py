@@ -0,0 +1,232 @@
+"""Bounded registry of asynchronous task records with expiry and spill."""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .persistence import BasePersistence
+from .validators import ValidationResult
+
+logger = logging.getLogger(__name__)
+
+# Validation type under which spilled task records are stored
+TASK_RECORD_TYPE = "workflow_task"
+
+# Task statuses that will not change anymore
+FINISHED_STATUSES = frozenset({"completed", "error", "failed", "cancelled"})
+
+
+class TaskRegistry:
+    """Holds task records in memory for a bounded time and number.
+
+    Finished tasks expire ``ttl`` seconds after they finish. When more than
+    ``max_entries`` records are held, the oldest finished ones are evicted
+    first. Running tasks are never evicted, as their results would be lost.
+    With a persistence backend, expired and evicted records are spilled to
+    it instead of being dropped and get() transparently loads them back.
+    Spilled records are written in batches by a background thread, outside
+    the registry lock, so callers on an event loop never wait for the
+    backend; until written they are still served from memory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: Optional[float] = 3600.0,
+        persistence: Optional[BasePersistence] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """Initialize task registry.
+
+        Args:
+            max_entries: Maximum number of records held in memory
+            ttl: Seconds finished records stay in memory, None to keep them
+                until evicted by max_entries
+            persistence: Optional backend that evicted records are spilled to
+            clock: Time source, replaceable in tests
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.persistence = persistence
+        self.clock = clock
+        self._records: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Finish times of finished tasks, in finishing order
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        # Spilled records not yet written, and the IDs queued for the writer
+        self._unwritten: Dict[str, Dict[str, Any]] = {}
+        self._spill_queue: List[str] = []
+        self._spill_executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, task_id: str) -> bool:
+        return self.get(task_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._records))
+
+    def __getitem__(self, task_id: str) -> Dict[str, Any]:
+        record = self.get(task_id)
+        if record is None:
+            raise KeyError(task_id)
+        return record
+
+    def __setitem__(self, task_id: str, record: Dict[str, Any]) -> None:
+        self.put(task_id, record)
+
+    def put(self, task_id: str, record: Dict[str, Any]) -> None:
+        """Add or replace a task record.
+
+        Args:
+            task_id: Task ID
+            record: Task record with at least a status field
+        """
+        with self._lock:
+            self._records[task_id] = dict(record)
+            self._finished.pop(task_id, None)
+            if record.get("status") in FINISHED_STATUSES:
+                self._finished[task_id] = self.clock()
+            self.evict()
+
+    def update(self, task_id: str, **fields: Any) -> None:
+        """Update fields of a task record held in memory.
+
+        Args:
+            task_id: Task ID
+            **fields: Fields to set
+
+        Raises:
+            KeyError: If the task is not held in memory
+        """
+        with self._lock:
+            record = self._records[task_id]
+            record.update(fields)
+            if record.get("status") in FINISHED_STATUSES and task_id not in self._finished:
+                self._finished[task_id] = self.clock()
+            self.evict()
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Get a task record from memory or, after a spill, from persistence.
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            Task record if found, None otherwise
+        """
+        with self._lock:
+            self._expire()
+            record = self._records.get(task_id)
+            if record is None:
+                record = self._unwritten.get(task_id)
+        if record is not None:
+            return record
+        return self._load(task_id)
+
+    def evict(self) -> int:
+        """Expire finished records past the TTL and enforce max_entries.
+
+        Returns:
+            Number of records removed from memory
+        """
+        with self._lock:
+            removed = self._expire()
+            while len(self._records) > self.max_entries and self._finished:
+                task_id = next(iter(self._finished))
+                self._spill(task_id)
+                removed += 1
+            if len(self._records) > self.max_entries:
+                logger.warning(
+                    f"Task registry holds {len(self._records)} running tasks, above its limit of {self.max_entries}"
+                )
+            return removed
+
+    def _expire(self) -> int:
+        """Remove finished records past the TTL. Must be called with the lock held."""
+        if self.ttl is None:
+            return 0
+        cutoff = self.clock() - self.ttl
+        removed = 0
+        while self._finished:
+            task_id, finished_at = next(iter(self._finished.items()))
+            if finished_at > cutoff:
+                break
+            self._spill(task_id)
+            removed += 1
+        return removed
+
+    def _spill(self, task_id: str) -> None:
+        """Move a finished record out of memory. Must be called with the lock held."""
+        self._finished.pop(task_id, None)
+        record = self._records.pop(task_id, None)
+        if record is None or self.persistence is None:
+            return
+        self._unwritten[task_id] = record
+        self._spill_queue.append(task_id)
+        if len(self._spill_queue) == 1:
+            # The writer takes every record queued until it runs
+            if self._spill_executor is None:
+                self._spill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-spill")
+            self._spill_executor.submit(self._write_spilled)
+
+    def _write_spilled(self) -> None:
+        """Writer thread: save the queued records to persistence."""
+        with self._lock:
+            task_ids, self._spill_queue = self._spill_queue, []
+            batch = {task_id: self._unwritten[task_id] for task_id in task_ids if task_id in self._unwritten}
+        for task_id, record in batch.items():
+            # Results are stored as JSON, values without a JSON form as strings
+            details = json.loads(json.dumps(record, default=str))
+            try:
+                saved = self.persistence.save_result(
+                    task_id,
+                    TASK_RECORD_TYPE,
+                    ValidationResult(
+                        is_valid=record.get("status") == "completed",
+                        details=details,
+                        message=record.get("error"),
+                        timestamp=datetime.now().isoformat()
+                    )
+                )
+            except Exception as e:
+                logger.error(f"Error spilling record of task {task_id}: {e}")
+                saved = False
+            if not saved:
+                logger.error(f"Failed to spill record of task {task_id}")
+        with self._lock:
+            for task_id, record in batch.items():
+                # Keep a record spilled again while this one was written
+                if self._unwritten.get(task_id) is record:
+                    del self._unwritten[task_id]
+
+    def flush(self) -> None:
+        """Wait until spilled records are written to persistence."""
+        executor = self._spill_executor
+        if executor is not None:
+            executor.submit(lambda: None).result()
+
+    def close(self) -> None:
+        """Write spilled records and stop the writer thread."""
+        with self._lock:
+            executor, self._spill_executor = self._spill_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _load(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Load a spilled record from persistence."""
+        if self.persistence is None:
+            return None
+        stored = self.persistence.get_result(task_id, TASK_RECORD_TYPE)
+        if not stored:
+            return None
+        return (stored.get("result") or {}).get("details")
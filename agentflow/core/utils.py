@@ -1,5 +1,12 @@
 """Utility functions for agentflow"""
+import functools
+import hashlib
 import importlib
+import types
+from enum import Enum
+from typing import Any, Set
+
+import numpy as np
 
 
 def import_class(class_path: str):
@@ -17,3 +24,131 @@ def import_class(class_path: str):
         return getattr(module, class_name)
     except (ImportError, AttributeError) as e:
         raise ImportError(f"Could not import {class_path}: {str(e)}")
+
+
+def content_hash(value: Any, strict: bool = False) -> str:
+    """Compute a stable content hash of a value.
+
+    Dictionaries are hashed independently of key order, NumPy arrays by
+    dtype, shape and raw bytes, Pydantic models by their dumped fields and
+    functions by their qualified name, bytecode, constants, defaults and
+    the values captured in their closures, so equal content gives equal
+    hashes across processes. Bound methods include the object they are
+    bound to and partials their arguments. Global variables a function
+    reads are only hashed by name.
+
+    Args:
+        value: Value to hash
+        strict: Raise for callables whose behaviour cannot be hashed by
+            content, such as callable objects, instead of hashing their repr
+
+    Returns:
+        Hex digest of the value's content
+
+    Raises:
+        TypeError: If strict and the value holds such a callable
+    """
+    digest = hashlib.sha256()
+    _update_hash(digest, value, set(), strict)
+    return digest.hexdigest()
+
+
+def _update_code_hash(digest: "hashlib._Hash", code: types.CodeType, seen: Set[int], strict: bool) -> None:
+    """Feed bytecode, names and constants, nested code included, into a hash digest."""
+    digest.update(b"code:")
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _update_code_hash(digest, const, seen, strict)
+        else:
+            _update_hash(digest, const, seen, strict)
+    digest.update(b";")
+
+
+def _update_callable_hash(digest: "hashlib._Hash", value: Any, seen: Set[int], strict: bool) -> None:
+    """Feed a callable into a hash digest."""
+    name = f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', '')}"
+    if isinstance(value, functools.partial):
+        digest.update(b"partial:")
+        _update_hash(digest, (value.func, value.args, value.keywords), seen, strict)
+    elif isinstance(value, types.MethodType):
+        digest.update(b"method:")
+        _update_hash(digest, value.__self__, seen, strict)
+        _update_hash(digest, value.__func__, seen, strict)
+    elif isinstance(value, type):
+        digest.update(f"class:{name};".encode())
+    elif isinstance(value, types.BuiltinFunctionType):
+        digest.update(f"builtin:{name};".encode())
+        owner = value.__self__
+        if owner is not None and not isinstance(owner, types.ModuleType):
+            _update_hash(digest, owner, seen, strict)
+    elif isinstance(value, types.FunctionType):
+        digest.update(f"function:{name};".encode())
+        _update_code_hash(digest, value.__code__, seen, strict)
+        _update_hash(digest, value.__defaults__, seen, strict)
+        _update_hash(digest, value.__kwdefaults__, seen, strict)
+        for cell in value.__closure__ or ():
+            try:
+                contents = cell.cell_contents
+            except ValueError:
+                digest.update(b"empty-cell;")
+            else:
+                _update_hash(digest, contents, seen, strict)
+    elif strict:
+        raise TypeError(f"Callable {value!r} cannot be hashed by content")
+    else:
+        digest.update(f"{type(value).__qualname__}:{value!r};".encode())
+
+
+def _update_hash(digest: "hashlib._Hash", value: Any, seen: Set[int], strict: bool = False) -> None:
+    """Feed a value into a hash digest."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+        return
+    if isinstance(value, (bytes, bytearray)):
+        digest.update(b"bytes:")
+        digest.update(bytes(value))
+        return
+    if isinstance(value, np.ndarray):
+        digest.update(f"ndarray:{value.dtype.str}:{value.shape};".encode())
+        digest.update(np.ascontiguousarray(value).tobytes() if value.dtype != object else repr(value.tolist()).encode())
+        return
+    if isinstance(value, np.generic):
+        _update_hash(digest, value.item(), seen, strict)
+        return
+    if isinstance(value, Enum):
+        digest.update(f"enum:{type(value).__qualname__}.{value.name};".encode())
+        return
+
+    # Guard against self-referencing containers
+    if id(value) in seen:
+        digest.update(b"cycle;")
+        return
+    seen.add(id(value))
+    try:
+        if isinstance(value, dict):
+            digest.update(b"dict{")
+            for key in sorted(value, key=repr):
+                _update_hash(digest, key, seen, strict)
+                _update_hash(digest, value[key], seen, strict)
+            digest.update(b"}")
+        elif isinstance(value, (list, tuple)):
+            digest.update(f"{type(value).__name__}[".encode())
+            for item in value:
+                _update_hash(digest, item, seen, strict)
+            digest.update(b"]")
+        elif isinstance(value, (set, frozenset)):
+            digest.update(b"set{")
+            for item in sorted(value, key=repr):
+                _update_hash(digest, item, seen, strict)
+            digest.update(b"}")
+        elif hasattr(value, "model_dump") and not isinstance(value, type):
+            digest.update(f"model:{type(value).__qualname__}".encode())
+            _update_hash(digest, value.model_dump(), seen, strict)
+        elif callable(value):
+            _update_callable_hash(digest, value, seen, strict)
+        else:
+            digest.update(f"{type(value).__qualname__}:{value!r};".encode())
+    finally:
+        seen.discard(id(value))
@@ -4,6 +4,7 @@ from typing import Dict, Any, Optional, List, Union, Type, cast, TYPE_CHECKING
 import uuid
 import logging
 import asyncio
+from collections import OrderedDict
 from datetime import datetime
 from enum import Enum
 from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
@@ -23,6 +24,7 @@ from .agent_config import AgentConfig
 from ..ell2a.types.message import Message, MessageRole, MessageType
 from .workflow_state import WorkflowStateManager
 from .metrics import MetricsManager, MetricType
+from .events import WorkflowEvent, WorkflowEventType, get_default_event_bus
 from .processors.transformers import TransformProcessor, ProcessorResult
 from .enums import StepStatus
 import time
@@ -38,16 +40,30 @@ logger = logging.getLogger(__name__)
 class WorkflowEngine:
     """Workflow engine class."""
     
-    def __init__(self, workflow_config: Optional[Union[Dict[str, Any], WorkflowConfig]] = None):
+    def __init__(
+        self,
+        workflow_config: Optional[Union[Dict[str, Any], WorkflowConfig]] = None,
+        max_workflows: Optional[int] = None,
+        max_instances: Optional[int] = None
+    ):
         """Initialize workflow engine.
         
         Args:
             workflow_config: Optional workflow configuration
+            max_workflows: Optional maximum number of registered workflows;
+                the least recently used idle ones are unregistered beyond it
+            max_instances: Optional maximum number of workflow instances
+                kept after execution; the oldest finished ones are dropped
         """
         self._initialized = False
         self.instances: Dict[str, WorkflowInstance] = {}
         self.workflows: Dict[str, WorkflowConfig] = {}
         self.agents: Dict[str, 'Agent'] = {}
+        self.max_workflows = max_workflows
+        self.max_instances = max_instances
+        # Registered workflow IDs, least recently used first, and their running executions
+        self._workflow_lru: "OrderedDict[str, None]" = OrderedDict()
+        self._active_workflows: Dict[str, int] = {}
         
         # Components that will be initialized later
         self._ell2a = None
@@ -65,6 +81,7 @@ class WorkflowEngine:
             self.config = workflow_config
             
         self._pending_tasks = {}  # Dictionary to store pending tasks
+        self.event_bus = get_default_event_bus()
         self.metrics = MetricsManager()
         self.state = WorkflowStateManager()
         
@@ -271,6 +288,8 @@ class WorkflowEngine:
         workflow.agent = agent  # Add agent reference to workflow config
         self.workflows[workflow_id] = workflow
         self.agents[workflow_id] = agent
+        self._workflow_lru[workflow_id] = None
+        await self._enforce_workflow_limit(keep=workflow_id)
         
         # If agent has a mock ELL2A, use it for the workflow engine too
         if hasattr(agent, '_ell2a') and agent._ell2a is not None:
@@ -279,12 +298,19 @@ class WorkflowEngine:
         
         return workflow_id
             
-    async def execute_workflow(self, workflow_id: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute_workflow(
+        self,
+        workflow_id: str,
+        context: Dict[str, Any],
+        run_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Execute workflow.
         
         Args:
             workflow_id: ID of the workflow to execute
             context: Execution context
+            run_id: Optional ID under which progress events are published,
+                defaults to the ID of the created workflow instance
             
         Returns:
             Dict[str, Any]: Workflow execution results
@@ -298,7 +324,25 @@ class WorkflowEngine:
             
         workflow = self.workflows[workflow_id]
         agent = self.agents[workflow_id]
-        
+        if workflow_id in self._workflow_lru:
+            self._workflow_lru.move_to_end(workflow_id)
+        self._active_workflows[workflow_id] = self._active_workflows.get(workflow_id, 0) + 1
+        try:
+            return await self._execute_registered_workflow(workflow, agent, context, run_id)
+        finally:
+            self._active_workflows[workflow_id] -= 1
+            if not self._active_workflows[workflow_id]:
+                del self._active_workflows[workflow_id]
+            self._trim_instances()
+            
+    async def _execute_registered_workflow(
+        self,
+        workflow: WorkflowConfig,
+        agent: 'Agent',
+        context: Dict[str, Any],
+        run_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Execute a registered workflow for its agent."""
         # Create and execute workflow instance
         instance = await self.create_workflow(workflow.name, workflow)
         
@@ -315,7 +359,7 @@ class WorkflowEngine:
             instance.context = {"agent_id": agent.id, **context}
             
         try:
-            result = await self.execute_workflow_instance(instance)
+            result = await self.execute_workflow_instance(instance, run_id)
             
             # Keep the status as "success" if it was set that way
             if result.get("status") == "completed":
@@ -346,11 +390,17 @@ class WorkflowEngine:
                 raise
             raise WorkflowExecutionError(f"Workflow execution failed: {str(e)}")
             
-    async def execute_workflow_instance(self, instance: WorkflowInstance) -> Dict[str, Any]:
+    async def execute_workflow_instance(
+        self,
+        instance: WorkflowInstance,
+        run_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Execute workflow instance.
         
         Args:
             instance: Workflow instance to execute
+            run_id: Optional ID under which progress events are published,
+                defaults to the instance ID
             
         Returns:
             Dict[str, Any]: Workflow execution results
@@ -364,9 +414,19 @@ class WorkflowEngine:
         instance.status = WorkflowStatus.RUNNING
         instance.updated_at = datetime.now()
         
+        run_id = run_id or instance.id
+        workflow_id = instance.config.id if instance.config else None
+        
+        def publish(event_type: WorkflowEventType, step_id: Optional[str] = None, data: Any = None) -> None:
+            self.event_bus.publish(WorkflowEvent(
+                type=event_type, run_id=run_id, workflow_id=workflow_id, step_id=step_id, data=data
+            ))
+            
+        publish(WorkflowEventType.WORKFLOW_STARTED)
         step_results = []
         try:
             for step in instance.steps:
+                publish(WorkflowEventType.STEP_STARTED, step.id)
                 try:
                     # Check for explicit failure trigger
                     if step.config.params.get("should_fail") or instance.context.get("should_fail"):
@@ -412,7 +472,9 @@ class WorkflowEngine:
                         "result": result,
                         "error": None
                     })
+                    publish(WorkflowEventType.STEP_COMPLETED, step.id, {"result": result})
                 except Exception as e:
+                    publish(WorkflowEventType.STEP_FAILED, step.id, {"error": str(e)})
                     logger.error(f"Step execution failed: {str(e)}")
                     step.execution_state["status"] = StepStatus.FAILED
                     step.execution_state["error"] = str(e)
@@ -425,6 +487,7 @@ class WorkflowEngine:
                 "steps": step_results,
                 "content": instance.context.get("message", "")
             }
+            publish(WorkflowEventType.WORKFLOW_COMPLETED, data=instance.result)
             
             return instance.result
             
@@ -437,6 +500,7 @@ class WorkflowEngine:
                 "error": str(e),
                 "content": ""
             }
+            publish(WorkflowEventType.WORKFLOW_FAILED, data={"error": str(e)})
             
             # Update agent status on failure if agent is available
             if instance.config and instance.config.agent:
@@ -451,6 +515,63 @@ class WorkflowEngine:
         instance.updated_at = datetime.now()
         return instance.result
         
+    async def unregister_workflow(self, workflow_id: str) -> bool:
+        """Unregister a workflow and clean up its agent.
+        
+        Args:
+            workflow_id: ID of the workflow to unregister
+            
+        Returns:
+            bool: True if the workflow was registered
+        """
+        workflow = self.workflows.pop(workflow_id, None)
+        agent = self.agents.pop(workflow_id, None)
+        self._workflow_lru.pop(workflow_id, None)
+        if agent is not None and hasattr(agent, 'cleanup'):
+            try:
+                cleanup_method = getattr(agent, 'cleanup')
+                if asyncio.iscoroutinefunction(cleanup_method):
+                    await cleanup_method()
+                else:
+                    cleanup_method()
+            except Exception as e:
+                logger.error(f"Error cleaning up agent of workflow {workflow_id}: {str(e)}")
+        return workflow is not None
+        
+    async def _enforce_workflow_limit(self, keep: Optional[str] = None) -> None:
+        """Unregister the least recently used idle workflows above max_workflows.
+        
+        Args:
+            keep: Optional workflow ID that must stay registered, such as the
+                one that was just registered
+        """
+        if self.max_workflows is None:
+            return
+        while len(self._workflow_lru) > self.max_workflows:
+            idle = next(
+                (
+                    workflow_id for workflow_id in self._workflow_lru
+                    if workflow_id != keep and workflow_id not in self._active_workflows
+                ),
+                None
+            )
+            if idle is None:
+                break
+            await self.unregister_workflow(idle)
+            
+    def _trim_instances(self) -> None:
+        """Drop the oldest finished workflow instances above max_instances."""
+        if self.max_instances is None or len(self.instances) <= self.max_instances:
+            return
+        finished = [
+            instance_id for instance_id, instance in self.instances.items()
+            if instance.status not in (WorkflowStatus.PENDING, WorkflowStatus.RUNNING)
+        ]
+        for instance_id in finished[:len(self.instances) - self.max_instances]:
+            del self.instances[instance_id]
+            # create_workflow registers each instance's config under its ID
+            self.workflows.pop(instance_id, None)
+            
     async def cleanup(self):
         """Clean up workflow engine resources."""
         if not self._initialized:
@@ -498,6 +619,7 @@ class WorkflowEngine:
             self._ell2a = None
             self.workflows.clear()
             self.agents.clear()
+            self._workflow_lru.clear()
             self._initialized = False
             
             # Clean up components
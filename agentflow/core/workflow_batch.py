@@ -0,0 +1,99 @@
+"""Execution of many inputs through one workflow with bounded concurrency."""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+from .agent_pool import PooledAgent, WorkflowAgentPool
+from .workflow_types import WorkflowConfig
+
+logger = logging.getLogger(__name__)
+
+# Marks a worker that has stopped taking inputs
+_WORKER_DONE = object()
+
+
+async def execute_batch(
+    pool: WorkflowAgentPool,
+    workflow_config: WorkflowConfig,
+    inputs: Iterable[Dict[str, Any]],
+    max_concurrency: int = 4
+) -> AsyncIterator[Dict[str, Any]]:
+    """Execute a workflow for each input and yield results as they finish.
+
+    Up to ``max_concurrency`` workers, capped by the pool's agents per
+    workflow configuration, each check out one agent for the whole batch and
+    take inputs one at a time, so the workflow is registered once per worker
+    rather than once per input. An agent whose execution raised is discarded
+    and the worker checks out a new one. Results are yielded in completion
+    order; a worker only takes the next input once its result has been
+    consumed or buffered, so a slow consumer slows the batch down instead of
+    buffering every result.
+
+    Args:
+        pool: Agent pool whose engine executes the workflow
+        workflow_config: Validated workflow configuration
+        inputs: Input data of each execution, consumed lazily
+        max_concurrency: Maximum number of concurrent executions
+
+    Yields:
+        Dict[str, Any]: Per input ``index`` and ``status``, with the
+        engine's ``result`` if the status is "completed" or the ``error``
+        if it is "error"
+
+    Raises:
+        ValueError: If max_concurrency is less than 1
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    items = enumerate(inputs)
+    results: asyncio.Queue = asyncio.Queue(maxsize=2 * max_concurrency)
+    last_error: Optional[Exception] = None
+
+    async def worker() -> None:
+        nonlocal last_error
+        pooled: Optional[PooledAgent] = None
+        try:
+            while True:
+                if pooled is None:
+                    pooled = await pool.acquire(workflow_config)
+                item = next(items, None)
+                if item is None:
+                    break
+                index, input_data = item
+                try:
+                    result = await pool.engine.execute_workflow(pooled.agent.id, input_data)
+                    await results.put({"index": index, "status": "completed", "result": result})
+                except Exception as e:
+                    logger.error(f"Batch item {index} of workflow {workflow_config.id} failed: {e}")
+                    discarded, pooled = pooled, None
+                    await pool.release(discarded, discard=True)
+                    await results.put({"index": index, "status": "error", "error": str(e)})
+        except Exception as e:
+            # Remaining inputs are left to the other workers
+            logger.warning(f"Batch worker for workflow {workflow_config.id} stopped: {e}")
+            last_error = e
+        finally:
+            if pooled is not None:
+                await pool.release(pooled)
+        await results.put(_WORKER_DONE)
+
+    workers = [
+        asyncio.ensure_future(worker())
+        for _ in range(min(max_concurrency, pool.max_size))
+    ]
+    try:
+        running = len(workers)
+        while running:
+            result = await results.get()
+            if result is _WORKER_DONE:
+                running -= 1
+                continue
+            yield result
+        # Every worker stopped before the inputs ran out
+        for index, _ in items:
+            yield {"index": index, "status": "error", "error": str(last_error)}
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+from collections import deque
 from typing import Dict, Any, List, Optional, Union, Tuple, Set, Callable
 from types import SimpleNamespace
 from datetime import datetime
@@ -13,6 +14,7 @@ from .workflow_types import (
     Message,
     WorkflowConfig,
     ErrorPolicy,
+    ExecutionMode,
 )
 from .base_types import WorkflowStatus, AgentStatus
 from .workflow_state import WorkflowStateManager
@@ -20,6 +22,11 @@ from .metrics import MetricsManager, MetricType
 from .exceptions import WorkflowExecutionError, StepExecutionError
 from .processors.transformers import TransformProcessor, ProcessorResult
 from .enums import StepStatus
+from .execution_plan import ExecutionPlan, get_execution_plan
+from .checkpoint import CheckpointStore
+from .step_cache import StepCache, get_default_step_cache
+from .histogram import get_default_histograms
+from .events import EventBus, WorkflowEvent, WorkflowEventType, get_default_event_bus
 import time
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import IsolationForest
@@ -35,11 +42,23 @@ VALID_PROTOCOLS = {"federated", "gossip", "hierarchical", "hierarchical_merge",
 class WorkflowExecutor:
     """Workflow executor class."""
     
-    def __init__(self, config: WorkflowConfig):
+    def __init__(
+        self,
+        config: WorkflowConfig,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        step_cache: Optional[StepCache] = None,
+        event_bus: Optional[EventBus] = None
+    ):
         """Initialize workflow executor.
 
         Args:
             config: Workflow configuration.
+            checkpoint_store: Optional store for completed step results, used
+                to resume failed runs.
+            step_cache: Cache for steps with caching enabled. Defaults to the
+                process-wide step cache.
+            event_bus: Bus that run and step progress events are published
+                to. Defaults to the process-wide event bus.
         """
         self.config = config
         if not hasattr(self.config, 'error_policy'):
@@ -47,13 +66,19 @@ class WorkflowExecutor:
         elif isinstance(self.config.error_policy, dict):
             self.config.error_policy = ErrorPolicy(**self.config.error_policy)
         self.state_manager = WorkflowStateManager()
-        self.metrics = MetricsManager()
+        self.metrics = MetricsManager(histograms=get_default_histograms())
         self._initialized = False
         self.iteration_count = 0
         self.start_time = None
         self._status = WorkflowStatus.PENDING
         self._step_results: Dict[str, Dict[str, Any]] = {}
         self._pending_tasks = {}
+        self.checkpoint_store = checkpoint_store
+        self.step_cache = step_cache
+        self.event_bus = event_bus if event_bus is not None else get_default_event_bus()
+        self.run_id: Optional[str] = None
+        self._input_hash: Optional[str] = None
+        self._restored_results: Dict[str, Any] = {}
 
     @property
     def status(self) -> WorkflowStatus:
@@ -153,65 +178,27 @@ class WorkflowExecutor:
                 except ValueError:
                     raise WorkflowExecutionError(f"Invalid step type: {step.type}")
 
-    def _has_circular_dependencies(self) -> bool:
-        """Check for circular dependencies in workflow steps."""
-        visited = set()
-        path = set()
-        
-        def dfs(step_id: str) -> bool:
-            """Depth-first search to detect cycles."""
-            if step_id in path:
-                return True
-            if step_id in visited:
-                return False
-            
-            visited.add(step_id)
-            path.add(step_id)
-            
-            # Find the step by ID
-            step = next((s for s in self.config.steps if s.id == step_id), None)
-            if step and step.dependencies:
-                for dep in step.dependencies:
-                    if dfs(dep):
-                        return True
-            
-            path.remove(step_id)
-            return False
-        
-        # Check each step for cycles
-        for step in self.config.steps:
-            visited.clear()  # Clear visited set for each starting point
-            path.clear()    # Clear path set for each starting point
-            if dfs(step.id):
-                return True
-            
-        return False
+    def _validate_dependencies(self) -> ExecutionPlan:
+        """Validate workflow dependencies.
 
-    def _has_missing_dependencies(self) -> bool:
-        """Check for missing dependencies."""
-        step_ids = {step.id for step in self.config.steps}
-        for step in self.config.steps:
-            if step.dependencies:  # Only check if step has dependencies
-                for dep in step.dependencies:
-                    if dep not in step_ids:
-                        return True
-        return False
-
-    def _validate_dependencies(self) -> None:
-        """Validate workflow dependencies."""
-        # Check for circular dependencies
-        if self._has_circular_dependencies():
-            raise WorkflowExecutionError("Circular dependency detected in workflow steps")
-            
-        # Check for missing dependencies
-        if self._has_missing_dependencies():
-            raise WorkflowExecutionError("Missing dependencies detected in workflow steps")
+        Returns:
+            ExecutionPlan: Compiled plan for the workflow steps, reused across
+            executions of the same workflow
 
-    async def execute(self, data: Any) -> Any:
+        Raises:
+            WorkflowExecutionError: If steps have circular or missing dependencies
+        """
+        return get_execution_plan(self.config.steps)
+
+    async def execute(self, data: Any, resume_from: Optional[str] = None, run_id: Optional[str] = None) -> Any:
         """Execute workflow.
         
         Args:
             data: Input data
+            resume_from: ID of an earlier run to resume. Steps that run
+                completed for the same input are not executed again.
+            run_id: Optional ID of this run, used for its progress events
+                and checkpoints. Defaults to resume_from or a new ID.
             
         Returns:
             Execution results
@@ -222,20 +209,40 @@ class WorkflowExecutor:
         """
         try:
             # Use asyncio.wait_for to enforce timeout
-            return await asyncio.wait_for(
-                self._execute(data),
+            result = await asyncio.wait_for(
+                self._execute(data, resume_from, run_id),
                 timeout=self.config.timeout
             )
         except asyncio.TimeoutError:
-            raise TimeoutError(f"Workflow execution timed out after {self.config.timeout} seconds")
+            error = TimeoutError(f"Workflow execution timed out after {self.config.timeout} seconds")
+            self._publish(WorkflowEventType.WORKFLOW_FAILED, data={"error": str(error)})
+            raise error
         except Exception as e:
+            self._publish(WorkflowEventType.WORKFLOW_FAILED, data={"error": str(e)})
             raise WorkflowExecutionError(f"Workflow execution failed: {str(e)}") from e
-
-    async def _execute(self, data: Any) -> Any:
+        self._publish(WorkflowEventType.WORKFLOW_COMPLETED, data=result)
+        return result
+
+    def _publish(self, event_type: WorkflowEventType, step_id: Optional[str] = None, data: Any = None) -> None:
+        """Publish a progress event of the current run."""
+        if self.run_id is None:
+            return
+        self.event_bus.publish(WorkflowEvent(
+            type=event_type,
+            run_id=self.run_id,
+            workflow_id=self.config.id,
+            step_id=step_id,
+            data=data
+        ))
+
+    async def _execute(self, data: Any, resume_from: Optional[str] = None, run_id: Optional[str] = None) -> Any:
         """Execute workflow steps."""
         try:
             # Set start time for timeout tracking
             self.start_time = time.time()
+            self.run_id = run_id or resume_from or str(uuid.uuid4())
+            self._restored_results = {}
+            self._publish(WorkflowEventType.WORKFLOW_STARTED)
 
             # Validate workflow has steps
             if not self.config.steps:
@@ -245,7 +252,7 @@ class WorkflowExecutor:
             self._validate_workflow_steps()
 
             # Validate dependencies
-            self._validate_dependencies()
+            plan = self._validate_dependencies()
 
             # If context is a numpy array, wrap it in a dictionary
             if isinstance(data, np.ndarray):
@@ -260,6 +267,14 @@ class WorkflowExecutor:
             # Prepare step results dictionary
             self._step_results = {}
 
+            # Restore steps completed by the run being resumed
+            if self.checkpoint_store is not None:
+                self._input_hash = self.checkpoint_store.hash_input(data)
+                if resume_from:
+                    self._restored_results = self.checkpoint_store.load_run(
+                        self.config.id, resume_from, self._input_hash
+                    )
+
             # Check for test context
             is_test_context = False
             if isinstance(data, dict):
@@ -287,66 +302,30 @@ class WorkflowExecutor:
                 # For Pydantic models like Message
                 context_dict.update(data.model_dump())
 
-            # Execute steps in order
-            for step in self.config.steps:
-                # Check for timeout
-                if self._is_timeout():
-                    self.status = WorkflowStatus.TIMEOUT
-                    raise TimeoutError("Workflow execution timed out")
+            if self._execution_mode() == ExecutionMode.DAG:
+                # Run independent steps concurrently
+                await self._execute_dag(plan, data)
+            else:
+                # Execute steps in order
+                for step in self.config.steps:
+                    # Check for timeout
+                    if self._is_timeout():
+                        self.status = WorkflowStatus.TIMEOUT
+                        raise TimeoutError("Workflow execution timed out")
 
-                # Execute step with timeout
-                try:
-                    # If step has dependencies, ensure they are executed first
-                    if step.dependencies:
-                        for dep_id in step.dependencies:
-                            if dep_id not in self._step_results:
-                                raise WorkflowExecutionError(f"Dependency {dep_id} not executed before {step.id}")
-
-                    # Execute the step with timeout
-                    if self.config.timeout:
-                        try:
-                            async with asyncio.timeout(self.config.timeout):
-                                step_result = await self._execute_step(step, data)
-                        except asyncio.TimeoutError:
-                            self.status = WorkflowStatus.TIMEOUT
-                            raise TimeoutError("Workflow execution timed out")
-                    else:
-                        step_result = await self._execute_step(step, data)
-
-                    # Store step result with status
-                    self._step_results[step.id] = {
-                        "result": step_result,
-                        "status": "success"  # Use "success" for step status
-                    }
+                    step_result = await self._run_step(step, data)
 
                     # Update context for next step
                     if isinstance(step_result, dict):
                         context_dict.update(step_result)
 
-                except WorkflowExecutionError as e:
-                    # Handle step execution error based on error policy
-                    if self.config.error_policy.fail_fast:
-                        raise
-
-                    # Log the error
-                    logging.error(f"Error in step {step.id}: {str(e)}")
-
-                    # Update step results with error
-                    self._step_results[step.id] = {
-                        "error": str(e),
-                        "status": "failed"
-                    }
-
-                    # Increment iteration count
-                    self.iteration_count += 1
-
-                    # Check max iterations
-                    if self.iteration_count >= self.config.max_iterations:
-                        self.status = WorkflowStatus.FAILED
-                        raise WorkflowExecutionError("Max workflow iterations exceeded")
-
             # Workflow completed successfully
             self.status = WorkflowStatus.SUCCESS
+            self.metrics.observe(
+                MetricType.WORKFLOW_DURATION,
+                time.time() - self.start_time,
+                {"workflow_id": self.config.id}
+            )
 
             # Return step results with status
             return {
@@ -367,6 +346,160 @@ class WorkflowExecutor:
             self.status = WorkflowStatus.FAILED
             raise WorkflowExecutionError(f"Unexpected workflow execution error: {str(e)}")
 
+    def _execution_mode(self) -> ExecutionMode:
+        """Get the configured step scheduling mode."""
+        mode = getattr(self.config, 'execution_mode', None) or ExecutionMode.SEQUENTIAL
+        try:
+            return ExecutionMode(mode)
+        except ValueError:
+            raise WorkflowExecutionError(f"Invalid execution mode: {mode}")
+
+    async def _run_step(self, step: WorkflowStep, data: Any) -> Any:
+        """Execute a step and record its outcome in the step results.
+
+        Args:
+            step: Step to execute
+            data: Workflow input data
+
+        Returns:
+            Step result, or None if the step failed and the error policy
+            allows the workflow to continue
+
+        Raises:
+            WorkflowExecutionError: If the step fails and the workflow must stop
+            TimeoutError: If the step exceeds the workflow timeout
+        """
+        # Reuse the result of a step completed by a resumed run
+        if step.id in self._restored_results:
+            step_result = self._restored_results[step.id]
+            self._step_results[step.id] = {
+                "result": step_result,
+                "status": "success"
+            }
+            self._publish(WorkflowEventType.STEP_COMPLETED, step.id, {"result": step_result, "restored": True})
+            return step_result
+
+        self._publish(WorkflowEventType.STEP_STARTED, step.id)
+        try:
+            # If step has dependencies, ensure they are executed first
+            if step.dependencies:
+                for dep_id in step.dependencies:
+                    if dep_id not in self._step_results:
+                        raise WorkflowExecutionError(f"Dependency {dep_id} not executed before {step.id}")
+
+            # Execute the step with timeout
+            step_start = time.perf_counter()
+            if self.config.timeout:
+                try:
+                    async with asyncio.timeout(self.config.timeout):
+                        step_result = await self._execute_step(step, data)
+                except asyncio.TimeoutError:
+                    self.status = WorkflowStatus.TIMEOUT
+                    raise TimeoutError("Workflow execution timed out")
+            else:
+                step_result = await self._execute_step(step, data)
+            self.metrics.observe(
+                MetricType.STEP_DURATION,
+                time.perf_counter() - step_start,
+                {"workflow_id": self.config.id, "step_id": step.id, "step_type": step.type.value}
+            )
+
+            # Store step result with status
+            self._step_results[step.id] = {
+                "result": step_result,
+                "status": "success"  # Use "success" for step status
+            }
+
+            # Checkpoint the result so a failed run can resume after this step
+            if self.checkpoint_store is not None:
+                self.checkpoint_store.save_step(
+                    self.config.id, self.run_id, self._input_hash, step.id, step_result
+                )
+            self._publish(WorkflowEventType.STEP_COMPLETED, step.id, {"result": step_result})
+            return step_result
+
+        except WorkflowExecutionError as e:
+            self._publish(WorkflowEventType.STEP_FAILED, step.id, {"error": str(e)})
+            # Handle step execution error based on error policy
+            if self.config.error_policy.fail_fast:
+                raise
+
+            # Log the error
+            logging.error(f"Error in step {step.id}: {str(e)}")
+
+            # Update step results with error
+            self._step_results[step.id] = {
+                "error": str(e),
+                "status": "failed"
+            }
+
+            # Increment iteration count
+            self.iteration_count += 1
+
+            # Check max iterations
+            if self.iteration_count >= self.config.max_iterations:
+                self.status = WorkflowStatus.FAILED
+                raise WorkflowExecutionError("Max workflow iterations exceeded")
+            return None
+
+        except Exception as e:
+            self._publish(WorkflowEventType.STEP_FAILED, step.id, {"error": str(e)})
+            raise
+
+    async def _execute_dag(self, plan: ExecutionPlan, data: Any) -> None:
+        """Execute steps as a dependency graph.
+
+        A step is started as soon as all of its dependencies have finished,
+        so independent steps run concurrently. At most ``max_parallelism``
+        steps run at once when it is configured. Results are merged into
+        ``_step_results`` as each step completes.
+
+        Args:
+            plan: Compiled plan for the workflow steps
+            data: Workflow input data
+
+        Raises:
+            WorkflowExecutionError: If a step fails and the workflow must stop
+            TimeoutError: If execution exceeds the workflow timeout
+        """
+        steps = self.config.steps
+        waiting_on = [len(deps) for deps in plan.dependencies]
+
+        # Seed with the first layer, keeping list order
+        ready = deque(plan.layers[0] if plan.layers else ())
+        max_parallelism = getattr(self.config, 'max_parallelism', None)
+        running: Dict[asyncio.Task, int] = {}
+
+        try:
+            while ready or running:
+                if self._is_timeout():
+                    self.status = WorkflowStatus.TIMEOUT
+                    raise TimeoutError("Workflow execution timed out")
+
+                # Launch ready steps up to the parallelism limit
+                while ready and (not max_parallelism or len(running) < max_parallelism):
+                    index = ready.popleft()
+                    task = asyncio.create_task(self._run_step(steps[index], data))
+                    running[task] = index
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = running.pop(task)
+                    # Propagate errors that the error policy does not absorb
+                    task.result()
+
+                    # Release dependents whose inputs are now all available
+                    for dependent in plan.dependents[index]:
+                        waiting_on[dependent] -= 1
+                        if waiting_on[dependent] == 0:
+                            ready.append(dependent)
+        finally:
+            # Cancel in-flight steps if the workflow is stopping early
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
     async def _execute_step(self, step: WorkflowStep, context: Any) -> Any:
         """Execute a single workflow step.
         
@@ -383,9 +516,31 @@ class WorkflowExecutor:
         try:
             # Get step function
             step_fn = self._get_step_function(step)
+
+            # Reuse the result of an identical earlier execution if caching is enabled
+            step_cache = None
+            if getattr(step.config, 'cache', False):
+                step_cache = self.step_cache or get_default_step_cache()
+                try:
+                    cache_key = step_cache.make_key(step, context, self.config.id)
+                except TypeError as e:
+                    logger.warning(f"Step {step.id} is not cached: {e}")
+                    step_cache = None
+            if step_cache is not None:
+                # The shared default cache reports to this executor's metrics
+                found, result = step_cache.lookup(
+                    cache_key,
+                    {"workflow_id": self.config.id, "step_type": step.type.value},
+                    metrics=self.metrics if self.step_cache is None else None
+                )
+                if found:
+                    return result
             
             # Execute step
             result = await step_fn(step, context)
+
+            if step_cache is not None:
+                step_cache.store(cache_key, result, ttl=step.config.cache_ttl)
             return result
         except Exception as e:
             # Wrap any error in WorkflowExecutionError
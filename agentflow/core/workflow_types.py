@@ -7,6 +7,9 @@ from datetime import datetime
 import uuid
 import asyncio
 
+from .histogram import get_default_histograms
+from .metrics import MetricType
+
 # Expose only the intended classes from this module
 __all__ = [
     "Message", 
@@ -22,6 +25,7 @@ __all__ = [
     "WorkflowStatus", 
     "WorkflowStepStatus", 
     "WorkflowStrategy", 
+    "ExecutionMode", 
     "StepConfig", 
     "WorkflowStep", 
     "WorkflowConfig", 
@@ -274,6 +278,12 @@ class WorkflowStrategy(str, Enum):
     DISTRIBUTED = "distributed"
 
 
+class ExecutionMode(str, Enum):
+    """Step scheduling mode for workflow execution."""
+    SEQUENTIAL = "sequential"  # Run steps one at a time in list order
+    DAG = "dag"  # Run every step whose dependencies are satisfied concurrently
+
+
 # Valid communication protocols
 VALID_PROTOCOLS = {
     "federated",
@@ -310,6 +320,8 @@ class StepConfig(BaseModel):
     retry_backoff: float = Field(default=2.0)
     max_retries: int = Field(default=3)
     timeout: float = Field(default=30.0)
+    cache: bool = Field(default=False, description="Memoize results for identical config and input")
+    cache_ttl: Optional[float] = Field(default=None, ge=0.0, description="Seconds a cached result stays valid")
     execute: Optional[Union[
         Callable[[Dict[str, Any]], Dict[str, Any]], 
         Callable[[Dict[str, Any]], Coroutine[Any, Any, Dict[str, Any]]]
@@ -457,6 +469,11 @@ class WorkflowStep(BaseModel):
             raise
         finally:
             self.execution_state["end_time"] = datetime.now()
+            get_default_histograms().observe(
+                MetricType.STEP_DURATION.value,
+                (self.execution_state["end_time"] - self.execution_state["start_time"]).total_seconds(),
+                {"step_id": self.id, "step_type": self.type.value, "status": self.execution_state["status"].value}
+            )
         return self.execution_state["result"] or {}
 
     async def _transform(self, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -490,6 +507,8 @@ class WorkflowConfig(BaseModel):
     steps: List[WorkflowStep] = Field(default_factory=list)
     agent: Any = Field(default=None, description="Agent instance")  # Use Any to avoid circular imports
     distributed: bool = Field(default=False)
+    execution_mode: ExecutionMode = Field(default=ExecutionMode.SEQUENTIAL)
+    max_parallelism: Optional[int] = Field(default=None, ge=1, description="Max concurrent steps in DAG mode")
 
     @model_validator(mode='before')
     @classmethod
@@ -65,6 +65,9 @@ setup(
             "sphinx",
             "sphinx-rtd-theme",
         ],
+        "parquet": [
+            "pyarrow>=10.0.0",
+        ],
     },
     entry_points={
         "console_scripts": [
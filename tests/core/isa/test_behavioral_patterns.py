@@ -1,7 +1,9 @@
 """Tests for behavioral pattern analysis in ISA."""
+import itertools
+import numpy as np
 import pytest
 from agentflow.core.isa.pattern_mining import BehavioralMiner
-from agentflow.core.isa.formal import FormalInstruction
+from agentflow.core.isa.formal import FormalInstruction, InstructionType
 from agentflow.core.isa.analyzer import AnalysisResult
 
 @pytest.fixture
@@ -123,3 +125,60 @@ class TestBehavioralPatterns:
         # Test invalid configuration
         with pytest.raises(ValueError):
             BehavioralMiner({"min_pattern_length": 0})
+        
+    def test_vectorized_confidence_matches_pairwise(self, sample_instructions):
+        """Test pattern confidence equals the mean over all instruction pairs."""
+        miner = BehavioralMiner({})
+        instructions = sample_instructions + [
+            FormalInstruction(id="10", name="save", parameters={"a": 1, "b": 2}),
+            FormalInstruction(id="11", name="load", parameters={"a": 1}, type=InstructionType.LLM),
+            FormalInstruction(id="12", name="load", parameters={"a": 3}, type=InstructionType.LLM)
+        ]
+        
+        def similarity(instr1, instr2):
+            shared = len(set(instr1.parameters) & set(instr2.parameters))
+            size = max(len(instr1.parameters), len(instr2.parameters), 1)
+            return ((instr1.type == instr2.type) + shared / size) / 2
+            
+        pairs = list(itertools.combinations(instructions, 2))
+        expected = sum(similarity(a, b) for a, b in pairs) / len(pairs)
+        assert miner._calculate_pattern_confidence(instructions) == pytest.approx(expected)
+        assert miner.pairwise_similarity(instructions)[10, 11] == pytest.approx(similarity(instructions[10], instructions[11]))
+        
+    def test_graph_clustering(self):
+        """Test sparse similarity graph clustering separates distinct behaviors."""
+        miner = BehavioralMiner({"clustering": "graph", "min_support": 0.1, "similarity_threshold": 0.5})
+        instructions = [
+            FormalInstruction(name=f"step{i}", type=instruction_type)
+            for instruction_type in (InstructionType.CONTROL, InstructionType.LLM)
+            for i in range(10)
+        ]
+        clusters = miner._cluster_instructions(miner._extract_features(instructions))
+        assert clusters == [list(range(10)), list(range(10, 20))]
+        
+        graph = miner.similarity_graph(np.array([[0.0], [0.1], [5.0]]))
+        assert graph[0, 1] > 0 and graph[1, 0] == graph[0, 1]
+        assert graph[0, 2] == 0
+        
+    def test_minibatch_clustering_for_large_sets(self):
+        """Test large sets are clustered with mini-batches and cover every row."""
+        miner = BehavioralMiner({"minibatch_threshold": 100, "min_support": 0.0})
+        instructions = [
+            FormalInstruction(type=list(InstructionType)[i % 3], parameters={str(k): k for k in range(i % 4)})
+            for i in range(500)
+        ]
+        clusters = miner._cluster_instructions(miner._extract_features(instructions))
+        assert len(clusters) > 1
+        assert sorted(i for cluster in clusters for i in cluster) == list(range(500))
+        
+    def test_streaming_clustering(self, sample_instructions):
+        """Test the streaming model is updated batch by batch."""
+        miner = BehavioralMiner({"max_clusters": 2})
+        with pytest.raises(ValueError):
+            miner.predict(sample_instructions)
+            
+        llm = [FormalInstruction(type=InstructionType.LLM, content="prompt") for _ in range(5)]
+        miner.partial_fit(sample_instructions).partial_fit(llm)
+        labels = miner.predict(sample_instructions[:2] + llm[:2])
+        assert labels[0] == labels[1]
+        assert labels[2] == labels[3] != labels[0]
@@ -0,0 +1,150 @@
+"""Tests for critical-path list scheduling."""
+import pytest
+from agentflow.core.isa.compiler import (
+    CompilationContext,
+    InstructionCompiler,
+    IRBuilder,
+    IRNodeType
+)
+from agentflow.core.isa.formal import FormalInstruction, OptimizationHint, ResourceRequirement
+from agentflow.core.isa.list_scheduler import ListScheduler, estimate_cost, instruction_dependencies
+from agentflow.core.isa.scheduler import ExecutionContext, ExecutionMode, InstructionScheduler
+
+def make_instruction(name, cost=1.0, dependencies=(), **kwargs):
+    return FormalInstruction(
+        id=name,
+        name=name,
+        dependencies=list(dependencies),
+        optimization=OptimizationHint(cost=cost),
+        **kwargs
+    )
+
+def test_dependencies_follow_data_and_ordering():
+    """Test read-after-write, write-after-read, explicit and ordering edges."""
+    instructions = [
+        make_instruction("write", dependencies=["output:x"]),
+        make_instruction("read", dependencies=["input:x"]),
+        make_instruction("overwrite", dependencies=["output:x"]),
+        make_instruction("explicit", dependencies=["read"]),
+        make_instruction("state1", metadata={"requires_ordering": True}),
+        make_instruction("state2", metadata={"requires_ordering": True}),
+        make_instruction("free")
+    ]
+    assert instruction_dependencies(instructions) == [
+        set(), {0}, {0, 1}, {1}, set(), {4}, set()
+    ]
+
+def test_cost_estimates_prefer_measurements():
+    """Test measured times win over hints, metadata and requirements."""
+    hinted = make_instruction("a", cost=2.0, metadata={"cost": 3.0})
+    assert estimate_cost(hinted, {"a": 0.5}) == 0.5
+    assert estimate_cost(hinted) == 2.0
+    assert estimate_cost(make_instruction("b", cost=None, metadata={"cost": 3.0})) == 3.0
+    timed = make_instruction("c", cost=None, resources=ResourceRequirement(time=4.0))
+    assert estimate_cost(timed) == 4.0
+    assert estimate_cost(make_instruction("d", cost=None), default=0.1) == 0.1
+
+def test_critical_path_is_scheduled_first():
+    """Test the long chain starts at once instead of after short work."""
+    instructions = [
+        make_instruction("x1"),
+        make_instruction("x2"),
+        make_instruction("x3"),
+        make_instruction("long", cost=4.0),
+        make_instruction("after", cost=4.0, dependencies=["long"])
+    ]
+    plan = ListScheduler(workers=2).schedule(instructions)
+    # In program order the chain would start at 1 and finish at 9
+    assert plan.makespan == plan.critical_path_length == 8.0
+    assert [instr.name for instr in plan.critical_path] == ["long", "after"]
+    slots = plan.to_metadata()["slots"]
+    assert slots["long"]["start"] == 0.0
+    assert slots["after"]["start"] == 4.0
+
+def test_capacities_limit_overlap():
+    """Test instructions needing a scarce resource do not overlap."""
+    instructions = [
+        make_instruction(f"gpu{n}", metadata={"resources": {"gpu": 1.0}})
+        for n in range(3)
+    ] + [make_instruction("cpu")]
+    plan = ListScheduler({"gpu": 1.0}, workers=4).schedule(instructions)
+    gpu = sorted((entry.start, entry.finish) for entry in plan.entries if entry.instruction.name != "cpu")
+    assert gpu == [(0.0, 1.0), (1.0, 2.0), (2.0, 3.0)]
+    for group in plan.groups:
+        assert sum(instr.metadata.get("resources", {}).get("gpu", 0) for instr in group) <= 1
+
+def test_groups_keep_dependencies_and_workers():
+    """Test groups never contain a dependency pair or exceed the workers."""
+    instructions = [make_instruction(f"i{n}", cost=1.0 + n % 3) for n in range(10)]
+    instructions += [make_instruction("join", dependencies=[f"i{n}" for n in range(10)])]
+    plan = ListScheduler(workers=3).schedule(instructions)
+    assert all(len(group) <= 3 for group in plan.groups)
+    assert plan.groups[-1] == [instructions[-1]]
+    assert sorted(instr.name for group in plan.groups for instr in group) == sorted(i.name for i in instructions)
+
+def test_cycles_are_rejected():
+    """Test extra edges that form a cycle raise."""
+    instructions = [make_instruction("a"), make_instruction("b", dependencies=["a"])]
+    with pytest.raises(ValueError):
+        ListScheduler().schedule(instructions, edges=[("b", "a")])
+
+def test_compiler_emits_parallel_groups():
+    """Test the parallel pass groups independent instructions by schedule."""
+    compiler = InstructionCompiler({})
+    context = CompilationContext({
+        "optimization_level": "ADVANCED",
+        "resource_constraints": {"workers": 2},
+        "cost_estimates": {"b": 3.0}
+    })
+    instructions = [
+        make_instruction("a", dependencies=["output:x"]),
+        make_instruction("b"),
+        make_instruction("c", dependencies=["input:x"])
+    ]
+    ir = compiler._parallelize_execution(IRBuilder().build(instructions), context)
+    assert ir.type == IRNodeType.PARALLEL
+    assert [[instr.name for instr in group] for group in ir.instructions] == [["a", "b"], ["c"]]
+    assert ir.metadata["schedule"]["makespan"] == 3.0
+
+    compiled = compiler.compile(instructions, context)
+    assert compiled[0].metadata["is_parallel"]
+    assert compiled[1].name == "c"
+
+def test_pure_instructions_fuse_and_dead_ones_are_removed():
+    """Test fusion keeps both bodies and unread pure outputs are dropped."""
+    compiler = InstructionCompiler({})
+    context = CompilationContext({"live_outputs": ["z"]})
+    instructions = [
+        FormalInstruction(name="one", content="a = 1", metadata={"pure": True, "outputs": ["y"]}),
+        FormalInstruction(name="two", content="result = 2", metadata={"pure": True, "outputs": ["z"]}),
+        FormalInstruction(name="effect", content="result = 3")
+    ]
+    compiled = compiler.compile(instructions, context)
+    assert [instr.name for instr in compiled] == ["fused_one_two", "effect"]
+    assert compiled[0].content == "a = 1\nresult = 2"
+
+    dead = [FormalInstruction(name="unused", metadata={"pure": True, "outputs": ["q"]})]
+    assert compiler._eliminate_dead_code(IRBuilder().build(dead), context).instructions == []
+
+def test_resource_aware_policy_executes_plan():
+    """Test the scheduler runs list-scheduled batches."""
+    scheduler = InstructionScheduler({"scheduling_policy": "resource_aware", "max_workers": 2})
+    try:
+        instructions = [
+            FormalInstruction(id=name, name=name, content=f"result = '{name}'", dependencies=deps)
+            for name, deps in [("a", []), ("b", ["a"]), ("c", [])]
+        ]
+        context = ExecutionContext(
+            mode=ExecutionMode.PARALLEL,
+            resources={},
+            constraints={"access_level": "default"},
+            metrics={},
+            callbacks={}
+        )
+        results = scheduler.schedule(IRBuilder().build(instructions), context)
+        outputs = [result.output for result in results]
+        assert sorted(outputs) == ["a", "b", "c"]
+        assert outputs.index("a") < outputs.index("b")
+        assert scheduler.metrics_collector.get_instruction_estimate("a") is not None
+    finally:
+        scheduler.close()
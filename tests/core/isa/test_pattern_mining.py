@@ -56,19 +56,65 @@ class TestSequenceMiner:
             
     def test_sequence_validation(self, sample_instructions):
         """Test sequence validation logic."""
-        config = {"min_support": 0.5, "min_confidence": 0.9}
-        miner = SequenceMiner(config)
-        
         # Test with invalid sequence length
         with pytest.raises(ValueError):
-            miner._generate_candidates(sample_instructions, 0)
+            SequenceMiner({"max_length": 1})
             
         # Test with sequence length > instructions
-        candidates = miner._generate_candidates(
-            sample_instructions,
-            len(sample_instructions) + 1
-        )
-        assert len(candidates) == 0
+        miner = SequenceMiner({"min_support": 0.0, "min_confidence": 0.0, "max_length": 10})
+        sequences = miner.find_sequences(sample_instructions)
+        assert max(len(seq.instructions) for seq in sequences) == len(sample_instructions)
+        assert miner.find_sequences([]) == []
+        
+    def test_sequences_match_window_counts(self):
+        """Test mined sequences equal a brute-force count of all windows."""
+        rng = np.random.default_rng(0)
+        names = [f"op{code}" for code in rng.integers(0, 4, size=300)]
+        trace = [FormalInstruction(id=name, name=name) for name in names]
+        miner = SequenceMiner({"min_support": 0.02, "min_confidence": 0.3, "max_length": 4})
+        
+        expected = {}
+        for length in range(2, 5):
+            windows = [tuple(names[i:i + length]) for i in range(len(names) - length + 1)]
+            prefixes = [tuple(names[i:i + length - 1]) for i in range(len(names) - length + 2)]
+            for window in set(windows):
+                frequency = windows.count(window)
+                confidence = frequency / prefixes.count(window[:-1])
+                if frequency >= 6 and confidence >= 0.3:
+                    expected[window] = (frequency, confidence)
+                    
+        sequences = miner.find_sequences(trace)
+        mined = {
+            tuple(instr.id for instr in seq.instructions): (seq.frequency, seq.confidence)
+            for seq in sequences
+        }
+        assert mined.keys() == expected.keys()
+        for window, (frequency, confidence) in expected.items():
+            assert mined[window][0] == frequency
+            assert mined[window][1] == pytest.approx(confidence)
+        assert all(seq.support == seq.frequency / len(trace) for seq in sequences)
+        
+    def test_multi_trace_and_incremental_update(self):
+        """Test sequences do not span traces and updates extend the corpus."""
+        def trace(*names):
+            return [FormalInstruction(name=name) for name in names]
+            
+        miner = SequenceMiner({"min_count": 2, "min_confidence": 0.0, "key": "name"})
+        miner.update([trace("a", "b"), trace("c", "a", "b")])
+        found = {tuple(i.name for i in seq.instructions) for seq in miner.frequent_sequences()}
+        assert found == {("a", "b")}
+        
+        # "b" ends the first trace and "c" starts the second, so ("b", "c") is not counted
+        miner.update(trace("b", "c", "a"))
+        found = {
+            tuple(i.name for i in seq.instructions): seq.frequency
+            for seq in miner.frequent_sequences()
+        }
+        assert found == {("a", "b"): 2, ("c", "a"): 2}
+        assert miner.corpus.num_traces == 3
+        
+        miner.reset()
+        assert miner.frequent_sequences() == []
 
 class TestParallelMiner:
     """Test parallel mining functionality."""
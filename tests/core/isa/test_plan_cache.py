@@ -0,0 +1,127 @@
+"""Tests for the compiled plan cache."""
+from unittest.mock import patch
+import pytest
+from agentflow.core.isa.compiler import CompilationContext, InstructionCompiler
+from agentflow.core.isa.formal import FormalInstruction, OptimizationHint
+from agentflow.core.isa.plan_cache import CompiledPlanCache, code_fingerprint, structural_hash
+
+def make_instructions():
+    return [
+        FormalInstruction(name="load", content="a = 1", metadata={"pure": True, "outputs": ["x"]}),
+        FormalInstruction(name="scale", content="b = 2", metadata={"pure": True, "outputs": ["y"]}),
+        FormalInstruction(name="left", content="result = 1",
+                          dependencies=["input:x"], optimization=OptimizationHint(cost=2.0)),
+        FormalInstruction(name="right", content="result = 2", dependencies=["input:x"]),
+    ]
+
+def make_context(**config):
+    return CompilationContext({"optimization_level": "ADVANCED", "live_outputs": ["x", "y"], **config})
+
+@pytest.fixture
+def cache():
+    return CompiledPlanCache()
+
+def test_recompiling_hits_the_cache(cache):
+    """Test a repeated compilation skips the passes and binds the caller's instructions."""
+    compiler = InstructionCompiler({}, plan_cache=cache)
+    first = compiler.compile(make_instructions(), make_context())
+
+    instructions = make_instructions()
+    instructions[3].dependencies.append(instructions[0].id)
+    compiler.compile(instructions, make_context())
+    with patch.object(compiler, "_compile", wraps=compiler._compile) as compile_pass:
+        second = compiler.compile(instructions, make_context())
+    compile_pass.assert_not_called()
+    assert cache.stats()["hits"] == 1
+
+    fused = second[0]
+    assert fused.name == "fused_load_scale" and fused.content == first[0].content
+    assert fused.metadata["aliases"][0] == instructions[0].id
+    block = second[1]
+    assert block.metadata["parallel_instructions"][0] is instructions[2]
+    assert block.metadata["parallel_instructions"][1] is instructions[3]
+    assert instructions[3].dependencies == ["input:x", instructions[0].id]
+
+def test_fresh_ids_share_a_plan():
+    """Test sequences rebuilt with new ids hash the same, id dependencies by position."""
+    one, two = make_instructions(), make_instructions()
+    one[1].dependencies.append(one[0].id)
+    two[1].dependencies.append(two[0].id)
+    assert structural_hash(one, make_context()) == structural_hash(two, make_context())
+
+def test_changed_definitions_and_contexts_miss(cache):
+    """Test edits to an instruction or the context invalidate the plan."""
+    compiler = InstructionCompiler({}, plan_cache=cache)
+    compiler.compile(make_instructions(), make_context())
+
+    changed = make_instructions()
+    changed[2].content = "result = 10"
+    assert compiler.compile(changed, make_context())[1].metadata["parallel_instructions"][0].content == "result = 10"
+    compiler.compile(make_instructions(), make_context(resource_constraints={"workers": 1}))
+    assert cache.stats() == {"hits": 0, "misses": 3, "entries": 3, "disk_entries": None}
+
+def test_plans_are_shared_through_disk(tmp_path):
+    """Test a new process-level cache finds plans another stored on disk."""
+    InstructionCompiler({}, plan_cache=CompiledPlanCache(disk_dir=str(tmp_path))).compile(
+        make_instructions(), make_context()
+    )
+    cache = CompiledPlanCache(disk_dir=str(tmp_path))
+    instructions = make_instructions()
+    compiled = InstructionCompiler({}, plan_cache=cache).compile(instructions, make_context())
+    assert cache.stats()["hits"] == 1 and cache.stats()["entries"] == 1
+    assert compiled[1].metadata["parallel_instructions"][0] is instructions[2]
+
+def test_unpicklable_plans_stay_in_memory(tmp_path):
+    """Test plans that cannot be pickled are still cached in memory."""
+    cache = CompiledPlanCache(disk_dir=str(tmp_path))
+    compiler = InstructionCompiler({}, plan_cache=cache)
+    instructions = make_instructions()
+    # Fused instructions carry the metadata of the originals
+    instructions[0].metadata["validator"] = lambda value: True
+    compiler.compile(instructions, make_context())
+    compiler.compile(instructions, make_context())
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["disk_entries"] == 0
+
+def test_cache_can_be_disabled():
+    """Test the plan_cache config turns caching off."""
+    assert InstructionCompiler({"plan_cache": False}).plan_cache is None
+
+def compiler_class(level):
+    """Create a compiler subclass whose code differs only in a constant."""
+    namespace = {"InstructionCompiler": InstructionCompiler}
+    exec(
+        "class TunedCompiler(InstructionCompiler):\n"
+        "    def _should_apply_pass(self, pass_name, context):\n"
+        f"        return pass_name != 'memory_optimization' or {level} > 2\n",
+        namespace
+    )
+    return namespace["TunedCompiler"]
+
+def test_changed_code_constants_miss(cache):
+    """Test editing a constant in compiler code invalidates cached plans."""
+    def half():
+        return 1 / 2
+
+    def third():
+        return 1 / 3
+
+    third.__qualname__ = half.__qualname__
+    assert code_fingerprint(type("A", (), {"f": half})) != code_fingerprint(type("A", (), {"f": third}))
+    assert code_fingerprint(type("A", (), {"LIMIT": 1})) != code_fingerprint(type("A", (), {"LIMIT": 2}))
+
+    for level in (1, 3):
+        compiler_class(level)({}, plan_cache=cache).compile(make_instructions(), make_context())
+    assert cache.stats()["misses"] == 2 and cache.stats()["hits"] == 0
+
+def test_uncontentable_fields_compile_uncached(cache):
+    """Test instructions holding callable objects are compiled without caching."""
+    class Check:
+        def __call__(self, context):
+            return True
+
+    instructions = make_instructions()
+    instructions[2].preconditions.append(Check())
+    compiled = InstructionCompiler({}, plan_cache=cache).compile(instructions, make_context())
+    assert compiled[1].metadata["parallel_instructions"][0] is instructions[2]
+    assert cache.stats()["entries"] == 0
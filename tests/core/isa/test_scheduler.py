@@ -0,0 +1,149 @@
+"""Tests for instruction execution and queueing."""
+import asyncio
+import threading
+import time
+import tracemalloc
+import pytest
+from agentflow.core.isa.formal import FormalInstruction, InstructionStatus, OptimizationHint
+from agentflow.core.isa.scheduler import (
+    ExecutionContext,
+    ExecutionEngine,
+    ExecutionMode,
+    InstructionScheduler,
+    MetricsCollector,
+    QueueManager
+)
+
+def make_context():
+    return ExecutionContext(
+        mode=ExecutionMode.PARALLEL,
+        resources={},
+        constraints={"access_level": "default"},
+        metrics={},
+        callbacks={}
+    )
+
+def make_instruction(name, content, priority=0, **kwargs):
+    return FormalInstruction(
+        name=name,
+        content=content,
+        optimization=OptimizationHint(priority=priority),
+        **kwargs
+    )
+
+@pytest.fixture
+def engine():
+    engine = ExecutionEngine({"max_workers": 3})
+    yield engine
+    engine.shutdown()
+
+def test_queue_orders_by_priority_then_arrival():
+    """Test instructions leave their class by priority, equal ones FIFO."""
+    queue = QueueManager({"work_stealing": False})
+    for name, priority in [("a", 0), ("b", 2), ("c", 0), ("d", 2)]:
+        queue.enqueue(make_instruction(name, "", priority), "medium")
+    order = [queue.dequeue("medium").name for _ in range(4)]
+    assert order == ["b", "d", "a", "c"]
+    assert queue.dequeue("medium") is None
+
+def test_queue_steals_from_higher_classes_first():
+    """Test an empty class takes work from the others."""
+    queue = QueueManager({})
+    queue.enqueue(make_instruction("low", ""), "low")
+    queue.enqueue(make_instruction("high", ""), "high")
+    assert queue.dequeue("medium", steal=False) is None
+    assert queue.dequeue("medium").name == "high"
+    assert queue.dequeue("medium").name == "low"
+    assert queue.stolen == 2
+    assert QueueManager.classify(make_instruction("x", "", priority=-1)) == "low"
+
+def test_parallel_results_keep_input_order_and_measure(engine):
+    """Test parallel results line up with inputs and carry real metrics."""
+    instructions = [
+        make_instruction(f"i{n}", f"data = list(range(20000))\nresult = {n}", priority=n % 3 - 1)
+        for n in range(8)
+    ]
+    results = engine.execute_parallel(instructions, make_context())
+    assert [result.output for result in results] == list(range(8))
+    assert all(result.success for result in results)
+    assert all(result.metrics["execution_time"] > 0 for result in results)
+    assert all(result.metrics["memory_usage"] >= 0 for result in results)
+    assert not tracemalloc.is_tracing()
+    assert all(instruction.status == InstructionStatus.COMPLETED for instruction in instructions)
+
+def test_parallel_execution_runs_concurrently(engine):
+    """Test sleeping instructions overlap on the worker threads."""
+    instructions = [make_instruction(f"s{n}", "import time\ntime.sleep(0.2)") for n in range(3)]
+    start = time.perf_counter()
+    engine.execute_parallel(instructions, make_context())
+    assert time.perf_counter() - start < 0.5
+
+def test_failures_are_reported_per_instruction(engine):
+    """Test a raising instruction fails without affecting the others."""
+    instructions = [make_instruction("ok", "result = 1"), make_instruction("bad", "raise RuntimeError('boom')")]
+    ok, bad = engine.execute_parallel(instructions, make_context())
+    assert ok.success and not bad.success
+    assert "boom" in bad.errors[0]
+    assert bad.metrics["execution_time"] >= 0
+    assert instructions[1].status == InstructionStatus.FAILED
+
+def test_process_backend_executes_in_workers():
+    """Test the process backend returns outputs from worker processes."""
+    engine = ExecutionEngine({"executor_backend": "process", "max_workers": 2})
+    try:
+        instructions = [make_instruction(f"p{n}", f"import os\nresult = ({n}, os.getpid())") for n in range(4)]
+        results = engine.execute_parallel(instructions, make_context())
+        assert [result.output[0] for result in results] == [0, 1, 2, 3]
+        assert {result.output[1] for result in results} != {threading.get_ident()}
+        assert all(result.metrics["cpu_time"] >= 0 for result in results)
+    finally:
+        engine.shutdown()
+
+def test_asyncio_backend_awaits_coroutine_bodies():
+    """Test the asyncio backend runs coroutine instructions on the loop."""
+    class AsyncInstruction(FormalInstruction):
+        async def execute(self, context):
+            await asyncio.sleep(0.1)
+            return self.name
+
+    engine = ExecutionEngine({"executor_backend": "asyncio", "max_workers": 4})
+    try:
+        instructions = [AsyncInstruction(name=f"a{n}") for n in range(4)]
+        instructions.append(make_instruction("sync", "result = 'sync'"))
+        start = time.perf_counter()
+        results = engine.execute_parallel(instructions, make_context())
+        assert time.perf_counter() - start < 0.35
+        assert [result.output for result in results] == ["a0", "a1", "a2", "a3", "sync"]
+    finally:
+        engine.shutdown()
+
+def test_metrics_collector_tracks_instruction_estimates():
+    """Test per-instruction moving averages."""
+    collector = MetricsCollector(smoothing=0.5)
+    collector.update({"execution_time": 1.0}, "a")
+    collector.update({"execution_time": 3.0}, "a")
+    collector.update({"execution_time": 5.0})
+    assert collector.get_instruction_estimate("a") == 2.0
+    assert collector.get_instruction_estimate("b") is None
+    assert collector.get_average("execution_time") == 3.0
+
+def test_memory_tracing_is_opt_in_and_stops_with_the_engine():
+    """Test traced peaks are measured only while an engine asks for them."""
+    assert not tracemalloc.is_tracing()
+    with ExecutionEngine({"max_workers": 2, "trace_memory": True}) as engine:
+        assert tracemalloc.is_tracing()
+        instructions = [
+            make_instruction(f"m{n}", f"data = list(range({n + 1} * 100000))\nresult = len(data)")
+            for n in range(4)
+        ]
+        results = engine.execute_parallel(instructions, make_context())
+        # Concurrent measurements never reset each other's peaks
+        assert all(result.metrics["memory_usage"] >= (n + 1) * 0.5 for n, result in enumerate(results))
+    assert not tracemalloc.is_tracing()
+
+def test_scheduler_close_shuts_down_workers():
+    """Test closing the scheduler releases the engine's threads."""
+    with InstructionScheduler({"max_workers": 2}) as scheduler:
+        scheduler.executor.execute_parallel([make_instruction("a", "result = 1")], make_context())
+    with pytest.raises(RuntimeError):
+        scheduler.executor.thread_pool.submit(print)
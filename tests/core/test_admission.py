@@ -0,0 +1,134 @@
+"""Test admission control."""
+
+import asyncio
+import pytest
+
+from agentflow.core.admission import AdmissionController, PriorityClass
+from agentflow.core.exceptions import AdmissionRejectedError
+from agentflow.core.histogram import HistogramRegistry
+
+
+def make_controller(**kwargs) -> AdmissionController:
+    return AdmissionController(histograms=HistogramRegistry(), **kwargs)
+
+
+def admitted(ticket) -> bool:
+    return ticket.admitted_at is not None
+
+
+@pytest.mark.asyncio
+async def test_requests_queue_beyond_capacity():
+    """Test requests wait for a slot and are admitted on release."""
+    controller = make_controller(max_concurrent=2)
+    tickets = [controller.submit() for _ in range(3)]
+    assert [admitted(ticket) for ticket in tickets] == [True, True, False]
+    assert controller.queue_depth == 1
+
+    controller.release(tickets[0])
+    await asyncio.wait_for(controller.wait(tickets[2]), timeout=1)
+    assert controller.stats()["running"] == 2
+    assert controller.stats()["wait_seconds"]["standard"]["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_with_retry_after():
+    """Test submissions beyond the queue bound raise with a retry-after."""
+    controller = make_controller(max_concurrent=1, max_queue=1)
+    controller.submit()
+    controller.submit()
+    with pytest.raises(AdmissionRejectedError) as error:
+        controller.submit()
+    assert error.value.retry_after >= 1
+    assert controller.stats()["rejected"]["standard"] == 1
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_classes_are_admitted_first():
+    """Test a released slot goes to the highest queued class."""
+    controller = make_controller(max_concurrent=1)
+    running = controller.submit()
+    batch = controller.submit(priority=PriorityClass.BATCH)
+    standard = controller.submit(priority=PriorityClass.STANDARD)
+    interactive = controller.submit(priority=PriorityClass.INTERACTIVE)
+
+    controller.release(running)
+    assert admitted(interactive) and not admitted(standard) and not admitted(batch)
+    controller.release(interactive)
+    assert admitted(standard) and not admitted(batch)
+
+
+@pytest.mark.asyncio
+async def test_tenant_limit_does_not_block_other_tenants():
+    """Test a tenant at its limit waits while other tenants are admitted."""
+    controller = make_controller(max_concurrent=4, tenant_limit=1, tenant_limits={"big": 2})
+    first = controller.submit("a")
+    blocked = controller.submit("a")
+    other = controller.submit("b")
+    big = [controller.submit("big") for _ in range(3)]
+
+    assert admitted(first) and not admitted(blocked) and admitted(other)
+    assert [admitted(ticket) for ticket in big] == [True, True, False]
+    assert controller.stats()["running_by_tenant"] == {"a": 1, "b": 1, "big": 2}
+
+    controller.release(first)
+    assert admitted(blocked)
+
+
+@pytest.mark.asyncio
+async def test_tenants_are_served_round_robin():
+    """Test queued tenants of a class take turns."""
+    controller = make_controller(max_concurrent=1)
+    running = controller.submit("x")
+    a1, a2, b1 = controller.submit("a"), controller.submit("a"), controller.submit("b")
+
+    controller.release(running)
+    controller.release(a1)
+    assert admitted(b1) and not admitted(a2)
+
+
+@pytest.mark.asyncio
+async def test_class_limits_reserve_capacity():
+    """Test batch requests cannot take the capacity kept for other classes."""
+    controller = make_controller(
+        max_concurrent=3,
+        class_limits={PriorityClass.BATCH: 1},
+        queue_limits={PriorityClass.BATCH: 1}
+    )
+    batch = controller.submit(priority=PriorityClass.BATCH, weight=4)
+    assert batch.weight == 1
+    queued = controller.submit(priority=PriorityClass.BATCH)
+    with pytest.raises(AdmissionRejectedError):
+        controller.submit(priority=PriorityClass.BATCH)
+
+    interactive = [controller.submit(priority=PriorityClass.INTERACTIVE) for _ in range(2)]
+    assert all(admitted(ticket) for ticket in interactive)
+    assert not admitted(queued)
+
+
+@pytest.mark.asyncio
+async def test_wait_timeout_withdraws_ticket():
+    """Test a request not admitted in time is rejected and dequeued."""
+    controller = make_controller(max_concurrent=1)
+    running = controller.submit()
+    waiting = controller.submit()
+    with pytest.raises(AdmissionRejectedError):
+        await controller.wait(waiting, timeout=0.01)
+    assert controller.queue_depth == 0
+
+    controller.release(running)
+    controller.release(running)
+    assert controller.stats()["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_admit_context_manager_releases_on_error():
+    """Test the context manager gives back its slot when the block raises."""
+    controller = make_controller(max_concurrent=1)
+    with pytest.raises(RuntimeError):
+        async with controller.admit("t", PriorityClass.INTERACTIVE):
+            assert controller.stats()["running_by_class"]["interactive"] == 1
+            raise RuntimeError("boom")
+    assert controller.stats()["running"] == 0
+
+    async with controller.admit() as ticket:
+        assert ticket.wait_time is not None
@@ -0,0 +1,102 @@
+"""Test workflow agent pool."""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from agentflow.core.agent_config import AgentConfig
+from agentflow.core.agent_pool import WorkflowAgentPool
+from agentflow.core.exceptions import WorkflowExecutionError
+from agentflow.core.workflow import WorkflowEngine
+from agentflow.core.workflow_types import WorkflowConfig
+
+
+def make_workflow(name: str = "wf") -> WorkflowConfig:
+    return WorkflowConfig.model_validate(
+        {"id": name, "name": name, "steps": [{"id": "s", "name": "s", "type": "agent"}]}
+    )
+
+
+@pytest.fixture
+def created():
+    """Agents created by the pool's factory."""
+    return []
+
+
+@pytest.fixture
+def pool(created):
+    """Create a pool over an engine with minimal agents."""
+    async def create_agent(workflow_config):
+        agent = MagicMock()
+        agent.id = f"agent_{len(created)}"
+        agent.config = MagicMock(spec=AgentConfig)
+        agent.config.workflow = None
+        agent.metadata = {}
+        agent._ell2a = None
+        agent.cleanup = AsyncMock()
+        created.append(agent)
+        return agent
+
+    return WorkflowAgentPool(WorkflowEngine(), create_agent, max_size=2, checkout_timeout=0.2)
+
+
+@pytest.mark.asyncio
+async def test_agents_are_reused_per_workflow_config(pool, created):
+    """Test equal configurations share agents and different ones do not."""
+    async with pool.checkout(make_workflow()) as first:
+        assert first in pool.engine.workflows
+    async with pool.checkout(make_workflow()) as second:
+        pass
+    async with pool.checkout(make_workflow("other")) as third:
+        pass
+
+    assert first == second
+    assert third != first
+    assert len(created) == 2
+    assert sorted(pool.stats().values(), key=str) == [{"leased": 0, "idle": 1}] * 2
+
+
+@pytest.mark.asyncio
+async def test_checkout_waits_when_group_is_full(pool, created):
+    """Test concurrent checkouts get distinct agents and wait beyond max_size."""
+    first = await pool.acquire(make_workflow())
+    second = await pool.acquire(make_workflow())
+    assert first.agent is not second.agent
+
+    with pytest.raises(WorkflowExecutionError):
+        await pool.acquire(make_workflow())
+
+    waiting = asyncio.create_task(pool.acquire(make_workflow()))
+    await asyncio.sleep(0.01)
+    await pool.release(first)
+    assert (await waiting).agent is first.agent
+    assert len(created) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_agents_are_discarded(pool, created):
+    """Test an agent whose execution raised is unregistered and not reused."""
+    with pytest.raises(RuntimeError):
+        async with pool.checkout(make_workflow()) as workflow_id:
+            raise RuntimeError("boom")
+
+    assert workflow_id not in pool.engine.workflows
+    created[0].cleanup.assert_awaited_once()
+    async with pool.checkout(make_workflow()) as next_id:
+        assert next_id != workflow_id
+
+
+@pytest.mark.asyncio
+async def test_idle_agents_are_evicted_and_reregistered(pool, created):
+    """Test idle expiry and re-registration after the engine dropped a workflow."""
+    async with pool.checkout(make_workflow()) as workflow_id:
+        pass
+    await pool.engine.unregister_workflow(workflow_id)
+    async with pool.checkout(make_workflow()) as again:
+        assert again == workflow_id
+        assert again in pool.engine.workflows
+
+    pool.idle_timeout = 0
+    assert await pool.evict_idle() == 1
+    assert workflow_id not in pool.engine.workflows
+    assert pool.stats() == {}
@@ -0,0 +1,157 @@
+"""Test workflow checkpointing and resume."""
+
+import json
+import os
+import pytest
+import numpy as np
+from typing import Dict, Any
+from agentflow.core.workflow_types import WorkflowConfig, WorkflowStep, WorkflowStepType, StepConfig
+from agentflow.core.exceptions import WorkflowExecutionError
+from agentflow.core.workflow_executor import WorkflowExecutor
+from agentflow.core.persistence import FilePersistence, SQLitePersistence
+from agentflow.core.checkpoint import CheckpointStore, decode_value, encode_value
+
+
+@pytest.fixture(params=["sqlite", "file"])
+def checkpoint_store(request, temp_dir):
+    """Create a checkpoint store on each persistence backend."""
+    if request.param == "sqlite":
+        persistence = SQLitePersistence(os.path.join(temp_dir, "results.db"))
+    else:
+        persistence = FilePersistence(os.path.join(temp_dir, "results"), format="jsonl")
+    store = CheckpointStore(persistence)
+    yield store
+    store.close()
+    persistence.close()
+
+
+def make_config(calls: Dict[str, int], fail: Dict[str, bool]) -> WorkflowConfig:
+    """Create a two step workflow whose second step can be made to fail."""
+    async def expensive(step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+        calls["expensive"] += 1
+        return {"data": context["data"] * 2}
+
+    async def flaky(step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+        calls["flaky"] += 1
+        if fail["flaky"]:
+            raise RuntimeError("Transient failure")
+        return {"data": context["data"] + 1}
+
+    return WorkflowConfig(
+        id="checkpoint-workflow",
+        name="checkpoint_workflow",
+        steps=[
+            WorkflowStep(
+                id="step-1",
+                name="expensive",
+                type=WorkflowStepType.TRANSFORM,
+                config=StepConfig(strategy="custom", params={"execute": expensive})
+            ),
+            WorkflowStep(
+                id="step-2",
+                name="flaky",
+                type=WorkflowStepType.TRANSFORM,
+                dependencies=["step-1"],
+                config=StepConfig(strategy="custom", params={"execute": flaky})
+            )
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_completed_steps(checkpoint_store):
+    """Test a resumed run does not execute steps that already completed."""
+    calls = {"expensive": 0, "flaky": 0}
+    fail = {"flaky": True}
+    config = make_config(calls, fail)
+    data = {"data": np.arange(4)}
+
+    executor = WorkflowExecutor(config, checkpoint_store=checkpoint_store)
+    await executor.initialize()
+    with pytest.raises(WorkflowExecutionError, match="Transient failure"):
+        await executor.execute(dict(data))
+    failed_run = executor.run_id
+
+    fail["flaky"] = False
+    executor = WorkflowExecutor(config, checkpoint_store=checkpoint_store)
+    await executor.initialize()
+    result = await executor.execute(dict(data), resume_from=failed_run)
+
+    assert result["status"] == "success"
+    assert calls == {"expensive": 1, "flaky": 2}
+    np.testing.assert_array_equal(result["steps"]["step-1"]["result"]["data"]["data"], np.arange(4) * 2)
+
+
+@pytest.mark.asyncio
+async def test_resume_ignores_checkpoints_for_other_input(checkpoint_store):
+    """Test checkpoints are not reused when the input changes."""
+    calls = {"expensive": 0, "flaky": 0}
+    config = make_config(calls, {"flaky": False})
+
+    executor = WorkflowExecutor(config, checkpoint_store=checkpoint_store)
+    await executor.initialize()
+    await executor.execute({"data": np.arange(4)})
+    run_id = executor.run_id
+
+    await executor.execute({"data": np.arange(5)}, resume_from=run_id)
+
+    assert calls == {"expensive": 2, "flaky": 2}
+
+
+def test_clear_run(checkpoint_store):
+    """Test checkpoints of a run can be removed."""
+    checkpoint_store.save_step("workflow", "run", "hash", "step-1", {"value": 1})
+    assert checkpoint_store.load_run("workflow", "run") == {"step-1": {"value": 1}}
+
+    checkpoint_store.clear_run("workflow", "run")
+    assert checkpoint_store.load_run("workflow", "run") == {}
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "json", "jsonl"])
+def test_checkpoints_stay_out_of_result_queries(temp_dir, backend):
+    """Test checkpoints stored next to results are not returned as results."""
+    if backend == "sqlite":
+        persistence = SQLitePersistence(os.path.join(temp_dir, "results.db"))
+    else:
+        persistence = FilePersistence(os.path.join(temp_dir, "results"), format=backend)
+    store = CheckpointStore(persistence)
+    store.save_step("workflow", "run", "hash", "step-1", {"value": 1})
+
+    assert persistence.get_results() == []
+    assert persistence.get_results_page().items == []
+    assert store.load_run("workflow", "run") == {"step-1": {"value": 1}}
+    store.close()
+    persistence.close()
+
+
+def test_file_checkpoints_survive_reopening(temp_dir):
+    """Test a FilePersistence directory keeps checkpoints across processes."""
+    base_dir = os.path.join(temp_dir, "results")
+    CheckpointStore(FilePersistence(base_dir)).save_step("workflow/a", "run", "hash", "step-1", (1, 2))
+
+    assert CheckpointStore(FilePersistence(base_dir)).load_run("workflow/a", "run", "hash") == {"step-1": (1, 2)}
+
+
+def test_values_round_trip_as_json():
+    """Test step results are encoded as JSON and restored with their types."""
+    value = {
+        "array": np.arange(6, dtype=np.float32).reshape(2, 3),
+        "scalar": np.int16(7),
+        "pair": (1, "a"),
+        "raw": b"bytes",
+        1: [None, True, 2.5],
+    }
+    restored = decode_value(json.loads(json.dumps(encode_value(value))))
+
+    np.testing.assert_array_equal(restored["array"], value["array"])
+    assert restored["array"].dtype == np.float32
+    assert restored["scalar"] == 7 and restored["scalar"].dtype == np.int16
+    assert restored["pair"] == (1, "a")
+    assert restored["raw"] == b"bytes"
+    assert restored[1] == [None, True, 2.5]
+
+
+def test_unencodable_results_are_not_checkpointed(checkpoint_store):
+    """Test results that JSON cannot hold are skipped instead of pickled."""
+    assert not checkpoint_store.save_step("workflow", "run", "hash", "step-1", {"value": object()})
+    assert checkpoint_store.load_run("workflow", "run") == {}
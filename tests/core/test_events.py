@@ -0,0 +1,179 @@
+"""Test workflow progress events."""
+
+import asyncio
+import uuid
+from typing import Any, Dict
+
+import pytest
+
+from agentflow.core.events import EventBus, WorkflowEvent, WorkflowEventType
+from agentflow.core.exceptions import WorkflowExecutionError
+from agentflow.core.workflow_executor import WorkflowExecutor
+from agentflow.core.workflow_types import (
+    ErrorPolicy,
+    RetryPolicy,
+    StepConfig,
+    WorkflowConfig,
+    WorkflowStep,
+    WorkflowStepType,
+)
+
+
+def _event(event_type: WorkflowEventType, run_id: str = "run-1", **kwargs) -> WorkflowEvent:
+    return WorkflowEvent(type=event_type, run_id=run_id, **kwargs)
+
+
+async def _collect(bus: EventBus, run_id: str, after: int = 0):
+    return [event async for event in bus.subscribe(run_id, after=after)]
+
+
+def _config(execute) -> WorkflowConfig:
+    return WorkflowConfig(
+        id=str(uuid.uuid4()),
+        name="event_workflow",
+        error_policy=ErrorPolicy(fail_fast=True, retry_policy=RetryPolicy(max_retries=0)),
+        steps=[
+            WorkflowStep(
+                id="step-1",
+                name="step_1",
+                type=WorkflowStepType.TRANSFORM,
+                config=StepConfig(strategy="custom", params={"execute": execute})
+            )
+        ]
+    )
+
+
+def test_publish_assigns_sequence_per_run():
+    bus = EventBus()
+    first = bus.publish(_event(WorkflowEventType.WORKFLOW_STARTED))
+    other = bus.publish(_event(WorkflowEventType.WORKFLOW_STARTED, run_id="run-2"))
+    second = bus.publish(_event(WorkflowEventType.STEP_STARTED, step_id="a"))
+    assert (first.seq, second.seq, other.seq) == (1, 2, 1)
+    assert [event.seq for event in bus.history("run-1")] == [1, 2]
+
+
+def test_history_is_bounded():
+    bus = EventBus(history_size=2, max_runs=1)
+    for _ in range(3):
+        bus.publish(_event(WorkflowEventType.STEP_STARTED))
+    assert [event.seq for event in bus.history("run-1")] == [2, 3]
+    bus.publish(_event(WorkflowEventType.WORKFLOW_COMPLETED))
+    bus.publish(_event(WorkflowEventType.WORKFLOW_STARTED, run_id="run-2"))
+    assert bus.history("run-1") == []
+
+
+def test_eviction_keeps_unfinished_runs():
+    bus = EventBus(max_runs=2)
+    bus.publish(_event(WorkflowEventType.WORKFLOW_STARTED, run_id="active"))
+    bus.publish(_event(WorkflowEventType.WORKFLOW_STARTED, run_id="done"))
+    bus.publish(_event(WorkflowEventType.WORKFLOW_COMPLETED, run_id="done"))
+    bus.publish(_event(WorkflowEventType.WORKFLOW_STARTED, run_id="new"))
+    assert bus.history("done") == []
+    assert [event.seq for event in bus.history("active")] == [1]
+
+    # Evicting an unfinished run's history keeps its numbering
+    bus.publish(_event(WorkflowEventType.WORKFLOW_STARTED, run_id="newest"))
+    assert bus.history("active") == []
+    assert bus.publish(_event(WorkflowEventType.WORKFLOW_COMPLETED, run_id="active")).seq == 2
+
+
+@pytest.mark.asyncio
+async def test_subscriber_receives_terminal_event_after_eviction():
+    bus = EventBus(max_runs=1)
+    bus.publish(_event(WorkflowEventType.WORKFLOW_STARTED))
+    subscriber = asyncio.ensure_future(_collect(bus, "run-1", after=1))
+    await asyncio.sleep(0)
+    for index in range(3):
+        bus.publish(_event(WorkflowEventType.WORKFLOW_STARTED, run_id=f"other-{index}"))
+    bus.publish(_event(WorkflowEventType.WORKFLOW_COMPLETED))
+
+    events = await asyncio.wait_for(subscriber, timeout=1)
+    assert [(event.type, event.seq) for event in events] == [(WorkflowEventType.WORKFLOW_COMPLETED, 2)]
+
+
+@pytest.mark.asyncio
+async def test_subscribe_replays_history_and_ends_on_terminal_event():
+    bus = EventBus()
+    bus.publish(_event(WorkflowEventType.WORKFLOW_STARTED))
+    bus.publish(_event(WorkflowEventType.STEP_STARTED, step_id="a"))
+    subscriber = asyncio.ensure_future(_collect(bus, "run-1", after=1))
+    await asyncio.sleep(0)
+    bus.publish(_event(WorkflowEventType.STEP_COMPLETED, step_id="a", data={"result": 1}))
+    bus.publish(_event(WorkflowEventType.WORKFLOW_COMPLETED))
+    bus.publish(_event(WorkflowEventType.WORKFLOW_STARTED, run_id="run-2"))
+    events = await asyncio.wait_for(subscriber, timeout=1)
+    assert [event.seq for event in events] == [2, 3, 4]
+    assert events[-1].terminal
+    # Subscriptions are removed once they end
+    assert not bus._subscribers
+
+
+@pytest.mark.asyncio
+async def test_subscribe_to_finished_run_returns_history():
+    bus = EventBus()
+    bus.publish(_event(WorkflowEventType.WORKFLOW_STARTED))
+    bus.publish(_event(WorkflowEventType.WORKFLOW_FAILED, data={"error": "boom"}))
+    events = await asyncio.wait_for(_collect(bus, "run-1"), timeout=1)
+    assert [event.type for event in events] == [
+        WorkflowEventType.WORKFLOW_STARTED,
+        WorkflowEventType.WORKFLOW_FAILED
+    ]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_events():
+    bus = EventBus(queue_size=2)
+    stream = bus.subscribe("run-1").__aiter__()
+    pending = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    pending.cancel()
+    for _ in range(3):
+        bus.publish(_event(WorkflowEventType.STEP_STARTED))
+    queue = next(iter(bus._subscribers["run-1"]))
+    assert [queue.get_nowait().seq for _ in range(queue.qsize())] == [2, 3]
+
+
+def test_event_to_dict_is_json_safe():
+    event = _event(WorkflowEventType.STEP_COMPLETED, data={"result": {1, 2}, "value": object})
+    data = event.to_dict()
+    assert data["type"] == "step_completed"
+    assert isinstance(data["data"]["value"], str)
+
+
+@pytest.mark.asyncio
+async def test_executor_publishes_step_events():
+    async def transform(step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+        return {"data": context["data"] * 2}
+
+    bus = EventBus()
+    executor = WorkflowExecutor(_config(transform), event_bus=bus)
+    await executor.initialize()
+    subscriber = asyncio.ensure_future(_collect(bus, "run-1"))
+    await asyncio.sleep(0)
+    result = await executor.execute({"data": 2}, run_id="run-1")
+    events = await asyncio.wait_for(subscriber, timeout=1)
+
+    assert [event.type for event in events] == [
+        WorkflowEventType.WORKFLOW_STARTED,
+        WorkflowEventType.STEP_STARTED,
+        WorkflowEventType.STEP_COMPLETED,
+        WorkflowEventType.WORKFLOW_COMPLETED
+    ]
+    assert events[2].step_id == "step-1"
+    assert events[2].data["result"] == result["steps"]["step-1"]["result"]
+
+
+@pytest.mark.asyncio
+async def test_executor_publishes_failure_events():
+    async def failing(step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+        raise ValueError("boom")
+
+    bus = EventBus()
+    executor = WorkflowExecutor(_config(failing), event_bus=bus)
+    await executor.initialize()
+    with pytest.raises(WorkflowExecutionError):
+        await executor.execute({"data": 1}, run_id="run-1")
+
+    types = [event.type for event in bus.history("run-1")]
+    assert WorkflowEventType.STEP_FAILED in types
+    assert types[-1] == WorkflowEventType.WORKFLOW_FAILED
@@ -0,0 +1,72 @@
+"""Test execution plan compilation."""
+
+import pytest
+from agentflow.core.workflow_types import WorkflowStep, WorkflowStepType
+from agentflow.core.exceptions import WorkflowExecutionError
+from agentflow.core.execution_plan import (
+    compile_plan,
+    get_execution_plan,
+    clear_plan_cache,
+)
+
+
+def make_steps(graph):
+    """Create transform steps from a mapping of step ID to dependencies."""
+    return [
+        WorkflowStep(id=step_id, name=step_id, type=WorkflowStepType.TRANSFORM, dependencies=deps)
+        for step_id, deps in graph.items()
+    ]
+
+
+def test_compile_plan_layers_and_order():
+    """Test plan layers follow dependencies."""
+    steps = make_steps({
+        "load": [],
+        "clean": ["load"],
+        "features": ["load"],
+        "train": ["clean", "features"],
+    })
+    plan = compile_plan(steps)
+
+    assert plan.step_index == {"load": 0, "clean": 1, "features": 2, "train": 3}
+    assert plan.layers == ((0,), (1, 2), (3,))
+    assert plan.order == (0, 1, 2, 3)
+    assert plan.dependents[0] == (1, 2)
+    assert plan.dependencies[3] == (1, 2)
+
+
+def test_compile_plan_detects_cycles():
+    """Test circular dependencies are rejected."""
+    steps = make_steps({"a": ["c"], "b": ["a"], "c": ["b"]})
+    with pytest.raises(WorkflowExecutionError, match="Circular dependency"):
+        compile_plan(steps)
+
+
+def test_compile_plan_detects_missing_dependencies():
+    """Test unknown dependencies are rejected."""
+    steps = make_steps({"a": [], "b": ["unknown"]})
+    with pytest.raises(WorkflowExecutionError, match="Missing dependencies"):
+        compile_plan(steps)
+
+
+def test_compile_plan_handles_long_chains():
+    """Test validation of large generated workflows."""
+    graph = {"step-0": []}
+    graph.update({f"step-{i}": [f"step-{i - 1}"] for i in range(1, 2000)})
+    plan = compile_plan(make_steps(graph))
+
+    assert len(plan) == 2000
+    assert len(plan.layers) == 2000
+
+
+def test_get_execution_plan_is_cached():
+    """Test plans are reused for identical step graphs."""
+    clear_plan_cache()
+    graph = {"a": [], "b": ["a"]}
+
+    first = get_execution_plan(make_steps(graph))
+    second = get_execution_plan(make_steps(graph))
+    changed = get_execution_plan(make_steps({"a": [], "b": []}))
+
+    assert first is second
+    assert changed is not first
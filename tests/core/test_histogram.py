@@ -0,0 +1,90 @@
+"""Tests for streaming latency histograms."""
+import pytest
+import numpy as np
+from typing import Dict, Any
+from agentflow.core.histogram import LogHistogram, HistogramRegistry
+from agentflow.core.metrics import MetricsManager, MetricType
+from agentflow.core.workflow_types import WorkflowConfig, WorkflowStep, WorkflowStepType, StepConfig
+from agentflow.core.workflow_executor import WorkflowExecutor
+
+
+def test_quantiles_within_relative_accuracy():
+    """Test quantile estimates stay within the configured relative error."""
+    rng = np.random.default_rng(0)
+    samples = rng.lognormal(mean=-3, sigma=1, size=20000)
+    histogram = LogHistogram(relative_accuracy=0.01)
+    for value in samples:
+        histogram.record(value)
+
+    for q in (0.5, 0.95, 0.99):
+        expected = np.quantile(samples, q)
+        assert histogram.quantile(q) == pytest.approx(expected, rel=0.03)
+    assert histogram.count == len(samples)
+    assert histogram.max == samples.max()
+
+
+def test_merge_matches_single_histogram():
+    """Test merged histograms equal one histogram of all observations."""
+    first, second, combined = LogHistogram(), LogHistogram(), LogHistogram()
+    for value in range(1, 100):
+        (first if value % 2 else second).record(value / 1000)
+        combined.record(value / 1000)
+
+    first.merge(second)
+    assert first.count == combined.count
+    assert first.quantiles() == combined.quantiles()
+
+    with pytest.raises(ValueError):
+        first.merge(LogHistogram(relative_accuracy=0.05))
+
+
+def test_memory_is_constant():
+    """Test histogram size does not depend on the number of observations."""
+    histogram = LogHistogram()
+    size = histogram.counts.nbytes
+    for value in range(100000):
+        histogram.record(value * 1e-3)
+    assert histogram.counts.nbytes == size
+
+
+def test_metrics_manager_percentiles():
+    """Test percentiles are merged across label sets."""
+    manager = MetricsManager()
+    for value in range(1, 101):
+        manager.observe(MetricType.LATENCY, value / 100, {"service": "api", "route": str(value % 2)})
+
+    summary = manager.get_percentiles(MetricType.LATENCY, {"service": "api"})
+    assert summary["count"] == 100
+    assert summary["p50"] == pytest.approx(0.5, rel=0.03)
+    assert summary["p99"] == pytest.approx(0.99, rel=0.03)
+    assert manager.get_percentiles(MetricType.LATENCY, {"service": "other"}) == {}
+
+
+@pytest.mark.asyncio
+async def test_executor_records_step_and_workflow_durations():
+    """Test workflow execution feeds the latency histograms."""
+    async def transform(step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+        return {"data": context["data"]}
+
+    config = WorkflowConfig(
+        id="timed-workflow",
+        name="timed_workflow",
+        steps=[
+            WorkflowStep(
+                id="step-1",
+                name="transform",
+                type=WorkflowStepType.TRANSFORM,
+                config=StepConfig(strategy="custom", params={"execute": transform})
+            )
+        ]
+    )
+    executor = WorkflowExecutor(config)
+    executor.metrics = MetricsManager(histograms=HistogramRegistry())
+    await executor.initialize()
+    for _ in range(3):
+        await executor.execute({"data": np.ones(2)})
+
+    steps = executor.metrics.get_percentiles(MetricType.STEP_DURATION, {"step_id": "step-1"})
+    workflows = executor.metrics.get_percentiles(MetricType.WORKFLOW_DURATION, {"workflow_id": "timed-workflow"})
+    assert steps["count"] == 3
+    assert workflows["count"] == 3
@@ -1,7 +1,10 @@
 """Tests for the metrics collection system."""
+import asyncio
 import pytest
 import time
-from agentflow.core.metrics import MetricsCollector, MetricType
+from unittest.mock import patch
+from agentflow.core.metrics import MetricsCollector, MetricsManager, MetricType
+from agentflow.core.persistence import ExecutorPersistence
 
 @pytest.fixture
 def metrics_collector():
@@ -85,3 +88,43 @@ def test_clear_metrics(metrics_collector):
     # Clear metrics
     metrics_collector.clear_metrics()
     assert len(metrics_collector.get_metrics()) == 0
+
+def test_async_persistence_writes_do_not_block():
+    """Test metrics stored through an async persistence layer are scheduled, not awaited."""
+    stored = []
+
+    class AsyncMetricStore:
+        async def store_metric(self, metric_point):
+            await asyncio.sleep(0.01)
+            stored.append(metric_point.value)
+
+    manager = MetricsManager(persistence=AsyncMetricStore())
+
+    async def run():
+        manager.record_metric(MetricType.LATENCY, 1.0)
+        manager.record_metric(MetricType.LATENCY, 2.0)
+        assert stored == []
+        await manager.flush()
+
+    asyncio.run(run())
+    assert stored == [1.0, 2.0]
+
+def test_executor_persistence_without_loop_writes_synchronously():
+    """Test metrics recorded outside an event loop skip the executor adapter."""
+    class MetricBackend:
+        def __init__(self):
+            self.stored = []
+
+        def store_metric(self, metric_point):
+            self.stored.append(metric_point.value)
+
+    backend = MetricBackend()
+    persistence = ExecutorPersistence(backend)
+    manager = MetricsManager(persistence=persistence)
+
+    with patch("asyncio.run") as run:
+        manager.record_metric(MetricType.LATENCY, 1.0)
+
+    run.assert_not_called()
+    assert backend.stored == [1.0]
+    asyncio.run(persistence.close())
@@ -0,0 +1,83 @@
+"""Tests for the columnar metrics store."""
+import time
+import pytest
+import numpy as np
+from agentflow.core.metrics import MetricsManager, MetricType
+from agentflow.core.metrics_store import ColumnarMetricsStore
+
+
+def test_ring_buffer_keeps_latest_points():
+    """Test the store overwrites the oldest points once full."""
+    store = ColumnarMetricsStore(capacity=5)
+    for i in range(12):
+        store.append("latency", float(i), 1000.0 + i)
+
+    series = store.query("latency")
+    np.testing.assert_array_equal(series.values, [7, 8, 9, 10, 11])
+    np.testing.assert_array_equal(series.timestamps, [1007, 1008, 1009, 1010, 1011])
+
+
+def test_time_and_label_queries():
+    """Test vectorized time range and label filtering."""
+    store = ColumnarMetricsStore()
+    for i in range(100):
+        labels = {"service": "api" if i % 2 else "worker", "region": "eu"}
+        store.append("latency", float(i), 1000.0 + i, labels)
+
+    api = store.query("latency", labels={"service": "api"})
+    assert len(api) == 50
+    assert np.all(api.values % 2 == 1)
+
+    window = store.query("latency", start_time=1010, end_time=1019, labels={"region": "eu", "service": "worker"})
+    np.testing.assert_array_equal(window.values, [10, 12, 14, 16, 18])
+    assert store.labels.labels(int(window.label_ids[0])) == {"service": "worker", "region": "eu"}
+
+    assert len(store.query("latency", labels={"service": "missing"})) == 0
+    assert len(store.labels) == 2
+
+
+def test_retention_drops_old_points():
+    """Test points older than the retention window are discarded."""
+    store = ColumnarMetricsStore(retention_seconds=60)
+    now = time.time()
+    store.append("latency", 1.0, now - 120)
+    store.append("latency", 2.0, now - 90)
+    store.append("latency", 3.0, now)
+
+    np.testing.assert_array_equal(store.query("latency").values, [3.0])
+
+
+def test_label_sets_are_evicted_with_their_points():
+    """Test label sets are dropped once no stored point uses them."""
+    store = ColumnarMetricsStore(capacity=4)
+    for i in range(100):
+        store.append("latency", float(i), 1000.0 + i, {"request": str(i)})
+
+    assert len(store.labels) == 4
+    assert len(store.query("latency", labels={"request": "0"})) == 0
+    series = store.query("latency", labels={"request": "99"})
+    assert series.label_sets[int(series.label_ids[0])] == {"request": "99"}
+
+    expiring = ColumnarMetricsStore(retention_seconds=60)
+    now = time.time()
+    expiring.append("latency", 1.0, now - 120, {"host": "old"})
+    expiring.append("latency", 2.0, now, {"host": "new"})
+    assert len(expiring.labels) == 1
+    assert len(expiring.query("latency", labels={"host": "old"})) == 0
+
+
+def test_metrics_manager_with_store():
+    """Test MetricsManager keeps its API when backed by the columnar store."""
+    manager = MetricsManager(store=ColumnarMetricsStore(capacity=3))
+    for value in range(5):
+        manager.record_metric(MetricType.LATENCY, float(value), {"service": "api"})
+    manager.record_metric(MetricType.THROUGHPUT, 10.0)
+
+    metrics = manager.get_metrics(metric_type=MetricType.LATENCY, labels={"service": "api"})
+    assert [point.value for point in metrics[MetricType.LATENCY.value]] == [2.0, 3.0, 4.0]
+    assert metrics[MetricType.LATENCY.value][0].labels == {"service": "api"}
+    assert len(manager.get_metrics()) == 2
+    np.testing.assert_array_equal(manager.query_metrics(MetricType.LATENCY).values, [2.0, 3.0, 4.0])
+
+    manager.clear_metrics()
+    assert manager.get_metrics() == {}
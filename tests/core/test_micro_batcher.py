@@ -0,0 +1,118 @@
+"""Tests for micro-batching across workers."""
+import asyncio
+import pytest
+from typing import Any, List
+
+from agentflow.core.micro_batcher import MicroBatcher
+from agentflow.core.research_workflow import ResearchDistributedWorkflow
+
+
+class FakeWorker:
+    """Worker that records the batches it receives."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches: List[List[Any]] = []
+
+    async def execute_batch(self, inputs: List[Any]) -> List[Any]:
+        self.batches.append(inputs)
+        await asyncio.sleep(self.delay)
+        return [item["data"] * 2 for item in inputs]
+
+
+async def run_batch(worker: FakeWorker, items: List[Any]) -> List[Any]:
+    return await worker.execute_batch([{"data": item} for item in items])
+
+
+@pytest.mark.asyncio
+async def test_items_are_coalesced_into_batches():
+    """Test items are grouped by batch size and results keep input order."""
+    worker = FakeWorker()
+    async with MicroBatcher([worker], run_batch, batch_size=4, max_wait=0.05) as batcher:
+        results = await batcher.map(range(10))
+
+    assert results == [item * 2 for item in range(10)]
+    assert [len(batch) for batch in worker.batches] == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_dispatched_after_max_wait():
+    """Test a partial batch is not held back past the deadline."""
+    worker = FakeWorker()
+    async with MicroBatcher([worker], run_batch, batch_size=100, max_wait=0.01) as batcher:
+        result = await asyncio.wait_for(batcher.submit(3), timeout=1)
+
+    assert result == 6
+    assert worker.batches == [[{"data": 3}]]
+
+
+@pytest.mark.asyncio
+async def test_least_loaded_worker_selection():
+    """Test a slow worker receives fewer batches than fast workers."""
+    slow, fast = FakeWorker(delay=0.2), FakeWorker(delay=0.01)
+    async with MicroBatcher([slow, fast], run_batch, batch_size=1, max_wait=0) as batcher:
+        await batcher.map(range(12))
+
+    assert len(slow.batches) < len(fast.batches)
+
+
+@pytest.mark.asyncio
+async def test_inflight_limit_applies_backpressure():
+    """Test no worker runs more batches than allowed at once."""
+    active, peak = 0, 0
+
+    async def tracked(worker: Any, items: List[Any]) -> List[Any]:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return items
+
+    async with MicroBatcher(
+        [object(), object()], tracked, batch_size=2, max_wait=0,
+        max_inflight_per_worker=1, max_pending=2
+    ) as batcher:
+        results = await batcher.map(range(20))
+
+    assert results == list(range(20))
+    assert peak <= 2
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_propagates():
+    """Test a failed batch fails the items it contained."""
+    async def failing(worker: Any, items: List[Any]) -> List[Any]:
+        raise RuntimeError("worker down")
+
+    async with MicroBatcher([object()], failing) as batcher:
+        with pytest.raises(RuntimeError, match="worker down"):
+            await batcher.submit(1)
+
+
+@pytest.mark.asyncio
+async def test_close_dispatches_pending_items():
+    """Test items waiting for a partial batch are dispatched on close."""
+    worker = FakeWorker()
+    batcher = MicroBatcher([worker], run_batch, batch_size=10, max_wait=60)
+    await batcher.start()
+    submitted = [asyncio.create_task(batcher.submit(item)) for item in range(3)]
+    await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(batcher.close(), timeout=1)
+
+    assert await asyncio.gather(*submitted) == [0, 2, 4]
+    assert worker.batches == [[{"data": 0}, {"data": 1}, {"data": 2}]]
+
+
+@pytest.mark.asyncio
+async def test_process_batch_uses_micro_batches():
+    """Test the research workflow sends micro-batches to its workers."""
+    workflow = ResearchDistributedWorkflow({"COLLABORATION": {"WORKFLOW": {}}})
+    await workflow.configure({"distributed": {"num_workers": 2, "batch_size": 3}})
+    workflow.workers = [FakeWorker(), FakeWorker()]
+
+    results = await workflow.process_batch(list(range(9)))
+
+    assert results == [{"result": item * 2} for item in range(9)]
+    assert all(len(batch) == 3 for worker in workflow.workers for batch in worker.batches)
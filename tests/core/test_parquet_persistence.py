@@ -0,0 +1,163 @@
+"""Test Parquet persistence."""
+
+import os
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from agentflow.core.parquet_persistence import ParquetPersistence, export_to_parquet
+from agentflow.core.persistence import PersistenceFactory, SQLitePersistence
+from agentflow.core.validators import ValidationResult
+
+
+def make_result(day: int, hour: int, is_valid: bool, score: float) -> ValidationResult:
+    """Create a validation result at a given day and hour of January 2024."""
+    return ValidationResult(
+        is_valid=is_valid,
+        score=score,
+        details={"day": day, "hour": hour},
+        timestamp=f"2024-01-{day:02d}T{hour:02d}:00:00"
+    )
+
+
+@pytest.fixture
+def parquet_persistence(temp_dir):
+    """Create Parquet persistence with results over three days."""
+    persistence = PersistenceFactory.create_persistence("parquet", base_dir=temp_dir)
+    for day, hour, is_valid, score in [
+        (1, 9, True, 0.9), (1, 17, False, 0.3), (2, 9, True, 0.8), (3, 9, True, 1.0)
+    ]:
+        persistence.save_result("obj", "accuracy", make_result(day, hour, is_valid, score))
+    persistence.save_result("obj", "latency", make_result(2, 12, False, 0.1))
+    yield persistence
+    persistence.close()
+
+
+def test_files_are_partitioned_by_date_and_type(parquet_persistence, temp_dir):
+    """Test results are written under date and validation type partitions."""
+    parquet_persistence.flush()
+
+    partitions = sorted(
+        os.path.relpath(root, temp_dir)
+        for root, _, files in os.walk(temp_dir)
+        if any(name.endswith(".parquet") for name in files)
+    )
+    assert partitions == [
+        "date=2024-01-01/validation_type=accuracy",
+        "date=2024-01-02/validation_type=accuracy",
+        "date=2024-01-02/validation_type=latency",
+        "date=2024-01-03/validation_type=accuracy",
+    ]
+
+
+def test_read_filters_and_round_trip(parquet_persistence):
+    """Test filtered reads return results in the common result shape."""
+    results = parquet_persistence.get_results(
+        validation_type="accuracy", start_time="2024-01-01T12:00:00", end_time="2024-01-02T23:59:59"
+    )
+    assert [result["timestamp"] for result in results] == ["2024-01-02T09:00:00", "2024-01-01T17:00:00"]
+    assert results[0] == {
+        "objective_id": "obj",
+        "validation_type": "accuracy",
+        "timestamp": "2024-01-02T09:00:00",
+        "result": {"is_valid": True, "score": 0.8, "details": {"day": 2, "hour": 9}, "message": None},
+    }
+    assert parquet_persistence.get_result("obj", "accuracy")["timestamp"] == "2024-01-03T09:00:00"
+
+    page = parquet_persistence.get_results_page(limit=2, fields=["result.score"])
+    assert page.items == [{"result": {"score": 1.0}}, {"result": {"score": 0.1}}]
+
+
+def test_delete_rewrites_partition(parquet_persistence):
+    """Test deleting a result removes only the matching rows."""
+    assert parquet_persistence.delete_result("obj", "accuracy", "2024-01-01T17:00:00")
+    assert not parquet_persistence.delete_result("obj", "accuracy", "2024-01-01T17:00:00")
+
+    timestamps = [r["timestamp"] for r in parquet_persistence.get_results(validation_type="accuracy")]
+    assert timestamps == ["2024-01-03T09:00:00", "2024-01-02T09:00:00", "2024-01-01T09:00:00"]
+
+
+def test_aggregate_per_bucket(parquet_persistence):
+    """Test count, mean score and pass rate per day and validation type."""
+    rows = parquet_persistence.aggregate(bucket="day")
+
+    assert rows[0] == {
+        "bucket": "2024-01-01T00:00:00", "validation_type": "accuracy",
+        "count": 2, "mean_score": pytest.approx(0.6), "pass_rate": 0.5,
+    }
+    assert [(row["bucket"][:10], row["validation_type"]) for row in rows] == [
+        ("2024-01-01", "accuracy"), ("2024-01-02", "accuracy"),
+        ("2024-01-02", "latency"), ("2024-01-03", "accuracy"),
+    ]
+
+    weekly = parquet_persistence.aggregate(bucket="week", by_validation_type=False, validation_type="accuracy")
+    assert weekly == [{
+        "bucket": "2024-01-01T00:00:00", "count": 4,
+        "mean_score": pytest.approx(0.75), "pass_rate": 0.75,
+    }]
+
+    with pytest.raises(ValueError):
+        parquet_persistence.aggregate(bucket="fortnight")
+
+
+def test_export_from_sqlite(temp_dir):
+    """Test history is exported from another backend."""
+    source = SQLitePersistence(os.path.join(temp_dir, "results.db"))
+    for day in range(1, 4):
+        source.save_result("obj", "accuracy", make_result(day, 9, day % 2 == 1, day / 10))
+    target = ParquetPersistence(os.path.join(temp_dir, "parquet"))
+
+    assert export_to_parquet(source, target, page_size=2) == 3
+    assert [row["count"] for row in target.aggregate(bucket="month")] == [3]
+    source.close()
+
+
+def parquet_files(directory):
+    """List the Parquet files under a directory."""
+    return [
+        os.path.join(root, name)
+        for root, _, files in os.walk(directory)
+        for name in files if name.endswith(".parquet")
+    ]
+
+
+def test_offset_timestamps_use_utc_partitions(temp_dir):
+    """Test partitions and time filters use the UTC instant of a timestamp."""
+    persistence = ParquetPersistence(temp_dir)
+    result = make_result(1, 0, True, 0.5)
+    result.timestamp = "2024-01-01T23:30:00-02:00"
+    persistence.save_result("obj", "accuracy", result)
+    persistence.flush()
+
+    assert [os.path.relpath(path, temp_dir).split(os.sep)[0] for path in parquet_files(temp_dir)] == [
+        "date=2024-01-02"
+    ]
+    assert len(persistence.get_results(start_time="2024-01-02T00:00:00+00:00")) == 1
+    assert persistence.get_results(end_time="2024-01-01T23:59:59+00:00") == []
+
+
+def test_reads_include_buffer_without_writing(temp_dir):
+    """Test reads see buffered results without flushing them to files."""
+    persistence = ParquetPersistence(temp_dir)
+    persistence.save_result("obj", "accuracy", make_result(1, 9, True, 0.9))
+    persistence.flush()
+    persistence.save_result("obj", "accuracy", make_result(2, 9, False, 0.2))
+
+    assert [r["result"]["score"] for r in persistence.get_results()] == [0.2, 0.9]
+    assert persistence.get_result("obj", "accuracy")["result"]["score"] == 0.2
+    assert len(parquet_files(temp_dir)) == 1
+
+    assert persistence.delete_result("obj", "accuracy", "2024-01-02T09:00:00")
+    assert len(persistence.get_results()) == 1
+
+
+def test_flush_interval_and_compaction(temp_dir):
+    """Test old buffers are flushed on save and small files are merged."""
+    persistence = ParquetPersistence(temp_dir, flush_interval=0, compact_files=2)
+    for hour in range(5):
+        persistence.save_result("obj", "accuracy", make_result(1, hour, True, hour / 10))
+        assert len(parquet_files(temp_dir)) <= 2
+
+    persistence.compact()
+    assert len(parquet_files(temp_dir)) == 1
+    assert len(persistence.get_results()) == 5
@@ -0,0 +1,455 @@
+"""Test persistence backends."""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+from bson import ObjectId
+from agentflow.core.persistence import (
+    AsyncMongoPersistence,
+    ExecutorPersistence,
+    FilePersistence,
+    MongoPersistence,
+    PersistenceFactory,
+    SQLitePersistence,
+)
+from agentflow.core.validators import ValidationResult
+
+
+def make_result(index: int) -> ValidationResult:
+    """Create a validation result with an ordered timestamp."""
+    return ValidationResult(
+        is_valid=index % 2 == 0,
+        score=index / 10,
+        details={"index": index},
+        timestamp=f"2024-01-01T00:00:{index:02d}"
+    )
+
+
+@pytest.fixture(params=[False, True], ids=["direct", "batched"])
+def sqlite_persistence(request, temp_dir):
+    """Create SQLite persistence with and without the batched writer."""
+    persistence = SQLitePersistence(
+        os.path.join(temp_dir, "results.db"),
+        batch_writes=request.param
+    )
+    yield persistence
+    persistence.close()
+
+
+def test_sqlite_schema_uses_wal_and_lookup_index(sqlite_persistence):
+    """Test the database is in WAL mode with the composite lookup index."""
+    with sqlite3.connect(sqlite_persistence.db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        columns = [row[2] for row in conn.execute(
+            "PRAGMA index_info(idx_validation_results_lookup)"
+        )]
+    assert columns == ["objective_id", "validation_type", "timestamp"]
+
+
+def test_sqlite_read_after_write(sqlite_persistence):
+    """Test results are readable right after they are saved."""
+    for index in range(20):
+        assert sqlite_persistence.save_result("objective", "accuracy", make_result(index))
+
+    latest = sqlite_persistence.get_result("objective", "accuracy")
+    assert latest["result"]["details"] == {"index": 19}
+    results = sqlite_persistence.get_results(objective_id="objective", start_time="2024-01-01T00:00:10")
+    assert len(results) == 10
+
+    assert sqlite_persistence.delete_result("objective", "accuracy")
+    assert sqlite_persistence.get_results(objective_id="objective") == []
+
+
+def test_sqlite_concurrent_writers(sqlite_persistence):
+    """Test writes from several threads are all stored."""
+    def write(thread_id: int):
+        for index in range(50):
+            sqlite_persistence.save_result(f"objective-{thread_id}", "accuracy", make_result(index))
+
+    threads = [threading.Thread(target=write, args=(thread_id,)) for thread_id in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(sqlite_persistence.get_results()) == 200
+
+
+def test_sqlite_batched_writer_flushes_on_close(temp_dir):
+    """Test queued writes are committed when the persistence is closed."""
+    db_path = os.path.join(temp_dir, "results.db")
+    persistence = PersistenceFactory.create_persistence(
+        "sqlite", db_path=db_path, batch_writes=True, flush_interval=10
+    )
+    for index in range(5):
+        persistence.save_result("objective", "accuracy", make_result(index))
+    persistence.close()
+
+    assert len(SQLitePersistence(db_path).get_results()) == 5
+
+
+def test_sqlite_batched_read_waits_only_for_earlier_writes(temp_dir):
+    """Test a read does not wait for writes queued after it."""
+    persistence = SQLitePersistence(os.path.join(temp_dir, "results.db"), batch_writes=True)
+    first_batch, later_batches = threading.Event(), threading.Event()
+    insert = persistence._insert
+    calls = []
+
+    def stalled_insert(conn, rows):
+        calls.append(rows)
+        (first_batch if len(calls) == 1 else later_batches).wait(5)
+        insert(conn, rows)
+
+    results = []
+    try:
+        with patch.object(persistence, "_insert", stalled_insert):
+            persistence.save_result("objective", "accuracy", make_result(0))
+            reader = threading.Thread(target=lambda: results.extend(persistence.get_results()))
+            reader.start()
+            while not calls:
+                time.sleep(0.01)
+            persistence.save_result("objective", "accuracy", make_result(1))
+            first_batch.set()
+            reader.join(timeout=2)
+            assert not reader.is_alive()
+            assert len(results) == 1
+            later_batches.set()
+            persistence.flush()
+        assert len(persistence.get_results()) == 2
+    finally:
+        first_batch.set()
+        later_batches.set()
+        persistence.close()
+
+
+def test_sqlite_batched_write_errors_are_reported(temp_dir):
+    """Test failed batched writes fail their futures and the next flush."""
+    persistence = SQLitePersistence(os.path.join(temp_dir, "results.db"), batch_writes=True)
+    try:
+        with patch.object(persistence, "_insert", side_effect=sqlite3.OperationalError("disk full")):
+            future = persistence.submit_result("objective", "accuracy", make_result(0))
+            with pytest.raises(sqlite3.OperationalError):
+                future.result(timeout=5)
+            with pytest.raises(sqlite3.OperationalError):
+                persistence.flush()
+        persistence.flush()
+        assert persistence.get_results() == []
+    finally:
+        persistence.close()
+
+
+def test_sqlite_batched_cancelled_write_is_skipped(temp_dir):
+    """Test a cancelled submission is not written and does not stall readers."""
+    persistence = SQLitePersistence(
+        os.path.join(temp_dir, "results.db"), batch_writes=True, flush_interval=0.5
+    )
+    results = []
+    try:
+        cancelled = persistence.submit_result("objective", "accuracy", make_result(0))
+        assert cancelled.cancel()
+        kept = persistence.submit_result("objective", "accuracy", make_result(1))
+        reader = threading.Thread(target=lambda: results.extend(persistence.get_results()))
+        reader.start()
+        reader.join(timeout=5)
+
+        assert not reader.is_alive()
+        assert kept.result(timeout=1) is True
+        assert [item["result"]["details"] for item in results] == [{"index": 1}]
+        persistence.flush()
+    finally:
+        persistence.close()
+
+
+@pytest.fixture
+def jsonl_persistence(temp_dir):
+    """Create file persistence using the jsonl segment format."""
+    persistence = FilePersistence(os.path.join(temp_dir, "results"), format="jsonl", segment_size=2048)
+    yield persistence
+    persistence.close()
+
+
+def test_jsonl_appends_without_rewriting(jsonl_persistence):
+    """Test saves append to segments and leave earlier bytes untouched."""
+    jsonl_persistence.save_result("objective", "accuracy", make_result(0))
+    segment = next(jsonl_persistence.base_dir.glob("segment-*.jsonl"))
+    first = segment.read_bytes()
+
+    jsonl_persistence.save_result("objective", "accuracy", make_result(1))
+
+    assert segment.read_bytes().startswith(first)
+    assert jsonl_persistence.get_result("objective", "accuracy")["result"]["details"] == {"index": 1}
+    assert jsonl_persistence.get_result(
+        "objective", "accuracy", "2024-01-01T00:00:00"
+    )["result"]["details"] == {"index": 0}
+
+
+def test_jsonl_filters_and_rollover(jsonl_persistence):
+    """Test index filters across several segments."""
+    for index in range(30):
+        jsonl_persistence.save_result(f"objective-{index % 3}", f"type-{index % 2}", make_result(index))
+
+    assert len(list(jsonl_persistence.base_dir.glob("segment-*.jsonl"))) > 1
+    assert len(jsonl_persistence.get_results()) == 30
+    assert len(jsonl_persistence.get_results(objective_id="objective-0")) == 10
+    assert len(jsonl_persistence.get_results(validation_type="type-1")) == 15
+    results = jsonl_persistence.get_results(
+        objective_id="objective-1", validation_type="type-1", start_time="2024-01-01T00:00:10"
+    )
+    assert [r["result"]["details"]["index"] for r in results] == [13, 19, 25]
+
+
+def test_jsonl_reopen_and_rebuild_index(temp_dir):
+    """Test the index is reloaded and rebuilt from segments when missing."""
+    base_dir = os.path.join(temp_dir, "results")
+    persistence = FilePersistence(base_dir, format="jsonl")
+    for index in range(5):
+        persistence.save_result("objective", "accuracy", make_result(index))
+    persistence.delete_result("objective", "accuracy", "2024-01-01T00:00:04")
+    persistence.close()
+
+    reopened = FilePersistence(base_dir, format="jsonl")
+    assert len(reopened.get_results()) == 4
+    reopened.close()
+
+    for index_file in Path(base_dir).glob("index-*.jsonl"):
+        index_file.unlink()
+    rebuilt = FilePersistence(base_dir, format="jsonl")
+    assert len(rebuilt.get_results()) == 5
+    rebuilt.close()
+
+
+def test_jsonl_compaction(jsonl_persistence):
+    """Test deleting most results compacts the segments."""
+    for index in range(30):
+        jsonl_persistence.save_result(f"objective-{index}", "accuracy", make_result(index))
+    size = sum(path.stat().st_size for path in jsonl_persistence.base_dir.glob("segment-*.jsonl"))
+
+    for index in range(20):
+        assert jsonl_persistence.delete_result(f"objective-{index}", "accuracy")
+
+    compacted = sum(path.stat().st_size for path in jsonl_persistence.base_dir.glob("segment-*.jsonl"))
+    assert compacted < size
+    assert len(jsonl_persistence.get_results()) == 10
+    assert jsonl_persistence.get_result("objective-25", "accuracy")["result"]["details"] == {"index": 25}
+    assert not jsonl_persistence.delete_result("objective-0", "accuracy")
+
+
+def test_jsonl_read_survives_concurrent_compaction(jsonl_persistence):
+    """Test entries found before a compaction stay readable until the read ends."""
+    log = jsonl_persistence._log
+    for index in range(10):
+        jsonl_persistence.save_result(f"objective-{index}", "accuracy", make_result(index))
+
+    with log.pinned():
+        entries = log.entries()
+        log.compact()
+        assert [record["timestamp"] for record in log.read(entries)] == [
+            make_result(index).timestamp for index in range(10)
+        ]
+        assert list(log.base_dir.glob("segment-0-*.jsonl"))
+
+    assert not list(log.base_dir.glob("segment-0-*.jsonl"))
+    with pytest.raises(LookupError):
+        list(log.read(entries))
+    assert len(jsonl_persistence.get_results()) == 10
+
+
+def test_jsonl_cursor_survives_compaction(jsonl_persistence):
+    """Test a page cursor continues at the same result after a compaction."""
+    jsonl_persistence.save_result("other", "accuracy", make_result(0))
+    for index in range(10):
+        result = make_result(index)
+        result.timestamp = "2024-01-01T00:00:00"
+        jsonl_persistence.save_result("obj", "accuracy", result)
+    jsonl_persistence.delete_result("other", "accuracy")
+
+    first = jsonl_persistence.get_results_page(objective_id="obj", limit=4)
+    jsonl_persistence.compact()
+    second = jsonl_persistence.get_results_page(objective_id="obj", limit=4, cursor=first.next_cursor)
+
+    indices = [item["result"]["details"]["index"] for item in first.items + second.items]
+    assert indices == list(range(9, 1, -1))
+
+
+def collect_pages(persistence, **kwargs):
+    """Fetch all pages and return the items of each page."""
+    pages, cursor = [], None
+    while True:
+        page = persistence.get_results_page(cursor=cursor, **kwargs)
+        pages.append(page.items)
+        if page.next_cursor is None:
+            return pages
+        cursor = page.next_cursor
+
+
+@pytest.fixture(params=["sqlite", "jsonl", "json"])
+def paged_persistence(request, temp_dir):
+    """Create persistence backends holding the same ten results."""
+    if request.param == "sqlite":
+        persistence = SQLitePersistence(os.path.join(temp_dir, "results.db"), batch_writes=True)
+    else:
+        persistence = FilePersistence(temp_dir, format=request.param)
+    for index in range(10):
+        persistence.save_result("obj", "type_a" if index < 8 else "type_b", make_result(index))
+    yield persistence
+    if hasattr(persistence, "close"):
+        persistence.close()
+
+
+def test_results_page_cursor_walks_newest_first(paged_persistence):
+    """Test pages are ordered newest first and cursors cover every result once."""
+    pages = collect_pages(paged_persistence, validation_type="type_a", limit=3)
+
+    assert [len(items) for items in pages] == [3, 3, 2]
+    indices = [item["result"]["details"]["index"] for items in pages for item in items]
+    assert indices == list(range(7, -1, -1))
+
+
+def test_results_page_projection(paged_persistence):
+    """Test only the requested fields are returned."""
+    page = paged_persistence.get_results_page(
+        start_time="2024-01-01T00:00:05", limit=2, fields=["timestamp", "result.score"]
+    )
+
+    assert page.items == [
+        {"timestamp": "2024-01-01T00:00:09", "result": {"score": 0.9}},
+        {"timestamp": "2024-01-01T00:00:08", "result": {"score": 0.8}},
+    ]
+    assert page.next_cursor is not None
+
+
+def test_iter_results_limit_and_async(paged_persistence):
+    """Test the sync and async iterators stream the same results."""
+    streamed = list(paged_persistence.iter_results(limit=5, page_size=2, fields=["timestamp"]))
+    assert [item["timestamp"][-2:] for item in streamed] == ["09", "08", "07", "06", "05"]
+
+    async def consume():
+        return [item async for item in paged_persistence.aiter_results(limit=5, page_size=2, fields=["timestamp"])]
+
+    assert asyncio.run(consume()) == streamed
+
+
+def test_results_page_rejects_malformed_cursor(paged_persistence):
+    """Test malformed cursors raise ValueError."""
+    with pytest.raises(ValueError):
+        paged_persistence.get_results_page(cursor="not a cursor")
+
+
+def test_mongo_results_page_pushes_down_query():
+    """Test MongoDB pages push filters, sort, limit and projection to the server."""
+    with patch("agentflow.core.persistence.pymongo.MongoClient"):
+        persistence = MongoPersistence("mongodb://localhost", "agentflow")
+    documents = [
+        {"_id": ObjectId(), "timestamp": f"2024-01-01T00:00:0{index}", "result": {"score": index}}
+        for index in (3, 2, 1)
+    ]
+    persistence.collection.find.return_value = documents
+
+    page = persistence.get_results_page(objective_id="obj", limit=2, fields=["result.score"])
+
+    query, projection = persistence.collection.find.call_args.args
+    options = persistence.collection.find.call_args.kwargs
+    assert query == {"objective_id": "obj"}
+    assert projection == {"result.score": 1, "timestamp": 1}
+    assert options["limit"] == 3
+    assert options["sort"] == [("timestamp", -1), ("_id", -1)]
+    assert page.items == [{"result": {"score": 3}}, {"result": {"score": 2}}]
+
+    persistence.get_results_page(objective_id="obj", limit=2, cursor=page.next_cursor)
+    query = persistence.collection.find.call_args.args[0]
+    assert query["$and"][1]["$or"][1] == {
+        "timestamp": "2024-01-01T00:00:02", "_id": {"$lt": documents[1]["_id"]}
+    }
+
+
+class SlowPersistence(FilePersistence):
+    """File persistence with slow writes that records the writing threads."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writer_threads = set()
+
+    def save_result(self, objective_id, validation_type, result):
+        self.writer_threads.add(threading.current_thread().name)
+        time.sleep(0.05)
+        return super().save_result(objective_id, validation_type, result)
+
+
+def test_executor_persistence_does_not_block_event_loop(temp_dir):
+    """Test slow writes run on one writer thread while the loop keeps running."""
+    backend = SlowPersistence(temp_dir, format="jsonl")
+    persistence = ExecutorPersistence(backend)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        saved = await asyncio.gather(*(
+            persistence.save_result("obj", "type_a", make_result(index)) for index in range(4)
+        ))
+        task.cancel()
+        # Reads observe all earlier writes
+        results = await persistence.get_results(objective_id="obj")
+        await persistence.close()
+        return ticks, saved, results
+
+    ticks, saved, results = asyncio.run(run())
+    assert saved == [True] * 4
+    assert len(results) == 4
+    assert ticks >= 10
+    assert len(backend.writer_threads) == 1
+
+
+def test_create_async_persistence(temp_dir):
+    """Test the factory creates threaded and native async backends."""
+    persistence = PersistenceFactory.create_async_persistence(
+        "sqlite", db_path=os.path.join(temp_dir, "results.db")
+    )
+    assert isinstance(persistence, ExecutorPersistence)
+    assert isinstance(persistence.persistence, SQLitePersistence)
+
+    async def round_trip():
+        async with persistence:
+            await persistence.save_result("obj", "type_a", make_result(1))
+            return [item async for item in persistence.aiter_results(fields=["timestamp"])]
+
+    assert asyncio.run(round_trip()) == [{"timestamp": "2024-01-01T00:00:01"}]
+
+    with patch("agentflow.core.persistence.pymongo.AsyncMongoClient"):
+        mongo = PersistenceFactory.create_async_persistence(
+            "mongo", connection_string="mongodb://localhost", database="agentflow"
+        )
+    assert isinstance(mongo, AsyncMongoPersistence)
+
+
+def test_async_mongo_persistence_awaits_client():
+    """Test async MongoDB persistence creates indexes lazily and awaits queries."""
+    with patch("agentflow.core.persistence.pymongo.AsyncMongoClient"):
+        persistence = AsyncMongoPersistence("mongodb://localhost", "agentflow")
+    collection = persistence.collection
+    collection.create_index = AsyncMock()
+    collection.insert_one = AsyncMock()
+    documents = [{"_id": ObjectId(), "timestamp": "2024-01-01T00:00:01", "result": {"score": 1}}]
+    collection.find = MagicMock(return_value=MagicMock(to_list=AsyncMock(return_value=documents)))
+
+    async def run():
+        saved = await persistence.save_result("obj", "type_a", make_result(1))
+        page = await persistence.get_results_page(objective_id="obj", fields=["result.score"])
+        return saved, page
+
+    saved, page = asyncio.run(run())
+    assert saved
+    collection.create_index.assert_awaited_once()
+    assert page.items == [{"result": {"score": 1}}]
+    assert page.next_cursor is None
@@ -0,0 +1,250 @@
+"""Test step result caching."""
+
+import os
+import time
+import pytest
+import numpy as np
+from typing import Dict, Any
+from agentflow.core.workflow_types import WorkflowConfig, WorkflowStep, WorkflowStepType, StepConfig
+from agentflow.core.workflow_executor import WorkflowExecutor
+from agentflow.core.metrics import MetricType
+from agentflow.core.step_cache import (
+    CacheEntry, DiskCacheBackend, StepCache, StepCacheFactory, set_default_step_cache
+)
+from agentflow.core.utils import content_hash
+
+# Calls of the cached test step, global so the step's closure stays constant
+_calls = {"count": 0}
+
+
+def make_config(workflow_id: str, execute) -> WorkflowConfig:
+    return WorkflowConfig(
+        id=workflow_id,
+        name=workflow_id,
+        steps=[
+            WorkflowStep(
+                id="step-1",
+                name="transform",
+                type=WorkflowStepType.TRANSFORM,
+                config=StepConfig(strategy="custom", cache=True, params={"execute": execute})
+            )
+        ]
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite", "disk"])
+def step_cache(request, temp_dir):
+    """Create a step cache on each supported backend."""
+    return StepCacheFactory.create_cache(
+        request.param,
+        db_path=os.path.join(temp_dir, "cache.db"),
+        base_dir=os.path.join(temp_dir, "cache"),
+        max_entries=2
+    )
+
+
+def test_lru_eviction(step_cache):
+    """Test least recently used entries are evicted when the cache is full."""
+    step_cache.store("a", 1)
+    time.sleep(0.01)
+    step_cache.store("b", 2)
+    time.sleep(0.01)
+    assert step_cache.lookup("a") == (True, 1)
+    time.sleep(0.01)
+    step_cache.store("c", 3)
+
+    assert step_cache.lookup("a") == (True, 1)
+    assert step_cache.lookup("b") == (False, None)
+    assert step_cache.lookup("c") == (True, 3)
+
+
+def test_disk_eviction_is_amortized(temp_dir):
+    """Test the disk backend only scans its directory when over the limit."""
+    backend = DiskCacheBackend(os.path.join(temp_dir, "cache"), max_entries=100)
+    evictions = []
+    evict = backend._evict
+    backend._evict = lambda: (evictions.append(len(backend)), evict())
+
+    for index in range(120):
+        backend.set(f"key-{index}", CacheEntry(value=index))
+        backend.set(f"key-{index}", CacheEntry(value=index))
+
+    assert evictions == [101, 101]
+    assert len(backend) == 98
+    assert backend.get("key-119").value == 119
+    assert backend.get("key-0") is None
+
+
+def test_ttl_expiry(step_cache):
+    """Test entries expire after their TTL."""
+    step_cache.store("short", "value", ttl=0.05)
+    assert step_cache.lookup("short") == (True, "value")
+    time.sleep(0.1)
+    assert step_cache.lookup("short") == (False, None)
+
+
+def test_unsupported_cache_type():
+    """Test unknown backends are rejected."""
+    with pytest.raises(ValueError):
+        StepCacheFactory.create_cache("redis")
+
+
+@pytest.mark.asyncio
+async def test_cached_step_reused_across_executions():
+    """Test identical steps with identical input are only computed once."""
+    _calls["count"] = 0
+
+    async def preprocess(step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+        _calls["count"] += 1
+        return {"data": context["data"] * 2}
+
+    config = WorkflowConfig(
+        id="cached-workflow",
+        name="cached_workflow",
+        steps=[
+            WorkflowStep(
+                id="step-1",
+                name="preprocess",
+                type=WorkflowStepType.TRANSFORM,
+                config=StepConfig(strategy="custom", cache=True, params={"execute": preprocess})
+            )
+        ]
+    )
+    cache = StepCache()
+
+    for data in (np.arange(3), np.arange(3), np.arange(4)):
+        executor = WorkflowExecutor(config, step_cache=cache)
+        await executor.initialize()
+        result = await executor.execute({"data": data})
+        assert result["status"] == "success"
+
+    assert _calls["count"] == 2
+    assert len(cache.metrics.get_metrics(MetricType.CACHE_HIT)[MetricType.CACHE_HIT.value]) == 1
+    assert len(cache.metrics.get_metrics(MetricType.CACHE_MISS)[MetricType.CACHE_MISS.value]) == 2
+
+
+@pytest.mark.asyncio
+async def test_default_cache_reports_to_executor_metrics():
+    """Test hits and misses of the shared default cache reach the executor's metrics."""
+    set_default_step_cache(None)
+    try:
+        counts = []
+        for _ in range(2):
+            executor = WorkflowExecutor(make_config("default-cache", make_scaler(3)))
+            await executor.initialize()
+            await executor.execute({"x": 1})
+            counts.append({
+                metric_type: len(executor.metrics.get_metrics(metric_type).get(metric_type.value, []))
+                for metric_type in (MetricType.CACHE_HIT, MetricType.CACHE_MISS)
+            })
+    finally:
+        set_default_step_cache(None)
+
+    assert counts == [
+        {MetricType.CACHE_HIT: 0, MetricType.CACHE_MISS: 1},
+        {MetricType.CACHE_HIT: 1, MetricType.CACHE_MISS: 0},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_steps_are_not_cached_by_default():
+    """Test caching is opt-in per step."""
+    calls = {"count": 0}
+
+    async def transform(step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+        calls["count"] += 1
+        return {"data": context["data"]}
+
+    config = WorkflowConfig(
+        id="uncached-workflow",
+        name="uncached_workflow",
+        steps=[
+            WorkflowStep(
+                id="step-1",
+                name="transform",
+                type=WorkflowStepType.TRANSFORM,
+                config=StepConfig(strategy="custom", params={"execute": transform})
+            )
+        ]
+    )
+    cache = StepCache()
+    for _ in range(2):
+        executor = WorkflowExecutor(config, step_cache=cache)
+        await executor.initialize()
+        await executor.execute({"data": np.arange(3)})
+
+    assert calls["count"] == 2
+    assert len(cache.backend) == 0
+
+
+def make_scaler(k: int):
+    async def scale(step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+        return {"y": context["x"] * k}
+    return scale
+
+
+def test_function_hash_covers_constants_and_closures():
+    """Test functions differing only in a constant, default or captured value hash apart."""
+    def half():
+        return 1 / 2
+
+    def third():
+        return 1 / 3
+
+    third.__qualname__ = half.__qualname__
+    assert content_hash(half) != content_hash(third)
+    assert content_hash(make_scaler(2)) != content_hash(make_scaler(3))
+    assert content_hash(make_scaler(2)) == content_hash(make_scaler(2))
+    assert content_hash(lambda x=1: x) != content_hash(lambda x=2: x)
+
+
+def test_uncontentable_callables_are_refused():
+    """Test strict hashing rejects callable objects."""
+    class Step:
+        def __call__(self):
+            return 1
+
+    content_hash(Step())
+    with pytest.raises(TypeError):
+        content_hash({"execute": Step()}, strict=True)
+
+
+@pytest.mark.asyncio
+async def test_closures_sharing_a_qualname_do_not_share_results():
+    """Test steps whose functions differ only in captured values are cached apart."""
+    cache = StepCache()
+    results = []
+    for k in (2, 3):
+        executor = WorkflowExecutor(make_config("scaled-workflow", make_scaler(k)), step_cache=cache)
+        await executor.initialize()
+        result = await executor.execute({"x": 10})
+        results.append(result["steps"]["step-1"]["result"])
+
+    assert [result["data"]["y"] for result in results] == [20, 30]
+
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped_by_workflow():
+    """Test identical steps of different workflows do not share entries."""
+    cache = StepCache()
+    scale = make_scaler(2)
+    for workflow_id in ("first", "second"):
+        executor = WorkflowExecutor(make_config(workflow_id, scale), step_cache=cache)
+        await executor.initialize()
+        await executor.execute({"x": 1})
+    assert len(cache.backend) == 2
+
+
+@pytest.mark.asyncio
+async def test_steps_with_callable_objects_run_uncached():
+    """Test a step that cannot be hashed by content still runs, without caching."""
+    class Scale:
+        async def __call__(self, step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+            return {"y": context["x"]}
+
+    cache = StepCache()
+    executor = WorkflowExecutor(make_config("object-workflow", Scale()), step_cache=cache)
+    await executor.initialize()
+    result = await executor.execute({"x": 1})
+    assert result["status"] == "success"
+    assert len(cache.backend) == 0
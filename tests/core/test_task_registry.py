@@ -0,0 +1,110 @@
+"""Test task registry."""
+
+import threading
+
+import pytest
+
+from agentflow.core.persistence import FilePersistence
+from agentflow.core.task_registry import TaskRegistry
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_finished_tasks_expire_after_ttl(clock):
+    """Test finished records are dropped after the TTL, running ones are kept."""
+    registry = TaskRegistry(ttl=60, clock=clock)
+    registry["done"] = {"status": "pending"}
+    registry["running"] = {"status": "pending"}
+    registry.update("done", status="completed", result={"value": 1})
+
+    clock.now += 59
+    assert registry.get("done")["result"] == {"value": 1}
+
+    clock.now += 2
+    assert registry.get("done") is None
+    assert "done" not in registry
+    assert registry.get("running") == {"status": "pending"}
+
+
+def test_max_entries_evicts_oldest_finished(clock):
+    """Test the cap evicts finished records in finishing order, never running ones."""
+    registry = TaskRegistry(max_entries=2, ttl=None, clock=clock)
+    registry["running"] = {"status": "pending"}
+    registry["first"] = {"status": "pending"}
+    registry["second"] = {"status": "pending"}
+    assert len(registry) == 3
+
+    registry.update("second", status="completed")
+    assert list(registry) == ["running", "first"]
+
+    registry.update("first", status="error", error="boom")
+    registry["third"] = {"status": "completed"}
+    assert list(registry) == ["running", "third"]
+
+
+def test_spilled_records_are_loaded_from_persistence(clock, temp_dir):
+    """Test evicted records are spilled and still served by get()."""
+    persistence = FilePersistence(temp_dir, format="jsonl")
+    registry = TaskRegistry(max_entries=1, ttl=60, persistence=persistence, clock=clock)
+    registry["task"] = {"status": "pending", "start_time": 1.0}
+    registry.update("task", status="completed", result={"rows": [1, 2]}, end_time=2.0)
+    registry["other"] = {"status": "pending"}
+
+    assert len(registry) == 1
+    assert registry.get("task") == {
+        "status": "completed", "start_time": 1.0, "result": {"rows": [1, 2]}, "end_time": 2.0
+    }
+
+    registry.update("other", status="error", error="boom")
+    clock.now += 120
+    registry.evict()
+    assert len(registry) == 0
+    assert registry["other"]["error"] == "boom"
+    with pytest.raises(KeyError):
+        registry["missing"]
+    persistence.close()
+
+
+def test_spills_are_written_off_the_caller_thread(clock, temp_dir):
+    """Test a slow backend does not block callers and spilled records stay readable."""
+    persistence = FilePersistence(temp_dir, format="jsonl")
+    release = threading.Event()
+    save_result = persistence.save_result
+    writers = []
+
+    def slow_save(*args, **kwargs):
+        writers.append(threading.current_thread())
+        release.wait(5)
+        return save_result(*args, **kwargs)
+
+    persistence.save_result = slow_save
+    registry = TaskRegistry(max_entries=1, ttl=None, persistence=persistence, clock=clock)
+    try:
+        registry["first"] = {"status": "completed"}
+        registry["second"] = {"status": "completed"}
+        registry["third"] = {"status": "completed"}
+
+        assert list(registry) == ["third"]
+        assert registry.get("first") == {"status": "completed"}
+        release.set()
+        registry.flush()
+        assert registry._unwritten == {}
+        assert registry.get("second") == {"status": "completed"}
+        assert threading.current_thread() not in writers
+    finally:
+        release.set()
+        registry.close()
+        persistence.close()
@@ -0,0 +1,125 @@
+"""Test batch workflow execution."""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from agentflow.core.agent_config import AgentConfig
+from agentflow.core.agent_pool import WorkflowAgentPool
+from agentflow.core.workflow import WorkflowEngine
+from agentflow.core.workflow_batch import execute_batch
+from agentflow.core.workflow_types import WorkflowConfig
+
+
+def make_workflow() -> WorkflowConfig:
+    return WorkflowConfig.model_validate(
+        {"id": "wf", "name": "wf", "steps": [{"id": "s", "name": "s", "type": "agent"}]}
+    )
+
+
+@pytest.fixture
+def created():
+    """Agents created by the pool's factory."""
+    return []
+
+
+@pytest.fixture
+def pool(created):
+    """Create a pool whose engine echoes inputs and tracks concurrency."""
+    async def create_agent(workflow_config):
+        agent = MagicMock()
+        agent.id = f"agent_{len(created)}"
+        agent.config = MagicMock(spec=AgentConfig)
+        agent.config.workflow = None
+        agent.metadata = {}
+        agent._ell2a = None
+        agent.cleanup = AsyncMock()
+        created.append(agent)
+        return agent
+
+    engine = WorkflowEngine()
+    engine.running = 0
+    engine.peak = 0
+
+    async def execute(workflow, agent, context, run_id=None):
+        engine.running += 1
+        engine.peak = max(engine.peak, engine.running)
+        try:
+            await asyncio.sleep(0.01 * (context["value"] % 3))
+            if context.get("fail"):
+                raise RuntimeError("boom")
+            return {"status": "success", "value": context["value"], "agent": agent.id}
+        finally:
+            engine.running -= 1
+
+    engine._execute_registered_workflow = execute
+    return WorkflowAgentPool(engine, create_agent, max_size=3, checkout_timeout=0.2)
+
+
+async def collect(*args, **kwargs):
+    return [item async for item in execute_batch(*args, **kwargs)]
+
+
+@pytest.mark.asyncio
+async def test_every_input_is_executed_with_bounded_concurrency(pool, created):
+    """Test each input yields one result and executions share few agents."""
+    inputs = [{"value": i} for i in range(20)]
+    results = await collect(pool, make_workflow(), inputs, max_concurrency=2)
+
+    assert sorted(item["index"] for item in results) == list(range(20))
+    assert all(item["result"]["value"] == item["index"] for item in results)
+    assert pool.engine.peak == 2
+    assert len(created) == 2
+    # Agents are back in the pool for later requests
+    assert list(pool.stats().values()) == [{"leased": 0, "idle": 2}]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_by_pool_size(pool, created):
+    """Test workers never exceed the agents available per configuration."""
+    await collect(pool, make_workflow(), [{"value": i} for i in range(10)], max_concurrency=10)
+    assert pool.engine.peak <= pool.max_size
+    assert len(created) <= pool.max_size
+
+
+@pytest.mark.asyncio
+async def test_failed_items_are_reported_and_agents_replaced(pool, created):
+    """Test a failing input yields an error without stopping the batch."""
+    inputs = [{"value": 0}, {"value": 1, "fail": True}, {"value": 2}]
+    results = {item["index"]: item for item in await collect(pool, make_workflow(), inputs, max_concurrency=1)}
+
+    assert results[1]["status"] == "error"
+    assert "boom" in results[1]["error"]
+    assert results[0]["status"] == results[2]["status"] == "completed"
+    # The agent that failed was discarded and a new one checked out
+    assert results[0]["result"]["agent"] != results[2]["result"]["agent"]
+    created[0].cleanup.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_inputs_fail_when_no_agent_is_available(pool):
+    """Test inputs are reported as errors if no worker gets an agent."""
+    held = [await pool.acquire(make_workflow()) for _ in range(pool.max_size)]
+    results = await collect(pool, make_workflow(), [{"value": 0}, {"value": 1}], max_concurrency=1)
+
+    assert [item["status"] for item in results] == ["error", "error"]
+    assert "No agent available" in results[0]["error"]
+    for pooled in held:
+        await pool.release(pooled)
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_releases_agents(pool):
+    """Test abandoning a batch cancels its workers and returns their agents."""
+    batch = execute_batch(pool, make_workflow(), ({"value": i} for i in range(100)), max_concurrency=2)
+    await batch.__anext__()
+    await batch.aclose()
+
+    assert all(stats["leased"] == 0 for stats in pool.stats().values())
+
+
+@pytest.mark.asyncio
+async def test_invalid_concurrency_is_rejected(pool):
+    """Test max_concurrency must be positive."""
+    with pytest.raises(ValueError):
+        await collect(pool, make_workflow(), [], max_concurrency=0)
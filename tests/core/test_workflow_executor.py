@@ -246,3 +246,89 @@ async def test_workflow_timeout():
     with pytest.raises(TimeoutError) as exc_info:
         await executor.execute({"data": data})
     assert "Workflow execution timed out" in str(exc_info.value)
+
+@pytest.mark.asyncio
+async def test_dag_execution_runs_independent_steps_concurrently():
+    """Test DAG mode runs independent steps in parallel and respects dependencies."""
+    finished = []
+
+    def make_transform(step_id: str):
+        async def transform(step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+            await asyncio.sleep(0.2)
+            finished.append(step_id)
+            return {"data": context["data"]}
+        return transform
+
+    fan_out = [
+        WorkflowStep(
+            id=f"branch-{i}",
+            name=f"branch_{i}",
+            type=WorkflowStepType.TRANSFORM,
+            config=StepConfig(strategy="custom", params={"execute": make_transform(f"branch-{i}")})
+        )
+        for i in range(4)
+    ]
+    merge = WorkflowStep(
+        id="merge",
+        name="merge",
+        type=WorkflowStepType.TRANSFORM,
+        dependencies=[step.id for step in fan_out],
+        config=StepConfig(strategy="custom", params={"execute": make_transform("merge")})
+    )
+    config = WorkflowConfig(
+        id=str(uuid.uuid4()),
+        name="dag_workflow",
+        timeout=30,
+        execution_mode="dag",
+        steps=[*fan_out, merge]
+    )
+    executor = WorkflowExecutor(config)
+    await executor.initialize()
+
+    start = asyncio.get_running_loop().time()
+    result = await executor.execute({"data": np.ones(3)})
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert result["status"] == "success"
+    assert set(result["steps"]) == {"branch-0", "branch-1", "branch-2", "branch-3", "merge"}
+    assert finished[-1] == "merge"
+    # Critical path is two steps long, sequential execution would take five
+    assert elapsed < 0.8
+
+@pytest.mark.asyncio
+async def test_dag_execution_respects_max_parallelism():
+    """Test DAG mode never runs more than max_parallelism steps at once."""
+    active = 0
+    peak = 0
+
+    async def tracked_transform(step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        return {"data": context["data"]}
+
+    config = WorkflowConfig(
+        id=str(uuid.uuid4()),
+        name="bounded_dag_workflow",
+        timeout=30,
+        execution_mode="dag",
+        max_parallelism=2,
+        steps=[
+            WorkflowStep(
+                id=f"step-{i}",
+                name=f"step_{i}",
+                type=WorkflowStepType.TRANSFORM,
+                config=StepConfig(strategy="custom", params={"execute": tracked_transform})
+            )
+            for i in range(6)
+        ]
+    )
+    executor = WorkflowExecutor(config)
+    await executor.initialize()
+    result = await executor.execute({"data": np.ones(3)})
+
+    assert result["status"] == "success"
+    assert len(result["steps"]) == 6
+    assert peak == 2
@@ -0,0 +1,82 @@
+"""Test workflow engine registration and instance limits."""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from agentflow.core.agent_config import AgentConfig
+from agentflow.core.workflow import WorkflowEngine
+from agentflow.core.workflow_types import WorkflowConfig, WorkflowStatus
+
+
+def make_agent(agent_id: str) -> MagicMock:
+    """Create a minimal agent that can register a workflow."""
+    agent = MagicMock()
+    agent.id = agent_id
+    agent.config = MagicMock(spec=AgentConfig)
+    agent.config.workflow = None
+    agent.metadata = {}
+    agent._ell2a = None
+    agent.cleanup = AsyncMock()
+    return agent
+
+
+def make_workflow() -> WorkflowConfig:
+    return WorkflowConfig.model_validate(
+        {"id": "wf", "name": "wf", "steps": [{"id": "s", "name": "s", "type": "agent"}]}
+    )
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_idle_workflows_are_unregistered():
+    """Test registrations above max_workflows evict idle workflows, oldest use first."""
+    engine = WorkflowEngine(max_workflows=2)
+    engine._execute_registered_workflow = AsyncMock(return_value={"status": "success"})
+    agents = [make_agent(f"agent_{index}") for index in range(3)]
+    await engine.register_workflow(agents[0], make_workflow())
+    await engine.register_workflow(agents[1], make_workflow())
+    await engine.execute_workflow("agent_0", {})
+
+    await engine.register_workflow(agents[2], make_workflow())
+
+    assert set(engine.workflows) == {"agent_0", "agent_2"}
+    assert set(engine.agents) == {"agent_0", "agent_2"}
+    agents[1].cleanup.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_running_workflows_are_not_unregistered():
+    """Test a workflow that is executing is kept even above the limit."""
+    engine = WorkflowEngine(max_workflows=1)
+    release = asyncio.Event()
+
+    async def execute(workflow, agent, context, run_id=None):
+        await release.wait()
+        return {"status": "success"}
+
+    engine._execute_registered_workflow = execute
+    await engine.register_workflow(make_agent("busy"), make_workflow())
+    running = asyncio.create_task(engine.execute_workflow("busy", {}))
+    await asyncio.sleep(0)
+
+    await engine.register_workflow(make_agent("new"), make_workflow())
+    assert set(engine.workflows) == {"busy", "new"}
+
+    release.set()
+    await running
+    assert await engine.unregister_workflow("busy")
+    assert not await engine.unregister_workflow("busy")
+
+
+def test_finished_instances_are_trimmed():
+    """Test only the newest finished instances are kept."""
+    engine = WorkflowEngine(max_instances=2)
+    instances = [asyncio.run(engine.create_workflow("wf", make_workflow())) for _ in range(4)]
+    instances[0].status = WorkflowStatus.RUNNING
+    for instance in instances[1:]:
+        instance.status = WorkflowStatus.SUCCESS
+
+    engine._trim_instances()
+
+    assert list(engine.instances) == [instances[0].id, instances[3].id]
+    assert instances[1].id not in engine.workflows
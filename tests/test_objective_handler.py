@@ -1,4 +1,5 @@
 """Tests for the objective handler module."""
+import asyncio
 import unittest
 from datetime import datetime
 from agentflow.core.objective_handler import (
@@ -133,5 +134,17 @@ class TestObjectiveHandler(unittest.TestCase):
         self.assertEqual(original_obj.description, new_obj.description)
         self.assertEqual(len(original_obj.success_criteria), len(new_obj.success_criteria))
         
+    def test_close_stops_async_persistence(self):
+        """Test closing the handler stops the async persistence threads"""
+        async def use_and_close():
+            async with ObjectiveHandler(config={}) as handler:
+                adapter = handler.async_persistence
+                await adapter.get_results()
+            return adapter
+            
+        adapter = asyncio.run(use_and_close())
+        with self.assertRaises(RuntimeError):
+            adapter._writer.submit(lambda: None)
+        
 if __name__ == '__main__':
     unittest.main()
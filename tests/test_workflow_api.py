@@ -331,5 +331,41 @@ def test_invalid_workflow(server):
         logger.error(f"Invalid workflow request failed: {e}")
         raise
 
+def test_batch_prepares_input_like_sync_execution(server):
+    """Test one input gives the same outcome through the sync and batch endpoints"""
+    workflow = {
+        "id": "test-workflow-batch",
+        "name": "Test Batch Workflow",
+        "steps": [
+            {
+                "id": "step-1",
+                "type": "agent",
+                "name": "Research Step",
+                "config": {"strategy": "standard", "params": {}}
+            }
+        ]
+    }
+
+    for input_data in ({"TEMPLATE": "Research Paper"}, {"TEMPLATE": "Research Paper", "should_fail": True}):
+        sync_response = requests.post(
+            f"{server.base_url}/workflow/execute",
+            json={"workflow": workflow, "input_data": dict(input_data)}
+        )
+        batch_response = requests.post(
+            f"{server.base_url}/workflow/execute_batch",
+            json={"workflow": workflow, "inputs": [dict(input_data)]}
+        )
+        assert batch_response.status_code == 200
+        items = [json.loads(line) for line in batch_response.text.splitlines() if line]
+        assert len(items) == 1
+
+        if sync_response.status_code == 200:
+            assert items[0]["status"] == "completed"
+            sync_steps = [(step["id"], step["status"]) for step in sync_response.json()["steps"]]
+            batch_steps = [(step["id"], step["status"]) for step in items[0]["result"]["steps"]]
+            assert batch_steps == sync_steps
+        else:
+            assert items[0]["status"] == "error"
+
 if __name__ == "__main__":
     pytest.main([__file__])
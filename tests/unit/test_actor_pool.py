@@ -0,0 +1,134 @@
+"""Test step actor pool."""
+
+import pytest
+import ray
+
+from agentflow.core.actor_pool import StepActorPool, set_default_actor_pool
+from agentflow.core.distributed_workflow import (
+    DistributedWorkflow,
+    ResearchDistributedWorkflow,
+    ResearchExecutionStep,
+)
+from agentflow.core.exceptions import WorkflowExecutionError
+
+STEP_CONFIG = {"strategy": "feature_engineering", "params": {}}
+
+@pytest.fixture
+def setup_ray():
+    """Setup Ray."""
+    if not ray.is_initialized():
+        ray.init(ignore_reinit_error=True)
+    yield None
+    if ray.is_initialized():
+        ray.shutdown()
+
+@pytest.fixture
+def workflow_def():
+    """Workflow definition with two research steps."""
+    return {
+        "COLLABORATION": {
+            "WORKFLOW": {
+                "step_1": {"id": "step_1", "type": "research_execution"},
+                "step_2": {"id": "step_2", "type": "research_execution", "dependencies": ["step_1"]}
+            }
+        }
+    }
+
+@pytest.mark.asyncio
+async def test_workflows_reuse_released_actors(setup_ray, workflow_def):
+    """Test a new workflow leases the actors released by a previous one."""
+    pool = StepActorPool()
+    first = DistributedWorkflow(actor_pool=pool)
+    await first.initialize(workflow_def, "first")
+    first_actors = {step["actor"] for step in first.steps.values()}
+    await first.execute({"data": [1, 2, 3]})
+    first.close()
+
+    second = DistributedWorkflow(actor_pool=pool)
+    await second.initialize(workflow_def, "second")
+    second_actors = {step["actor"] for step in second.steps.values()}
+
+    assert second_actors == first_actors
+    result = await second.execute({"data": [1, 2, 3]})
+    assert result["metrics"]["steps_executed"] == 2
+    assert list(pool.stats().values()) == [{"leased": 2, "idle": 0}]
+
+@pytest.mark.asyncio
+async def test_lease_times_out_when_group_is_full(setup_ray):
+    """Test leases wait for a release and fail after the lease timeout."""
+    pool = StepActorPool(max_size=1, lease_timeout=0.2)
+    actor = await pool.lease(ResearchExecutionStep, "research_execution", STEP_CONFIG)
+    await actor.initialize.remote("step", STEP_CONFIG)
+
+    with pytest.raises(WorkflowExecutionError):
+        await pool.lease(ResearchExecutionStep, "research_execution", STEP_CONFIG)
+
+    pool.release(actor)
+    assert await pool.lease(ResearchExecutionStep, "research_execution", STEP_CONFIG) == actor
+
+@pytest.mark.asyncio
+async def test_unhealthy_actors_are_evicted(setup_ray):
+    """Test an idle actor failing its health check is replaced."""
+    pool = StepActorPool()
+    actor = await pool.lease(ResearchExecutionStep, "research_execution", STEP_CONFIG)
+    await actor.initialize.remote("step", STEP_CONFIG)
+    pool.release(actor)
+    ray.kill(actor)
+
+    replacement = await pool.lease(ResearchExecutionStep, "research_execution", STEP_CONFIG)
+    assert replacement != actor
+
+@pytest.mark.asyncio
+async def test_idle_actors_expire_down_to_min_size(setup_ray):
+    """Test idle actors past the timeout are stopped, keeping min_size."""
+    pool = StepActorPool(min_size=1, idle_timeout=0)
+    await pool.warm(ResearchExecutionStep, "research_execution", STEP_CONFIG, count=3)
+    assert list(pool.stats().values()) == [{"leased": 0, "idle": 3}]
+
+    assert pool.evict_idle() == 2
+    assert list(pool.stats().values()) == [{"leased": 0, "idle": 1}]
+
+@pytest.mark.asyncio
+async def test_pools_do_not_share_named_actors(setup_ray):
+    """Test detached pools of different drivers create distinct actors."""
+    first = StepActorPool(detached=True)
+    second = StepActorPool(detached=True)
+    try:
+        actor = await first.lease(ResearchExecutionStep, "research_execution", STEP_CONFIG)
+        other = await second.lease(ResearchExecutionStep, "research_execution", STEP_CONFIG)
+        assert actor != other
+    finally:
+        first.shutdown()
+        second.shutdown()
+
+@pytest.mark.asyncio
+async def test_remote_workflows_are_leased_from_pool(setup_ray, workflow_def):
+    """Test a released remote workflow actor is reused for the next workflow."""
+    pool = StepActorPool()
+    set_default_actor_pool(pool)
+    try:
+        config = {"id": "pooled"}
+        first = await ResearchDistributedWorkflow.create_remote_workflow(workflow_def, config, "first")
+        await ResearchDistributedWorkflow.release_remote_workflow(first)
+        second = await ResearchDistributedWorkflow.create_remote_workflow(workflow_def, config, "second")
+
+        assert second == first
+        result = await second.execute_async.remote({"data": [1, 2, 3]})
+        assert result["metrics"]["steps_executed"] == 2
+    finally:
+        pool.shutdown()
+        set_default_actor_pool(None)
+
+@pytest.mark.asyncio
+async def test_research_workflow_steps_lease_actors(setup_ray):
+    """Test steps given to the constructor run on actors leased from the pool."""
+    pool = StepActorPool()
+    workflow = ResearchDistributedWorkflow(
+        steps=[{"id": "step_1", "config": STEP_CONFIG}], actor_pool=pool
+    )
+    result = await workflow.execute({"data": [1, 2, 3]})
+
+    assert result["metrics"]["steps_executed"] == 1
+    assert list(pool.stats().values()) == [{"leased": 1, "idle": 0}]
+    workflow.close()
+    assert list(pool.stats().values()) == [{"leased": 0, "idle": 1}]
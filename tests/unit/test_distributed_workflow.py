@@ -6,6 +6,14 @@ from typing import Dict, Any
 import asyncio
 
 from agentflow.core.research_workflow import ResearchDistributedWorkflow
+import numpy as np
+from agentflow.core.distributed_workflow import (
+    DistributedWorkflow,
+    PayloadMode,
+    put_large_payloads,
+    _resolve_dependencies,
+    _resolve_input
+)
 from agentflow.core.workflow_types import WorkflowStepType, WorkflowConfig, ErrorPolicy
 from agentflow.core.exceptions import WorkflowExecutionError
 
@@ -138,3 +146,73 @@ async def test_distributed_workflow_parallel_execution(setup_ray, test_workflow_
     result = await workflow.execute_async.remote(input_data)
     assert result is not None
     assert isinstance(result, dict)
+
+def _diamond_workflow_def() -> Dict[str, Any]:
+    """Workflow with two independent steps between a source and a sink."""
+    step = lambda step_id, deps: {"id": step_id, "type": "research_execution", "dependencies": deps}
+    return {
+        "COLLABORATION": {
+            "WORKFLOW": {
+                "source": step("source", []),
+                "left": step("left", ["source"]),
+                "right": step("right", ["source"]),
+                "sink": step("sink", ["left", "right"])
+            }
+        }
+    }
+
+@pytest.mark.asyncio
+async def test_distributed_workflow_dependency_dispatch(setup_ray):
+    """Test steps are dispatched in dependency order and all complete."""
+    workflow = DistributedWorkflow()
+    await workflow.initialize(_diamond_workflow_def(), "diamond")
+
+    result = await workflow.execute({"data": [1, 2, 3]})
+
+    assert result["metrics"]["steps_executed"] == 4
+    assert set(result["results"]) == {"source", "left", "right", "sink"}
+    status = await workflow.get_status()
+    assert all(step["status"] == "completed" for step in status["steps"].values())
+
+@pytest.mark.asyncio
+async def test_distributed_workflow_missing_dependency(setup_ray):
+    """Test a dependency on an unknown step fails the workflow."""
+    workflow_def = _diamond_workflow_def()
+    workflow_def["COLLABORATION"]["WORKFLOW"]["sink"]["dependencies"] = ["unknown"]
+    workflow = DistributedWorkflow()
+    await workflow.initialize(workflow_def, "missing")
+
+    with pytest.raises(WorkflowExecutionError, match="unknown"):
+        await workflow.execute({"data": [1, 2, 3]})
+
+@pytest.mark.asyncio
+async def test_resolve_dependencies(setup_ray):
+    """Test dependency object references are replaced by their data."""
+    ref = ray.put({"data": [1, 2]})
+    resolved = await _resolve_dependencies({"data": 0, "dependencies": {"upstream": ref}})
+    assert resolved == {"data": 0, "dependencies": {"upstream": [1, 2]}}
+
+@pytest.mark.asyncio
+async def test_large_payloads_shared_through_object_store(setup_ray):
+    """Test large arrays are replaced by references and fetched without copies."""
+    features = np.ones((512, 512))
+    shared = put_large_payloads({"data": features, "meta": {"small": np.ones(2)}}, threshold=1024)
+
+    assert isinstance(shared["data"], ray.ObjectRef)
+    assert isinstance(shared["meta"]["small"], np.ndarray)
+
+    resolved = await _resolve_input(shared)
+    np.testing.assert_array_equal(resolved["data"], features)
+    # Arrays read from the object store are views of shared memory
+    assert not resolved["data"].flags.writeable
+
+@pytest.mark.asyncio
+async def test_distributed_workflow_object_store_payload_mode(setup_ray):
+    """Test workflows run with input passed through the object store."""
+    workflow = DistributedWorkflow({"payload_mode": "object_store", "payload_threshold": 1024})
+    assert workflow.payload_mode == PayloadMode.OBJECT_STORE
+    await workflow.initialize(_diamond_workflow_def(), "shared")
+
+    result = await workflow.execute({"data": np.random.rand(256, 64)})
+
+    assert result["metrics"]["steps_executed"] == 4